@@ -0,0 +1,238 @@
+"""Photo scraper HTML extraction — old multi-sweep regexes vs the single pass.
+
+Runs rrg-brochure's photo_scraper._extract_imgs (one anchor scan, one
+combined junk regex) and the original implementation kept below as the
+reference (a findall sweep per pattern, a substring scan per junk pattern)
+over the same pages, and reports per-page time, throughput and whether the
+two return the same URLs. The original returned a set in arbitrary order;
+the single pass returns page order, so results are compared as sets (and
+the new list must have no duplicates).
+
+Pages:
+  - default: generated pages shaped like Crexi, LoopNet, Zillow and
+    GolfPass listings (lazy-loaded <img>s, CSS backgrounds, JSON-LD image
+    arrays, og:image, icons/badges/tracking pixels, resized thumbnails)
+  - --pages DIR: saved pages (*.html, e.g. the browser's "Save Page As,
+    HTML only"). The page URL is read from the "saved from url=" comment
+    browsers add, else https://<file name>/.
+  - --fuzz N: also compares both on N random pages of tag soup (odd
+    quoting, attribute names in mixed case, markup inside attribute values)
+
+    python benchmarks/bench_extract.py
+    python benchmarks/bench_extract.py --pages ~/saved-listings --repeat 50 --json
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import sys
+import time
+from urllib.parse import urljoin
+
+from bench_process import ROOT
+
+BROCHURE_DIR = os.path.join(ROOT, "rrg-brochure")
+
+_SAVED_FROM_RE = re.compile(r"<!-- saved from url=\(\d+\)(\S+?) -->")
+
+
+# -- the original implementation (reference) ------------------------------
+
+def _is_junk_reference(url, skip_patterns):
+    lower = url.lower()
+    if lower.endswith(".svg"):
+        return True
+    return any(p in lower for p in skip_patterns)
+
+
+def _extract_imgs_reference(html, base_url, ps):
+    urls = set()
+    for attr in ("src", "data-src", "data-original", "data-lazy-src",
+                 "data-image", "data-bg", "data-background"):
+        for match in re.findall(rf'{attr}=["\']([^"\']+)["\']', html, re.IGNORECASE):
+            urls.add(urljoin(base_url, match))
+    for match in re.findall(r'url\(["\']?([^"\')\s]+)["\']?\)', html):
+        urls.add(urljoin(base_url, match))
+    for match in re.findall(r'"(?:image|photo|contentUrl)"\s*:\s*"(https?://[^"]+)"', html):
+        urls.add(match)
+    for match in re.findall(r'content=["\']([^"\']+)["\']', html):
+        if ps._is_photo_url(match):
+            urls.add(urljoin(base_url, match))
+    out = []
+    for u in urls:
+        if not ps._is_photo_url(u) or _is_junk_reference(u, ps._SKIP_PATTERNS):
+            continue
+        m = re.search(r'/resize/(\d+)x(\d+)', u)
+        if m and (int(m.group(1)) < 300 or int(m.group(2)) < 200):
+            continue
+        m = re.search(r'/crop/(\d+)x(\d+)', u)
+        if m and (int(m.group(1)) < 300 or int(m.group(2)) < 200):
+            continue
+        m = re.search(r'[?&]w(?:idth)?=(\d+)', u)
+        if m and int(m.group(1)) < 200:
+            continue
+        out.append(u)
+    return out
+
+
+# -- pages -------------------------------------------------------------------
+
+_FILLER = ("<div class=\"card\"><p>Prime retail location with excellent visibility, "
+           "ample parking and strong co-tenancy.</p><span class=\"price\">$1,250,000</span>"
+           "<a href=\"/search?type=retail&page={n}\">More</a></div>\n")
+
+_JUNK = [
+    '<img src="/static/logo.svg" alt="logo">',
+    '<img data-src="/assets/icons/chevron-right.png">',
+    '<img src="https://www.facebook.com/tr?id=1&ev=PageView" height="1" width="1">',
+    '<img src="/images/badge-premium.png">',
+    '<img src="https://pixel.tracking.example.com/1x1.gif">',
+    '<img src="/img/avatar/default_avatar.jpg">',
+    '<img src="https://ad.doubleclick.net/ads/banner-300.jpg">',
+]
+
+
+def _site_page(site: str, photos: int, rng: random.Random) -> tuple:
+    """A listing page of roughly real size for one site. Returns (base_url, html)."""
+    parts = ["<!DOCTYPE html><html><head><meta charset=\"utf-8\">"]
+    pid = rng.randint(100000, 999999)
+    if site == "crexi":
+        base = f"https://www.crexi.com/properties/{pid}/michigan-benchmark-plaza"
+        cdn = "https://images.crexi.com/assets/{pid}/{n}_{w}x{h}.jpg"
+        parts.append(f'<meta property="og:image" content="https://images.crexi.com/assets/{pid}/0_1200x800.jpg">')
+        ld = [cdn.format(pid=pid, n=n, w=1600, h=1067) for n in range(photos)]
+        parts.append('<script type="application/ld+json">' + json.dumps({"@type": "Product", "image": ld[0]}) + "</script>")
+        parts.append('<script id="__NEXT_DATA__">' + json.dumps(
+            {"props": {"photos": [{"photo": u, "thumb": u.replace("1600x1067", "160x107")} for u in ld]}}) + "</script>")
+        img = '<img src="{u}" srcset="{u} 1x" alt="Property photo {n}" loading="lazy">'
+        urls = [cdn.format(pid=pid, n=n, w=800, h=533) for n in range(photos)]
+    elif site == "loopnet":
+        base = f"https://www.loopnet.com/Listing/100-Main-St-Ann-Arbor-MI/{pid}/"
+        cdn = "https://images1.loopnet.com/i2/{key}/100-Main-St-Ann-Arbor-MI-Primary-Photo-{n}-Large.jpg"
+        img = '<div class="carousel-item"><img class="lazy" data-src="{u}" src="/images/placeholder.gif" alt="{n}"></div>'
+        urls = [cdn.format(key=f"{rng.getrandbits(64):016x}", n=n) for n in range(photos)]
+        parts.append('<style>.hero{background-image:url("' + urls[0] + '")}</style>')
+    elif site == "zillow":
+        base = f"https://www.zillow.com/homedetails/100-Main-St-Ann-Arbor-MI-48104/{pid}_zpid/"
+        cdn = "https://photos.zillowstatic.com/fp/{key}-cc_ft_{w}.webp"
+        urls = [cdn.format(key=f"{rng.getrandbits(128):032x}", w=960) for _ in range(photos)]
+        parts.append('<script>window.__APOLLO_STATE__=' + json.dumps(
+            {"responsivePhotos": [{"url": u, "contentUrl": u.replace("_960", "_1536"), "caption": ""} for u in urls]}
+        ) + ";</script>")
+        img = '<picture><source srcset="{u} 960w" type="image/webp"><img src="{u}" alt="{n}"></picture>'
+    else:  # golfpass
+        base = f"https://www.golfpass.com/travel-advisor/courses/{pid}-benchmark-golf-club"
+        cdn = ("https://golf-pass.brightspotcdn.com/dims4/default/{key}/resize/{w}x{h}/quality/80/"
+               "?url=https%3A%2F%2Fgolf-pass-brightspot.s3.amazonaws.com%2F{n}.jpg")
+        urls = [cdn.format(key=f"{rng.getrandbits(28):07x}", w=rng.choice([1200, 526, 192]),
+                           h=rng.choice([800, 296, 108]), n=n) for n in range(photos)]
+        urls += [f"https://photos-us.bazaarvoice.com/photo/2/cGhvdG86Z29sZnBhc3M/{rng.getrandbits(40):010x}"
+                 for _ in range(photos // 2)]
+        img = '<div class="gallery-slide" data-image="{u}"><img data-original="{u}" alt="{n}"></div>'
+    parts.append("</head><body>")
+    for n, u in enumerate(urls):
+        parts.append(img.format(u=u, n=n))
+        parts.append(_FILLER.format(n=n))
+        if n % 3 == 0:
+            parts.append(rng.choice(_JUNK))
+    parts.extend(_FILLER.format(n=n) for n in range(photos * 4))
+    parts.append("</body></html>")
+    return base, "\n".join(parts)
+
+
+def generated_pages(photos: int = 40, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [(f"{site} (generated)",) + _site_page(site, photos, rng)
+            for site in ("crexi", "loopnet", "zillow", "golfpass")]
+
+
+def saved_pages(directory: str) -> list:
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html")) + glob.glob(os.path.join(directory, "*.htm"))):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            html = f.read()
+        m = _SAVED_FROM_RE.search(html[:4096])
+        name = os.path.splitext(os.path.basename(path))[0]
+        pages.append((os.path.basename(path), m.group(1) if m else f"https://{name}/", html))
+    return pages
+
+
+_SOUP = ['src', 'SRC', 'Src', 'data-src', 'DATA-SRC', 'data-lazy-src', 'data-bg', 'data-background',
+         'data-original', 'data-image', 'content', 'Content', 'xsrc', '=', '"', "'", ' ', 'url(', ')',
+         '"image"', '"photo"', '"contentUrl"', ':', ' : ', '/a.jpg', 'https://cdn.example.com/p/1.jpg',
+         '/resize/1200x800/', '/resize/100x50/', 'logo', '?w=50', '?w=900', '.png', '.svg', 'photo',
+         '<img ', '>', 'http://x.example.com/photo/2.webp', 'quality=80', '\n', 'icon', 'ſrc', 'data-İmage']
+
+
+def fuzz_pages(count: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    return [(f"fuzz {i}", "https://www.example.com/listing/1",
+             "".join(rng.choice(_SOUP) for _ in range(rng.randint(20, 400))))
+            for i in range(count)]
+
+
+# -- run -------------------------------------------------------------------
+
+def _time(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def compare(pages: list, repeat: int, ps) -> list:
+    reports = []
+    for name, base, html in pages:
+        ref = _extract_imgs_reference(html, base, ps)
+        new = ps._extract_imgs(html, base)
+        identical = set(ref) == set(new) and len(new) == len(set(new))
+        report = {"page": name, "bytes": len(html), "urls": len(new), "identical": identical}
+        if repeat:
+            ref_ms = _time(lambda: _extract_imgs_reference(html, base, ps), repeat)
+            new_ms = _time(lambda: ps._extract_imgs(html, base), repeat)
+            report.update({
+                "reference_ms": round(ref_ms, 2),
+                "single_pass_ms": round(new_ms, 2),
+                "reference_mb_s": round(len(html) / 1e3 / ref_ms, 1) if ref_ms else 0.0,
+                "single_pass_mb_s": round(len(html) / 1e3 / new_ms, 1) if new_ms else 0.0,
+                "speedup": round(ref_ms / new_ms, 2) if new_ms else 0.0,
+            })
+        reports.append(report)
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", help="directory of saved listing pages (*.html)")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per page")
+    parser.add_argument("--fuzz", type=int, default=500, help="random pages checked for identical output")
+    parser.add_argument("--json", action="store_true", help="print JSON reports")
+    args = parser.parse_args()
+
+    sys.path.insert(0, BROCHURE_DIR)
+    import photo_scraper
+
+    pages = saved_pages(args.pages) if args.pages else generated_pages()
+    reports = compare(pages, args.repeat, photo_scraper)
+    fuzz = compare(fuzz_pages(args.fuzz), 0, photo_scraper) if args.fuzz else []
+    mismatches = [r["page"] for r in reports + fuzz if not r["identical"]]
+
+    if args.json:
+        print(json.dumps({"pages": reports, "fuzz_pages": len(fuzz), "mismatches": mismatches}, indent=2))
+    else:
+        for r in reports:
+            print(f"{r['page']:<24} {r['bytes'] / 1e3:8.1f} KB  {r['urls']:4d} urls   "
+                  f"reference {r['reference_ms']:7.2f} ms ({r['reference_mb_s']:5.1f} MB/s)   "
+                  f"single pass {r['single_pass_ms']:7.2f} ms ({r['single_pass_mb_s']:5.1f} MB/s)   "
+                  f"x{r['speedup']:.2f}   {'identical' if r['identical'] else 'DIFFERENT'}")
+        if fuzz:
+            print(f"fuzz: {len(fuzz) - sum(1 for r in fuzz if not r['identical'])}/{len(fuzz)} identical")
+    if mismatches:
+        sys.exit(f"Output differs on: {', '.join(mismatches[:10])}")
+
+
+if __name__ == "__main__":
+    main()
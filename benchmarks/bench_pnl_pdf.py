@@ -0,0 +1,111 @@
+"""Benchmark P&L PDF rendering — cold renders vs. cached re-approvals.
+
+Compares three paths:
+  baseline  — the old per-call path: new Jinja Environment, inline <style>,
+              fresh WeasyPrint font/CSS setup on every render
+  cold      — shared template/stylesheet/FontConfiguration, empty PDF cache
+  cached    — re-approving an unchanged P&L (PDF cache hit)
+
+Needs WeasyPrint — run inside the rrg-pnl dev shell:
+    python benchmarks/bench_pnl_pdf.py [--iterations 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from bench_process import ROOT, percentile
+
+PNL_DIR = os.path.join(ROOT, "rrg-pnl")
+sys.path.insert(0, PNL_DIR)
+
+from jinja2 import Environment, FileSystemLoader  # noqa: E402
+from weasyprint import HTML  # noqa: E402
+
+import pnl_pdf  # noqa: E402
+
+
+SAMPLE_PNL = {
+    "property_name": "Maple Court Apartments",
+    "property_address": "1200 Maple Ct, Ypsilanti, MI 48197",
+    "period": "Annual",
+    "income": {"Gross Rental Income": 186000, "Laundry": 2400, "Parking": 3600},
+    "vacancy_rate": 0.06,
+    "expenses": {
+        "Property Taxes": 21000,
+        "Insurance": 7800,
+        "Property Management": 11500,
+        "Repairs & Maintenance": 9300,
+        "Water/Sewer": 6200,
+        "Trash": 1900,
+        "Landscaping": 2400,
+        "Snow Removal": 1800,
+    },
+    "sensitivity": {
+        "vacancy_rates": [0.0, 0.05, 0.06, 0.08, 0.10, 0.15],
+        "expense_growth": [0.0, 0.05, 0.10],
+        "cap_rates": [0.06, 0.07, 0.08, 0.09],
+    },
+}
+
+
+def _baseline_render(data: dict) -> bytes:
+    """The pre-cache render path, reconstructed for comparison."""
+    with open(os.path.join(pnl_pdf.TEMPLATE_DIR, "pnl.css")) as f:
+        css = f.read()
+    env = Environment(loader=FileSystemLoader(pnl_pdf.TEMPLATE_DIR))
+    template = env.get_template("pnl.html")
+    html_content = template.render(**pnl_pdf.build_pnl_context(data))
+    html_content = html_content.replace("</head>", f"<style>{css}</style></head>", 1)
+    return HTML(string=html_content).write_pdf()
+
+
+def _cold_render(data: dict) -> bytes:
+    pnl_pdf.clear_pdf_cache()
+    return pnl_pdf.generate_pnl_pdf(data)
+
+
+def _time(fn, iterations: int) -> list:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(SAMPLE_PNL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(label: str, timings: list):
+    p95 = percentile(timings, 95)
+    print(
+        f"{label:<10} median {statistics.median(timings):9.2f} ms"
+        f"   mean {statistics.mean(timings):9.2f} ms"
+        f"   p95 {p95:9.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    # Warm-up: first WeasyPrint call pays one-off library/font loading
+    _baseline_render(SAMPLE_PNL)
+    _cold_render(SAMPLE_PNL)
+
+    baseline = _time(_baseline_render, args.iterations)
+    cold = _time(_cold_render, args.iterations)
+    pnl_pdf.generate_pnl_pdf(SAMPLE_PNL)
+    cached = _time(pnl_pdf.generate_pnl_pdf, args.iterations)
+
+    print(f"P&L PDF render — {args.iterations} iterations")
+    _report("baseline", baseline)
+    _report("cold", cold)
+    _report("cached", cached)
+    print(f"cold speedup   {statistics.median(baseline) / statistics.median(cold):6.2f}x")
+    print(f"cached speedup {statistics.median(baseline) / statistics.median(cached):6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
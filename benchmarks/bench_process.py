@@ -0,0 +1,536 @@
+"""Load test for the /process worker contract — offline, deterministic.
+
+Replays recorded multi-turn conversations (benchmarks/conversations/*.json)
+against each worker's server.py through Flask's test client, at a
+configurable concurrency, and reports:
+  - per-turn latency p50/p95/p99/max and throughput
+  - memory high-water mark (max RSS) and its growth during the run
+  - per-node graph time (every LangGraph node is wrapped with a timer)
+
+Nothing leaves the machine:
+  - ChatClaudeCLI is replaced by a fake that returns each turn's recorded
+    `llm` responses in order (optionally after --llm-ms of simulated latency).
+    With --llm-fixtures DIR the worker's own LLM_BACKEND=replay is used
+    instead: responses come from fixtures recorded by running the workers
+    with LLM_BACKEND=record, and --llm-ms (if set) overrides their latency.
+  - WeasyPrint (P&L) and Playwright (brochure) are stubbed with backends
+    that return a placeholder PDF after --render-ms; --real-render uses the
+    installed libraries instead. PA DOCX rendering (docxtpl) is always real.
+  - session/job/draft databases and the artifact store go to a temp dir
+
+Each service runs in its own subprocess (the three workers share module
+names like server, graph and claude_llm), which also keeps max RSS per
+service. --parallel runs those subprocesses at the same time — e.g. P&L
+and PA users together — instead of one after another.
+
+Conversation fixture format:
+    {"service": "rrg-pnl",
+     "conversations": [
+        {"name": "...",
+         "turns": [{"user_message": "...",
+                    "llm": ["first LLM reply", "second", ...],
+                    "expect": {"active": true, "file": false}}]}]}
+
+The first turn is sent as command "create", later turns as "continue",
+threading `state` and chat history the way the router does. Turns whose
+response doesn't match `expect` are counted as mismatches — usually a sign
+the fixture's LLM script no longer matches the graph's calls.
+
+Every conversation is replayed once untimed before the run. Replays are
+identical, so content-keyed caches (e.g. the P&L PDF cache) hit after
+that — add varied conversations to measure cold render paths.
+
+Usage (from the repo root, inside a worker's nix dev shell or any env with
+its dependencies):
+    python benchmarks/bench_process.py --service pnl --concurrency 8 --rounds 20
+    python benchmarks/bench_process.py --service all --llm-ms 50 --json
+    python benchmarks/bench_process.py --service pnl,commercial_pa --parallel --llm-ms 300
+    python benchmarks/bench_process.py --service pnl --llm-fixtures rrg-pnl/llm_fixtures
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import math
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONVERSATION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "conversations")
+
+SERVICES = {
+    "pnl": "rrg-pnl",
+    "brochure": "rrg-brochure",
+    "commercial_pa": "rrg-commercial-pa",
+}
+
+# Smallest byte string that PDF consumers recognise
+STUB_PDF = b"%PDF-1.4\n%stub\n1 0 obj<<>>endobj\ntrailer<<>>\n%%EOF\n"
+
+
+# ---------------------------------------------------------------------------
+# Fakes and stubs (child process only)
+# ---------------------------------------------------------------------------
+
+_script = threading.local()
+_counters_lock = threading.Lock()
+_counters = {"llm_calls": 0, "unscripted_llm_calls": 0}
+_node_times: dict = {}
+
+
+def _set_script(responses: list):
+    _script.responses = list(responses)
+
+
+def _install_fake_llm(llm_ms: float):
+    """Replace ChatClaudeCLI._generate with scripted replies (per thread)."""
+    from langchain_core.messages import AIMessage
+    from langchain_core.outputs import ChatGeneration, ChatResult
+    import claude_llm
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if llm_ms:
+            time.sleep(llm_ms / 1000)
+        responses = getattr(_script, "responses", None)
+        with _counters_lock:
+            _counters["llm_calls"] += 1
+            if not responses:
+                _counters["unscripted_llm_calls"] += 1
+        content = responses.pop(0) if responses else ""
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    claude_llm.ChatClaudeCLI._generate = _generate
+
+
+def _install_replay_counter():
+    """Count replayed LLM calls; a missing fixture counts as unscripted."""
+    import claude_llm
+
+    replay = claude_llm.ChatClaudeCLI._replay
+
+    def _counted(self, prompt, system_prompt):
+        with _counters_lock:
+            _counters["llm_calls"] += 1
+        try:
+            return replay(self, prompt, system_prompt)
+        except RuntimeError:
+            with _counters_lock:
+                _counters["unscripted_llm_calls"] += 1
+            raise
+
+    claude_llm.ChatClaudeCLI._replay = _counted
+
+
+def _install_render_stubs(render_ms: float):
+    """Stub WeasyPrint and Playwright with fixed-latency placeholder PDFs."""
+
+    def _render():
+        if render_ms:
+            time.sleep(render_ms / 1000)
+        return STUB_PDF
+
+    # weasyprint: HTML(...).write_pdf(), CSS(...), text.fonts.FontConfiguration
+    weasyprint = types.ModuleType("weasyprint")
+
+    class HTML:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def write_pdf(self, *args, **kwargs):
+            return _render()
+
+    class CSS:
+        def __init__(self, *args, **kwargs):
+            pass
+
+    weasyprint.HTML = HTML
+    weasyprint.CSS = CSS
+    text = types.ModuleType("weasyprint.text")
+    fonts = types.ModuleType("weasyprint.text.fonts")
+    fonts.FontConfiguration = type("FontConfiguration", (), {})
+    weasyprint.text = text
+    text.fonts = fonts
+    sys.modules.update({
+        "weasyprint": weasyprint,
+        "weasyprint.text": text,
+        "weasyprint.text.fonts": fonts,
+    })
+
+    # playwright.sync_api.sync_playwright() context manager
+    class _Page:
+        def goto(self, *args, **kwargs):
+            pass
+
+        def set_content(self, *args, **kwargs):
+            pass
+
+        def wait_for_load_state(self, *args, **kwargs):
+            pass
+
+        def pdf(self, *args, **kwargs):
+            return _render()
+
+        def close(self):
+            pass
+
+    class _Browser:
+        def new_page(self, *args, **kwargs):
+            return _Page()
+
+        def is_connected(self):
+            return True
+
+        def close(self):
+            pass
+
+    class _Playwright:
+        chromium = types.SimpleNamespace(launch=lambda *args, **kwargs: _Browser())
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def start(self):
+            return self
+
+        def stop(self):
+            pass
+
+    # playwright.async_api.async_playwright() — used by the brochure BrowserPool
+    class _AsyncPage:
+        def __init__(self, context):
+            self.context = context
+            self._closed = False
+
+        async def goto(self, *args, **kwargs):
+            pass
+
+        async def set_content(self, *args, **kwargs):
+            pass
+
+        async def route(self, *args, **kwargs):
+            pass
+
+        async def evaluate(self, *args, **kwargs):
+            return 0
+
+        async def pdf(self, *args, **kwargs):
+            if render_ms:
+                await asyncio.sleep(render_ms / 1000)
+            return STUB_PDF
+
+        def is_closed(self):
+            return self._closed or self.context.closed
+
+    class _AsyncContext:
+        closed = False
+
+        async def new_page(self):
+            return _AsyncPage(self)
+
+        async def close(self):
+            self.closed = True
+
+    class _AsyncBrowser:
+        def is_connected(self):
+            return True
+
+        async def new_context(self, *args, **kwargs):
+            return _AsyncContext()
+
+        async def close(self):
+            pass
+
+    class _AsyncPlaywright:
+        async def _launch(self, *args, **kwargs):
+            return _AsyncBrowser()
+
+        def __init__(self):
+            self.chromium = types.SimpleNamespace(launch=self._launch)
+
+        async def start(self):
+            return self
+
+        async def stop(self):
+            pass
+
+    playwright = types.ModuleType("playwright")
+    sync_api = types.ModuleType("playwright.sync_api")
+    sync_api.sync_playwright = lambda: _Playwright()
+    async_api = types.ModuleType("playwright.async_api")
+    async_api.async_playwright = lambda: _AsyncPlaywright()
+    playwright.sync_api = sync_api
+    playwright.async_api = async_api
+    sys.modules.update({
+        "playwright": playwright,
+        "playwright.sync_api": sync_api,
+        "playwright.async_api": async_api,
+    })
+
+
+def _install_node_timers():
+    """Wrap every node added to a StateGraph with a wall-clock timer."""
+    from langgraph.graph import StateGraph
+
+    original_add_node = StateGraph.add_node
+
+    def _timed(name, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = (time.perf_counter() - t0) * 1000
+                with _counters_lock:
+                    _node_times.setdefault(name, []).append(elapsed)
+        return wrapper
+
+    def add_node(self, node, action=None, **kwargs):
+        if isinstance(node, str) and callable(action):
+            action = _timed(node, action)
+        return original_add_node(self, node, action, **kwargs)
+
+    StateGraph.add_node = add_node
+
+
+# ---------------------------------------------------------------------------
+# Load run (child process)
+# ---------------------------------------------------------------------------
+
+def _max_rss_mb() -> float:
+    # ru_maxrss is KB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered), max(1, math.ceil(pct / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def _run_conversation(app, conversation: dict) -> dict:
+    """Replay one conversation; return per-turn latencies and mismatches."""
+    client = app.test_client()
+    state, history = {}, []
+    latencies, errors, mismatches = [], 0, []
+    for i, turn in enumerate(conversation["turns"]):
+        _set_script(turn.get("llm", []))
+        body = {
+            "command": "create" if i == 0 else "continue",
+            "user_message": turn["user_message"],
+            "chat_history": history[-20:],
+            "state": state,
+        }
+        t0 = time.perf_counter()
+        resp = client.post("/process", json=body)
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+        data = resp.get_json() or {}
+        if resp.status_code != 200:
+            errors += 1
+        expect = turn.get("expect", {})
+        has_file = any(data.get(k) for k in (
+            "pdf_bytes", "pdf_artifact_id", "docx_bytes", "docx_artifact_id",
+            "preview_docx", "preview_artifact_id",
+        ))
+        if "active" in expect and data.get("active") != expect["active"]:
+            mismatches.append(f"{conversation['name']} turn {i + 1}: active={data.get('active')}")
+        if "file" in expect and has_file != expect["file"]:
+            mismatches.append(f"{conversation['name']} turn {i + 1}: file={has_file}")
+
+        state = data.get("state") or {}
+        history.append({"role": "user", "content": turn["user_message"]})
+        history.append({"role": "assistant", "content": data.get("response", "")})
+    return {"latencies": latencies, "errors": errors, "mismatches": mismatches}
+
+
+def run_service(service: str, args) -> dict:
+    """Import one worker with fakes installed and drive it under load."""
+    service_dir = os.path.join(ROOT, SERVICES[service])
+    workdir = tempfile.mkdtemp(prefix=f"bench-{service}-")
+    os.makedirs(os.path.join(workdir, "artifacts"))
+    os.environ.update({
+        "SESSION_DB_PATH": os.path.join(workdir, "sessions.db"),
+        "JOB_DB_PATH": os.path.join(workdir, "jobs.db"),
+        "PA_DB_PATH": os.path.join(workdir, "pa_drafts.db"),
+        "ARTIFACT_DIR": os.path.join(workdir, "artifacts"),
+        "WARMUP": "false",
+    })
+    if args.llm_fixtures:
+        os.environ.update({
+            "LLM_BACKEND": "replay",
+            "LLM_FIXTURE_DIR": os.path.abspath(args.llm_fixtures),
+            "LLM_REPLAY_LATENCY_MS": str(args.llm_ms) if args.llm_ms else "",
+        })
+    sys.path.insert(0, service_dir)
+    os.chdir(service_dir)
+
+    if not args.real_render:
+        _install_render_stubs(args.render_ms)
+    _install_node_timers()
+    if args.llm_fixtures:
+        _install_replay_counter()
+    else:
+        _install_fake_llm(args.llm_ms)
+
+    import_start = time.perf_counter()
+    import server  # noqa: E402 — after fakes are in place
+    import_ms = (time.perf_counter() - import_start) * 1000
+
+    with open(os.path.join(CONVERSATION_DIR, f"{service}.json")) as f:
+        conversations = json.load(f)["conversations"]
+
+    # One untimed pass so lazily-built graphs and templates don't skew p99
+    for conversation in conversations:
+        _run_conversation(server.app, conversation)
+    _node_times.clear()
+    _counters.update(llm_calls=0, unscripted_llm_calls=0)
+
+    rss_before = _max_rss_mb()
+    jobs = [c for _ in range(args.rounds) for c in conversations]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda c: _run_conversation(server.app, c), jobs))
+    wall_s = time.perf_counter() - started
+
+    latencies = [ms for r in results for ms in r["latencies"]]
+    mismatches = [m for r in results for m in r["mismatches"]]
+    return {
+        "service": SERVICES[service],
+        "conversations": len(jobs),
+        "turns": len(latencies),
+        "concurrency": args.concurrency,
+        "import_ms": round(import_ms, 1),
+        "wall_seconds": round(wall_s, 3),
+        "turns_per_second": round(len(latencies) / wall_s, 1) if wall_s else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(max(latencies, default=0.0), 2),
+        },
+        "max_rss_mb": round(_max_rss_mb(), 1),
+        "rss_growth_mb": round(_max_rss_mb() - rss_before, 1),
+        "errors": sum(r["errors"] for r in results),
+        "mismatches": sorted(set(mismatches)),
+        "llm_calls": _counters["llm_calls"],
+        "unscripted_llm_calls": _counters["unscripted_llm_calls"],
+        "nodes": {
+            name: {
+                "calls": len(times),
+                "total_ms": round(sum(times), 1),
+                "mean_ms": round(sum(times) / len(times), 2),
+                "p95_ms": round(percentile(times, 95), 2),
+            }
+            for name, times in sorted(_node_times.items())
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Reporting (parent process)
+# ---------------------------------------------------------------------------
+
+def _print_report(report: dict):
+    lat = report["latency_ms"]
+    print(f"{report['service']} — {report['conversations']} conversations, "
+          f"{report['turns']} turns, concurrency {report['concurrency']}")
+    print(f"  latency     p50 {lat['p50']:8.2f} ms   p95 {lat['p95']:8.2f} ms"
+          f"   p99 {lat['p99']:8.2f} ms   max {lat['max']:8.2f} ms")
+    print(f"  throughput  {report['turns_per_second']:.1f} turns/s "
+          f"({report['wall_seconds']:.2f}s wall)")
+    print(f"  memory      max RSS {report['max_rss_mb']:.1f} MB "
+          f"(+{report['rss_growth_mb']:.1f} MB during run)")
+    print(f"  llm calls   {report['llm_calls']} "
+          f"({report['unscripted_llm_calls']} unscripted)   errors {report['errors']}")
+    print(f"  {'node':<16}{'calls':>7}{'total ms':>12}{'mean ms':>10}{'p95 ms':>10}")
+    for name, n in report["nodes"].items():
+        print(f"  {name:<16}{n['calls']:>7}{n['total_ms']:>12.1f}"
+              f"{n['mean_ms']:>10.2f}{n['p95_ms']:>10.2f}")
+    for mismatch in report["mismatches"]:
+        print(f"  MISMATCH    {mismatch}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--service", default="all",
+                        help=f"all, or comma-separated: {', '.join(SERVICES)}")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=10,
+                        help="times each recorded conversation is replayed")
+    parser.add_argument("--llm-ms", type=float, default=0.0,
+                        help="simulated latency per fake LLM call")
+    parser.add_argument("--llm-fixtures", metavar="DIR",
+                        help="replay recorded LLM fixtures from DIR (LLM_BACKEND=replay) "
+                             "instead of each turn's scripted `llm` replies")
+    parser.add_argument("--render-ms", type=float, default=100.0,
+                        help="simulated latency per stubbed PDF render")
+    parser.add_argument("--real-render", action="store_true",
+                        help="use installed WeasyPrint/Playwright instead of stubs")
+    parser.add_argument("--parallel", action="store_true",
+                        help="run the selected services at the same time")
+    parser.add_argument("--json", action="store_true", help="print JSON reports")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_service(args.service, args)))
+        return
+
+    services = list(SERVICES) if args.service == "all" else args.service.split(",")
+    unknown = [s for s in services if s not in SERVICES]
+    if unknown:
+        parser.error(f"unknown service(s): {', '.join(unknown)}")
+
+    def _start(service):
+        cmd = [sys.executable, os.path.abspath(__file__), "--child", "--service", service,
+               "--concurrency", str(args.concurrency), "--rounds", str(args.rounds),
+               "--llm-ms", str(args.llm_ms), "--render-ms", str(args.render_ms)]
+        if args.real_render:
+            cmd.append("--real-render")
+        if args.llm_fixtures:
+            cmd.extend(["--llm-fixtures", os.path.abspath(args.llm_fixtures)])
+        return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+    # Parallel: start every child now; otherwise each starts when collected
+    procs = {service: _start(service) for service in services} if args.parallel else {}
+
+    reports, failed = [], False
+    for service in services:
+        proc = procs.get(service) or _start(service)
+        stdout, stderr = proc.communicate()
+        if proc.returncode != 0:
+            failed = True
+            print(f"{SERVICES[service]}: benchmark failed\n{stderr}", file=sys.stderr)
+            continue
+        # Workers may print during import; the report is the last line
+        report = json.loads(stdout.strip().splitlines()[-1])
+        reports.append(report)
+        if report["errors"] or report["mismatches"]:
+            failed = True
+        if not args.json:
+            _print_report(report)
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Brochure render latency — a fresh Chromium per render vs the BrowserPool.
+
+Renders the real brochure template (sample data, bundled static assets)
+N times per mode and reports first-render and steady-state latency:
+  - launch: the original path — HTML written to a temp file in the
+    template dir, sync_playwright(), launch Chromium, goto file:// with
+    networkidle, print, close, for every render
+  - pool:   rrg-brochure's browser_pool (one browser, reused pages, HTML
+    and assets served from memory, images/fonts readiness check)
+
+With --concurrency > 1 renders are submitted from that many threads, which
+also exercises the pool's render queue (BROWSER_MAX_PAGES).
+
+Each timed render uses its own property name, so the brochure PDF cache
+never answers it; cached_ms is the same brochure requested again (a preview
+followed by approve, with nothing changed in between).
+
+Needs Playwright and Chromium — run inside the rrg-brochure dev shell:
+    python benchmarks/bench_render.py --renders 20
+    python benchmarks/bench_render.py --mode pool --concurrency 4 --json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_process import ROOT, percentile
+
+BROCHURE_DIR = os.path.join(ROOT, "rrg-brochure")
+
+SAMPLE = {
+    "property_name": "Benchmark Plaza",
+    "address_line1": "100 Main St",
+    "address_line2": "Ann Arbor, MI 48104",
+    "price": "$1,250,000",
+    "highlights": ["Fully leased", "NNN"],
+    "investment_highlights": ["7.1% cap rate", "Long-term tenants"],
+    "property_highlights": ["12,000 SF", "Built 2004"],
+    "location_highlights": ["Downtown", "High traffic"],
+    "photos": [],
+}
+
+
+def _sample(mode: str, i: int) -> dict:
+    """SAMPLE with a name of its own, so the PDF cache can't answer it."""
+    return dict(SAMPLE, property_name=f"{SAMPLE['property_name']} {mode} {i}")
+
+
+def _render_with_fresh_browser(html: str, static_dir=None, files=None, **pdf_options) -> bytes:
+    """The original render path, kept here as the baseline."""
+    from playwright.sync_api import sync_playwright
+    from browser_pool import find_chrome_executable
+
+    for name, path in (files or {}).items():
+        html = html.replace(f"files/{name}", f"file://{path}")
+    # static/... resolves relative to the temp file, as it used to
+    with tempfile.NamedTemporaryFile(
+        suffix=".html", dir=os.path.dirname(static_dir), delete=False, mode="w"
+    ) as tmp:
+        tmp.write(html)
+    try:
+        with sync_playwright() as p:
+            exec_path = find_chrome_executable()
+            browser = p.chromium.launch(**({"executable_path": exec_path} if exec_path else {}))
+            page = browser.new_page()
+            page.goto(f"file://{tmp.name}", wait_until="networkidle")
+            pdf_bytes = page.pdf(**pdf_options)
+            browser.close()
+    finally:
+        os.unlink(tmp.name)
+    return pdf_bytes
+
+
+def run_mode(mode: str, renders: int, concurrency: int) -> dict:
+    import brochure_pdf
+    from browser_pool import get_pool
+
+    class _Launcher:
+        def render_pdf(self, html, **kwargs):
+            return _render_with_fresh_browser(html, **kwargs)
+
+    # "launch" swaps the pooled call for a fresh browser per render
+    brochure_pdf.get_pool = (lambda: _Launcher()) if mode == "launch" else get_pool
+
+    def _one(i):
+        t0 = time.perf_counter()
+        pdf = brochure_pdf.generate_brochure_pdf(_sample(mode, i))
+        assert pdf[:4] == b"%PDF"
+        return (time.perf_counter() - t0) * 1000
+
+    first_ms = _one(0)  # cold: includes the pool's first launch
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(_one, range(1, renders + 1)))
+    wall_s = time.perf_counter() - started
+
+    t0 = time.perf_counter()
+    brochure_pdf.generate_brochure_pdf(_sample(mode, renders))
+    cached_ms = (time.perf_counter() - t0) * 1000
+
+    report = {
+        "mode": mode,
+        "renders": renders,
+        "concurrency": concurrency,
+        "first_ms": round(first_ms, 1),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "mean_ms": round(sum(latencies) / len(latencies), 1),
+        "renders_per_second": round(renders / wall_s, 2) if wall_s else 0.0,
+        "cached_ms": round(cached_ms, 2),
+    }
+    if mode == "pool":
+        report["pool"] = get_pool().stats()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["launch", "pool", "both"], default="both")
+    parser.add_argument("--renders", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print JSON reports")
+    args = parser.parse_args()
+
+    sys.path.insert(0, BROCHURE_DIR)
+    os.chdir(BROCHURE_DIR)
+
+    modes = ["launch", "pool"] if args.mode == "both" else [args.mode]
+    reports = [run_mode(mode, args.renders, args.concurrency) for mode in modes]
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        return
+    for r in reports:
+        print(f"{r['mode']:<7} first {r['first_ms']:8.1f} ms   p50 {r['p50_ms']:8.1f} ms   "
+              f"p95 {r['p95_ms']:8.1f} ms   mean {r['mean_ms']:8.1f} ms   "
+              f"{r['renders_per_second']:.2f} renders/s   cached {r['cached_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,37 @@
-"""Generate a property brochure PDF using Playwright (Chromium) + Jinja2."""
+"""Generate a property brochure PDF using Playwright (Chromium) + Jinja2.
 
-import glob
+Rendered PDFs are cached whole, by a hash of the brochure's HTML, so
+previewing an unchanged brochure again, or approving the one just
+previewed, returns the previous bytes without a Chromium render. Local
+images appear in the HTML under a name made from a fingerprint of the
+file, so a replaced photo changes the hash too. Any change re-prints the
+whole brochure.
+"""
+
+import hashlib
 import os
-import tempfile
+import threading
+from collections import OrderedDict
+
 from jinja2 import Environment, FileSystemLoader
-from playwright.sync_api import sync_playwright
+
+from browser_pool import get_pool
+from image_fetch import cached_image_path
 
 
 TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
 STATIC_DIR = os.path.join(TEMPLATE_DIR, "static")
 
 
-def _find_chrome_executable():
-    """Find the Chrome/Chromium executable, checking env vars and Nix store paths."""
-    # 1. Explicit env var
-    path = os.environ.get("CHROMIUM_EXECUTABLE_PATH")
-    if path and os.path.isfile(path):
-        return path
-    # 2. Search PLAYWRIGHT_BROWSERS_PATH for chromium-*/chrome-linux64/chrome
-    browsers_path = os.environ.get("PLAYWRIGHT_BROWSERS_PATH", "")
-    if browsers_path:
-        matches = glob.glob(os.path.join(browsers_path, "chromium-*/chrome-linux64/chrome"))
-        if matches:
-            return matches[0]
-    # 3. Fall back to Playwright's default discovery
-    return None
+# Max rendered brochures kept in memory (LRU). One with photos is a few MB.
+PDF_CACHE_SIZE = int(os.getenv("BROCHURE_PDF_CACHE_SIZE", "16"))
+
+# Compiled templates are cached by the Environment across renders
+_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+
+_pdf_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_pdf_cache_lock = threading.Lock()
+
 
 # Default static assets — used when the caller doesn't provide explicit paths
 _DEFAULT_ASSETS = {
@@ -55,13 +62,28 @@ def generate_brochure_pdf(data: dict) -> bytes:
         larry_photo_path: str|None  - Larry headshot path (optional)
         jake_photo_path: str|None   - Jake headshot path (optional)
 
-    Returns raw PDF bytes.
+    Returns raw PDF bytes — the cached render if the HTML hasn't changed.
     """
-    # Resolve image paths to file:// URIs
+    # Local image paths become URLs the render page serves from memory:
+    # bundled assets as static/..., anything else as files/<name>. Photo URLs
+    # (picked from a photo search) are served from the image cache.
+    files = {}
+
     def to_uri(path):
-        if path and os.path.isfile(path):
-            return "file://" + os.path.abspath(path)
-        return path or ""
+        if path and path.startswith(("http://", "https://")):
+            path = cached_image_path(path) or path
+        if not (path and os.path.isfile(path)):
+            return path or ""
+        path = os.path.abspath(path)
+        if path.startswith(os.path.abspath(STATIC_DIR) + os.sep):
+            return "static/" + os.path.relpath(path, os.path.abspath(STATIC_DIR)).replace(os.sep, "/")
+        # Named by path, size and mtime: a replaced file gets a new name,
+        # which changes the HTML and so the PDF cache key
+        stat = os.stat(path)
+        fingerprint = hashlib.sha256(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+        name = f"{fingerprint.hexdigest()[:16]}{os.path.splitext(path)[1].lower()}"
+        files[name] = path
+        return f"files/{name}"
 
     context = {
         "property_name": data.get("property_name", "Property"),
@@ -82,33 +104,45 @@ def generate_brochure_pdf(data: dict) -> bytes:
         "jake_photo": to_uri(data.get("jake_photo_path") or _DEFAULT_ASSETS["jake_photo_path"]),
     }
 
-    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
-    template = env.get_template("brochure.html")
+    template = _env.get_template("brochure.html")
     html_content = template.render(**context)
 
-    # Write HTML to a temp file so Playwright can load it with the
-    # correct base_url for resolving relative paths (static/, etc.)
-    with tempfile.NamedTemporaryFile(
-        suffix=".html", dir=TEMPLATE_DIR, delete=False, mode="w"
-    ) as tmp:
-        tmp.write(html_content)
-        tmp_path = tmp.name
-
-    try:
-        with sync_playwright() as p:
-            exec_path = _find_chrome_executable()
-            launch_args = {"executable_path": exec_path} if exec_path else {}
-            browser = p.chromium.launch(**launch_args)
-            page = browser.new_page()
-            page.goto(f"file://{tmp_path}", wait_until="networkidle")
-            pdf_bytes = page.pdf(
-                width="11in",
-                height="8.5in",
-                print_background=True,
-                margin={"top": "0", "right": "0", "bottom": "0", "left": "0"},
-            )
-            browser.close()
-    finally:
-        os.unlink(tmp_path)
+    key = hashlib.sha256(html_content.encode("utf-8")).hexdigest()
+    with _pdf_cache_lock:
+        cached = _pdf_cache.get(key)
+        if cached is not None:
+            _pdf_cache.move_to_end(key)
+            return cached
+
+    pdf_bytes = get_pool().render_pdf(
+        html_content,
+        static_dir=STATIC_DIR,
+        files=files,
+        width="11in",
+        height="8.5in",
+        print_background=True,
+        margin={"top": "0", "right": "0", "bottom": "0", "left": "0"},
+    )
+
+    with _pdf_cache_lock:
+        _pdf_cache[key] = pdf_bytes
+        _pdf_cache.move_to_end(key)
+        while len(_pdf_cache) > PDF_CACHE_SIZE:
+            _pdf_cache.popitem(last=False)
 
     return pdf_bytes
+
+
+def warm_up():
+    """Compile the brochure template, launch the pooled Chromium and print one page.
+
+    Rendering once also creates a pooled page and builds the font cache,
+    so the first brochure only pays for its own layout.
+    """
+    _env.get_template("brochure.html")
+    get_pool().render_pdf(
+        "<html><body><p>warm-up</p></body></html>",
+        width="11in",
+        height="8.5in",
+        print_background=True,
+    )
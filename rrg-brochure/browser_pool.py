@@ -0,0 +1,514 @@
+"""Long-lived Chromium for brochure and contact-sheet rendering.
+
+Launching Chromium costs seconds; rendering one page into an already
+running browser costs a fraction of that. BrowserPool keeps one browser
+per process and a bounded set of reusable pages:
+
+- All Playwright calls run on one background thread with its own asyncio
+  loop. Playwright objects can't be shared across threads, so request
+  threads submit render jobs to that loop and block on the result.
+- At most BROWSER_MAX_PAGES renders run at once, each on its own page
+  (in its own browser context). Further jobs wait in the render queue.
+- A page that errors is closed instead of reused. Pages are also
+  recycled after BROWSER_PAGE_MAX_RENDERS renders, to bound memory.
+- If the browser dies (crash, OOM kill), the next job relaunches it. A
+  job that was running on the dead browser is retried once.
+
+Documents never touch disk. Each page routes RENDER_ORIGIN to the job
+being rendered:
+- `/` is the HTML string.
+- `static/<path>` is read from the job's static_dir and kept in memory.
+- `files/<name>` are the local files the caller listed (photos), or
+  in-memory image bytes for downscale_images().
+The job is ready to print once every <img>, CSS background image and web
+font has loaded and decoded (_WAIT_FOR_ASSETS), rather than after a fixed
+network-idle window.
+
+downscale_images() uses the same pages to shrink photos before they are
+embedded: Chromium decodes each image once, draws it onto a canvas at the
+target size and re-encodes it, so the document that is finally printed
+carries print-sized images instead of multi-megabyte originals. From the
+same decode it reports each photo's pixel size and a 64-bit difference
+hash (dHash) for spotting the same shot from different sources.
+
+get_pool() returns the process-wide pool and creates it on first use. It
+checks the pid, so pre-forked server workers each launch their own
+browser instead of sharing the parent's.
+
+Settings (env):
+    BROWSER_MAX_PAGES                — concurrent renders per process (default 2)
+    BROWSER_PAGE_MAX_RENDERS         — renders before a page is replaced (default 50)
+    BROWSER_RENDER_TIMEOUT_SECONDS   — max wait for one render, queue included (default 120)
+    BROWSER_ASSET_TIMEOUT_SECONDS    — max wait for images/fonts before printing anyway (default 30)
+"""
+
+import asyncio
+import base64
+import glob
+import mimetypes
+import os
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from playwright.async_api import async_playwright
+
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "2"))
+BROWSER_PAGE_MAX_RENDERS = int(os.getenv("BROWSER_PAGE_MAX_RENDERS", "50"))
+BROWSER_RENDER_TIMEOUT_SECONDS = float(os.getenv("BROWSER_RENDER_TIMEOUT_SECONDS", "120"))
+BROWSER_ASSET_TIMEOUT_SECONDS = float(os.getenv("BROWSER_ASSET_TIMEOUT_SECONDS", "30"))
+
+# Origin the in-memory documents are served from. .invalid never resolves,
+# so nothing under it can reach the network — the page route answers all of it.
+RENDER_ORIGIN = "http://render.invalid"
+
+# Resolves once every <img>, CSS background image and web font has loaded
+# and decoded; returns how many images it waited for
+_WAIT_FOR_ASSETS = """
+async () => {
+    const urls = new Set();
+    for (const el of document.querySelectorAll("*")) {
+        const bg = getComputedStyle(el).backgroundImage;
+        for (const m of bg.matchAll(/url\\(["']?(.*?)["']?\\)/g)) urls.add(m[1]);
+    }
+    const images = Array.from(document.images).map(img => img.decode().catch(() => {}));
+    const backgrounds = Array.from(urls).map(src => {
+        const img = new Image();
+        img.src = src;
+        return img.decode().catch(() => {});
+    });
+    await Promise.all([...images, ...backgrounds, document.fonts.ready]);
+    return images.length + backgrounds.length;
+}
+"""
+
+# Decodes each files/<name> once and returns, per name, null if it can't
+# be decoded, else {width, height, dhash, image}: its pixel size, a dHash
+# (9x8 grayscale, each pixel vs its right neighbour, as 16 hex digits) and
+# base64 of it scaled to cover a width x height box and re-encoded — or
+# null image where it is already about that size.
+_DOWNSCALE = """
+async ({names, width, height, type, quality}) => {
+    const toBase64 = async (blob) => {
+        const bytes = new Uint8Array(await blob.arrayBuffer());
+        let binary = "";
+        for (let i = 0; i < bytes.length; i += 0x8000) {
+            binary += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+        }
+        return btoa(binary);
+    };
+    const dhash = (bitmap) => {
+        const canvas = new OffscreenCanvas(9, 8);
+        const ctx = canvas.getContext("2d");
+        ctx.imageSmoothingQuality = "high";
+        ctx.drawImage(bitmap, 0, 0, 9, 8);
+        const px = ctx.getImageData(0, 0, 9, 8).data;
+        const gray = (x, y) => {
+            const i = (y * 9 + x) * 4;
+            return px[i] * 0.299 + px[i + 1] * 0.587 + px[i + 2] * 0.114;
+        };
+        let hex = "";
+        for (let y = 0; y < 8; y++) {
+            let bits = 0;
+            for (let x = 0; x < 8; x++) {
+                bits = (bits << 1) | (gray(x, y) > gray(x + 1, y) ? 1 : 0);
+            }
+            hex += bits.toString(16).padStart(2, "0");
+        }
+        return hex;
+    };
+    const out = [];
+    for (const name of names) {
+        let bitmap;
+        try {
+            const blob = await (await fetch("files/" + name)).blob();
+            bitmap = await createImageBitmap(blob);
+        } catch (e) {
+            out.push(null);
+            continue;
+        }
+        const result = {width: bitmap.width, height: bitmap.height, dhash: dhash(bitmap), image: null};
+        const scale = Math.min(1, Math.max(width / bitmap.width, height / bitmap.height));
+        if (scale <= 0.9) {
+            const w = Math.round(bitmap.width * scale);
+            const h = Math.round(bitmap.height * scale);
+            const canvas = new OffscreenCanvas(w, h);
+            const ctx = canvas.getContext("2d");
+            ctx.imageSmoothingQuality = "high";
+            ctx.drawImage(bitmap, 0, 0, w, h);
+            try {
+                result.image = await toBase64(await canvas.convertToBlob({type, quality}));
+            } catch (e) {}
+        }
+        bitmap.close();
+        out.push(result);
+    }
+    return out;
+}
+"""
+
+_BLANK_HTML = "<!DOCTYPE html><html><body></body></html>"
+
+# Static template assets, read once per process: path -> (bytes, content type)
+_static_cache: Dict[str, Tuple[bytes, str]] = {}
+_static_lock = threading.Lock()
+
+
+def find_chrome_executable():
+    """Find the Chrome/Chromium executable, checking env vars and Nix store paths."""
+    # 1. Explicit env var
+    path = os.environ.get("CHROMIUM_EXECUTABLE_PATH")
+    if path and os.path.isfile(path):
+        return path
+    # 2. Search PLAYWRIGHT_BROWSERS_PATH for chromium-*/chrome-linux64/chrome
+    browsers_path = os.environ.get("PLAYWRIGHT_BROWSERS_PATH", "")
+    if browsers_path:
+        matches = glob.glob(os.path.join(browsers_path, "chromium-*/chrome-linux64/chrome"))
+        if matches:
+            return matches[0]
+    # 3. Fall back to Playwright's default discovery
+    return None
+
+
+def _content_type(path: str) -> str:
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def _read_static(path: str) -> Tuple[bytes, str]:
+    with _static_lock:
+        cached = _static_cache.get(path)
+    if cached is None:
+        with open(path, "rb") as f:
+            cached = (f.read(), _content_type(path))
+        with _static_lock:
+            _static_cache[path] = cached
+    return cached
+
+
+def _read_file(path: str) -> Tuple[bytes, str]:
+    with open(path, "rb") as f:
+        return f.read(), _content_type(path)
+
+
+class _Document:
+    """One job's HTML and the local files (or in-memory bodies) it may reference."""
+
+    def __init__(
+        self,
+        html: str,
+        static_dir: Optional[str] = None,
+        files: Optional[Dict[str, str]] = None,
+        blobs: Optional[Dict[str, bytes]] = None,
+    ):
+        self.html = html
+        self.static_dir = os.path.abspath(static_dir) if static_dir else None
+        self.files = files or {}
+        self.blobs = blobs or {}
+
+    def resolve(self, path: str) -> Optional[Tuple[str, bool]]:
+        """Map a URL path to (local file, cacheable), or None if not allowed."""
+        if path.startswith("files/"):
+            local = self.files.get(path[len("files/"):])
+            return (local, False) if local else None
+        if path.startswith("static/") and self.static_dir:
+            local = os.path.abspath(os.path.join(self.static_dir, path[len("static/"):]))
+            if local.startswith(self.static_dir + os.sep):
+                return local, True
+        return None
+
+
+class _PageSlot:
+    """A reusable page, the document it is rendering and its render count."""
+
+    def __init__(self, page):
+        self.page = page
+        self.document: Optional[_Document] = None
+        self.renders = 0
+
+
+class BrowserPool:
+    """One Chromium per process, a bounded pool of pages, and a render queue."""
+
+    def __init__(self, max_pages: Optional[int] = None, page_max_renders: Optional[int] = None):
+        self.max_pages = max_pages or BROWSER_MAX_PAGES
+        self.page_max_renders = page_max_renders or BROWSER_PAGE_MAX_RENDERS
+        self.pid = os.getpid()
+        self._start_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        # Owned by the loop thread
+        self._playwright = None
+        self._browser = None
+        self._idle: List[_PageSlot] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+        # Counters for stats()
+        self.launches = 0
+        self.renders = 0
+        self.retries = 0
+        self.waiting = 0
+        self.active = 0
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self):
+        """Start the browser thread (idempotent). The browser launches lazily."""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            ready = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run_loop, args=(ready,), name="browser-pool", daemon=True
+            )
+            self._thread.start()
+            ready.wait()
+
+    def _run_loop(self, ready: threading.Event):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._slots = asyncio.Semaphore(self.max_pages)
+        self._launch_lock = asyncio.Lock()
+        ready.set()
+        self._loop.run_forever()
+
+    def _call(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the browser thread and wait for its result."""
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            future.cancel()  # frees its queue slot / page
+            raise TimeoutError(f"Browser render timed out after {timeout}s")
+
+    def launch(self):
+        """Launch the browser now (warm-up) instead of on the first render."""
+        self._call(self._ensure_browser(), BROWSER_RENDER_TIMEOUT_SECONDS)
+
+    def close(self):
+        """Close pages, the browser and Playwright; stop the thread."""
+        if self._thread is None:
+            return
+        try:
+            self._call(self._shutdown(), 30)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    async def _shutdown(self):
+        for slot in self._idle:
+            await self._close_slot(slot)
+        self._idle.clear()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    # -- browser and pages (loop thread) ----------------------------------
+
+    async def _ensure_browser(self):
+        """Return a connected browser, relaunching if it died."""
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            # Pages of a dead browser are useless
+            self._idle.clear()
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            exec_path = find_chrome_executable()
+            launch_args = {"executable_path": exec_path} if exec_path else {}
+            if self._browser is not None:
+                print("browser_pool: browser disconnected — relaunching")
+            self._browser = await self._playwright.chromium.launch(**launch_args)
+            self.launches += 1
+            return self._browser
+
+    async def _take_slot(self) -> _PageSlot:
+        browser = await self._ensure_browser()
+        while self._idle:
+            slot = self._idle.pop()
+            if not slot.page.is_closed():
+                return slot
+        context = await browser.new_context()
+        slot = _PageSlot(await context.new_page())
+        await slot.page.route(f"{RENDER_ORIGIN}/**", lambda route: self._serve(slot, route))
+        return slot
+
+    async def _serve(self, slot: _PageSlot, route):
+        """Answer a request under RENDER_ORIGIN from the slot's document."""
+        document = slot.document
+        path = unquote(urlsplit(route.request.url).path).lstrip("/")
+        if document is None:
+            await route.abort()
+            return
+        if path in ("", "index.html"):
+            await route.fulfill(body=document.html, content_type="text/html; charset=utf-8")
+            return
+        if path.startswith("files/") and path[len("files/"):] in document.blobs:
+            await route.fulfill(body=document.blobs[path[len("files/"):]],
+                                content_type="application/octet-stream")
+            return
+        resolved = document.resolve(path)
+        if resolved is None:
+            await route.fulfill(status=404, body="")
+            return
+        local, cacheable = resolved
+        try:
+            # Photos can be large — read them off the loop thread
+            body, content_type = await asyncio.get_running_loop().run_in_executor(
+                None, _read_static if cacheable else _read_file, local
+            )
+        except OSError:
+            await route.fulfill(status=404, body="")
+            return
+        await route.fulfill(body=body, content_type=content_type)
+
+    async def _load(self, slot: _PageSlot, document: _Document):
+        """Navigate to the document and wait until its images and fonts are in."""
+        slot.document = document
+        await slot.page.goto(f"{RENDER_ORIGIN}/", wait_until="load")
+        try:
+            await asyncio.wait_for(
+                slot.page.evaluate(_WAIT_FOR_ASSETS), BROWSER_ASSET_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            print(f"browser_pool: assets still loading after {BROWSER_ASSET_TIMEOUT_SECONDS}s — printing anyway")
+
+    async def _close_slot(self, slot: _PageSlot):
+        try:
+            await slot.page.context.close()
+        except Exception:
+            pass  # browser already gone
+
+    async def _with_page(self, document: _Document, work):
+        """Load `document` in a pooled page and return `await work(page)`.
+
+        Waits in the render queue for a page; retries once on a fresh
+        browser if the browser died mid-job.
+        """
+        self.waiting += 1
+        try:
+            await self._slots.acquire()  # the render queue
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        try:
+            for attempt in (1, 2):
+                slot = await self._take_slot()
+                try:
+                    await self._load(slot, document)
+                    result = await work(slot.page)
+                except BaseException as e:
+                    # Also CancelledError, when _call gives up on a slow
+                    # render — the page may be mid-job, so never reuse it
+                    await self._close_slot(slot)
+                    if (
+                        isinstance(e, Exception)
+                        and attempt == 1
+                        and not self._browser.is_connected()
+                    ):
+                        self.retries += 1
+                        continue  # browser crashed mid-render — relaunch and retry
+                    raise
+                slot.document = None
+                slot.renders += 1
+                if slot.renders >= self.page_max_renders:
+                    await self._close_slot(slot)
+                else:
+                    self._idle.append(slot)
+                self.renders += 1
+                return result
+        finally:
+            self.active -= 1
+            self._slots.release()
+
+    async def _render(self, document: _Document, pdf_options: dict) -> bytes:
+        return await self._with_page(document, lambda page: page.pdf(**pdf_options))
+
+    async def _downscale(self, document: _Document, args: dict) -> list:
+        return await self._with_page(document, lambda page: page.evaluate(_DOWNSCALE, args))
+
+    # -- public API (any thread) ------------------------------------------
+
+    def render_pdf(
+        self,
+        html: str,
+        static_dir: Optional[str] = None,
+        files: Optional[Dict[str, str]] = None,
+        **pdf_options,
+    ) -> bytes:
+        """Render an HTML string in a pooled page and print it to PDF.
+
+        Relative URLs in `html` resolve against RENDER_ORIGIN: `static/...`
+        is served from static_dir and `files/<name>` from files[name] (a
+        local path). Anything else under the origin is a 404.
+
+        Blocks the calling thread; waits in the render queue while all
+        pages are busy. pdf_options go to Playwright's page.pdf().
+        """
+        document = _Document(html, static_dir, files)
+        return self._call(self._render(document, pdf_options), BROWSER_RENDER_TIMEOUT_SECONDS)
+
+    def downscale_images(
+        self,
+        images: List[bytes],
+        width: int,
+        height: int,
+        mime: str = "image/jpeg",
+        quality: float = 0.85,
+    ) -> List[Optional[dict]]:
+        """Shrink images to cover a width x height pixel box, re-encoded as `mime`.
+
+        Returns one entry per input: None if Chromium can't decode it, else
+        {"image": smaller bytes or None to keep the original (already about
+        that size), "width"/"height": original pixels, "dhash": 64-bit int}.
+        """
+        if not images:
+            return []
+        document = _Document(_BLANK_HTML, blobs={str(i): img for i, img in enumerate(images)})
+        args = {"names": [str(i) for i in range(len(images))],
+                "width": width, "height": height, "type": mime, "quality": quality}
+        results = self._call(self._downscale(document, args), BROWSER_RENDER_TIMEOUT_SECONDS)
+        if not isinstance(results, list) or len(results) != len(images):
+            raise RuntimeError("Image processing returned an unexpected result")
+        return [
+            {
+                "image": base64.b64decode(r["image"]) if r.get("image") else None,
+                "width": r["width"],
+                "height": r["height"],
+                "dhash": int(r["dhash"], 16),
+            } if r else None
+            for r in results
+        ]
+
+    def stats(self) -> dict:
+        """Counters for debugging and benchmarks."""
+        return {
+            "max_pages": self.max_pages,
+            "launches": self.launches,
+            "renders": self.renders,
+            "retries": self.retries,
+            "active": self.active,
+            "queued": self.waiting,
+            "idle_pages": len(self._idle),
+        }
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> BrowserPool:
+    """Return this process's BrowserPool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid():
+            _pool = BrowserPool()
+        return _pool
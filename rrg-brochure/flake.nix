@@ -74,9 +74,19 @@
         cp ${./server.py} $out/app/server.py
         cp ${./graph.py} $out/app/graph.py
         cp ${./brochure_pdf.py} $out/app/brochure_pdf.py
+        cp ${./browser_pool.py} $out/app/browser_pool.py
         cp ${./photo_scraper.py} $out/app/photo_scraper.py
         cp ${./photo_search_pdf.py} $out/app/photo_search_pdf.py
+        cp ${./image_fetch.py} $out/app/image_fetch.py
+        cp ${./thumbnails.py} $out/app/thumbnails.py
+        cp ${./image_cache.py} $out/app/image_cache.py
+        cp ${./listing_cache.py} $out/app/listing_cache.py
         cp ${./claude_llm.py} $out/app/claude_llm.py
+        cp ${./session_store.py} $out/app/session_store.py
+        cp ${./job_runner.py} $out/app/job_runner.py
+        cp ${./warmup.py} $out/app/warmup.py
+        cp ${./wsgi_server.py} $out/app/wsgi_server.py
+        cp ${./artifact_store.py} $out/app/artifact_store.py
         cp ${./templates/brochure.html} $out/app/templates/brochure.html
         cp -r ${./templates/static}/* $out/app/templates/static/
       '';
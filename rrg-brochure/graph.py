@@ -18,6 +18,7 @@ from claude_llm import ChatClaudeCLI
 from brochure_pdf import generate_brochure_pdf
 from photo_scraper import search_property_photos
 from photo_search_pdf import generate_photo_search_pdf
+from job_runner import report_progress
 
 
 CLAUDE_MODEL = os.getenv("CLAUDE_MODEL", "haiku")
@@ -362,6 +363,7 @@ def brochure_edit_node(state: BrochureState) -> dict:
 def brochure_approve_node(state: BrochureState) -> dict:
     """Generate the finalized brochure PDF."""
     data = state["brochure_data"]
+    report_progress("Rendering PDF")
     pdf_bytes = generate_brochure_pdf(data)
 
     today = date.today().strftime("%Y%m%d")
@@ -412,6 +414,7 @@ def brochure_question_node(state: BrochureState) -> dict:
 def brochure_preview_node(state: BrochureState) -> dict:
     """Generate a preview PDF without finalizing."""
     data = state["brochure_data"]
+    report_progress("Rendering PDF")
     pdf_bytes = generate_brochure_pdf(data)
 
     today = date.today().strftime("%Y%m%d")
@@ -468,6 +471,18 @@ def brochure_nudge_node(state: BrochureState) -> dict:
     }
 
 
+# "search again", "fresh search", "redo the search", ... — skip the listing
+# URL cache. Whole phrases only: a bare "again" or "new" is usually about
+# something else ("new photos of the lobby", "send it again")
+_FRESH_SEARCH_RE = re.compile(
+    r"\b(?:(?:search|look|try)\s+again"
+    r"|(?:fresh|new)\s+search"
+    r"|re-search"
+    r"|(?:redo|re-?run|refresh)\s+(?:the\s+|your\s+)?(?:photo\s+|listing\s+)?search)\b",
+    re.IGNORECASE,
+)
+
+
 def brochure_photo_search_node(state: BrochureState) -> dict:
     """Search the web for photos of the property, download them, and output a numbered PDF.
 
@@ -479,9 +494,12 @@ def brochure_photo_search_node(state: BrochureState) -> dict:
     prop_name = data.get("property_name", "")
     address = f"{data.get('address_line1', '')} {data.get('address_line2', '')}".strip()
 
-    # Run the two-phase scraper
+    # Run the two-phase scraper. Listing pages found for this property
+    # before are reused unless the user asks to search again.
+    force_refresh = bool(_FRESH_SEARCH_RE.search(state.get("user_message", "")))
     try:
-        photos = search_property_photos(prop_name, address)
+        report_progress("Searching listings")
+        photos = search_property_photos(prop_name, address, force_refresh=force_refresh)
     except Exception:
         photos = []
 
@@ -489,6 +507,7 @@ def brochure_photo_search_node(state: BrochureState) -> dict:
     pdf_bytes = None
     pdf_filename = None
     if photos:
+        report_progress(f"Downloading {len(photos)} photos")
         pdf_bytes = generate_photo_search_pdf(
             photos=photos,
             property_name=prop_name,
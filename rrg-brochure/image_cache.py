@@ -0,0 +1,249 @@
+"""On-disk cache of downloaded listing photos, shared across sessions.
+
+The same photos are touched several times per property: the scraper's
+HEAD check, the contact sheet download, and again when the chosen photos
+go into the brochure — and again on every later search for that
+property. ImageCache keeps them under IMAGE_CACHE_DIR:
+
+- Bodies are content-addressed files (an ArtifactStore under blobs/), so
+  one photo served from two URLs is stored once. The store is bounded by
+  IMAGE_CACHE_MAX_BYTES and evicts least recently used files.
+- A SQLite index has one row per downloaded URL: its content hash and
+  the response's ETag / Last-Modified. Each row also carries the photo's
+  canonical key (image_key — the same photo at different sizes shares
+  a key), so the scraper can tell a photo is known from any size variant
+  while every size keeps its own entry.
+- Entries younger than IMAGE_CACHE_FRESH_SECONDS are used as-is. Older
+  ones are revalidated with a conditional GET (If-None-Match /
+  If-Modified-Since); a 304 refreshes them without a download.
+
+image_fetch.download_image() reads and fills the cache; the scraper skips
+its HEAD request for photos already cached. If IMAGE_CACHE_DIR can't be
+created the cache is disabled and get_image_cache() returns None.
+
+Settings (env):
+    IMAGE_CACHE_DIR            — cache directory (default /data/image_cache)
+    IMAGE_CACHE_MAX_BYTES      — photo bytes kept on disk (default 512 MB)
+    IMAGE_CACHE_FRESH_SECONDS  — age before an entry is revalidated (default 1 day)
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Mapping, Optional
+from urllib.parse import urlparse
+
+from artifact_store import ArtifactStore
+
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", "/data/image_cache")
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+IMAGE_CACHE_FRESH_SECONDS = int(os.getenv("IMAGE_CACHE_FRESH_SECONDS", str(24 * 60 * 60)))
+
+
+def image_key(url: str) -> str:
+    """Dedup key: identifies same image at different sizes."""
+    lower = url.lower()
+    # brightspotcdn hash
+    m = re.search(r'/dims4/default/([a-f0-9]+)/', lower)
+    if m:
+        return m.group(1)
+    # bazaarvoice photo ID
+    m = re.search(r'bazaarvoice\.com/photo/\d+/([^/]+)', lower)
+    if m:
+        return m.group(1)
+    # Cloudinary: extract the base image path (before transformations)
+    m = re.search(r'cloudinary\.com/.+?/image/upload/(?:.*?/)?v\d+/(.+)', lower)
+    if m:
+        return m.group(1)
+    # Strip common resize/quality params for dedup
+    parsed = urlparse(url)
+    path = re.sub(r'/resize/\d+x\d+', '', parsed.path)
+    path = re.sub(r'/(?:thumb|small|medium|large|preview)/', '/', path)
+    return parsed.netloc + path
+
+
+@dataclass
+class CachedImage:
+    """One index entry and the file holding its bytes."""
+
+    key: str
+    url: str
+    sha256: str
+    path: str
+    size: int
+    content_type: str
+    etag: str
+    last_modified: str
+    fetched_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.fetched_at < IMAGE_CACHE_FRESH_SECONDS
+
+    def conditional_headers(self) -> dict:
+        """Request headers that let the server answer 304 Not Modified."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def read(self) -> Optional[bytes]:
+        try:
+            with open(self.path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None  # evicted since lookup
+
+
+class ImageCache:
+    """Per-URL index over a content-addressed, size-bounded photo store."""
+
+    def __init__(self, root: str | None = None, max_bytes: int | None = None):
+        self.root = root or IMAGE_CACHE_DIR
+        blob_dir = os.path.join(self.root, "blobs")
+        os.makedirs(blob_dir, exist_ok=True)
+        self.blobs = ArtifactStore(blob_dir, max_bytes if max_bytes is not None else IMAGE_CACHE_MAX_BYTES)
+        self.db_path = os.path.join(self.root, "index.db")
+        self._init_table()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Create a new SQLite connection."""
+        return sqlite3.connect(self.db_path)
+
+    def _init_table(self):
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS image_urls (
+                    url TEXT PRIMARY KEY,
+                    key TEXT NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    content_type TEXT NOT NULL DEFAULT '',
+                    etag TEXT NOT NULL DEFAULT '',
+                    last_modified TEXT NOT NULL DEFAULT '',
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_image_urls_key ON image_urls (key)")
+            conn.commit()
+        finally:
+            conn.close()
+
+    _COLUMNS = "url, key, sha256, size, content_type, etag, last_modified, fetched_at"
+
+    def _entry(self, conn: sqlite3.Connection, row) -> Optional[CachedImage]:
+        """Build an entry from a row; drop the row if its file was evicted."""
+        url, key, sha256, size, content_type, etag, last_modified, fetched_at = row
+        path = self.blobs.path(sha256)  # also marks it recently used
+        if path is None:
+            conn.execute("DELETE FROM image_urls WHERE url = ?", (url,))
+            conn.commit()
+            return None
+        return CachedImage(key, url, sha256, path, size, content_type, etag, last_modified, fetched_at)
+
+    def lookup(self, url: str) -> Optional[CachedImage]:
+        """Return the cached copy of exactly this URL, or None."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"SELECT {self._COLUMNS} FROM image_urls WHERE url = ?", (url,)
+            ).fetchone()
+            return self._entry(conn, row) if row is not None else None
+        finally:
+            conn.close()
+
+    def lookup_variant(self, url: str) -> Optional[CachedImage]:
+        """Return a cached copy of this photo at any size (same image_key), or None.
+
+        Prefers the exact URL, then the most recently fetched variant.
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT {self._COLUMNS} FROM image_urls WHERE key = ? "
+                "ORDER BY url = ? DESC, fetched_at DESC",
+                (image_key(url), url),
+            ).fetchall()
+            for row in rows:
+                entry = self._entry(conn, row)
+                if entry is not None:
+                    return entry
+            return None
+        finally:
+            conn.close()
+
+    def store(self, url: str, body: bytes, headers: Mapping[str, str]) -> CachedImage:
+        """Cache a downloaded photo with the response's validators."""
+        sha256 = self.blobs.put(body)  # identical bytes dedupe
+        entry = CachedImage(
+            key=image_key(url),
+            url=url,
+            sha256=sha256,
+            path=self.blobs.path(sha256) or "",
+            size=len(body),
+            content_type=headers.get("Content-Type", ""),
+            etag=headers.get("ETag", ""),
+            last_modified=headers.get("Last-Modified", ""),
+            fetched_at=time.time(),
+        )
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                INSERT INTO image_urls (url, key, sha256, size, content_type, etag, last_modified, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    key = excluded.key,
+                    sha256 = excluded.sha256,
+                    size = excluded.size,
+                    content_type = excluded.content_type,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    fetched_at = excluded.fetched_at
+                """,
+                (url, entry.key, sha256, entry.size, entry.content_type,
+                 entry.etag, entry.last_modified, entry.fetched_at),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        return entry
+
+    def revalidated(self, entry: CachedImage, headers: Mapping[str, str]):
+        """Record a 304: the cached copy is current again."""
+        etag = headers.get("ETag") or entry.etag
+        last_modified = headers.get("Last-Modified") or entry.last_modified
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE image_urls SET fetched_at = ?, etag = ?, last_modified = ? WHERE url = ?",
+                (time.time(), etag, last_modified, entry.url),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+
+_cache: Optional[ImageCache] = None
+_cache_failed = False
+_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> Optional[ImageCache]:
+    """Return the process-wide ImageCache, or None if it can't be used."""
+    global _cache, _cache_failed
+    with _cache_lock:
+        if _cache is None and not _cache_failed:
+            try:
+                _cache = ImageCache()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Image cache disabled ({IMAGE_CACHE_DIR}): {e}")
+                _cache_failed = True
+        return _cache
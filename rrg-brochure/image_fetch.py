@@ -0,0 +1,225 @@
+"""Concurrent image downloads for the photo contact sheet.
+
+fetch_images() downloads a list of image URLs on a bounded thread pool and
+yields results in input order as soon as the next one is ready, so the
+caller can lay out photo 1 while later photos are still downloading.
+
+- IMAGE_FETCH_WORKERS downloads run at once, at most IMAGE_FETCH_PER_HOST
+  against any one host (listing CDNs throttle bursts).
+- Each download gets IMAGE_FETCH_TIMEOUT_SECONDS of wall time, checked
+  while the body streams in — a host trickling bytes can't hold a worker
+  for a socket timeout per chunk.
+- A host that times out once is treated as slow: its queued URLs are
+  dropped instead of each waiting out its own timeout.
+- IMAGE_FETCH_DEADLINE_SECONDS caps the whole batch; whatever isn't done
+  by then comes back as None.
+
+All downloads share one requests.Session, so photos from the same host
+reuse keep-alive connections, and go through the on-disk image_cache: a
+fresh cached photo costs no request, a stale one a conditional GET.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from image_cache import get_image_cache
+
+IMAGE_FETCH_WORKERS = int(os.getenv("IMAGE_FETCH_WORKERS", "8"))
+IMAGE_FETCH_PER_HOST = int(os.getenv("IMAGE_FETCH_PER_HOST", "3"))
+IMAGE_FETCH_TIMEOUT_SECONDS = float(os.getenv("IMAGE_FETCH_TIMEOUT_SECONDS", "10"))
+IMAGE_FETCH_DEADLINE_SECONDS = float(os.getenv("IMAGE_FETCH_DEADLINE_SECONDS", "45"))
+
+# Connect timeout — a host that can't open a socket in this long is slow
+_CONNECT_TIMEOUT_SECONDS = 3.0
+# Listing photos are well under this; anything bigger isn't worth embedding
+_MAX_IMAGE_BYTES = 25 * 1024 * 1024
+_CHUNK_BYTES = 64 * 1024
+
+_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/120.0.0.0 Safari/537.36",
+}
+
+_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif")
+_IMAGE_MAGIC = (b"\xff\xd8\xff", b"\x89PNG", b"RIFF", b"GIF8")
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class SlowHostError(Exception):
+    """A download ran past its time budget."""
+
+
+def get_session() -> requests.Session:
+    """The process-wide session, its connection pool sized for the workers."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(_HEADERS)
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=max(IMAGE_FETCH_WORKERS, 10))
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def _looks_like_image(url: str, content_type: str, body: bytes) -> bool:
+    if "image" in content_type or url.lower().endswith(_IMAGE_EXTENSIONS):
+        return True
+    # Some CDNs don't set content-type properly — accept if body looks like an image
+    return body[:4].startswith(_IMAGE_MAGIC)
+
+
+def download_image(url: str, timeout: float = IMAGE_FETCH_TIMEOUT_SECONDS) -> Optional[bytes]:
+    """Download one image within `timeout` seconds of wall time.
+
+    Returns the bytes, or None if the response isn't a usable image.
+    Raises SlowHostError if the host didn't answer in time.
+    """
+    cache = get_image_cache()
+    cached = cache.lookup(url) if cache else None
+    if cached is not None and cached.fresh:
+        body = cached.read()
+        if body:
+            return body
+
+    started = time.monotonic()
+    headers = cached.conditional_headers() if cached is not None else {}
+    try:
+        with get_session().get(
+            url, stream=True, headers=headers,
+            timeout=(min(_CONNECT_TIMEOUT_SECONDS, timeout), timeout),
+        ) as resp:
+            if resp.status_code == 304 and cached is not None:
+                body = cached.read()
+                if body:
+                    cache.revalidated(cached, resp.headers)
+                return body  # None if evicted meanwhile — the next call downloads it
+            resp.raise_for_status()
+            chunks, size = [], 0
+            for chunk in resp.iter_content(_CHUNK_BYTES):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > _MAX_IMAGE_BYTES:
+                    return None
+                if time.monotonic() - started > timeout:
+                    raise SlowHostError(url)
+            body = b"".join(chunks)
+            response_headers = resp.headers
+    except requests.Timeout as e:
+        raise SlowHostError(url) from e
+    except SlowHostError:
+        raise
+    except Exception:
+        return None
+    if not (body and _looks_like_image(url, response_headers.get("content-type", ""), body)):
+        return None
+    if cache is not None:
+        try:
+            cache.store(url, body, response_headers)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Image cache write failed: {e}")
+    return body
+
+
+def cached_image_path(url: str) -> Optional[str]:
+    """Local path of the cached copy of `url`, downloading it if needed.
+
+    None if the download fails or the cache is disabled.
+    """
+    cache = get_image_cache()
+    if cache is None:
+        return None
+    try:
+        if download_image(url) is None:
+            return None
+    except SlowHostError:
+        return None
+    cached = cache.lookup(url)
+    return cached.path if cached is not None else None
+
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def fetch_images(
+    urls: List[str],
+    workers: Optional[int] = None,
+    per_host: Optional[int] = None,
+    deadline_seconds: Optional[float] = None,
+) -> Iterator[Tuple[str, Optional[bytes]]]:
+    """Download `urls` concurrently, yielding (url, bytes or None) in input order."""
+    workers = workers or IMAGE_FETCH_WORKERS
+    per_host = per_host or IMAGE_FETCH_PER_HOST
+    deadline = time.monotonic() + (deadline_seconds or IMAGE_FETCH_DEADLINE_SECONDS)
+
+    results: Dict[int, Optional[bytes]] = {}
+    queued = list(enumerate(urls))
+    running: Dict = {}  # future -> (index, host)
+    active: Counter = Counter()  # host -> downloads in flight
+    slow_hosts = set()
+    next_out = 0
+    started = time.monotonic()
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="img")
+    try:
+        while next_out < len(urls):
+            # Start whatever the worker and per-host limits allow, in input
+            # order so the photos the layout needs next go first
+            left = deadline - time.monotonic()
+            waiting = []
+            for i, url in queued:
+                host = _host(url)
+                if not url or host in slow_hosts:
+                    results[i] = None
+                elif len(running) < workers and active[host] < per_host and left > 0:
+                    budget = min(IMAGE_FETCH_TIMEOUT_SECONDS, left)
+                    running[pool.submit(download_image, url, budget)] = (i, host)
+                    active[host] += 1
+                else:
+                    waiting.append((i, url))
+            queued = waiting
+
+            while next_out in results:
+                yield urls[next_out], results.pop(next_out)
+                next_out += 1
+
+            left = deadline - time.monotonic()
+            if next_out >= len(urls) or not running or left <= 0:
+                break
+
+            done, _ = wait(running, timeout=left, return_when=FIRST_COMPLETED)
+            for future in done:
+                i, host = running.pop(future)
+                active[host] -= 1
+                try:
+                    results[i] = future.result()
+                except SlowHostError:
+                    results[i] = None
+                    slow_hosts.add(host)
+
+        # Past the deadline: anything still outstanding is dropped
+        dropped = 0
+        for i in range(next_out, len(urls)):
+            if i not in results:
+                dropped += 1
+            yield urls[i], results.get(i)
+        if dropped or slow_hosts:
+            print(f"Image fetch: dropped {dropped} unfinished after "
+                  f"{time.monotonic() - started:.1f}s; slow hosts: {sorted(slow_hosts) or 'none'}")
+    finally:
+        # Don't wait on downloads the caller no longer needs
+        pool.shutdown(wait=False, cancel_futures=True)
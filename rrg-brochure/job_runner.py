@@ -0,0 +1,261 @@
+"""Background jobs for /process — submit now, poll for progress and result.
+
+A slow turn (photo search, PDF rendering) doesn't have to hold an HTTP
+request open. POST /jobs stores the request as a job and runs it on a
+thread pool; GET /jobs/<id> returns its status, the stage events emitted
+so far and, once finished, the same body /process would have returned.
+It also reports how long the job waited for a thread (queue_ms) and how
+long the handler ran (worker_ms), so callers can split a job's latency
+the way Server-Timing splits a synchronous /process call.
+
+Graph code reports stages with `report_progress("Rendering PDF")`. It's
+a no-op outside a job, so the synchronous /process path is unchanged.
+
+Job rows live in SQLite next to the session store, so any server process
+can answer a poll. Finished jobs are kept for JOB_TTL_SECONDS, which is
+what lets a client resume polling after its own timeout. A job that stops
+updating for JOB_STALE_SECONDS (its process died) is reported as failed.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "/data/jobs.db")
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", str(60 * 60)))
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", str(15 * 60)))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+
+# Minimum seconds between expired-row sweeps
+_EVICT_INTERVAL_SECONDS = 60
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+
+_current = threading.local()
+
+
+def report_progress(stage: str):
+    """Record a stage event for the job running on this thread.
+
+    No-op when called outside a job (e.g. from the synchronous /process).
+    """
+    job = getattr(_current, "job", None)
+    if job is None:
+        return
+    store, job_id = job
+    try:
+        store.add_event(job_id, stage)
+    except sqlite3.Error:
+        traceback.print_exc()  # progress is best-effort
+
+
+class JobStore:
+    """SQLite-backed job table.
+
+    Each job has:
+    - id: UUID string (returned to the caller)
+    - status: queued | running | done | error
+    - events: JSON list of {stage, at} progress events
+    - result: JSON /process response body (done or error)
+    - http_status: the status /process would have returned
+    - started_at / finished_at: when the handler started and returned
+    - updated_at / expires_at: epoch seconds
+    """
+
+    def __init__(self, db_path: str | None = None, ttl_seconds: int | None = None):
+        self.db_path = db_path or JOB_DB_PATH
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else JOB_TTL_SECONDS
+        self._last_evict = 0.0
+        self._init_table()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Create a new SQLite connection."""
+        return sqlite3.connect(self.db_path)
+
+    def _init_table(self):
+        """Create the jobs table if it doesn't exist."""
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    events TEXT NOT NULL DEFAULT '[]',
+                    result TEXT,
+                    http_status INTEGER,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    updated_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_expires_at ON jobs (expires_at)"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def create(self) -> str:
+        """Insert a new queued job and return its ID."""
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO jobs (id, status, created_at, updated_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job_id, QUEUED, now, now, now + self.ttl_seconds),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        if now - self._last_evict >= _EVICT_INTERVAL_SECONDS:
+            self.evict_expired(now)
+        return job_id
+
+    def _update(self, job_id: str, sql: str, params: tuple):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                f"UPDATE jobs SET {sql}, updated_at = ?, expires_at = ? WHERE id = ?",
+                params + (now, now + self.ttl_seconds, job_id),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def set_running(self, job_id: str):
+        """Mark a job as picked up by a worker thread."""
+        self._update(job_id, "status = ?, started_at = ?", (RUNNING, time.time()))
+
+    def add_event(self, job_id: str, stage: str):
+        """Append a progress event."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            # Read-modify-write in one transaction so events never interleave
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT events FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                conn.rollback()
+                return
+            events = json.loads(row[0] or "[]")
+            events.append({"stage": stage, "at": now})
+            conn.execute(
+                "UPDATE jobs SET events = ?, updated_at = ?, expires_at = ? WHERE id = ?",
+                (json.dumps(events), now, now + self.ttl_seconds, job_id),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def finish(self, job_id: str, result: dict, http_status: int = 200):
+        """Store a job's /process response body."""
+        status = DONE if http_status < 400 else ERROR
+        self._update(
+            job_id,
+            "status = ?, result = ?, http_status = ?, finished_at = ?",
+            (status, json.dumps(result), http_status, time.time()),
+        )
+
+    def get(self, job_id: str) -> dict | None:
+        """Load a job. Returns None if missing or expired."""
+        if not job_id:
+            return None
+        now = time.time()
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT status, events, result, http_status, created_at, started_at, "
+                "finished_at, updated_at FROM jobs WHERE id = ? AND expires_at > ?",
+                (job_id, now),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        status, events, result, http_status, created_at, started_at, finished_at, updated_at = row
+        job = {
+            "job_id": job_id,
+            "status": status,
+            "events": json.loads(events or "[]"),
+            "result": json.loads(result) if result else None,
+            "http_status": http_status,
+            "elapsed_seconds": round(now - created_at, 1),
+        }
+        if started_at is not None:
+            job["queue_ms"] = round((started_at - created_at) * 1000, 1)
+            if finished_at is not None:
+                job["worker_ms"] = round((finished_at - started_at) * 1000, 1)
+        if status in (QUEUED, RUNNING) and now - updated_at > JOB_STALE_SECONDS:
+            job["status"] = ERROR
+            job["error"] = "Job stopped responding (worker restarted?)"
+        return job
+
+    def evict_expired(self, now: float | None = None) -> int:
+        """Delete all expired jobs. Returns the number removed."""
+        now = now if now is not None else time.time()
+        self._last_evict = now
+        conn = self._connect()
+        try:
+            cur = conn.execute("DELETE FROM jobs WHERE expires_at <= ?", (now,))
+            conn.commit()
+            return cur.rowcount
+        finally:
+            conn.close()
+
+
+class JobRunner:
+    """Runs /process handlers on a thread pool, recording progress in a JobStore.
+
+    `handler` takes the /process request body and returns
+    (response_body, http_status) — the same thing the route would send.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        handler: Callable[[dict], Tuple[dict, int]],
+        max_workers: Optional[int] = None,
+    ):
+        self.store = store
+        self.handler = handler
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or JOB_WORKERS,
+            thread_name_prefix="job",
+        )
+
+    def submit(self, payload: dict) -> str:
+        """Queue a /process payload and return the job ID."""
+        job_id = self.store.create()
+        self._pool.submit(self._run, job_id, payload)
+        return job_id
+
+    def _run(self, job_id: str, payload: dict):
+        _current.job = (self.store, job_id)
+        try:
+            self.store.set_running(job_id)
+            body, http_status = self.handler(payload)
+            self.store.finish(job_id, body, http_status)
+        except Exception as e:
+            traceback.print_exc()
+            self.store.finish(job_id, {"response": f"Job failed: {e}"}, 500)
+        finally:
+            _current.job = None
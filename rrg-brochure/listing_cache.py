@@ -0,0 +1,139 @@
+"""SQLite cache of listing-page URLs found per property.
+
+Finding a property's listing pages is a Claude CLI WebSearch that takes
+30-60s (photo_scraper._find_listing_urls). The pages it finds rarely
+change, so the URLs are kept per property, across sessions:
+
+- Keyed by property_key(): normalized property name + address, so
+  "Oak Plaza, 100 Main Street" and "oak plaza  100 main st." share an entry.
+- An entry younger than LISTING_CACHE_FRESH_SECONDS is used as-is.
+- An older one is still used, but a background search refreshes it for
+  next time (stale-while-revalidate). Only one process refreshes a key at
+  a time — the claim is a column in the same database.
+- Past LISTING_CACHE_MAX_AGE_SECONDS an entry is ignored and the caller
+  searches again before answering.
+- Empty search results aren't cached (usually a failed search).
+- Callers skip the cache when both name and address normalize to
+  nothing (property_key() == "|") — that key would match every such search.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import time
+
+DB_PATH = os.getenv("LISTING_CACHE_DB_PATH", "/data/listing_urls.db")
+LISTING_CACHE_FRESH_SECONDS = int(os.getenv("LISTING_CACHE_FRESH_SECONDS", str(24 * 60 * 60)))
+LISTING_CACHE_MAX_AGE_SECONDS = int(os.getenv("LISTING_CACHE_MAX_AGE_SECONDS", str(30 * 24 * 60 * 60)))
+
+# A refresh claim older than this is assumed dead (the search timed out or
+# its process was killed) and can be taken over
+_REFRESH_CLAIM_SECONDS = 5 * 60
+
+_STREET_WORDS = {
+    "street": "st", "avenue": "ave", "road": "rd", "drive": "dr",
+    "boulevard": "blvd", "lane": "ln", "court": "ct", "highway": "hwy",
+    "parkway": "pkwy", "place": "pl", "suite": "ste",
+    "north": "n", "south": "s", "east": "e", "west": "w",
+}
+
+
+def normalize_address(addr) -> str:
+    """Normalize an address for matching: lowercase, no punctuation, short street words."""
+    if not addr:
+        return ""
+    words = re.sub(r"[^\w\s]", " ", str(addr).lower()).split()
+    return " ".join(_STREET_WORDS.get(w, w) for w in words)
+
+
+def property_key(property_name: str, address: str) -> str:
+    """Cache key for one property."""
+    return f"{normalize_address(property_name)}|{normalize_address(address)}"
+
+
+class ListingCache:
+    """SQLite-backed map of property key -> listing page URLs."""
+
+    def __init__(self, db_path: str | None = None):
+        self.db_path = db_path or DB_PATH
+        self._init_table()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Create a new SQLite connection."""
+        return sqlite3.connect(self.db_path)
+
+    def _init_table(self):
+        """Create the listing_searches table if it doesn't exist."""
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS listing_searches (
+                    key TEXT PRIMARY KEY,
+                    urls TEXT NOT NULL,
+                    searched_at REAL NOT NULL,
+                    refreshing_since REAL
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> tuple[list[str], float] | None:
+        """Return (urls, searched_at), or None if missing or too old to use."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT urls, searched_at FROM listing_searches WHERE key = ? AND searched_at > ?",
+                (key, time.time() - LISTING_CACHE_MAX_AGE_SECONDS),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, key: str, urls: list[str]):
+        """Store a search's URLs (ignored if empty) and release any refresh claim."""
+        conn = self._connect()
+        try:
+            if urls:
+                conn.execute(
+                    """
+                    INSERT INTO listing_searches (key, urls, searched_at, refreshing_since)
+                    VALUES (?, ?, ?, NULL)
+                    ON CONFLICT(key) DO UPDATE SET
+                        urls = excluded.urls,
+                        searched_at = excluded.searched_at,
+                        refreshing_since = NULL
+                    """,
+                    (key, json.dumps(urls), time.time()),
+                )
+            else:
+                conn.execute(
+                    "UPDATE listing_searches SET refreshing_since = NULL WHERE key = ?", (key,)
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def claim_refresh(self, key: str) -> bool:
+        """Mark a key as being refreshed. False if another search already is."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            cur = conn.execute(
+                """
+                UPDATE listing_searches SET refreshing_since = ?
+                WHERE key = ? AND (refreshing_since IS NULL OR refreshing_since < ?)
+                """,
+                (now, key, now - _REFRESH_CLAIM_SECONDS),
+            )
+            conn.commit()
+            return cur.rowcount == 1
+        finally:
+            conn.close()
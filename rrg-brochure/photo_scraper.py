@@ -1,9 +1,19 @@
 """Scrape property photos from listing sites.
 
 Two-phase approach:
-  1. Use Claude CLI + WebSearch (haiku, ~30s) to find listing page URLs
-  2. Fetch those pages in Python and extract image URLs with regex
-  3. HEAD-check each candidate to verify it's a real photo (>15KB)
+  1. Use Claude CLI + WebSearch (haiku, ~30s) to find listing page URLs —
+     or reuse the ones found for this property before (listing_cache)
+  2. Fetch those pages in Python and extract image URLs with regex —
+     concurrently, at most _PAGES_PER_DOMAIN at a time per site; pages
+     are handed out across sites so no worker waits on a busy one
+  3. HEAD-check each candidate to verify it's a real photo (>15KB) —
+     photos already in the on-disk image_cache skip the request
+
+Phases 2 and 3 overlap: pages are parsed in search-result order as soon
+as they and the pages before them are in, and their candidates go to HEAD
+checks while later pages are still downloading — so the per-site photo
+cap keeps the same photos whichever page downloads first. All
+requests share image_fetch's keep-alive session.
 
 Works for any property type: commercial buildings, golf courses,
 restaurants, duplexes, vacant land, etc.
@@ -13,11 +23,19 @@ Returns a list of {url, description, source} dicts for photo_search_pdf.
 
 import json
 import re
+import sqlite3
 import subprocess
-import requests
+import threading
+import time
 from urllib.parse import urljoin, urlparse, unquote
-from typing import List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import Counter
+from typing import List, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from image_cache import get_image_cache, image_key
+from image_fetch import get_session
+from job_runner import report_progress
+from listing_cache import LISTING_CACHE_FRESH_SECONDS, ListingCache, property_key
 
 
 _HEADERS = {
@@ -73,12 +91,41 @@ _SKIP_DOMAINS = [
 # Minimum image file size in bytes — anything smaller is likely an icon/thumbnail
 _MIN_IMAGE_BYTES = 15_000  # 15KB
 
+# Listing pages fetched at once, and at most this many per site (politeness)
+_PAGE_WORKERS = 6
+_PAGES_PER_DOMAIN = 2
+
+
+# All of _SKIP_PATTERNS as one precompiled alternation — one search per URL
+# instead of a substring scan per pattern
+_SKIP_RE = re.compile("|".join(re.escape(p) for p in _SKIP_PATTERNS))
+
+# Where an image URL can start. Each alternative consumes one character, so
+# no place is skipped for overlapping another; the full pattern for that
+# kind of place is then matched right there (_extract_imgs)
+_IMG_ANCHOR_RE = re.compile(r'''=(?=["'])|u(?=rl\()|"(?=(?:image|photo|contentUrl)")''')
+# Attributes whose quoted value may be an image; matched case-insensitively
+_IMG_ATTRS = ("src", "data-src", "data-original", "data-lazy-src",
+              "data-image", "data-bg", "data-background")
+_IMG_ATTR_RES = [(attr, len(attr), re.compile(re.escape(attr), re.IGNORECASE)) for attr in _IMG_ATTRS]
+# Last letters of those names and of content= — most `="` on a page (class=,
+# href=, alt=) end in something else and are skipped without a match
+_IMG_ATTR_LAST = frozenset("cCgGlLeEdDtT")
+_QUOTED_VALUE_RE = re.compile(r'''["']([^"']+)["']''')
+# CSS background-image
+_CSS_URL_RE = re.compile(r'''url\(["']?([^"')\s]+)["']?\)''')
+# JSON-LD structured data (many listing sites embed image arrays)
+_JSON_IMAGE_RE = re.compile(r'"(?:image|photo|contentUrl)"\s*:\s*"(https?://[^"]+)"')
+_RESIZE_RE = re.compile(r'/resize/(\d+)x(\d+)')
+_CROP_RE = re.compile(r'/crop/(\d+)x(\d+)')
+_WIDTH_RE = re.compile(r'[?&]w(?:idth)?=(\d+)')
+
 
 def _is_junk(url: str) -> bool:
     lower = url.lower()
     if lower.endswith(".svg"):
         return True
-    return any(p in lower for p in _SKIP_PATTERNS)
+    return _SKIP_RE.search(lower) is not None
 
 
 def _is_photo_url(url: str) -> bool:
@@ -109,31 +156,9 @@ def _is_photo_url(url: str) -> bool:
     return False
 
 
-def _image_key(url: str) -> str:
-    """Dedup key: identifies same image at different sizes."""
-    lower = url.lower()
-    # brightspotcdn hash
-    m = re.search(r'/dims4/default/([a-f0-9]+)/', lower)
-    if m:
-        return m.group(1)
-    # bazaarvoice photo ID
-    m = re.search(r'bazaarvoice\.com/photo/\d+/([^/]+)', lower)
-    if m:
-        return m.group(1)
-    # Cloudinary: extract the base image path (before transformations)
-    m = re.search(r'cloudinary\.com/.+?/image/upload/(?:.*?/)?v\d+/(.+)', lower)
-    if m:
-        return m.group(1)
-    # Strip common resize/quality params for dedup
-    parsed = urlparse(url)
-    path = re.sub(r'/resize/\d+x\d+', '', parsed.path)
-    path = re.sub(r'/(?:thumb|small|medium|large|preview)/', '/', path)
-    return parsed.netloc + path
-
-
 def _fetch(url: str, timeout: int = 10) -> str:
     try:
-        r = requests.get(url, headers=_HEADERS, timeout=timeout, allow_redirects=True)
+        r = get_session().get(url, headers=_HEADERS, timeout=timeout, allow_redirects=True)
         r.raise_for_status()
         return r.text
     except Exception:
@@ -142,8 +167,13 @@ def _fetch(url: str, timeout: int = 10) -> str:
 
 def _head_check(url: str) -> bool:
     """Quick HEAD request to verify the URL is a real photo (not a tiny icon)."""
+    # Already downloaded (this or an earlier search) — no request needed
+    cache = get_image_cache()
+    cached = cache.lookup_variant(url) if cache else None
+    if cached is not None:
+        return cached.size >= _MIN_IMAGE_BYTES
     try:
-        r = requests.head(url, headers=_HEADERS, timeout=5, allow_redirects=True)
+        r = get_session().head(url, headers=_HEADERS, timeout=5, allow_redirects=True)
         if r.status_code >= 400:
             return False
         content_type = r.headers.get("Content-Type", "")
@@ -159,38 +189,65 @@ def _head_check(url: str) -> bool:
 
 
 def _extract_imgs(html: str, base_url: str) -> List[str]:
-    """Pull image URLs from HTML."""
-    urls = set()
-    # Standard image attributes
-    for attr in ("src", "data-src", "data-original", "data-lazy-src",
-                 "data-image", "data-bg", "data-background"):
-        for match in re.findall(rf'{attr}=["\']([^"\']+)["\']', html, re.IGNORECASE):
-            urls.add(urljoin(base_url, match))
-    # CSS background-image
-    for match in re.findall(r'url\(["\']?([^"\')\s]+)["\']?\)', html):
-        urls.add(urljoin(base_url, match))
-    # JSON-LD structured data (many listing sites embed image arrays)
-    for match in re.findall(r'"(?:image|photo|contentUrl)"\s*:\s*"(https?://[^"]+)"', html):
-        urls.add(match)
-    # og:image meta tags
-    for match in re.findall(r'content=["\']([^"\']+)["\']', html):
-        if _is_photo_url(match):
-            urls.add(urljoin(base_url, match))
+    """Pull image URLs from HTML, in the order they first appear.
+
+    One pass over the page: _IMG_ANCHOR_RE stops at every `="`, `url(` and
+    `"image"`-style JSON key, and the pattern for that kind of place is
+    matched there. Each pattern keeps its own scan position, so the result
+    is exactly what separate findall() sweeps per pattern would give.
+    """
+    raw = {}  # (value as found, needs urljoin) -> None; a dict keeps page order
+    attr_ends = dict.fromkeys(_IMG_ATTRS, 0)
+    content_end = css_end = json_end = 0
+    for anchor in _IMG_ANCHOR_RE.finditer(html):
+        pos = anchor.start()
+        char = html[pos]
+        if char == "=":
+            if html[pos - 1] not in _IMG_ATTR_LAST:
+                continue
+            m = _QUOTED_VALUE_RE.match(html, pos + 1)
+            if m is None:
+                continue
+            value = m.group(1)
+            # Standard image attributes (src=, data-src=, ...)
+            for attr, length, name_re in _IMG_ATTR_RES:
+                start = pos - length
+                if start >= attr_ends[attr] and name_re.fullmatch(html, start, pos):
+                    attr_ends[attr] = m.end()
+                    raw[value, True] = None
+            # og:image meta tags
+            if pos - 7 >= content_end and html.startswith("content", pos - 7):
+                content_end = m.end()
+                if _is_photo_url(value):
+                    raw[value, True] = None
+        elif char == "u":
+            if pos >= css_end:
+                m = _CSS_URL_RE.match(html, pos)
+                if m:
+                    css_end = m.end()
+                    raw[m.group(1), True] = None
+        elif pos >= json_end:
+            m = _JSON_IMAGE_RE.match(html, pos)
+            if m:
+                json_end = m.end()
+                raw[m.group(1), False] = None  # absolute already
+
+    urls = dict.fromkeys(urljoin(base_url, value) if join else value for value, join in raw)
     # Filter
     out = []
     for u in urls:
         if not _is_photo_url(u) or _is_junk(u):
             continue
         # Skip obviously tiny resize dimensions
-        m = re.search(r'/resize/(\d+)x(\d+)', u)
+        m = _RESIZE_RE.search(u)
         if m and (int(m.group(1)) < 300 or int(m.group(2)) < 200):
             continue
         # Skip tiny crop dimensions (brightspot CDN)
-        m = re.search(r'/crop/(\d+)x(\d+)', u)
+        m = _CROP_RE.search(u)
         if m and (int(m.group(1)) < 300 or int(m.group(2)) < 200):
             continue
         # Skip tiny dimension hints in URL like ?w=50&h=50
-        m = re.search(r'[?&]w(?:idth)?=(\d+)', u)
+        m = _WIDTH_RE.search(u)
         if m and int(m.group(1)) < 200:
             continue
         out.append(u)
@@ -280,6 +337,56 @@ def _find_listing_urls(property_name: str, address: str) -> List[str]:
     return [u for u in urls if isinstance(u, str) and u.startswith("http")]
 
 
+_listing_cache: Optional[ListingCache] = None
+_listing_cache_failed = False
+_listing_cache_lock = threading.Lock()
+
+
+def _get_listing_cache() -> Optional[ListingCache]:
+    """The process-wide ListingCache, or None if its database can't be opened."""
+    global _listing_cache, _listing_cache_failed
+    with _listing_cache_lock:
+        if _listing_cache is None and not _listing_cache_failed:
+            try:
+                _listing_cache = ListingCache()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Listing URL cache disabled: {e}")
+                _listing_cache_failed = True
+        return _listing_cache
+
+
+def _refresh_listing_urls(cache: ListingCache, key: str, property_name: str, address: str):
+    try:
+        cache.put(key, _find_listing_urls(property_name, address))
+    except Exception as e:
+        print(f"Listing URL refresh failed for {key!r}: {e}")
+
+
+def _cached_listing_urls(property_name: str, address: str, force_refresh: bool = False) -> List[str]:
+    """Listing page URLs for a property, from the cache when possible.
+
+    A stale entry is returned immediately and refreshed in the background;
+    force_refresh searches again now.
+    """
+    cache = _get_listing_cache()
+    key = property_key(property_name, address)
+    if cache is None or key == "|":
+        # No cache, or nothing to tell this property from any other
+        return _find_listing_urls(property_name, address)
+    cached = None if force_refresh else cache.get(key)
+    if cached is None:
+        urls = _find_listing_urls(property_name, address)
+        cache.put(key, urls)
+        return urls
+    urls, searched_at = cached
+    if time.time() - searched_at > LISTING_CACHE_FRESH_SECONDS and cache.claim_refresh(key):
+        threading.Thread(
+            target=_refresh_listing_urls, args=(cache, key, property_name, address),
+            name="listing-refresh", daemon=True,
+        ).start()
+    return urls
+
+
 # ---------------------------------------------------------------------------
 # Site-specific scrapers for sites that mix in lots of unrelated images
 # ---------------------------------------------------------------------------
@@ -345,23 +452,42 @@ _PORTAL_SITES = [
 ]
 
 
+def source_tier(source: str) -> int:
+    """How much to trust a photo's source: 0 listing sites, 1 other sites, 2 portals."""
+    src = source.lower()
+    for site in _LISTING_SITES:
+        if site.split(".")[0] in src:
+            return 0  # listing sites first
+    for site in _PORTAL_SITES:
+        if site.split(".")[0] in src:
+            return 2  # portal sites last
+    return 1  # everything else in the middle
+
+
 def search_property_photos(
     property_name: str,
     address: str,
+    force_refresh: bool = False,
 ) -> List[dict]:
     """Find photos of a property online.
 
-    Phase 1: Use Claude + WebSearch to find listing URLs (~30s).
-    Phase 2: Fetch each page and extract image URLs (~5-10s).
-    Phase 3: HEAD-check each candidate to filter out icons/tiny images (~2-5s).
+    Phase 1: Use Claude + WebSearch to find listing URLs (~30s), or reuse
+             the URLs cached for this property unless force_refresh.
+    Phase 2: Fetch the pages concurrently and extract image URLs (~2-5s).
+    Phase 3: HEAD-check each candidate to filter out icons/tiny images —
+             started per page as phase 2 finishes it.
 
     Returns list of {url, description, source} dicts.
     """
     results = []
     seen_keys = {}
+    # key -> (page index, position on page): keeps the order independent of
+    # which page happened to download first
+    order = {}
 
-    def _add(url: str, desc: str, source: str):
-        key = _image_key(url)
+    def _add(url: str, desc: str, source: str, position: tuple) -> bool:
+        """Add or upgrade a candidate. Returns True if `url` is now in results."""
+        key = image_key(url)
         # For resized images, prefer the largest version
         size = 0
         m = re.search(r'/resize/(\d+)x(\d+)', url)
@@ -373,25 +499,28 @@ def search_property_photos(
             old_size = int(old_m.group(1)) * int(old_m.group(2)) if old_m else 0
             if size > old_size:
                 results[idx] = {"url": url, "description": desc, "source": source}
-            return
+                return True
+            return False
         seen_keys[key] = len(results)
+        order[key] = position
         results.append({"url": url, "description": desc, "source": source})
+        return True
 
     # Phase 1: Find listing URLs
-    listing_urls = _find_listing_urls(property_name, address)
+    listing_urls = _cached_listing_urls(property_name, address, force_refresh)
+    page_urls = [u for u in listing_urls if not any(d in u for d in _SKIP_DOMAINS)]
 
-    # Phase 2: Scrape each URL (skip blocked domains)
+    # Phase 2: Scrape the pages concurrently (skip blocked domains); each
+    # page's new candidates go straight to phase 3
+    report_progress(f"Scanning {len(page_urls)} listing pages")
     # Limit per source to avoid any single site flooding results
     _MAX_PER_SOURCE = 10
     source_counts = {}
+    checks = {}  # image url -> HEAD-check future
 
-    for page_url in listing_urls:
-        if any(d in page_url for d in _SKIP_DOMAINS):
-            continue
-        html = _fetch(page_url)
+    def _scan(page_index: int, page_url: str, html: str):
         if not html:
-            continue
-
+            return
         source = _source_name(page_url)
         is_listing = any(site in page_url for site in _LISTING_SITES)
 
@@ -401,42 +530,61 @@ def search_property_photos(
         else:
             imgs = _extract_imgs(html, page_url)
 
-        for img_url in imgs:
+        for position, img_url in enumerate(imgs):
             # Enforce per-source limit (listing sites get more allowance)
             limit = _MAX_PER_SOURCE * 2 if is_listing else _MAX_PER_SOURCE
             if source_counts.get(source, 0) >= limit:
                 break
-            _add(img_url, _desc_from_url(img_url, source), source)
+            if _add(img_url, _desc_from_url(img_url, source), source, (page_index, position)) \
+                    and img_url not in checks:
+                checks[img_url] = head_pool.submit(_head_check, img_url)
             source_counts[source] = source_counts.get(source, 0) + 1
 
-    # Phase 3: HEAD-check all candidates in parallel to filter out tiny icons
-    if results:
+    with ThreadPoolExecutor(max_workers=_PAGE_WORKERS, thread_name_prefix="page") as page_pool, \
+            ThreadPoolExecutor(max_workers=10, thread_name_prefix="head") as head_pool:
+        queued = list(enumerate(page_urls))
+        running = {}  # future -> (page index, host)
+        active = Counter()  # host -> pages in flight
+        fetched = {}  # page index -> html, until the pages before it are scanned
+        next_scan = 0
+        while next_scan < len(page_urls):
+            # Hand out pages in order, skipping sites already at their
+            # limit — a worker never sits waiting on a busy site
+            waiting = []
+            for i, url in queued:
+                host = urlparse(url).netloc.lower()
+                if len(running) < _PAGE_WORKERS and active[host] < _PAGES_PER_DOMAIN:
+                    running[page_pool.submit(_fetch, url)] = (i, host)
+                    active[host] += 1
+                else:
+                    waiting.append((i, url))
+            queued = waiting
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for page in done:
+                i, host = running.pop(page)
+                active[host] -= 1
+                fetched[i] = page.result()
+
+            # Scan in search-result order so the per-source cap doesn't
+            # depend on which page downloaded first
+            while next_scan in fetched:
+                _scan(next_scan, page_urls[next_scan], fetched.pop(next_scan))
+                next_scan += 1
+
+        # Phase 3: wait for the HEAD checks still running
+        if results:
+            report_progress(f"Checking {len(results)} candidate images")
         verified = []
-        with ThreadPoolExecutor(max_workers=10) as pool:
-            futures = {
-                pool.submit(_head_check, r["url"]): r
-                for r in results
-            }
-            for future in as_completed(futures):
-                r = futures[future]
-                try:
-                    if future.result():
-                        verified.append(r)
-                except Exception:
-                    pass
+        for r in results:
+            try:
+                if checks[r["url"]].result():
+                    verified.append(r)
+            except Exception:
+                pass
         results = verified
 
     # Sort: listing-site photos first, then property websites, then portals
-    def _sort_key(r):
-        src = r["source"].lower()
-        for site in _LISTING_SITES:
-            if site.split(".")[0] in src:
-                return 0  # listing sites first
-        for site in _PORTAL_SITES:
-            if site.split(".")[0] in src:
-                return 2  # portal sites last
-        return 1  # everything else in the middle
-
-    results.sort(key=_sort_key)
+    results.sort(key=lambda r: (source_tier(r["source"]), order[image_key(r["url"])]))
 
     return results
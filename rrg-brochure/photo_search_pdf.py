@@ -1,50 +1,52 @@
 """Generate a numbered contact sheet PDF from photo search results.
 
 Downloads images from URLs and lays them out in a numbered grid so the user
-can reference photos by number (e.g., "use photo 3 as the hero").
+can reference photos by number (e.g., "use photo 3 as the hero"). Downloads
+run concurrently (image_fetch) and stream back in search order. Photos are
+shrunk to print size (thumbnails) in batches while the rest are still
+downloading, so the HTML and PDF carry ~100 KB per photo instead of the
+multi-megabyte originals.
+
+The same shot is often syndicated across Crexi, LoopNet and a broker's
+site under unrelated URLs. Photos whose dHashes are within
+_DUPLICATE_DISTANCE bits are treated as one: the sheet keeps the copy
+from the most trusted source tier, then the one with the most pixels.
 """
 
-import glob
 import io
-import os
-import tempfile
 import base64
-import requests
 from typing import List, Optional
-from playwright.sync_api import sync_playwright
-
-
-def _find_chrome_executable():
-    """Find the Chrome/Chromium executable, checking env vars and Nix store paths."""
-    path = os.environ.get("CHROMIUM_EXECUTABLE_PATH")
-    if path and os.path.isfile(path):
-        return path
-    browsers_path = os.environ.get("PLAYWRIGHT_BROWSERS_PATH", "")
-    if browsers_path:
-        matches = glob.glob(os.path.join(browsers_path, "chromium-*/chrome-linux64/chrome"))
-        if matches:
-            return matches[0]
-    return None
-
-
-def _download_image(url: str, timeout: int = 15) -> Optional[bytes]:
-    """Download an image from a URL. Returns bytes or None on failure."""
-    try:
-        resp = requests.get(url, timeout=timeout, headers={
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                          "AppleWebKit/537.36 (KHTML, like Gecko) "
-                          "Chrome/120.0.0.0 Safari/537.36",
-        })
-        resp.raise_for_status()
-        content_type = resp.headers.get("content-type", "")
-        if "image" in content_type or url.lower().endswith((".jpg", ".jpeg", ".png", ".webp", ".gif")):
-            return resp.content
-        # Some CDNs don't set content-type properly — accept if body looks like an image
-        if resp.content[:4] in (b"\xff\xd8\xff", b"\x89PNG", b"RIFF", b"GIF8"):
-            return resp.content
-        return None
-    except Exception:
-        return None
+
+from browser_pool import get_pool
+from image_fetch import fetch_images
+from photo_scraper import source_tier
+from thumbnails import Thumbnail, make_thumbnails
+
+# The 264pt x 200pt photo cell in CSS px (4/3 per pt), doubled for print
+_THUMB_WIDTH = 704
+_THUMB_HEIGHT = 534
+# Photos per thumbnail job — small enough that layout keeps pace with downloads
+_THUMB_BATCH = 8
+# Max differing dHash bits (of 64) for two photos to count as the same shot
+_DUPLICATE_DISTANCE = 10
+
+
+def _keep_best(kept: List[list], photo: dict, thumb: Thumbnail):
+    """Add a photo to `kept`, or let it replace a near-duplicate it beats.
+
+    A replacement takes over the duplicate's slot, so numbering stays in
+    search order.
+    """
+    # A flat image (hash 0) has no structure to compare
+    if thumb.dhash:
+        rank = (source_tier(photo.get("source", "")), -thumb.pixels)
+        for entry in kept:
+            other_photo, other = entry
+            if other.dhash and bin(thumb.dhash ^ other.dhash).count("1") <= _DUPLICATE_DISTANCE:
+                if rank < (source_tier(other_photo.get("source", "")), -other.pixels):
+                    entry[:] = [photo, thumb]
+                return
+    kept.append([photo, thumb])
 
 
 def _image_to_data_uri(image_bytes: bytes) -> str:
@@ -64,6 +66,22 @@ def _image_to_data_uri(image_bytes: bytes) -> str:
     return f"data:{mime};base64,{b64}"
 
 
+def _photo_card(number: int, photo: dict, image_bytes: bytes) -> str:
+    caption = f"<strong>#{number}</strong>"
+    if photo.get("source"):
+        caption += f" &mdash; {photo['source']}"
+    if photo.get("description"):
+        caption += f"<br>{photo['description']}"
+    return f"""
+        <div class="photo-card">
+            <div class="photo-img">
+                <img src="{_image_to_data_uri(image_bytes)}" alt="Photo {number}" />
+            </div>
+            <div class="photo-caption">{caption}</div>
+        </div>
+        """
+
+
 def generate_photo_search_pdf(
     photos: List[dict],
     property_name: str = "",
@@ -82,43 +100,29 @@ def generate_photo_search_pdf(
     Returns:
         PDF bytes, or None if no images could be downloaded.
     """
-    # Download all images
-    downloaded = []
-    for i, photo in enumerate(photos):
-        url = photo.get("url", "")
-        if not url:
-            continue
-        img_bytes = _download_image(url)
+    # Download concurrently; thumbnail and dedup in order as results stream in
+    candidates = [p for p in photos if p.get("url")]
+    kept = []  # [photo, Thumbnail]
+    batch = []
+
+    def _flush():
+        thumbs = make_thumbnails([img for _, img in batch], _THUMB_WIDTH, _THUMB_HEIGHT)
+        for (photo, _), thumb in zip(batch, thumbs):
+            _keep_best(kept, photo, thumb)
+        batch.clear()
+
+    for photo, (url, img_bytes) in zip(candidates, fetch_images([p["url"] for p in candidates])):
         if img_bytes:
-            downloaded.append({
-                "number": len(downloaded) + 1,
-                "data_uri": _image_to_data_uri(img_bytes),
-                "description": photo.get("description", ""),
-                "source": photo.get("source", ""),
-                "url": url,
-            })
-
-    if not downloaded:
+            batch.append((photo, img_bytes))
+        if len(batch) >= _THUMB_BATCH:
+            _flush()
+    if batch:
+        _flush()
+    photo_cards = [_photo_card(n, photo, thumb.image) for n, (photo, thumb) in enumerate(kept, 1)]
+
+    if not photo_cards:
         return None
 
-    # Build HTML
-    photo_cards = []
-    for p in downloaded:
-        caption = f"<strong>#{p['number']}</strong>"
-        if p["source"]:
-            caption += f" &mdash; {p['source']}"
-        if p["description"]:
-            caption += f"<br>{p['description']}"
-
-        photo_cards.append(f"""
-        <div class="photo-card">
-            <div class="photo-img">
-                <img src="{p['data_uri']}" alt="Photo {p['number']}" />
-            </div>
-            <div class="photo-caption">{caption}</div>
-        </div>
-        """)
-
     header = property_name
     if address:
         header += f" &mdash; {address}"
@@ -203,7 +207,7 @@ def generate_photo_search_pdf(
 <body>
     <div class="header">
         <h1>Photo Search Results</h1>
-        <p>{header} &mdash; {len(downloaded)} photos found</p>
+        <p>{header} &mdash; {len(photo_cards)} photos found</p>
     </div>
     <div class="grid">
         {"".join(photo_cards)}
@@ -214,25 +218,10 @@ def generate_photo_search_pdf(
 </body>
 </html>"""
 
-    # Render to PDF with Playwright
-    with tempfile.NamedTemporaryFile(suffix=".html", delete=False, mode="w") as tmp:
-        tmp.write(html)
-        tmp_path = tmp.name
-
-    try:
-        with sync_playwright() as p:
-            exec_path = _find_chrome_executable()
-            launch_args = {"executable_path": exec_path} if exec_path else {}
-            browser = p.chromium.launch(**launch_args)
-            page = browser.new_page()
-            page.goto(f"file://{tmp_path}", wait_until="networkidle")
-            pdf_bytes = page.pdf(
-                format="Letter",
-                print_background=True,
-                margin={"top": "0.5in", "right": "0.5in", "bottom": "0.5in", "left": "0.5in"},
-            )
-            browser.close()
-    finally:
-        os.unlink(tmp_path)
-
-    return pdf_bytes
+    # Images are inline data URIs, so the page needs nothing but the HTML
+    return get_pool().render_pdf(
+        html,
+        format="Letter",
+        print_background=True,
+        margin={"top": "0.5in", "right": "0.5in", "bottom": "0.5in", "left": "0.5in"},
+    )
@@ -1,24 +1,102 @@
 """RRG Brochure Microservice — persistent Flask container.
 
 Loads the Brochure LangGraph once at startup. Container stays warm.
-Exposes POST /process (standard worker node contract) and GET /health.
+Served by wsgi_server (WEB_WORKERS processes x WEB_THREADS threads).
+Exposes POST /process (standard worker node contract), POST /jobs +
+GET /jobs/<id> (the same turn as a background job with progress),
+GET /artifacts/<id> (generated PDFs), GET /ready (warm-up state) and
+GET /health.
 """
 
 import base64
 import os
+import threading
+import time
 import traceback
-from flask import Flask, request, jsonify
+from flask import Flask, request, g, jsonify, send_file
 
 app = Flask(__name__)
 
+
+@app.before_request
+def _start_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def _server_timing(response):
+    """Report handler time so callers can split network from processing."""
+    start = g.get("request_start")
+    if start is not None:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        response.headers["Server-Timing"] = f"app;dur={elapsed_ms:.1f}"
+    return response
+
+
 # Load graph once at startup — no cold start per request
 from graph import build_graph
 graph = build_graph()
 
+# Working brochure data lives here; the router only round-trips a session handle
+from session_store import SessionStore
+_session_store = None
+# Guards the lazily created stores below
+_init_lock = threading.Lock()
+
+
+def _get_session_store() -> SessionStore:
+    """Return the session store, opening its database on first call.
+
+    Created on first use so importing the app (tests) doesn't touch /data.
+    """
+    global _session_store
+    if _session_store is None:
+        with _init_lock:
+            if _session_store is None:
+                _session_store = SessionStore()
+    return _session_store
+
+# Generated files go to the shared artifact volume; responses carry the ID
+from artifact_store import ArtifactStore
+artifact_store = ArtifactStore()
 
-@app.route("/process", methods=["POST"])
-def process():
-    """Standard worker node endpoint.
+
+def _encode_file(raw: bytes | None) -> tuple:
+    """Return (base64, artifact_id) for a generated file.
+
+    Uses the artifact store when the shared volume is mounted, otherwise
+    falls back to inline base64.
+    """
+    if not raw:
+        return None, None
+    if artifact_store.enabled:
+        try:
+            return None, artifact_store.put(raw)
+        except OSError:
+            traceback.print_exc()
+    return base64.b64encode(raw).decode("utf-8"), None
+
+
+# Background jobs — POST /jobs + GET /jobs/<id> for long-running turns.
+# Created on first use so importing the app (tests) doesn't touch /data.
+from job_runner import JobStore, JobRunner
+_job_runner = None
+
+
+def _get_job_runner() -> JobRunner:
+    """Return the job runner, creating its store on first call."""
+    global _job_runner
+    if _job_runner is None:
+        with _init_lock:
+            if _job_runner is None:
+                _job_runner = JobRunner(JobStore(), _handle_process)
+    return _job_runner
+
+
+def _handle_process(data: dict) -> tuple:
+    """Run one /process turn. Returns (response_body, http_status).
+
+    Shared by POST /process (synchronous) and POST /jobs (background).
 
     Request:
         {
@@ -31,24 +109,43 @@ def process():
     Response:
         {
             response: str,          # message to display to user
-            state: {...},           # updated state (passed back next time)
+            state: {...},           # {session_id, brochure_active} handle (passed back next time)
             active: bool,           # true = node still owns conversation
-            pdf_bytes: str|null,    # base64-encoded PDF if generated
+            pdf_bytes: str|null,    # base64-encoded PDF (artifact store disabled)
+            pdf_artifact_id: str|null,  # artifact ID (artifact store enabled)
             pdf_filename: str|null
         }
     """
-    data = request.json or {}
     command = data.get("command", "create")
     user_message = data.get("user_message", "")
     chat_history = data.get("chat_history", [])
     prev_state = data.get("state", {})
 
-    # Build graph input from request + previous state
+    # Resolve the session handle to the stored working state. Callers that
+    # still send the full state inline (no session_id) are accepted as-is.
+    session_id = prev_state.get("session_id")
+    if session_id:
+        session = _get_session_store().get(session_id)
+        if session is None:
+            return {
+                "response": (
+                    "That brochure session expired after a period of inactivity. "
+                    "Start a new one whenever you're ready."
+                ),
+                "state": {},
+                "active": False,
+                "pdf_bytes": None,
+                "pdf_filename": None,
+            }, 200
+    else:
+        session = prev_state
+
+    # Build graph input from request + stored session state
     graph_input = {
         "command": command,
         "user_message": user_message,
         "chat_history": chat_history,
-        "brochure_data": prev_state.get("brochure_data"),
+        "brochure_data": session.get("brochure_data"),
         # Initialize output fields
         "response": "",
         "brochure_data_out": None,
@@ -62,13 +159,13 @@ def process():
         result = graph.invoke(graph_input)
     except Exception as e:
         traceback.print_exc()
-        return jsonify({
+        return {
             "response": f"Error processing brochure request: {e}",
             "state": prev_state,
             "active": prev_state.get("brochure_active", True),
             "pdf_bytes": None,
             "pdf_filename": None,
-        }), 500
+        }, 500
 
     # Build response
     response_text = result.get("response", "")
@@ -79,27 +176,102 @@ def process():
 
     # Determine current brochure data for state persistence
     # If node produced new data, use it; otherwise keep previous
-    current_brochure_data = brochure_data_out if brochure_data_out is not None else prev_state.get("brochure_data")
+    current_brochure_data = brochure_data_out if brochure_data_out is not None else session.get("brochure_data")
 
-    # If workflow ended (active=False), clear the data
-    if not brochure_active:
-        current_brochure_data = None
+    # Persist while the workflow is active; drop the session once it ends
+    session_store = _get_session_store()
+    if brochure_active:
+        session_id = session_id or session_store.new_session_id()
+        session_store.put(session_id, {"brochure_data": current_brochure_data})
+    else:
+        session_store.delete(session_id)
+        session_id = None
 
-    # Encode PDF as base64 if present
-    pdf_b64 = None
-    if pdf_bytes_raw:
-        pdf_b64 = base64.b64encode(pdf_bytes_raw).decode("utf-8")
+    # Store the PDF as an artifact (or base64 it) if present
+    pdf_b64, pdf_artifact_id = _encode_file(pdf_bytes_raw)
 
-    return jsonify({
+    return {
         "response": response_text,
         "state": {
-            "brochure_data": current_brochure_data,
+            "session_id": session_id,
             "brochure_active": brochure_active,
         },
         "active": brochure_active,
         "pdf_bytes": pdf_b64,
+        "pdf_artifact_id": pdf_artifact_id,
         "pdf_filename": pdf_filename,
-    })
+    }, 200
+
+
+@app.route("/process", methods=["POST"])
+def process():
+    """Standard worker node endpoint — see _handle_process for the contract."""
+    body, status = _handle_process(request.json or {})
+    return jsonify(body), status
+
+
+@app.route("/jobs", methods=["POST"])
+def submit_job():
+    """Run a /process request in the background.
+
+    Request: same body as /process.
+    Response: 202 {job_id} — poll GET /jobs/<job_id>.
+    """
+    job_id = _get_job_runner().submit(request.json or {})
+    return jsonify({"job_id": job_id}), 202
+
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """Job status, progress events and (when finished) the /process body.
+
+    Response:
+        {
+            job_id: str,
+            status: "queued" | "running" | "done" | "error",
+            events: [{stage, at}, ...],
+            result: {...}|null,     # /process response body once finished
+            http_status: int|null,
+            elapsed_seconds: float,
+            queue_ms: float,        # waiting for a job thread (once started)
+            worker_ms: float        # handler time (once finished)
+        }
+        404 if the job is unknown or expired.
+    """
+    job = _get_job_runner().store.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+
+# Startup warm-up — first CLI start and first Chromium launch happen
+# before the first user; GET /ready reports progress
+from warmup import Warmup, warm_claude_cli
+from graph import CLAUDE_MODEL
+import brochure_pdf
+warmup = Warmup("rrg-brochure")
+warmup.add("llm_cli", lambda: warm_claude_cli(CLAUDE_MODEL))
+warmup.add("browser", brochure_pdf.warm_up)
+
+
+@app.route("/artifacts/<artifact_id>", methods=["GET"])
+def get_artifact(artifact_id):
+    """Stream a generated file from the artifact store by ID."""
+    path = artifact_store.path(artifact_id)
+    if path is None:
+        return jsonify({"error": "Artifact not found"}), 404
+    return send_file(path, mimetype="application/pdf", conditional=True)
+
+
+@app.route("/ready", methods=["GET"])
+def ready():
+    """Readiness probe — per-component warm-up state and timings.
+
+    200 once every required warm-up step has finished, 503 while warming
+    or if one failed. /health stays a plain liveness check.
+    """
+    body = warmup.status()
+    return jsonify(body), 200 if body["ready"] else 503
 
 
 @app.route("/health", methods=["GET"])
@@ -111,4 +283,5 @@ def health():
 if __name__ == "__main__":
     port = int(os.getenv("PORT", "8101"))
     print(f"rrg-brochure starting on port {port}")
-    app.run(host="0.0.0.0", port=port)
+    from wsgi_server import serve
+    serve(app, port, on_worker_start=warmup.start)
@@ -0,0 +1,6 @@
+"""Shared fixtures for rrg-brochure test suite."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
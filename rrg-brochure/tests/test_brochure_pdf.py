@@ -0,0 +1,74 @@
+"""Tests for brochure_pdf.py's rendered-PDF cache."""
+
+import os
+
+import pytest
+
+try:
+    import brochure_pdf
+except ImportError:
+    pytest.skip("Playwright is not available", allow_module_level=True)
+
+SAMPLE = {
+    "property_name": "Oak Plaza",
+    "address_line1": "100 Main St",
+    "address_line2": "Ann Arbor, MI 48104",
+    "price": "$1,250,000",
+    "highlights": ["Corner lot", "Fully leased"],
+}
+
+
+class FakePool:
+    def __init__(self):
+        self.renders = []
+
+    def render_pdf(self, html, **options):
+        self.renders.append((html, options))
+        return b"%PDF-" + str(len(self.renders)).encode()
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(brochure_pdf, "get_pool", lambda: pool)
+    monkeypatch.setattr(brochure_pdf, "_pdf_cache", type(brochure_pdf._pdf_cache)())
+    return pool
+
+
+def test_same_brochure_renders_once(pool):
+    first = brochure_pdf.generate_brochure_pdf(SAMPLE)
+    assert brochure_pdf.generate_brochure_pdf(dict(SAMPLE)) == first
+    assert len(pool.renders) == 1
+
+
+def test_changed_field_renders_again(pool):
+    brochure_pdf.generate_brochure_pdf(SAMPLE)
+    brochure_pdf.generate_brochure_pdf(dict(SAMPLE, price="$1,300,000"))
+    assert len(pool.renders) == 2
+    assert "$1,300,000" in pool.renders[1][0]
+
+
+def test_replaced_photo_renders_again(pool, tmp_path):
+    photo = tmp_path / "hero.jpg"
+    photo.write_bytes(b"\xff\xd8\xff old")
+    data = dict(SAMPLE, hero_image_path=str(photo))
+    brochure_pdf.generate_brochure_pdf(data)
+    brochure_pdf.generate_brochure_pdf(data)
+    assert len(pool.renders) == 1
+
+    photo.write_bytes(b"\xff\xd8\xff new photo")
+    stat = os.stat(photo)
+    os.utime(photo, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    brochure_pdf.generate_brochure_pdf(data)
+    assert len(pool.renders) == 2
+    (name, path), = pool.renders[1][1]["files"].items()
+    assert path == str(photo)
+    assert f"files/{name}" in pool.renders[1][0]
+
+
+def test_cache_is_bounded(pool, monkeypatch):
+    monkeypatch.setattr(brochure_pdf, "PDF_CACHE_SIZE", 2)
+    for price in ("$1", "$2", "$3"):
+        brochure_pdf.generate_brochure_pdf(dict(SAMPLE, price=price))
+    brochure_pdf.generate_brochure_pdf(dict(SAMPLE, price="$1"))
+    assert len(pool.renders) == 4
@@ -0,0 +1,245 @@
+"""Tests for browser_pool.py — render queue, page recycling and crash recovery.
+
+Playwright is replaced by a small fake, so no Chromium is needed; the
+module itself still needs the playwright package to import.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+try:
+    import browser_pool
+except ImportError:
+    pytest.skip("Playwright is not available", allow_module_level=True)
+
+from browser_pool import BrowserPool
+
+
+class FakePage:
+    def __init__(self, browser, context):
+        self.browser = browser
+        self.context = context
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def goto(self, url, wait_until=None):
+        pass
+
+    async def evaluate(self, script, arg=None):
+        return 0
+
+    async def pdf(self, **options):
+        return await self.browser.on_pdf(self)
+
+    def is_closed(self):
+        return self.context.closed
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def new_page(self):
+        return FakePage(self.browser, self)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, playwright):
+        self.playwright = playwright
+        self.connected = True
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+    async def on_pdf(self, page):
+        return await self.playwright.on_pdf(page)
+
+    async def close(self):
+        self.connected = False
+
+
+class FakePlaywright:
+    """async_playwright() stand-in; `on_pdf` decides what page.pdf() does."""
+
+    def __init__(self):
+        self.browsers = []
+        self.chromium = self
+        self.on_pdf = self._default_pdf
+
+    async def _default_pdf(self, page):
+        return b"%PDF"
+
+    # async_playwright().start()
+    async def start(self):
+        return self
+
+    async def launch(self, **kwargs):
+        browser = FakeBrowser(self)
+        self.browsers.append(browser)
+        return browser
+
+    async def stop(self):
+        pass
+
+    @property
+    def contexts(self):
+        return [c for b in self.browsers for c in b.contexts]
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    fake = FakePlaywright()
+    monkeypatch.setattr(browser_pool, "async_playwright", lambda: fake)
+    monkeypatch.setattr(browser_pool, "find_chrome_executable", lambda: None)
+    return fake
+
+
+@pytest.fixture
+def make_pool(fake_playwright):
+    pools = []
+
+    def _make(**kwargs):
+        pool = BrowserPool(**kwargs)
+        pools.append(pool)
+        return pool
+
+    yield _make
+    for pool in pools:
+        pool.close()
+
+
+def _render_all(pool, n):
+    results = [None] * n
+
+    def render(i):
+        results[i] = pool.render_pdf(f"<p>{i}</p>")
+
+    threads = [threading.Thread(target=render, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+class TestRenderQueue:
+    """At most max_pages renders run at once; the rest wait their turn."""
+
+    def test_concurrency_is_bounded(self, make_pool, fake_playwright):
+        running = []
+        peak = []
+
+        async def slow_pdf(page):
+            running.append(page)
+            peak.append(len(running))
+            await asyncio.sleep(0.05)
+            running.remove(page)
+            return b"%PDF"
+
+        fake_playwright.on_pdf = slow_pdf
+        pool = make_pool(max_pages=2)
+        assert _render_all(pool, 6) == [b"%PDF"] * 6
+        assert max(peak) == 2
+        assert len(fake_playwright.contexts) == 2  # pages reused, not one per job
+        stats = pool.stats()
+        assert stats["renders"] == 6
+        assert stats["active"] == stats["queued"] == 0
+        assert stats["launches"] == 1
+
+
+class TestPageRecycling:
+    def test_page_replaced_after_max_renders(self, make_pool, fake_playwright):
+        pool = make_pool(max_pages=1, page_max_renders=2)
+        for _ in range(5):
+            pool.render_pdf("<p>x</p>")
+        contexts = fake_playwright.contexts
+        assert len(contexts) == 3
+        assert [c.closed for c in contexts] == [True, True, False]
+
+    def test_failed_render_closes_its_page(self, make_pool, fake_playwright):
+        async def broken_pdf(page):
+            raise RuntimeError("print failed")
+
+        fake_playwright.on_pdf = broken_pdf
+        pool = make_pool(max_pages=1)
+        with pytest.raises(RuntimeError, match="print failed"):
+            pool.render_pdf("<p>x</p>")
+        assert fake_playwright.contexts[0].closed
+        assert pool.retries == 0  # browser still up — no retry
+
+        fake_playwright.on_pdf = fake_playwright._default_pdf
+        assert pool.render_pdf("<p>x</p>") == b"%PDF"
+        assert len(fake_playwright.contexts) == 2
+
+    def test_timed_out_render_releases_its_page(self, make_pool, fake_playwright, monkeypatch):
+        async def hung_pdf(page):
+            await asyncio.sleep(30)
+
+        fake_playwright.on_pdf = hung_pdf
+        monkeypatch.setattr(browser_pool, "BROWSER_RENDER_TIMEOUT_SECONDS", 0.1)
+        pool = make_pool(max_pages=1)
+        with pytest.raises(TimeoutError):
+            pool.render_pdf("<p>x</p>")
+
+        deadline = time.time() + 2
+        while pool.stats()["active"] and time.time() < deadline:
+            time.sleep(0.01)
+        assert pool.stats()["active"] == 0
+        assert fake_playwright.contexts[0].closed
+        assert pool.stats()["idle_pages"] == 0
+
+        # The queue slot came back — the next render isn't stuck behind it
+        fake_playwright.on_pdf = fake_playwright._default_pdf
+        assert pool.render_pdf("<p>x</p>") == b"%PDF"
+
+
+class TestCrashRecovery:
+    def test_browser_crash_relaunches_and_retries_once(self, make_pool, fake_playwright):
+        calls = []
+
+        async def crash_once(page):
+            calls.append(page)
+            if len(calls) == 1:
+                page.browser.connected = False
+                raise RuntimeError("Target closed")
+            return b"%PDF"
+
+        fake_playwright.on_pdf = crash_once
+        pool = make_pool(max_pages=1)
+        assert pool.render_pdf("<p>x</p>") == b"%PDF"
+        assert pool.launches == 2
+        assert pool.retries == 1
+        assert calls[1].browser is not calls[0].browser
+
+    def test_second_crash_is_raised(self, make_pool, fake_playwright):
+        async def always_crash(page):
+            page.browser.connected = False
+            raise RuntimeError("Target closed")
+
+        fake_playwright.on_pdf = always_crash
+        pool = make_pool(max_pages=1)
+        with pytest.raises(RuntimeError, match="Target closed"):
+            pool.render_pdf("<p>x</p>")
+        assert pool.retries == 1
+
+    def test_idle_pages_of_dead_browser_are_dropped(self, make_pool, fake_playwright):
+        pool = make_pool(max_pages=1)
+        pool.render_pdf("<p>x</p>")
+        fake_playwright.browsers[0].connected = False
+        pool.render_pdf("<p>x</p>")
+        assert pool.launches == 2
+        assert fake_playwright.contexts[1] in fake_playwright.browsers[1].contexts
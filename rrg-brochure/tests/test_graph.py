@@ -0,0 +1,36 @@
+"""Tests for graph.py helpers that don't need the LLM or a browser."""
+
+import pytest
+
+try:
+    from graph import _FRESH_SEARCH_RE
+except ImportError:
+    pytest.skip("Playwright is not available", allow_module_level=True)
+
+
+class TestFreshSearch:
+    """Only an explicit request to search again skips the listing URL cache."""
+
+    @pytest.mark.parametrize("message", [
+        "search again",
+        "Can you look again for photos?",
+        "do a fresh search",
+        "try a new search please",
+        "re-search the listings",
+        "redo the photo search",
+        "rerun the search",
+        "refresh the search",
+    ])
+    def test_matches(self, message):
+        assert _FRESH_SEARCH_RE.search(message)
+
+    @pytest.mark.parametrize("message", [
+        "find photos",
+        "send it again",
+        "new photos of the lobby",
+        "use the fresh paint shot",
+        "research the area",
+        "refresh my memory on the cap rate",
+    ])
+    def test_no_match(self, message):
+        assert not _FRESH_SEARCH_RE.search(message)
@@ -0,0 +1,192 @@
+"""Tests for image_cache.py and the cache path through image_fetch.download_image."""
+
+import os
+import time
+
+import pytest
+
+import image_cache
+import image_fetch
+from image_cache import ImageCache, get_image_cache
+
+JPEG = b"\xff\xd8\xff" + b"photo" * 20
+SMALL = "https://img.example.com/resize/320x240/listing/abc.jpg"
+LARGE = "https://img.example.com/resize/1600x1200/listing/abc.jpg"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ImageCache(str(tmp_path / "images"), max_bytes=10 * 1024 * 1024)
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+    def iter_content(self, chunk_size):
+        yield self.body
+
+
+class FakeSession:
+    """requests.Session stand-in; answers every GET with the next queued response."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, stream=False, headers=None, timeout=None):
+        self.requests.append((url, headers or {}))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def use_cache(cache, monkeypatch):
+    monkeypatch.setattr(image_fetch, "get_image_cache", lambda: cache)
+    return cache
+
+
+def _session(monkeypatch, *responses):
+    session = FakeSession(*responses)
+    monkeypatch.setattr(image_fetch, "get_session", lambda: session)
+    return session
+
+
+# ===========================================================================
+# Lookup
+# ===========================================================================
+
+class TestLookup:
+    """Rows are per URL; image_key finds any size of the same photo."""
+
+    def test_sizes_keep_their_own_entries(self, cache):
+        cache.store(SMALL, b"small" + JPEG, {"ETag": '"s"'})
+        cache.store(LARGE, b"large" + JPEG, {"ETag": '"l"'})
+        assert cache.lookup(SMALL).read() == b"small" + JPEG
+        assert cache.lookup(LARGE).read() == b"large" + JPEG
+        assert cache.lookup(SMALL).etag == '"s"'
+        assert cache.lookup(SMALL).key == cache.lookup(LARGE).key
+
+    def test_lookup_is_exact(self, cache):
+        cache.store(SMALL, JPEG, {})
+        assert cache.lookup(LARGE) is None
+        assert cache.lookup_variant(LARGE).url == SMALL
+
+    def test_variant_prefers_exact_then_newest(self, cache):
+        cache.store(SMALL, b"small" + JPEG, {})
+        cache.store(LARGE, b"large" + JPEG, {})
+        assert cache.lookup_variant(SMALL).url == SMALL
+        other = "https://img.example.com/resize/800x600/listing/abc.jpg"
+        assert cache.lookup_variant(other).url == LARGE
+
+    def test_store_replaces_same_url(self, cache):
+        cache.store(SMALL, b"old" + JPEG, {})
+        cache.store(SMALL, b"new" + JPEG, {})
+        assert cache.lookup(SMALL).read() == b"new" + JPEG
+
+    def test_unknown(self, cache):
+        assert cache.lookup(SMALL) is None
+        assert cache.lookup_variant(SMALL) is None
+
+
+# ===========================================================================
+# Eviction
+# ===========================================================================
+
+class TestEviction:
+    def test_evicted_blob_drops_its_row(self, tmp_path):
+        cache = ImageCache(str(tmp_path / "images"), max_bytes=len(JPEG) + 10)
+        first = cache.store(SMALL, b"a" + JPEG, {})
+        past = time.time() - 60
+        os.utime(first.path, (past, past))
+        cache.store("https://other.example.com/b.jpg", b"b" + JPEG, {})
+
+        assert not os.path.exists(first.path)
+        assert cache.lookup(SMALL) is None
+        assert cache.lookup_variant(LARGE) is None
+        assert cache.lookup("https://other.example.com/b.jpg").read() == b"b" + JPEG
+
+    def test_read_after_eviction(self, cache):
+        entry = cache.store(SMALL, JPEG, {})
+        os.unlink(entry.path)
+        assert entry.read() is None
+
+
+# ===========================================================================
+# download_image through the cache
+# ===========================================================================
+
+class TestDownload:
+    def test_miss_downloads_and_stores(self, use_cache, monkeypatch):
+        session = _session(monkeypatch, FakeResponse(200, JPEG, {"content-type": "image/jpeg", "ETag": '"v1"'}))
+        assert image_fetch.download_image(SMALL) == JPEG
+        assert session.requests == [(SMALL, {})]
+        assert use_cache.lookup(SMALL).etag == '"v1"'
+
+    def test_fresh_hit_makes_no_request(self, use_cache, monkeypatch):
+        use_cache.store(SMALL, JPEG, {})
+        session = _session(monkeypatch)
+        assert image_fetch.download_image(SMALL) == JPEG
+        assert session.requests == []
+
+    def test_other_size_is_downloaded(self, use_cache, monkeypatch):
+        use_cache.store(SMALL, b"small" + JPEG, {})
+        _session(monkeypatch, FakeResponse(200, b"large" + JPEG, {"content-type": "image/jpeg"}))
+        assert image_fetch.download_image(LARGE) == b"large" + JPEG
+        assert use_cache.lookup(SMALL).read() == b"small" + JPEG
+
+    def test_stale_entry_revalidated_with_304(self, use_cache, monkeypatch):
+        use_cache.store(SMALL, JPEG, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        monkeypatch.setattr(image_cache, "IMAGE_CACHE_FRESH_SECONDS", 0)
+        before = use_cache.lookup(SMALL).fetched_at
+        session = _session(monkeypatch, FakeResponse(304, headers={"ETag": '"v2"'}))
+
+        assert image_fetch.download_image(SMALL) == JPEG
+        (_, headers), = session.requests
+        assert headers == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        entry = use_cache.lookup(SMALL)
+        assert entry.etag == '"v2"'
+        assert entry.fetched_at >= before
+
+    def test_stale_entry_replaced_on_200(self, use_cache, monkeypatch):
+        use_cache.store(SMALL, b"old" + JPEG, {"ETag": '"v1"'})
+        monkeypatch.setattr(image_cache, "IMAGE_CACHE_FRESH_SECONDS", 0)
+        _session(monkeypatch, FakeResponse(200, b"new" + JPEG, {"content-type": "image/jpeg", "ETag": '"v2"'}))
+        assert image_fetch.download_image(SMALL) == b"new" + JPEG
+        assert use_cache.lookup(SMALL).read() == b"new" + JPEG
+
+
+# ===========================================================================
+# Disabled cache
+# ===========================================================================
+
+class TestDisabled:
+    @pytest.fixture
+    def unusable_dir(self, tmp_path, monkeypatch):
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("")
+        monkeypatch.setattr(image_cache, "IMAGE_CACHE_DIR", str(blocker / "cache"))
+        monkeypatch.setattr(image_cache, "_cache", None)
+        monkeypatch.setattr(image_cache, "_cache_failed", False)
+
+    def test_unusable_dir_disables_cache(self, unusable_dir):
+        assert get_image_cache() is None
+        assert image_cache._cache_failed
+        assert get_image_cache() is None  # not retried
+
+    def test_download_without_cache(self, unusable_dir, monkeypatch):
+        session = _session(monkeypatch, FakeResponse(200, JPEG, {"content-type": "image/jpeg"}))
+        assert image_fetch.download_image(SMALL) == JPEG
+        assert image_fetch.cached_image_path(SMALL) is None
+        assert len(session.requests) == 1
@@ -0,0 +1,127 @@
+"""Tests for listing_cache.py and photo_scraper's use of it."""
+
+import time
+
+import pytest
+
+import listing_cache
+import photo_scraper
+from listing_cache import ListingCache, normalize_address, property_key
+
+URLS = ["https://www.loopnet.com/Listing/1", "https://www.crexi.com/properties/2"]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ListingCache(str(tmp_path / "listing_urls.db"))
+
+
+def _age(cache, key, seconds):
+    conn = cache._connect()
+    conn.execute("UPDATE listing_searches SET searched_at = ? WHERE key = ?", (time.time() - seconds, key))
+    conn.commit()
+    conn.close()
+
+
+# ===========================================================================
+# property_key
+# ===========================================================================
+
+class TestPropertyKey:
+    def test_spellings_share_a_key(self):
+        assert property_key("Oak Plaza", "100 Main Street, Suite 4") == \
+            property_key("oak  plaza", "100 main st. ste 4")
+
+    def test_street_words_shortened(self):
+        assert normalize_address("12 North Elm Avenue") == "12 n elm ave"
+
+    def test_name_and_address_kept_apart(self):
+        assert property_key("Oak", "Plaza") != property_key("Oak Plaza", "")
+
+    def test_empty(self):
+        assert property_key("", None) == "|"
+        assert property_key(" ,. ", "--") == "|"
+
+
+# ===========================================================================
+# ListingCache
+# ===========================================================================
+
+class TestListingCache:
+    def test_put_and_get(self, cache):
+        assert cache.get("oak|1 main st") is None
+        cache.put("oak|1 main st", URLS)
+        urls, searched_at = cache.get("oak|1 main st")
+        assert urls == URLS
+        assert time.time() - searched_at < 5
+
+    def test_put_replaces(self, cache):
+        cache.put("k", URLS)
+        cache.put("k", URLS[:1])
+        assert cache.get("k")[0] == URLS[:1]
+
+    def test_empty_results_not_cached(self, cache):
+        cache.put("k", [])
+        assert cache.get("k") is None
+        cache.put("k", URLS)
+        cache.put("k", [])  # a failed refresh keeps the old URLs
+        assert cache.get("k")[0] == URLS
+
+    def test_too_old_is_ignored(self, cache):
+        cache.put("k", URLS)
+        _age(cache, "k", listing_cache.LISTING_CACHE_MAX_AGE_SECONDS + 1)
+        assert cache.get("k") is None
+
+    def test_claim_refresh_once(self, cache):
+        assert not cache.claim_refresh("k")  # nothing to refresh
+        cache.put("k", URLS)
+        assert cache.claim_refresh("k")
+        assert not cache.claim_refresh("k")
+        cache.put("k", URLS)  # the refresh finished
+        assert cache.claim_refresh("k")
+
+    def test_failed_refresh_releases_claim(self, cache):
+        cache.put("k", URLS)
+        assert cache.claim_refresh("k")
+        cache.put("k", [])
+        assert cache.claim_refresh("k")
+
+    def test_dead_claim_taken_over(self, cache, monkeypatch):
+        cache.put("k", URLS)
+        assert cache.claim_refresh("k")
+        monkeypatch.setattr(listing_cache, "_REFRESH_CLAIM_SECONDS", -1)
+        assert cache.claim_refresh("k")
+
+
+# ===========================================================================
+# photo_scraper._cached_listing_urls
+# ===========================================================================
+
+class TestCachedListingUrls:
+    @pytest.fixture
+    def searches(self, cache, monkeypatch):
+        calls = []
+
+        def find(property_name, address):
+            calls.append((property_name, address))
+            return list(URLS)
+
+        monkeypatch.setattr(photo_scraper, "_find_listing_urls", find)
+        monkeypatch.setattr(photo_scraper, "_get_listing_cache", lambda: cache)
+        return calls
+
+    def test_second_search_is_cached(self, searches):
+        assert photo_scraper._cached_listing_urls("Oak Plaza", "100 Main Street") == URLS
+        assert photo_scraper._cached_listing_urls("oak plaza", "100 main st") == URLS
+        assert len(searches) == 1
+
+    def test_force_refresh_searches(self, searches):
+        photo_scraper._cached_listing_urls("Oak Plaza", "1 Main St")
+        photo_scraper._cached_listing_urls("Oak Plaza", "1 Main St", force_refresh=True)
+        assert len(searches) == 2
+
+    def test_unnamed_property_not_cached(self, searches, cache):
+        photo_scraper._cached_listing_urls("", "")
+        photo_scraper._cached_listing_urls(None, " ")
+        assert len(searches) == 2
+        assert cache.get("|") is None
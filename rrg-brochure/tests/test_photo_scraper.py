@@ -0,0 +1,85 @@
+"""Tests for photo_scraper.search_property_photos — page scheduling and the per-source cap."""
+
+import threading
+import time
+
+import pytest
+
+import photo_scraper
+
+
+def _page(tag, n):
+    return "".join(f'<img src="https://cdn.{tag}.com/photos/{tag}-{i}.jpg">' for i in range(n))
+
+
+@pytest.fixture
+def fake_web(monkeypatch):
+    """Listing pages served from a dict, with per-page delays; every photo passes HEAD."""
+    web = {"pages": {}, "delays": {}, "active": {}, "peak": {}, "fetched": []}
+    lock = threading.Lock()
+
+    def fetch(url, timeout=10):
+        host = photo_scraper.urlparse(url).netloc
+        with lock:
+            web["active"][host] = web["active"].get(host, 0) + 1
+            web["peak"][host] = max(web["peak"].get(host, 0), web["active"][host])
+            web["fetched"].append(url)
+        time.sleep(web["delays"].get(url, 0.01))
+        with lock:
+            web["active"][host] -= 1
+        return web["pages"].get(url, "")
+
+    monkeypatch.setattr(photo_scraper, "_fetch", fetch)
+    monkeypatch.setattr(photo_scraper, "_head_check", lambda url: True)
+    monkeypatch.setattr(photo_scraper, "report_progress", lambda msg: None)
+    monkeypatch.setattr(photo_scraper, "_cached_listing_urls",
+                        lambda name, address, force_refresh=False: list(web["pages"]))
+    return web
+
+
+def _search():
+    return [r["url"] for r in photo_scraper.search_property_photos("Oak Plaza", "1 Oak St")]
+
+
+class TestPerSourceCap:
+    """The cap keeps the same photos whichever page downloads first."""
+
+    def _two_pages_one_source(self, fake_web):
+        first = "https://www.example.com/oak-plaza"
+        second = "https://www.example.com/oak-plaza/gallery"
+        fake_web["pages"] = {first: _page("first", 8), second: _page("second", 8)}
+        return first, second
+
+    def test_first_page_fills_the_quota(self, fake_web):
+        first, second = self._two_pages_one_source(fake_web)
+        fake_web["delays"] = {first: 0.2}  # the second page arrives long before
+        urls = _search()
+        assert len(urls) == 10
+        assert sum("first-" in u for u in urls) == 8
+        assert sum("second-" in u for u in urls) == 2
+
+    def test_same_result_either_arrival_order(self, fake_web):
+        first, second = self._two_pages_one_source(fake_web)
+        fake_web["delays"] = {first: 0.2}
+        slow_first = _search()
+        fake_web["delays"] = {second: 0.2}
+        assert _search() == slow_first
+
+
+class TestPageScheduling:
+    def test_per_site_limit_without_blocking_other_sites(self, fake_web):
+        busy = [f"https://www.busysite.com/p{i}" for i in range(6)]
+        other = [f"https://www.othersite.com/p{i}" for i in range(3)]
+        fake_web["pages"] = {url: _page(f"s{i}", 1) for i, url in enumerate(busy + other)}
+        fake_web["delays"] = {url: 0.05 for url in busy}
+        _search()
+        assert fake_web["peak"]["www.busysite.com"] == photo_scraper._PAGES_PER_DOMAIN
+        # The other site's pages went out before the busy site's queue drained
+        assert fake_web["fetched"].index(other[-1]) < fake_web["fetched"].index(busy[-1])
+
+    def test_failed_pages_are_skipped(self, fake_web):
+        fake_web["pages"] = {
+            "https://www.example.com/gone": "",
+            "https://www.othersite.com/ok": _page("ok", 2),
+        }
+        assert len(_search()) == 2
@@ -0,0 +1,114 @@
+"""Tests for server.py — the /process session path and background jobs.
+
+The graph is replaced by a mock and the stores point at tmp_path; the
+app itself still needs Playwright to import (brochure_pdf).
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+try:
+    import server
+except ImportError:
+    pytest.skip("Playwright is not available", allow_module_level=True)
+
+from job_runner import JobRunner, JobStore
+from session_store import SessionStore
+
+
+def _turn(response="Here's the brochure.", data=None, active=True):
+    return {
+        "response": response,
+        "brochure_data_out": data,
+        "brochure_active_out": active,
+        "pdf_bytes": None,
+        "pdf_filename": None,
+    }
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    mock_graph = MagicMock()
+    monkeypatch.setattr(server, "graph", mock_graph)
+    monkeypatch.setattr(server, "_session_store", SessionStore(str(tmp_path / "sessions.db")))
+    monkeypatch.setattr(
+        server, "_job_runner", JobRunner(JobStore(str(tmp_path / "jobs.db")), server._handle_process)
+    )
+    return server.app.test_client(), mock_graph
+
+
+def _process(client, state=None, message="make a brochure"):
+    resp = client.post("/process", json={
+        "command": "continue" if state else "create",
+        "user_message": message,
+        "chat_history": [],
+        "state": state or {},
+    })
+    assert resp.status_code == 200
+    return resp.get_json()
+
+
+def test_import_does_not_open_stores():
+    """Stores open on first use, so importing the app doesn't touch /data."""
+    assert server._session_store is None
+    assert server._job_runner is None
+
+
+class TestSessionPath:
+    """The router round-trips a session_id; the brochure data stays here."""
+
+    def test_data_is_kept_behind_the_session(self, client):
+        client, graph = client
+        graph.invoke.return_value = _turn(data={"property_name": "Oak Plaza"})
+        body = _process(client)
+        session_id = body["state"]["session_id"]
+        assert session_id
+        assert "brochure_data" not in body["state"]
+        assert server._get_session_store().get(session_id) == {"brochure_data": {"property_name": "Oak Plaza"}}
+
+        graph.invoke.return_value = _turn(response="Updated.")
+        body = _process(client, state=body["state"], message="change the price")
+        assert body["state"]["session_id"] == session_id
+        assert graph.invoke.call_args[0][0]["brochure_data"] == {"property_name": "Oak Plaza"}
+
+    def test_finished_workflow_drops_session(self, client):
+        client, graph = client
+        graph.invoke.return_value = _turn(data={"property_name": "Oak Plaza"})
+        state = _process(client)["state"]
+        graph.invoke.return_value = _turn(response="Done.", active=False)
+        body = _process(client, state=state, message="approve")
+        assert body["state"]["session_id"] is None
+        assert server._get_session_store().get(state["session_id"]) is None
+
+    def test_expired_session(self, client):
+        client, graph = client
+        body = _process(client, state={"session_id": "gone", "brochure_active": True})
+        assert "expired" in body["response"]
+        assert body["active"] is False
+        graph.invoke.assert_not_called()
+
+    def test_inline_state_still_accepted(self, client):
+        client, graph = client
+        graph.invoke.return_value = _turn()
+        _process(client, state={"brochure_data": {"property_name": "Inline"}, "brochure_active": True})
+        assert graph.invoke.call_args[0][0]["brochure_data"] == {"property_name": "Inline"}
+
+
+def test_job_runs_the_same_turn(client):
+    client, graph = client
+    graph.invoke.return_value = _turn(data={"property_name": "Oak Plaza"})
+    resp = client.post("/jobs", json={"command": "create", "user_message": "brochure", "state": {}})
+    assert resp.status_code == 202
+    job_id = resp.get_json()["job_id"]
+
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        job = client.get(f"/jobs/{job_id}").get_json()
+        if job["status"] in ("done", "error"):
+            break
+        time.sleep(0.02)
+    assert job["status"] == "done"
+    assert job["result"]["state"]["session_id"]
+    assert client.get("/jobs/unknown").status_code == 404
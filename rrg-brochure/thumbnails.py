@@ -0,0 +1,102 @@
+"""Print-size thumbnails for photos embedded in PDFs.
+
+Listing photos arrive as multi-megabyte originals, but the contact sheet
+shows each in a 264pt x 200pt card. make_thumbnails() shrinks a batch to
+cover a pixel box (callers pass 2x the CSS size, so print stays sharp) in
+one pooled Chromium job — see BrowserPool.downscale_images — and
+re-encodes them as THUMBNAIL_FORMAT. The same pass measures each photo
+and computes its dHash, for near-duplicate detection (see
+photo_search_pdf).
+
+Results are cached in memory by content hash and box, so the same photo
+found again (another search, a re-run) isn't decoded twice. Images that
+are already small, or that Chromium can't decode, are returned as-is, as
+is the whole batch if the browser job fails.
+
+Settings (env):
+    THUMBNAIL_FORMAT       — jpeg or webp (default jpeg: Chromium's PDF
+                             output embeds JPEG as-is and re-compresses
+                             other formats losslessly)
+    THUMBNAIL_QUALITY      — encoder quality 0-1 (default 0.85)
+    THUMBNAIL_CACHE_ITEMS  — thumbnails kept per process (default 512)
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from browser_pool import get_pool
+
+THUMBNAIL_FORMAT = os.getenv("THUMBNAIL_FORMAT", "jpeg")
+THUMBNAIL_QUALITY = float(os.getenv("THUMBNAIL_QUALITY", "0.85"))
+THUMBNAIL_CACHE_ITEMS = int(os.getenv("THUMBNAIL_CACHE_ITEMS", "512"))
+
+
+
+@dataclass
+class Thumbnail:
+    """A photo ready to embed, with what the decode learned about it."""
+
+    image: bytes  # the thumbnail, or the original if that is as small
+    width: int = 0  # original size in pixels (0 if it didn't decode)
+    height: int = 0
+    dhash: Optional[int] = None  # 64-bit difference hash
+
+    @property
+    def pixels(self) -> int:
+        return self.width * self.height
+
+
+# (content hash, width, height, format) -> Thumbnail, with image=b"" where
+# the original is kept (the original's bytes aren't held in the cache)
+_cache: "OrderedDict[Tuple[str, int, int, str], Thumbnail]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_get(key) -> Optional[Thumbnail]:
+    with _cache_lock:
+        thumb = _cache.get(key)
+        if thumb is not None:
+            _cache.move_to_end(key)
+        return thumb
+
+
+def _cache_put(key, thumb: Thumbnail):
+    with _cache_lock:
+        _cache[key] = thumb
+        _cache.move_to_end(key)
+        while len(_cache) > THUMBNAIL_CACHE_ITEMS:
+            _cache.popitem(last=False)
+
+
+def make_thumbnails(images: List[bytes], width: int, height: int) -> List[Thumbnail]:
+    """Return each image shrunk to cover width x height pixels (or unchanged)."""
+    keys = [(hashlib.sha256(img).hexdigest(), width, height, THUMBNAIL_FORMAT) for img in images]
+    out: List[Optional[Thumbnail]] = [_cache_get(key) for key in keys]
+    missing = [i for i, thumb in enumerate(out) if thumb is None]
+    if missing:
+        try:
+            results = get_pool().downscale_images(
+                [images[i] for i in missing], width, height,
+                mime=f"image/{THUMBNAIL_FORMAT}", quality=THUMBNAIL_QUALITY,
+            )
+        except Exception as e:
+            print(f"Thumbnails failed, embedding originals: {e}")
+            results = None
+        for n, i in enumerate(missing):
+            r = results[n] if results else None
+            if r is None:
+                thumb = Thumbnail(b"")  # didn't decode — embed as-is
+            else:
+                smaller = r["image"] if r["image"] and len(r["image"]) < len(images[i]) else b""
+                thumb = Thumbnail(smaller, r["width"], r["height"], r["dhash"])
+            if results is not None:
+                _cache_put(keys[i], thumb)  # a failed job isn't cached
+            out[i] = thumb
+    return [
+        thumb if thumb.image else Thumbnail(img, thumb.width, thumb.height, thumb.dhash)
+        for thumb, img in zip(out, images)
+    ]
@@ -0,0 +1,125 @@
+"""Content-addressed artifact store for generated files (PDF, DOCX).
+
+Files live on a volume shared by the workers and the router, named by the
+SHA-256 of their bytes. Workers put a file and return its artifact ID in
+the /process response instead of base64-encoding it; the router streams
+the file back on demand (from the shared volume, or from the worker's
+GET /artifacts/<id> endpoint).
+
+The store is bounded by ARTIFACT_MAX_BYTES. When a put pushes it over,
+the least recently used files (by mtime — reads touch it) are deleted.
+
+If ARTIFACT_DIR doesn't exist the store is disabled and callers fall back
+to inline base64.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", "/artifacts")
+ARTIFACT_MAX_BYTES = int(os.getenv("ARTIFACT_MAX_BYTES", str(1024 * 1024 * 1024)))  # 1 GB
+
+_ID_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class ArtifactStore:
+    """Hash-named files in a directory, with size-based LRU eviction."""
+
+    def __init__(self, root: str | None = None, max_bytes: int | None = None):
+        self.root = root or ARTIFACT_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else ARTIFACT_MAX_BYTES
+
+    @property
+    def enabled(self) -> bool:
+        """True if the artifact directory exists and is writable."""
+        return os.path.isdir(self.root) and os.access(self.root, os.W_OK)
+
+    @staticmethod
+    def is_valid_id(artifact_id: str) -> bool:
+        """Artifact IDs are lowercase hex SHA-256 digests (guards path traversal)."""
+        return bool(artifact_id) and bool(_ID_RE.match(artifact_id))
+
+    def _path(self, artifact_id: str) -> str:
+        return os.path.join(self.root, artifact_id)
+
+    def put(self, data: bytes) -> str:
+        """Store bytes and return their artifact ID. Identical bytes dedupe."""
+        artifact_id = hashlib.sha256(data).hexdigest()
+        path = self._path(artifact_id)
+        if os.path.exists(path):
+            os.utime(path)  # refresh LRU position
+            return artifact_id
+
+        # Write to a temp file then rename, so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        self.evict(keep=artifact_id)
+        return artifact_id
+
+    def path(self, artifact_id: str) -> str | None:
+        """Return the file path for an artifact, or None if unknown/evicted."""
+        if not self.is_valid_id(artifact_id):
+            return None
+        path = self._path(artifact_id)
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            return None
+        return path
+
+    def get(self, artifact_id: str) -> bytes | None:
+        """Read an artifact's bytes, or None if unknown/evicted."""
+        path = self.path(artifact_id)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def evict(self, keep: str | None = None) -> int:
+        """Delete least recently used artifacts until under max_bytes.
+
+        Returns the number of files removed. `keep` is never evicted (the
+        file just written).
+        """
+        entries = []
+        total = 0
+        with os.scandir(self.root) as it:
+            for entry in it:
+                if not entry.is_file() or not self.is_valid_id(entry.name):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # evicted by another worker
+                entries.append((stat.st_mtime, stat.st_size, entry.name))
+                total += stat.st_size
+
+        removed = 0
+        if total <= self.max_bytes:
+            return removed
+        for _mtime, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            try:
+                os.unlink(self._path(name))
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
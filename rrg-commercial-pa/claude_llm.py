@@ -3,9 +3,25 @@
 Uses `claude -p` to send prompts to a local Claude instance.
 No API key needed — just a Claude subscription and the CLI installed.
 Each call is stateless — the full prompt is sent every time.
+
+Backends (LLM_BACKEND env var):
+    cli     — call the Claude CLI (default)
+    record  — call the CLI and save each prompt→response pair as a fixture
+    replay  — answer from fixtures only, by prompt hash; no CLI needed
+
+Fixtures are one JSON file per prompt in LLM_FIXTURE_DIR, named by
+prompt_key(model, system_prompt, prompt). Replay sleeps for the recorded
+latency, or LLM_REPLAY_LATENCY_MS if set (0 for fastest). The Windmill
+scripts use the same fixture format via f/switchboard/claude_backend.
 """
 
+import hashlib
+import json
+import os
 import subprocess
+import threading
+import time
+from datetime import datetime, timezone
 from typing import Any, List, Optional
 
 from langchain_core.callbacks import CallbackManagerForLLMRun
@@ -13,6 +29,58 @@ from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 from langchain_core.outputs import ChatResult, ChatGeneration
 
+LLM_BACKEND = os.getenv("LLM_BACKEND", "cli")
+LLM_FIXTURE_DIR = os.getenv("LLM_FIXTURE_DIR", "llm_fixtures")
+LLM_REPLAY_LATENCY_MS = os.getenv("LLM_REPLAY_LATENCY_MS", "")  # "" = recorded latency
+
+
+def prompt_key(model: str, system_prompt: Optional[str], prompt: str) -> str:
+    """Stable fixture key for one LLM call."""
+    payload = json.dumps([model, system_prompt or "", prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _fixture_path(key: str, fixture_dir: Optional[str] = None) -> str:
+    return os.path.join(fixture_dir or LLM_FIXTURE_DIR, f"{key}.json")
+
+
+def save_fixture(
+    model: str,
+    system_prompt: Optional[str],
+    prompt: str,
+    response: str,
+    latency_ms: float,
+    fixture_dir: Optional[str] = None,
+) -> str:
+    """Write one prompt→response fixture. Returns its key."""
+    key = prompt_key(model, system_prompt, prompt)
+    path = _fixture_path(key, fixture_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # pid + thread: two threads recording the same prompt mustn't share a temp file
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({
+            "model": model,
+            "system_prompt": system_prompt,
+            "prompt": prompt,
+            "response": response,
+            "latency_ms": round(latency_ms, 1),
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+        }, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)  # atomic — concurrent recorders never see half a file
+    return key
+
+
+def load_fixture(
+    model: str, system_prompt: Optional[str], prompt: str, fixture_dir: Optional[str] = None
+) -> Optional[dict]:
+    """Return the recorded fixture for a call, or None."""
+    try:
+        with open(_fixture_path(prompt_key(model, system_prompt, prompt), fixture_dir), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
 
 class ChatClaudeCLI(BaseChatModel):
     """Chat model that shells out to the Claude CLI.
@@ -79,8 +147,40 @@ class ChatClaudeCLI(BaseChatModel):
         run_manager: Optional[CallbackManagerForLLMRun] = None,
         **kwargs: Any,
     ) -> ChatResult:
-        """Call Claude CLI with the formatted prompt."""
+        """Call Claude CLI with the formatted prompt (or replay/record it)."""
         prompt, system_prompt = self._format_messages(messages)
+
+        if LLM_BACKEND == "replay":
+            content = self._replay(prompt, system_prompt)
+        else:
+            started = time.perf_counter()
+            content = self._call_cli(prompt, system_prompt)
+            if LLM_BACKEND == "record":
+                save_fixture(
+                    self.model_name, system_prompt, prompt, content,
+                    (time.perf_counter() - started) * 1000,
+                )
+
+        message = AIMessage(content=content)
+        generation = ChatGeneration(message=message)
+        return ChatResult(generations=[generation])
+
+    def _replay(self, prompt: str, system_prompt: Optional[str]) -> str:
+        """Serve a recorded response by prompt hash, with simulated latency."""
+        fixture = load_fixture(self.model_name, system_prompt, prompt)
+        if fixture is None:
+            raise RuntimeError(
+                "No recorded LLM response for this prompt "
+                f"(key {prompt_key(self.model_name, system_prompt, prompt)[:12]} in {LLM_FIXTURE_DIR}). "
+                "Re-run with LLM_BACKEND=record to capture it."
+            )
+        latency_ms = float(LLM_REPLAY_LATENCY_MS or fixture.get("latency_ms") or 0)
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+        return fixture["response"]
+
+    def _call_cli(self, prompt: str, system_prompt: Optional[str]) -> str:
+        """Run `claude -p` and return its stdout."""
         cmd = self._build_command(prompt, system_prompt)
 
         try:
@@ -95,7 +195,7 @@ class ChatClaudeCLI(BaseChatModel):
                 error_msg = result.stderr.strip() or f"Claude CLI exited with code {result.returncode}"
                 raise RuntimeError(error_msg)
 
-            content = result.stdout.strip()
+            return result.stdout.strip()
 
         except FileNotFoundError:
             raise RuntimeError(
@@ -103,7 +203,3 @@ class ChatClaudeCLI(BaseChatModel):
             )
         except subprocess.TimeoutExpired:
             raise RuntimeError(f"Claude CLI timed out after {self.timeout}s")
-
-        message = AIMessage(content=content)
-        generation = ChatGeneration(message=message)
-        return ChatResult(generations=[generation])
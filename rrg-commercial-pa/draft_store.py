@@ -133,6 +133,8 @@ class DraftStore:
         """Create the drafts table if it doesn't exist."""
         conn = self._connect()
         try:
+            # WAL lets request threads/processes read while another writes
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS drafts (
                     id TEXT PRIMARY KEY,
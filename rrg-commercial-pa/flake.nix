@@ -51,9 +51,13 @@
         cp ${./pa_handler.py} $out/app/pa_handler.py
         cp ${./pa_docx.py} $out/app/pa_docx.py
         cp ${./draft_store.py} $out/app/draft_store.py
+        cp ${./job_runner.py} $out/app/job_runner.py
+        cp ${./warmup.py} $out/app/warmup.py
+        cp ${./wsgi_server.py} $out/app/wsgi_server.py
         cp ${./claude_llm.py} $out/app/claude_llm.py
         cp ${./provisions.py} $out/app/provisions.py
         cp ${./exhibit_a_helpers.py} $out/app/exhibit_a_helpers.py
+        cp ${./artifact_store.py} $out/app/artifact_store.py
         cp ${./templates/commercial_pa.docx} $out/app/templates/commercial_pa.docx
       '';
 
@@ -28,6 +28,7 @@ from pa_handler import (
     format_exhibit_a_summary,
 )
 from pa_docx import generate_pa_docx
+from job_runner import report_progress
 
 
 CLAUDE_MODEL = os.getenv("CLAUDE_MODEL", "haiku")
@@ -434,6 +435,7 @@ def preview_node(state: PaState) -> dict:
     prop_address = draft.get("property_address", "Property")
 
     try:
+        report_progress("Generating DOCX")
         docx_bytes = generate_pa_docx(variables)
         filename = f"PA_{prop_address}.docx"
         return {
@@ -479,6 +481,7 @@ def finalize_node(state: PaState) -> dict:
     prop_address = draft.get("property_address", "Property")
 
     try:
+        report_progress("Generating DOCX")
         docx_bytes = generate_pa_docx(variables)
     except Exception:
         docx_bytes = b""
@@ -17,6 +17,10 @@ from exhibit_a_helpers import (
 
 TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "templates", "commercial_pa.docx")
 
+# Template file bytes, read once per process (docxtpl still parses per render
+# because rendering mutates the document)
+_template_bytes: bytes | None = None
+
 # Boolean fields — default to False when missing/None
 _BOOL_FIELDS = frozenset({
     "payment_cash",
@@ -271,6 +275,14 @@ def _build_context(variables: dict) -> dict:
     return ctx
 
 
+def _load_template() -> bytes:
+    global _template_bytes
+    if _template_bytes is None:
+        with open(TEMPLATE_PATH, "rb") as f:
+            _template_bytes = f.read()
+    return _template_bytes
+
+
 def generate_pa_docx(variables: dict) -> bytes:
     """Render the PA template with the given variables, return .docx bytes.
 
@@ -281,9 +293,14 @@ def generate_pa_docx(variables: dict) -> bytes:
     Returns:
         Raw .docx file content as bytes.
     """
-    doc = DocxTemplate(TEMPLATE_PATH)
+    doc = DocxTemplate(io.BytesIO(_load_template()))
     context = _build_context(variables)
     doc.render(context)
     buf = io.BytesIO()
     doc.save(buf)
     return buf.getvalue()
+
+
+def warm_up():
+    """Load the template and render an empty PA (imports docxtpl/lxml/Jinja paths)."""
+    generate_pa_docx({})
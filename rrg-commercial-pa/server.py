@@ -1,16 +1,38 @@
 """RRG Commercial PA Microservice — persistent Flask container.
 
 Loads the PA LangGraph once at startup. Container stays warm.
-Exposes POST /process (standard worker node contract) and GET /health.
+Served by wsgi_server (WEB_WORKERS processes x WEB_THREADS threads).
+Exposes POST /process (standard worker node contract), POST /jobs +
+GET /jobs/<id> (the same turn as a background job with progress),
+GET /artifacts/<id> (generated DOCX files), GET /ready (warm-up state)
+and GET /health.
 """
 
 import base64
 import os
+import threading
+import time
 import traceback
-from flask import Flask, request, jsonify
+from flask import Flask, request, g, jsonify, send_file
 
 app = Flask(__name__)
 
+
+@app.before_request
+def _start_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def _server_timing(response):
+    """Report handler time so callers can split network from processing."""
+    start = g.get("request_start")
+    if start is not None:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        response.headers["Server-Timing"] = f"app;dur={elapsed_ms:.1f}"
+    return response
+
+
 # Import the graph module — build_graph() is called per-request so that
 # the mock in test fixtures can swap the return value between tests.
 import graph as _graph_module
@@ -19,6 +41,29 @@ import graph as _graph_module
 # to return a fresh mock each invocation.
 _cached_graph = None
 
+# Request threads race to the lazy singletons below; build each once
+_init_lock = threading.Lock()
+
+# Generated files go to the shared artifact volume; responses carry the ID
+from artifact_store import ArtifactStore
+artifact_store = ArtifactStore()
+
+
+def _encode_file(raw: bytes | None) -> tuple:
+    """Return (base64, artifact_id) for a generated file.
+
+    Uses the artifact store when the shared volume is mounted, otherwise
+    falls back to inline base64.
+    """
+    if not raw:
+        return None, None
+    if artifact_store.enabled:
+        try:
+            return None, artifact_store.put(raw)
+        except OSError:
+            traceback.print_exc()
+    return base64.b64encode(raw).decode("utf-8"), None
+
 
 def _get_graph():
     """Return the compiled graph, building it on first call."""
@@ -28,13 +73,44 @@ def _get_graph():
         # swap the mock between tests.
         return _graph_module.build_graph()
     if _cached_graph is None:
-        _cached_graph = _graph_module.build_graph()
+        with _init_lock:
+            if _cached_graph is None:
+                _cached_graph = _graph_module.build_graph()
     return _cached_graph
 
 
-@app.route("/process", methods=["POST"])
-def process():
-    """Standard worker node endpoint.
+# Background jobs — POST /jobs + GET /jobs/<id> for long-running turns.
+# Created on first use so importing the app (tests) doesn't touch /data.
+from job_runner import JobStore, JobRunner
+_job_runner = None
+
+
+def _get_job_runner() -> JobRunner:
+    """Return the job runner, creating its store on first call."""
+    global _job_runner
+    if _job_runner is None:
+        with _init_lock:
+            if _job_runner is None:
+                _job_runner = JobRunner(JobStore(), _handle_process)
+    return _job_runner
+
+
+# Startup warm-up — graph build, first CLI start and first DOCX render
+# happen before the first user; started in each worker process by
+# wsgi_server.serve, so importing the app (tests) doesn't spawn anything.
+# GET /ready reports progress.
+from warmup import Warmup, warm_claude_cli
+import pa_docx
+warmup = Warmup("rrg-commercial-pa")
+warmup.add("graph", _get_graph)
+warmup.add("llm_cli", lambda: warm_claude_cli(_graph_module.CLAUDE_MODEL))
+warmup.add("docx_render", pa_docx.warm_up)
+
+
+def _handle_process(data: dict) -> tuple:
+    """Run one /process turn. Returns (response_body, http_status).
+
+    Shared by POST /process (synchronous) and POST /jobs (background).
 
     Request:
         {
@@ -47,13 +123,20 @@ def process():
     Response:
         {
             response: str,          # message to display to user
-            state: {...},           # updated state (passed back next time)
+            state: {...},           # {draft_id, pa_active} handle (passed back next time)
             active: bool,           # true = node still owns conversation
-            docx_bytes: str|null,   # base64-encoded DOCX if generated
-            docx_filename: str|null
+            docx_bytes: str|null,   # base64-encoded DOCX (artifact store disabled)
+            docx_artifact_id: str|null,  # artifact ID (artifact store enabled)
+            docx_filename: str|null,
+            preview_docx: str|null, # base64 draft for the standing download button
+            preview_artifact_id: str|null,
+            preview_filename: str|null
         }
+
+    The draft itself lives in the DraftStore, so `state` stays a small
+    handle. The preview DOCX is returned once per turn rather than placed
+    in `state`, so it is never posted back on the next turn.
     """
-    data = request.get_json(silent=True) or {}
     command = data.get("command", "create")
     user_message = data.get("user_message", "")
     chat_history = data.get("chat_history", [])
@@ -78,43 +161,105 @@ def process():
         result = compiled_graph.invoke(graph_input)
     except Exception as e:
         traceback.print_exc()
-        return jsonify({
+        return {
             "response": f"Error processing PA request: {e}",
             "state": prev_state,
             "active": prev_state.get("pa_active", True),
             "docx_bytes": None,
+            "docx_artifact_id": None,
             "docx_filename": None,
-        }), 500
+        }, 500
 
     # Build response
     pa_active = result.get("pa_active", True)
     pa_action = result.get("pa_action")
     docx_bytes_raw = result.get("docx_bytes")
 
-    # Encode DOCX as base64 if present
-    docx_b64 = None
-    if docx_bytes_raw:
-        docx_b64 = base64.b64encode(docx_bytes_raw).decode("utf-8")
+    # Store the DOCX as an artifact (or base64 it) if present
+    docx_b64, docx_artifact_id = _encode_file(docx_bytes_raw)
 
     # For preview/finalize actions, docx goes in the response (shown in chat).
-    # For edit/start_new, docx goes in state as preview_docx (for instant download button).
+    # For edit/start_new, docx goes in preview_docx (for instant download button).
     is_preview_action = pa_action in ("preview", "finalize")
+    is_standing_preview = bool(docx_bytes_raw) and not is_preview_action
 
     state = {
         "draft_id": result.get("draft_id"),
         "pa_active": pa_active,
     }
-    if docx_b64 and not is_preview_action:
-        state["preview_docx"] = docx_b64
-        state["preview_filename"] = result.get("docx_filename")
 
-    return jsonify({
+    return {
         "response": result.get("response", ""),
         "state": state,
         "active": pa_active,
         "docx_bytes": docx_b64 if is_preview_action else None,
+        "docx_artifact_id": docx_artifact_id if is_preview_action else None,
         "docx_filename": result.get("docx_filename") if is_preview_action else None,
-    })
+        "preview_docx": docx_b64 if is_standing_preview else None,
+        "preview_artifact_id": docx_artifact_id if is_standing_preview else None,
+        "preview_filename": result.get("docx_filename") if is_standing_preview else None,
+    }, 200
+
+
+@app.route("/process", methods=["POST"])
+def process():
+    """Standard worker node endpoint — see _handle_process for the contract."""
+    body, status = _handle_process(request.get_json(silent=True) or {})
+    return jsonify(body), status
+
+
+@app.route("/jobs", methods=["POST"])
+def submit_job():
+    """Run a /process request in the background.
+
+    Request: same body as /process.
+    Response: 202 {job_id} — poll GET /jobs/<job_id>.
+    """
+    job_id = _get_job_runner().submit(request.get_json(silent=True) or {})
+    return jsonify({"job_id": job_id}), 202
+
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """Job status, progress events and (when finished) the /process body.
+
+    Response:
+        {
+            job_id: str,
+            status: "queued" | "running" | "done" | "error",
+            events: [{stage, at}, ...],
+            result: {...}|null,     # /process response body once finished
+            http_status: int|null,
+            elapsed_seconds: float,
+            queue_ms: float,        # waiting for a job thread (once started)
+            worker_ms: float        # handler time (once finished)
+        }
+        404 if the job is unknown or expired.
+    """
+    job = _get_job_runner().store.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+
+@app.route("/artifacts/<artifact_id>", methods=["GET"])
+def get_artifact(artifact_id):
+    """Stream a generated file from the artifact store by ID."""
+    path = artifact_store.path(artifact_id)
+    if path is None:
+        return jsonify({"error": "Artifact not found"}), 404
+    return send_file(path, mimetype="application/octet-stream", conditional=True)
+
+
+@app.route("/ready", methods=["GET"])
+def ready():
+    """Readiness probe — per-component warm-up state and timings.
+
+    200 once every required warm-up step has finished, 503 while warming
+    or if one failed. /health stays a plain liveness check.
+    """
+    body = warmup.status()
+    return jsonify(body), 200 if body["ready"] else 503
 
 
 @app.route("/health", methods=["GET"])
@@ -126,4 +271,5 @@ def health():
 if __name__ == "__main__":
     port = int(os.getenv("PORT", "8102"))
     print(f"rrg-commercial-pa starting on port {port}")
-    app.run(host="0.0.0.0", port=port)
+    from wsgi_server import serve
+    serve(app, port, on_worker_start=warmup.start)
@@ -0,0 +1,84 @@
+"""Tests for artifact_store.py — content-addressed file store with LRU eviction."""
+
+import hashlib
+import os
+import time
+import pytest
+
+from artifact_store import ArtifactStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(str(tmp_path), max_bytes=1000)
+
+
+def _age(store, artifact_id, seconds):
+    """Backdate an artifact's mtime so LRU order is deterministic."""
+    path = os.path.join(store.root, artifact_id)
+    t = time.time() - seconds
+    os.utime(path, (t, t))
+
+
+class TestPutGet:
+    """Storing and reading artifacts."""
+
+    def test_put_returns_sha256(self, store):
+        data = b"%PDF-1.7 fake"
+        assert store.put(data) == hashlib.sha256(data).hexdigest()
+
+    def test_get_roundtrip(self, store):
+        artifact_id = store.put(b"PK\x03\x04docx")
+        assert store.get(artifact_id) == b"PK\x03\x04docx"
+
+    def test_identical_bytes_dedupe(self, store, tmp_path):
+        a = store.put(b"same")
+        b = store.put(b"same")
+        assert a == b
+        assert len(os.listdir(tmp_path)) == 1
+
+    def test_get_unknown_returns_none(self, store):
+        assert store.get("0" * 64) is None
+
+    def test_invalid_id_rejected(self, store):
+        assert store.path("../etc/passwd") is None
+        assert store.path("ABC") is None
+        assert store.path("") is None
+
+    def test_enabled(self, store, tmp_path):
+        assert store.enabled
+        assert not ArtifactStore(str(tmp_path / "missing")).enabled
+
+
+class TestEviction:
+    """Size-based LRU eviction."""
+
+    def test_under_limit_keeps_everything(self, store):
+        a = store.put(b"a" * 300)
+        b = store.put(b"b" * 300)
+        assert store.get(a) and store.get(b)
+
+    def test_evicts_least_recently_used(self, store):
+        a = store.put(b"a" * 400)
+        _age(store, a, 300)
+        b = store.put(b"b" * 400)
+        _age(store, b, 200)
+        c = store.put(b"c" * 400)  # total 1200 > 1000 -> evict oldest
+        assert store.get(a) is None
+        assert store.get(b) is not None
+        assert store.get(c) is not None
+
+    def test_read_refreshes_lru_position(self, store):
+        a = store.put(b"a" * 400)
+        _age(store, a, 300)
+        b = store.put(b"b" * 400)
+        _age(store, b, 200)
+        store.path(a)  # touch a — b is now the oldest
+        store.put(b"c" * 400)
+        assert store.get(a) is not None
+        assert store.get(b) is None
+
+    def test_never_evicts_new_file(self, tmp_path):
+        store = ArtifactStore(str(tmp_path), max_bytes=10)
+        big = store.put(b"x" * 100)
+        assert store.get(big) == b"x" * 100
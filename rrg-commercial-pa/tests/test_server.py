@@ -6,10 +6,23 @@ worker contract (POST /process) and the health check (GET /health).
 
 import base64
 import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from unittest.mock import patch, MagicMock
 
 
+def _post_json(url, body):
+    req = urllib.request.Request(
+        url, data=json.dumps(body).encode(), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return json.loads(resp.read())
+
+
 # ===========================================================================
 # Health Check
 # ===========================================================================
@@ -330,6 +343,182 @@ class TestProcessErrors:
         assert resp.status_code in (200, 400, 500)
 
 
+# ===========================================================================
+# Preview DOCX — returned per turn, never round-tripped in state
+# ===========================================================================
+
+class TestPreviewDocx:
+    """The standing preview DOCX stays out of the state handle."""
+
+    def test_edit_docx_returned_as_preview(self, flask_client):
+        """Edit turns return the DOCX in preview_docx, not in state."""
+        client, mock_graph = flask_client
+        fake_docx = b"PK\x03\x04preview"
+        mock_graph.invoke.return_value = {
+            "response": "Updated",
+            "draft_id": "abc-123",
+            "pa_active": True,
+            "pa_action": "edit",
+            "docx_bytes": fake_docx,
+            "docx_filename": "20260309_PA_123 Main St.docx",
+        }
+        resp = client.post("/process", json={
+            "command": "continue",
+            "user_message": "The buyer is Acme LLC",
+            "chat_history": [],
+            "state": {"draft_id": "abc-123", "pa_active": True},
+        })
+        data = resp.get_json()
+        assert base64.b64decode(data["preview_docx"]) == fake_docx
+        assert data["preview_filename"] == "20260309_PA_123 Main St.docx"
+        assert data["docx_bytes"] is None
+        assert data["state"] == {"draft_id": "abc-123", "pa_active": True}
+
+    def test_preview_action_has_no_standing_preview(self, flask_client):
+        """Explicit preview/finalize turns put the DOCX in docx_bytes only."""
+        client, mock_graph = flask_client
+        mock_graph.invoke.return_value = {
+            "response": "Here's the preview",
+            "draft_id": "abc-123",
+            "pa_active": True,
+            "pa_action": "preview",
+            "docx_bytes": b"PK\x03\x04fake",
+            "docx_filename": "20260309_PA_123 Main St.docx",
+        }
+        resp = client.post("/process", json={
+            "command": "continue",
+            "user_message": "show me",
+            "chat_history": [],
+            "state": {"draft_id": "abc-123"},
+        })
+        data = resp.get_json()
+        assert data["docx_bytes"] is not None
+        assert data["preview_docx"] is None
+        assert "preview_docx" not in data["state"]
+
+
+# ===========================================================================
+# Artifact store — DOCX returned by ID instead of base64
+# ===========================================================================
+
+class TestArtifacts:
+    """Generated files go to the artifact store when the volume is mounted."""
+
+    @pytest.fixture
+    def artifact_store(self, tmp_path):
+        import server
+        from artifact_store import ArtifactStore
+        store = ArtifactStore(str(tmp_path))
+        with patch.object(server, "artifact_store", store):
+            yield store
+
+    def test_finalize_returns_artifact_id(self, flask_client, artifact_store):
+        client, mock_graph = flask_client
+        fake_docx = b"PK\x03\x04final"
+        mock_graph.invoke.return_value = {
+            "response": "Finalized!",
+            "draft_id": "abc-123",
+            "pa_active": False,
+            "pa_action": "finalize",
+            "docx_bytes": fake_docx,
+            "docx_filename": "20260309_PA_123 Main St.docx",
+        }
+        resp = client.post("/process", json={
+            "command": "continue",
+            "user_message": "finalize it",
+            "chat_history": [],
+            "state": {"draft_id": "abc-123"},
+        })
+        data = resp.get_json()
+        assert data["docx_bytes"] is None
+        assert artifact_store.get(data["docx_artifact_id"]) == fake_docx
+
+    def test_preview_returns_artifact_id(self, flask_client, artifact_store):
+        client, mock_graph = flask_client
+        mock_graph.invoke.return_value = {
+            "response": "Updated",
+            "draft_id": "abc-123",
+            "pa_active": True,
+            "pa_action": "edit",
+            "docx_bytes": b"PK\x03\x04preview",
+            "docx_filename": "preview.docx",
+        }
+        resp = client.post("/process", json={
+            "command": "continue",
+            "user_message": "price is 2.5M",
+            "chat_history": [],
+            "state": {"draft_id": "abc-123"},
+        })
+        data = resp.get_json()
+        assert data["preview_docx"] is None
+        assert data["preview_artifact_id"] is not None
+        assert data["docx_artifact_id"] is None
+
+    def test_get_artifact_endpoint(self, flask_client, artifact_store):
+        client, _ = flask_client
+        artifact_id = artifact_store.put(b"PK\x03\x04served")
+        resp = client.get(f"/artifacts/{artifact_id}")
+        assert resp.status_code == 200
+        assert resp.data == b"PK\x03\x04served"
+
+    def test_get_unknown_artifact_404(self, flask_client, artifact_store):
+        client, _ = flask_client
+        assert client.get(f"/artifacts/{'0' * 64}").status_code == 404
+        assert client.get("/artifacts/not-a-hash").status_code == 404
+
+
+# ===========================================================================
+# Background jobs — POST /jobs + GET /jobs/<id>
+# ===========================================================================
+
+class TestJobs:
+    """A /process turn can run as a background job and be polled."""
+
+    @pytest.fixture
+    def job_runner(self, tmp_path):
+        import server
+        from job_runner import JobStore, JobRunner
+        runner = JobRunner(JobStore(str(tmp_path / "jobs.db")), server._handle_process)
+        with patch.object(server, "_job_runner", runner):
+            yield runner
+
+    def _poll(self, client, job_id):
+        import time
+        for _ in range(500):
+            job = client.get(f"/jobs/{job_id}").get_json()
+            if job["status"] in ("done", "error"):
+                return job
+            time.sleep(0.01)
+        raise AssertionError("job did not finish")
+
+    def test_job_returns_process_body(self, flask_client, job_runner):
+        client, mock_graph = flask_client
+        resp = client.post("/jobs", json={
+            "command": "create",
+            "user_message": "Start a PA",
+            "chat_history": [],
+            "state": {},
+        })
+        assert resp.status_code == 202
+        job = self._poll(client, resp.get_json()["job_id"])
+        assert job["status"] == "done"
+        assert job["result"]["response"] == "Test response"
+        assert job["result"]["state"]["draft_id"] == "test-uuid"
+
+    def test_job_graph_error_is_reported(self, flask_client, job_runner):
+        client, mock_graph = flask_client
+        mock_graph.invoke.side_effect = RuntimeError("LLM crashed")
+        resp = client.post("/jobs", json={"command": "create", "state": {}})
+        job = self._poll(client, resp.get_json()["job_id"])
+        assert job["status"] == "error"
+        assert job["http_status"] == 500
+        assert "LLM crashed" in job["result"]["response"]
+
+    def test_unknown_job_404(self, flask_client, job_runner):
+        client, _ = flask_client
+        assert client.get("/jobs/nope").status_code == 404
+
+
 # ===========================================================================
 # Response Shape Contract
 # ===========================================================================
@@ -389,3 +578,97 @@ class TestResponseContract:
         })
         data = resp.get_json()
         assert isinstance(data["active"], bool)
+
+
+# ===========================================================================
+# Readiness — GET /ready reports warm-up state
+# ===========================================================================
+
+class TestReady:
+    """/ready is 503 until warm-up finishes, then 200 with timings."""
+
+    @pytest.fixture
+    def warmup(self):
+        import server
+        from warmup import Warmup
+        warmup = Warmup("rrg-commercial-pa", enabled=True)
+        warmup.add("docx_render", lambda: None)
+        with patch.object(server, "warmup", warmup):
+            yield warmup
+
+    def test_not_ready_before_warmup(self, flask_client, warmup):
+        client, _ = flask_client
+        resp = client.get("/ready")
+        assert resp.status_code == 503
+        assert resp.get_json()["components"]["docx_render"]["state"] == "pending"
+
+    def test_ready_after_warmup(self, flask_client, warmup):
+        client, _ = flask_client
+        warmup.run()
+        resp = client.get("/ready")
+        data = resp.get_json()
+        assert resp.status_code == 200
+        assert data["ready"] is True
+        assert data["components"]["docx_render"]["seconds"] is not None
+
+    def test_docx_warm_up_renders(self):
+        import pa_docx
+        pa_docx.warm_up()
+
+    def test_health_unaffected(self, flask_client, warmup):
+        client, _ = flask_client
+        assert client.get("/health").status_code == 200
+
+
+# ===========================================================================
+# Concurrency — real HTTP server (wsgi_server) with request threads
+# ===========================================================================
+
+class TestConcurrentUsers:
+    """Two users' turns run side by side and keep their own drafts."""
+
+    DELAY = 0.4
+
+    @pytest.fixture
+    def base_url(self, flask_client):
+        from server import app
+        from wsgi_server import make_server
+
+        _, mock_graph = flask_client
+
+        def slow_invoke(graph_input):
+            time.sleep(self.DELAY)  # stands in for the LLM call
+            user = graph_input["user_message"]
+            return {
+                "response": f"Draft for {user}",
+                "draft_id": graph_input["draft_id"] or f"draft-{user}",
+                "pa_active": True,
+                "docx_bytes": None,
+                "docx_filename": None,
+            }
+
+        mock_graph.invoke.side_effect = slow_invoke
+        server = make_server(app, "127.0.0.1", 0, threads=4)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield f"http://127.0.0.1:{server.port}"
+        server.shutdown()
+
+    def test_two_users_do_not_block_each_other(self, base_url):
+        def turn(user):
+            return _post_json(f"{base_url}/process", {
+                "command": "create",
+                "user_message": user,
+                "chat_history": [],
+                "state": {},
+            })
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            alice, bob = pool.map(turn, ["alice", "bob"])
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < self.DELAY * 1.75
+        assert alice["state"]["draft_id"] == "draft-alice"
+        assert bob["state"]["draft_id"] == "draft-bob"
+        assert alice["response"] == "Draft for alice"
+        assert bob["response"] == "Draft for bob"
@@ -0,0 +1,122 @@
+"""Startup warm-up and readiness reporting.
+
+A fresh container otherwise makes its first user pay for the first Claude
+CLI start, the first font/template load and (brochure) the first Chromium
+launch. server.py registers one warm-up step per component; start() runs
+them in order on a background thread so the port binds right away, and
+GET /ready reports each component's state and timing — 503 until every
+required step has finished.
+
+Settings (env):
+    WARMUP      — "false" skips warm-up; /ready reports ready immediately
+    WARMUP_LLM  — "true" also sends one tiny prompt through the CLI
+                  (costs a request, so off by default)
+"""
+
+import os
+import subprocess
+import threading
+import time
+import traceback
+from typing import Callable, Dict, Optional
+
+WARMUP_ENABLED = os.getenv("WARMUP", "true").lower() == "true"
+WARMUP_LLM = os.getenv("WARMUP_LLM", "false").lower() == "true"
+
+
+class Warmup:
+    """Named warm-up steps with per-step state and timing."""
+
+    def __init__(self, service: str, enabled: Optional[bool] = None):
+        self.service = service
+        self.enabled = WARMUP_ENABLED if enabled is None else enabled
+        self._steps: Dict[str, Callable[[], None]] = {}
+        self._components: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def add(self, name: str, step: Callable[[], None], required: bool = True):
+        """Register a warm-up step. Failures of optional steps don't block /ready."""
+        self._steps[name] = step
+        self._components[name] = {
+            "state": "pending" if self.enabled else "skipped",
+            "required": required,
+            "seconds": None,
+            "error": None,
+        }
+
+    def _set(self, name: str, **fields):
+        with self._lock:
+            self._components[name].update(fields)
+
+    def run(self):
+        """Run every step in order (blocking)."""
+        self.started_at = time.time()
+        for name, step in self._steps.items():
+            self._set(name, state="warming")
+            t0 = time.perf_counter()
+            try:
+                step()
+                self._set(name, state="ready")
+            except Exception as e:
+                traceback.print_exc()
+                self._set(name, state="failed", error=str(e))
+            self._set(name, seconds=round(time.perf_counter() - t0, 3))
+            print(f"{self.service} warm-up: {name} {self._components[name]['state']} "
+                  f"in {self._components[name]['seconds']}s")
+        self.finished_at = time.time()
+
+    def start(self):
+        """Run the steps on a background thread (idempotent; no-op if disabled)."""
+        if not self.enabled or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def ready(self) -> bool:
+        """True once every required step is ready (or warm-up is disabled)."""
+        with self._lock:
+            for c in self._components.values():
+                if c["state"] in ("pending", "warming"):
+                    return False
+                if c["state"] == "failed" and c["required"]:
+                    return False
+            return True
+
+    def status(self) -> dict:
+        """Readiness body for GET /ready."""
+        with self._lock:
+            components = {name: dict(c) for name, c in self._components.items()}
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round((self.finished_at or time.time()) - self.started_at, 3)
+        return {
+            "service": self.service,
+            "ready": self.ready(),
+            "warmup_enabled": self.enabled,
+            "warmup_seconds": elapsed,
+            "components": components,
+        }
+
+
+def warm_claude_cli(model_name: str, timeout: int = 60):
+    """Resolve and start the Claude CLI once so its files are in page cache.
+
+    With WARMUP_LLM=true, also round-trips one tiny prompt (auth, model).
+    Nothing to warm when LLM calls are replayed from fixtures.
+    """
+    if os.getenv("LLM_BACKEND") == "replay":
+        return
+    result = subprocess.run(
+        ["claude", "--version"], capture_output=True, text=True, timeout=timeout
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or "claude --version failed")
+    if WARMUP_LLM:
+        from langchain_core.messages import HumanMessage
+        from claude_llm import ChatClaudeCLI
+        ChatClaudeCLI(model_name=model_name, timeout=timeout).invoke(
+            [HumanMessage(content="Reply with the single word OK.")]
+        )
@@ -0,0 +1,194 @@
+"""Production HTTP serving for the worker's Flask app.
+
+`app.run()` is Flask's development server: one process, a new thread per
+connection, no bound. serve() runs the same app on Werkzeug's WSGI server
+(already a Flask dependency) with:
+
+- WEB_THREADS request threads per process. The accept loop takes a
+  thread slot before accepting the next connection, so connections beyond
+  that wait in the listen backlog instead of spawning more threads or
+  piling up in memory.
+- WEB_WORKERS processes sharing one listening socket (pre-fork). The
+  parent restarts a worker that dies and stops them all on SIGTERM/SIGINT,
+  letting in-flight requests finish.
+
+Nothing a request touches is shared unguarded: graph state is passed into
+invoke(), every LLM call is its own `claude` subprocess, the SQLite stores
+open a connection per call, Chromium renders queue for pages of the
+process's browser pool (brochure), and process-wide caches take a lock.
+Jobs live in SQLite, so GET /jobs/<id> works from any worker process.
+
+Settings (env):
+    WEB_WORKERS            — server processes (default 1)
+    WEB_THREADS            — request threads per process (default 8)
+    WEB_KEEPALIVE_SECONDS  — idle keep-alive connections are closed after
+                             this, so they don't pin a thread (default 5)
+"""
+
+import os
+import signal
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", "1"))
+WEB_THREADS = int(os.getenv("WEB_THREADS", "8"))
+WEB_KEEPALIVE_SECONDS = float(os.getenv("WEB_KEEPALIVE_SECONDS", "5"))
+
+# Pause before restarting a dead worker — a worker that crashes on
+# startup would otherwise fork in a tight loop
+_RESTART_DELAY_SECONDS = 1.0
+
+
+class _RequestHandler(WSGIRequestHandler):
+    """HTTP/1.1 handler whose socket reads time out when a client goes idle."""
+
+    protocol_version = "HTTP/1.1"
+    timeout = WEB_KEEPALIVE_SECONDS
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """Werkzeug WSGI server that runs each connection on a bounded thread pool.
+
+    `threads` caps connections in progress, not just threads: process_request
+    blocks until a slot is free, so the pool's queue never grows.
+    """
+
+    multithread = True
+
+    def __init__(self, host: str, port: int, app, threads: Optional[int] = None):
+        super().__init__(host, port, app, handler=_RequestHandler)
+        self.threads = threads or WEB_THREADS
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.threads)
+
+    def process_request(self, request, client_address):
+        with self._pool_lock:
+            if self._pool is None:
+                # Created on first use so a pre-forked parent never holds threads
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.threads, thread_name_prefix="http"
+                )
+        # Runs on the accept loop — holding it here keeps later connections
+        # in the kernel backlog until a request thread frees up
+        self._slots.acquire()
+        try:
+            self._pool.submit(self._process_request_thread, request, client_address)
+        except RuntimeError:  # pool already shut down
+            self._slots.release()
+            self.shutdown_request(request)
+
+    def _process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self):
+        super().server_close()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)  # drain in-flight requests
+
+
+def make_server(app, host: str = "0.0.0.0", port: int = 0, threads: Optional[int] = None) -> PooledWSGIServer:
+    """Bind a PooledWSGIServer (port 0 picks a free port — see server.port)."""
+    return PooledWSGIServer(host, port, app, threads=threads)
+
+
+def _stop_on_signals(server: PooledWSGIServer):
+    """Stop serve_forever() on SIGTERM/SIGINT (shutdown() must run off-thread)."""
+    def _handler(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, _handler)
+    signal.signal(signal.SIGINT, _handler)
+
+
+def _run_worker(server: PooledWSGIServer, on_worker_start: Optional[Callable[[], None]]):
+    _stop_on_signals(server)
+    if on_worker_start is not None:
+        on_worker_start()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()  # waits for in-flight requests before we exit
+
+
+def serve(
+    app,
+    port: int,
+    host: str = "0.0.0.0",
+    workers: Optional[int] = None,
+    threads: Optional[int] = None,
+    on_worker_start: Optional[Callable[[], None]] = None,
+):
+    """Serve `app` until SIGTERM/SIGINT.
+
+    on_worker_start runs in every worker process once it is ready to
+    accept requests (e.g. warmup.start) — after fork, so each process
+    warms its own CLI, browser and caches.
+    """
+    workers = workers or WEB_WORKERS
+    server = make_server(app, host, port, threads)
+    print(f"Serving on {host}:{server.port} — {workers} worker(s) x {server.threads} thread(s)")
+
+    if workers <= 1:
+        _run_worker(server, on_worker_start)
+        return
+
+    server.multiprocess = True
+    children: Dict[int, int] = {}  # pid -> slot
+    stopping = False
+
+    def _spawn(slot: int):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _run_worker(server, on_worker_start)
+            except Exception:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = slot
+
+    def _stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    for slot in range(workers):
+        _spawn(slot)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        slot = children.pop(pid, None)
+        if slot is None or stopping:
+            continue
+        print(f"Worker {pid} exited (status {status}); restarting")
+        time.sleep(_RESTART_DELAY_SECONDS)
+        if not stopping:
+            _spawn(slot)
+
+    server.server_close()
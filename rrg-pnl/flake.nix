@@ -58,8 +58,15 @@
         cp ${./graph.py} $out/app/graph.py
         cp ${./pnl_handler.py} $out/app/pnl_handler.py
         cp ${./pnl_pdf.py} $out/app/pnl_pdf.py
+        cp ${./pnl_batch.py} $out/app/pnl_batch.py
+        cp ${./session_store.py} $out/app/session_store.py
+        cp ${./job_runner.py} $out/app/job_runner.py
+        cp ${./warmup.py} $out/app/warmup.py
+        cp ${./wsgi_server.py} $out/app/wsgi_server.py
+        cp ${./artifact_store.py} $out/app/artifact_store.py
         cp ${./claude_llm.py} $out/app/claude_llm.py
         cp ${./templates/pnl.html} $out/app/templates/pnl.html
+        cp ${./templates/pnl.css} $out/app/templates/pnl.css
       '';
 
       # WeasyPrint needs fonts at runtime
@@ -1,6 +1,6 @@
 """Self-contained P&L LangGraph for the rrg-pnl microservice.
 
-7 nodes: extract, nudge, triage, edit, approve, question, cancel.
+8 nodes: extract, nudge, triage, edit, approve, question, scenario, cancel.
 Entry point is `build_graph()` which returns a compiled LangGraph.
 """
 
@@ -22,8 +22,12 @@ from pnl_handler import (
     is_approval,
     compute_pnl,
     format_pnl_table,
+    parse_sensitivity_axes,
+    compute_sensitivity,
+    format_sensitivity_table,
 )
-from pnl_pdf import generate_pnl_pdf
+from pnl_pdf import generate_pnl_pdf, build_pdf_filename
+from job_runner import report_progress
 
 
 CLAUDE_MODEL = os.getenv("CLAUDE_MODEL", "haiku")
@@ -50,7 +54,7 @@ class PnlState(TypedDict):
     pnl_active_out: bool
     pdf_bytes: Optional[bytes]
     pdf_filename: Optional[str]
-    pnl_action: Optional[str]  # triage result: edit/approve/cancel/question
+    pnl_action: Optional[str]  # triage result: edit/approve/cancel/question/scenario
 
 
 # ---------------------------------------------------------------------------
@@ -72,8 +76,9 @@ The user already has a P&L draft in progress. Classify their message into ONE of
 
 - "edit" — They want to change/add/remove something in the P&L (e.g., "change vacancy to 8%", "add landscaping at $1200/yr", "remove insurance")
 - "question" — They are asking a general question, seeking advice, or asking for information (e.g., "what is a good rule of thumb for repairs?", "how much should I budget for maintenance?", "what does cap rate mean?")
+- "scenario" — They want to see how NOI or value would change under hypothetical conditions WITHOUT changing the P&L (e.g., "what if vacancy is 8% and taxes go up 10%?", "run a sensitivity", "what's it worth at a 7 cap?")
 
-Respond with ONLY one word: edit or question"""
+Respond with ONLY one word: edit, question, or scenario"""
 
 
 # ---------------------------------------------------------------------------
@@ -85,6 +90,11 @@ def _message_has_numbers(msg: str) -> bool:
     return bool(re.search(r'[\$\d][\d,]*\.?\d*|[\d]+\s*%', msg))
 
 
+def _is_scenario_request(msg: str) -> bool:
+    """Keyword check for what-if / sensitivity requests — skips the triage LLM call."""
+    return bool(re.search(r'\bwhat[- ]if\b|\bsensitivity\b|\bscenarios?\b', msg, re.IGNORECASE))
+
+
 # ---------------------------------------------------------------------------
 # Nodes
 # ---------------------------------------------------------------------------
@@ -107,6 +117,7 @@ def pnl_extract_node(state: PnlState) -> dict:
         }
 
     try:
+        report_progress("Reading the numbers")
         data = extract_pnl_data(state["user_message"])
         data["date_generated"] = date.today().isoformat()
 
@@ -185,6 +196,8 @@ def pnl_triage_node(state: PnlState) -> dict:
     msg = state["user_message"].lower().strip()
     if msg in ("cancel", "nevermind", "never mind", "stop", "quit"):
         return {"pnl_action": "cancel"}
+    if _is_scenario_request(state["user_message"]):
+        return {"pnl_action": "scenario"}
     if is_approval(state["user_message"]):
         return {"pnl_action": "approve"}
 
@@ -195,7 +208,7 @@ def pnl_triage_node(state: PnlState) -> dict:
         HumanMessage(content=state["user_message"]),
     ])
     action = response.content.strip().lower()
-    if action in ("question", "edit"):
+    if action in ("question", "edit", "scenario"):
         return {"pnl_action": action}
     return {"pnl_action": "edit"}
 
@@ -230,16 +243,9 @@ def pnl_edit_node(state: PnlState) -> dict:
 def pnl_approve_node(state: PnlState) -> dict:
     """Generate the finalized PDF."""
     pnl_data = state["pnl_data"]
+    report_progress("Rendering PDF")
     pdf_bytes = generate_pnl_pdf(pnl_data)
-
-    # Build filename: YYYYMMDD_Profit and Loss_Address.pdf
-    today = date.today().strftime("%Y%m%d")
-    address = pnl_data.get("property_address", "").strip()
-    if not address:
-        address = pnl_data.get("property_name", "Property")
-    parts = [p.strip() for p in address.split(",")]
-    short_address = " ".join(parts[:2]) if len(parts) >= 2 else parts[0]
-    pdf_filename = f"{today}_Profit and Loss_{short_address}.pdf"
+    pdf_filename = build_pdf_filename(pnl_data)
 
     return {
         "response": "P&L finalized! Generating your PDF now...",
@@ -274,6 +280,41 @@ def pnl_question_node(state: PnlState) -> dict:
     }
 
 
+def pnl_scenario_node(state: PnlState) -> dict:
+    """Answer a what-if request with a full sensitivity grid — no per-cell LLM calls.
+
+    The P&L itself is left unchanged; the grid axes are stored on it so the
+    finalized PDF includes a sensitivity page.
+    """
+    pnl_data = dict(state["pnl_data"])
+    try:
+        axes = parse_sensitivity_axes(state["user_message"], pnl_data)
+    except ValueError as e:
+        lines = ", ".join(pnl_data.get("expenses", {})) or "none"
+        return {
+            "response": (
+                f"{e}, so I can't grow it on its own. Expense lines: {lines}. "
+                "Which line should the increase apply to — or should it apply to total expenses?"
+            ),
+            "pnl_data_out": state["pnl_data"],
+            "pdf_bytes": None,
+            "pdf_filename": None,
+        }
+    grid = compute_sensitivity(pnl_data, **axes)
+    pnl_data["sensitivity"] = axes
+    table = format_sensitivity_table(pnl_data, grid)
+    return {
+        "response": (
+            f"{table}\n\n"
+            "The P&L itself is unchanged — this grid will be included as a page in the PDF. "
+            "Make any changes, or say **looks good** to finalize."
+        ),
+        "pnl_data_out": pnl_data,
+        "pdf_bytes": None,
+        "pdf_filename": None,
+    }
+
+
 def pnl_cancel_node(state: PnlState) -> dict:
     """Cancel the P&L workflow."""
     return {
@@ -313,6 +354,8 @@ def route_triage(state: PnlState) -> str:
         return "cancel"
     elif action == "question":
         return "question"
+    elif action == "scenario":
+        return "scenario"
     return "edit"
 
 
@@ -332,6 +375,7 @@ def build_graph() -> StateGraph:
     graph.add_node("edit", pnl_edit_node)
     graph.add_node("approve", pnl_approve_node)
     graph.add_node("question", pnl_question_node)
+    graph.add_node("scenario", pnl_scenario_node)
     graph.add_node("cancel", pnl_cancel_node)
 
     # Entry point
@@ -349,6 +393,7 @@ def build_graph() -> StateGraph:
         "edit": "edit",
         "approve": "approve",
         "question": "question",
+        "scenario": "scenario",
         "cancel": "cancel",
     })
 
@@ -358,6 +403,7 @@ def build_graph() -> StateGraph:
     graph.add_edge("edit", END)
     graph.add_edge("approve", END)
     graph.add_edge("question", END)
+    graph.add_edge("scenario", END)
     graph.add_edge("cancel", END)
 
     return graph.compile()
@@ -0,0 +1,233 @@
+"""Batch P&L generation — many structured records in, one zip of PDFs out.
+
+Used by POST /batch for month-end portfolio packs. Records skip the
+conversational graph entirely: no LLM calls, just compute + render.
+Rendering runs in a process pool (one WeasyPrint renderer per process,
+see pnl_pdf) and the zip is streamed back as each PDF finishes.
+
+CSV input: one row per property. Recognised columns are
+`property_name`, `property_address`, `period`, `vacancy_rate`, plus any
+number of `income:<label>` and `expense:<label>` columns, e.g.
+
+    property_name,vacancy_rate,income:Gross Rental Income,expense:Property Taxes
+    Maple Court,0.05,186000,21000
+"""
+
+import csv
+import io
+import json
+import multiprocessing
+import os
+import threading
+import traceback
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, Optional
+
+from pnl_pdf import generate_pnl_pdf, build_pdf_filename
+from wsgi_server import WEB_WORKERS
+
+
+# Every pre-forked server process has its own pool, so by default they
+# split the cores between them
+BATCH_WORKERS = int(os.getenv("PNL_BATCH_WORKERS", "0")) or max(1, (os.cpu_count() or 1) // max(1, WEB_WORKERS))
+MAX_BATCH_RECORDS = int(os.getenv("PNL_BATCH_MAX_RECORDS", "500"))
+
+_INCOME_PREFIX = "income:"
+_EXPENSE_PREFIX = "expense:"
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool, creating it on first use.
+
+    Workers are spawned, not forked: the server is multithreaded, and a
+    forked child could inherit a lock (pnl_pdf's render or cache lock)
+    that another thread held at that moment, and hang on it.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=BATCH_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+# ---------------------------------------------------------------------------
+# Input parsing
+# ---------------------------------------------------------------------------
+
+def _to_number(value: str, field: str) -> float:
+    """Parse a CSV cell like "$1,200", "5%" or "0.05" into a float.
+
+    Percent values are returned as decimals ("5%" -> 0.05).
+    """
+    text = (value or "").strip().replace("$", "").replace(",", "")
+    if not text:
+        return 0.0
+    try:
+        if text.endswith("%"):
+            return float(text[:-1]) / 100
+        return float(text)
+    except ValueError:
+        raise ValueError(f"{field}: not a number ({value!r})")
+
+
+def parse_pnl_csv(text: str) -> List[dict]:
+    """Parse a portfolio CSV into a list of pnl_data dicts."""
+    reader = csv.DictReader(io.StringIO(text))
+    records = []
+    for row in reader:
+        if not any((v or "").strip() for v in row.values()):
+            continue  # blank line
+        income = {}
+        expenses = {}
+        for column, value in row.items():
+            if column is None:
+                continue
+            key = column.strip()
+            if key.lower().startswith(_INCOME_PREFIX):
+                income[key[len(_INCOME_PREFIX):].strip()] = _to_number(value, key)
+            elif key.lower().startswith(_EXPENSE_PREFIX):
+                expenses[key[len(_EXPENSE_PREFIX):].strip()] = _to_number(value, key)
+
+        vacancy = row.get("vacancy_rate")
+        vacancy_rate = _to_number(vacancy, "vacancy_rate") if (vacancy or "").strip() else 0.05
+        if vacancy_rate >= 1:
+            vacancy_rate /= 100  # "5" means 5%
+
+        records.append({
+            "property_name": (row.get("property_name") or "").strip() or "Property",
+            "property_address": (row.get("property_address") or "").strip(),
+            "period": (row.get("period") or "").strip() or "Annual",
+            "income": income,
+            "vacancy_rate": vacancy_rate,
+            "expenses": expenses,
+        })
+    return records
+
+
+def validate_record(data) -> Optional[str]:
+    """Return an error message if a record can't be rendered, else None."""
+    if not isinstance(data, dict):
+        return "record must be an object"
+    for section in ("income", "expenses"):
+        values = data.get(section, {})
+        if not isinstance(values, dict):
+            return f"{section} must be an object of label -> amount"
+        for label, amount in values.items():
+            if not isinstance(amount, (int, float)) or isinstance(amount, bool):
+                return f"{section}.{label} must be a number"
+    if not any(v > 0 for v in data.get("income", {}).values()):
+        return "no income provided"
+    vacancy_rate = data.get("vacancy_rate", 0.05)
+    if not isinstance(vacancy_rate, (int, float)) or not 0 <= vacancy_rate < 1:
+        return "vacancy_rate must be a decimal between 0 and 1"
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def render_record(index: int, data: dict) -> dict:
+    """Render one record. Runs inside a pool process — never raises."""
+    error = validate_record(data)
+    if error:
+        return {"index": index, "ok": False, "error": error}
+    try:
+        return {
+            "index": index,
+            "ok": True,
+            "filename": build_pdf_filename(data),
+            "pdf_bytes": generate_pnl_pdf(data),
+        }
+    except Exception as e:
+        traceback.print_exc()
+        return {"index": index, "ok": False, "error": f"render failed: {e}"}
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only sink for ZipFile that hands out chunks as they're written."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _unique_name(filename: str, used: set) -> str:
+    """Avoid duplicate zip member names (two records, same address)."""
+    name = filename
+    stem, ext = os.path.splitext(filename)
+    n = 2
+    while name in used:
+        name = f"{stem} ({n}){ext}"
+        n += 1
+    used.add(name)
+    return name
+
+
+def stream_batch_zip(records: List[dict]) -> Iterator[bytes]:
+    """Render records in the process pool and yield a zip archive in chunks.
+
+    Each PDF is added as soon as it finishes. A `manifest.json` member at
+    the end lists every record's outcome so per-item failures are visible
+    without failing the whole batch.
+    """
+    pool = _get_pool()
+    futures = {
+        pool.submit(render_record, i, record): i
+        for i, record in enumerate(records)
+    }
+
+    sink = _ZipStream()
+    used_names = set()
+    manifest = [None] * len(records)
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for future in as_completed(futures):
+            index = futures[future]
+            record = records[index] if isinstance(records[index], dict) else {}
+            entry = {
+                "index": index,
+                "property_name": record.get("property_name", ""),
+            }
+            try:
+                result = future.result()
+            except Exception as e:  # pool process died
+                result = {"index": index, "ok": False, "error": f"worker failed: {e}"}
+
+            if result["ok"]:
+                name = _unique_name(result["filename"], used_names)
+                zf.writestr(name, result["pdf_bytes"])
+                entry.update({"ok": True, "filename": name})
+            else:
+                entry.update({"ok": False, "error": result["error"]})
+            manifest[index] = entry
+
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+
+        summary = {
+            "total": len(records),
+            "succeeded": sum(1 for e in manifest if e["ok"]),
+            "failed": sum(1 for e in manifest if not e["ok"]),
+            "items": manifest,
+        }
+        zf.writestr("manifest.json", json.dumps(summary, indent=2))
+
+    yield sink.drain()
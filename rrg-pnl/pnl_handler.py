@@ -2,6 +2,7 @@
 
 import json
 import os
+import re
 from langchain_core.messages import SystemMessage, HumanMessage
 from claude_llm import ChatClaudeCLI
 
@@ -194,3 +195,200 @@ def format_pnl_table(data: dict) -> str:
     lines.append(f"| **Net Income** | **${computed['net_income']:,.2f}** |")
 
     return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Sensitivity analysis — vacancy × expense growth × cap rate, no LLM calls
+# ---------------------------------------------------------------------------
+
+DEFAULT_VACANCY_RATES = [0.0, 0.05, 0.08, 0.10, 0.15]
+DEFAULT_EXPENSE_GROWTH = [0.0, 0.05, 0.10]
+DEFAULT_CAP_RATES = [0.06, 0.07, 0.08, 0.09]
+
+_SCENARIO_PCT_RE = re.compile(
+    r'\b(vacancy|cap(?:italization)?(?:\s*rate)?|expenses?|tax(?:es)?|insurance|costs?|opex)'
+    r'([^%\d]{0,30}?)(-?\d+(?:\.\d+)?)\s*%',
+    re.IGNORECASE,
+)
+# "expenses down 5%", "cut insurance by 10%" — growth below zero. Looked for
+# between the keyword and its number, and in the words just before the
+# keyword back to the previous clause (_SCENARIO_CLAUSE_RE)
+_SCENARIO_DECREASE_RE = re.compile(
+    r'\b(?:down|decrease[sd]?|declines?|drops?|falls?|cut|lower(?:ed)?|reduced?|less)\b',
+    re.IGNORECASE,
+)
+_SCENARIO_CLAUSE_RE = re.compile(r'\band\b|\bbut\b|[,;%\d]', re.IGNORECASE)
+# "7 cap", "6.5% cap rate"
+_SCENARIO_CAP_SUFFIX_RE = re.compile(r'(\d+(?:\.\d+)?)\s*%?\s*cap\b', re.IGNORECASE)
+
+
+# Scenario words that name one expense line, and the text that finds that
+# line in the P&L's expenses ("taxes" -> "Property Taxes")
+_EXPENSE_LINE_WORDS = {"tax": "tax", "taxes": "tax", "insurance": "insur"}
+
+
+def _expense_line(keyword: str, expenses: dict):
+    """The expense line a scenario keyword names, or None for total expenses.
+
+    Raises ValueError if the keyword names a line this P&L doesn't have.
+    """
+    stem = _EXPENSE_LINE_WORDS.get(keyword)
+    if stem is None:
+        return None
+    for label in expenses:
+        if stem in label.lower():
+            return label
+    raise ValueError(f"This P&L has no {keyword} line")
+
+
+def parse_sensitivity_axes(user_message: str, data: dict) -> dict:
+    """Build the scenario axes for a sensitivity run.
+
+    Starts from the default grid, always includes the P&L's current vacancy
+    rate, and adds any percentages the user tied to vacancy, cap rate, or
+    expenses (e.g. "what if vacancy is 8% and taxes go up 10%"). Expense
+    changes worded as a decrease ("expenses down 5%") are negative. Growth tied
+    to one expense line ("taxes", "insurance") applies to that line only:
+    expense_lines[j] is the line expense_growth[j] applies to, None for
+    total expenses.
+
+    Raises ValueError if the message names an expense line the P&L doesn't have.
+    """
+    vacancy = set(DEFAULT_VACANCY_RATES)
+    growth = {(g, None) for g in DEFAULT_EXPENSE_GROWTH}
+    caps = set(DEFAULT_CAP_RATES)
+    vacancy.add(round(data.get("vacancy_rate", 0.05), 4))
+    expenses = data.get("expenses", {})
+
+    message = user_message or ""
+    claimed = set()  # start of each number a keyword above already took
+    for m in _SCENARIO_PCT_RE.finditer(message):
+        keyword, between, pct = m.group(1).lower(), m.group(2), m.group(3)
+        claimed.add(m.start(3))
+        value = round(float(pct) / 100, 4)
+        if keyword.startswith("vacancy"):
+            if 0 <= value < 1:
+                vacancy.add(value)
+        elif keyword.startswith("cap"):
+            if value > 0:
+                caps.add(value)
+        else:
+            lead_in = _SCENARIO_CLAUSE_RE.split(message[:m.start()])[-1]
+            if _SCENARIO_DECREASE_RE.search(lead_in + " " + between):
+                value = -abs(value)
+            growth.add((value, _expense_line(keyword, expenses)))
+    # "taxes up 10% cap at 7": the 10% is the taxes', not a cap rate
+    for m in _SCENARIO_CAP_SUFFIX_RE.finditer(message):
+        if m.start(1) in claimed:
+            continue
+        value = round(float(m.group(1)) / 100, 4)
+        if 0 < value < 1:
+            caps.add(value)
+
+    # Total-expense scenarios first, then per line
+    growth = sorted(growth, key=lambda g: (g[1] is not None, g[1] or "", g[0]))
+    return {
+        "vacancy_rates": sorted(vacancy),
+        "expense_growth": [g[0] for g in growth],
+        "expense_lines": [g[1] for g in growth],
+        "cap_rates": sorted(caps),
+    }
+
+
+def compute_sensitivity(
+    data: dict,
+    vacancy_rates: list = None,
+    expense_growth: list = None,
+    cap_rates: list = None,
+    expense_lines: list = None,
+) -> dict:
+    """Compute NOI and implied value across every scenario in one pass.
+
+    Rows are vacancy rates, columns are expense growth rates:
+        noi[i][j]      — NOI at vacancy_rates[i], expense_growth[j]
+        value[i][j][k] — noi[i][j] / cap_rates[k]
+    Growth applies to expense_lines[j] if given (None = total expenses).
+    """
+    vacancy_rates = vacancy_rates if vacancy_rates is not None else DEFAULT_VACANCY_RATES
+    expense_growth = expense_growth if expense_growth is not None else DEFAULT_EXPENSE_GROWTH
+    cap_rates = cap_rates if cap_rates is not None else DEFAULT_CAP_RATES
+    expense_lines = expense_lines if expense_lines is not None else [None] * len(expense_growth)
+
+    expenses = data.get("expenses", {})
+    total_income = sum(data.get("income", {}).values())
+    total_expenses = sum(expenses.values())
+    # Expenses under each growth scenario
+    grown = [
+        total_expenses + (expenses.get(line, 0) if line else total_expenses) * growth
+        for growth, line in zip(expense_growth, expense_lines)
+    ]
+
+    noi = []
+    value = []
+    for vacancy_rate in vacancy_rates:
+        egi = total_income * (1 - vacancy_rate)
+        noi_row = []
+        value_row = []
+        for expense_total in grown:
+            net = egi - expense_total
+            noi_row.append(net)
+            value_row.append([net / cap if cap else 0.0 for cap in cap_rates])
+        noi.append(noi_row)
+        value.append(value_row)
+
+    return {
+        "vacancy_rates": list(vacancy_rates),
+        "expense_growth": list(expense_growth),
+        "expense_lines": list(expense_lines),
+        "cap_rates": list(cap_rates),
+        "noi": noi,
+        "value": value,
+    }
+
+
+def _fmt_money(amount: float) -> str:
+    """Format a dollar amount with no cents, negatives as -$X."""
+    if amount < 0:
+        return f"-${-amount:,.0f}"
+    return f"${amount:,.0f}"
+
+
+def _fmt_pct(rate: float) -> str:
+    """Format a decimal rate as a percent, showing decimals only when needed."""
+    return f"{round(rate * 100, 2):g}%"
+
+
+def format_sensitivity_table(data: dict, grid: dict) -> str:
+    """Format a sensitivity grid as markdown tables for display.
+
+    One NOI table (vacancy × expense growth), then one implied-value table
+    (vacancy × cap rate) per expense growth scenario.
+    """
+    lines = []
+    name = data.get("property_name", "Property")
+    growth_labels = [
+        f"{line or 'Exp'} {'+' if g >= 0 else ''}{_fmt_pct(g)}"
+        for g, line in zip(grid["expense_growth"], grid["expense_lines"])
+    ]
+
+    lines.append(f"**{name}** — Sensitivity Analysis")
+    lines.append("")
+
+    # NOI: vacancy × expense growth
+    lines.append("| **NOI** | " + " | ".join(growth_labels) + " |")
+    lines.append("|:---|" + "---:|" * len(growth_labels))
+    for i, vacancy_rate in enumerate(grid["vacancy_rates"]):
+        cells = [_fmt_money(n) for n in grid["noi"][i]]
+        lines.append(f"| Vacancy {_fmt_pct(vacancy_rate)} | " + " | ".join(cells) + " |")
+
+    # Implied value: vacancy × cap rate, one table per expense scenario
+    cap_labels = [f"Cap {_fmt_pct(c)}" for c in grid["cap_rates"]]
+    for j, label in enumerate(growth_labels):
+        lines.append("")
+        lines.append(f"| **Value ({label})** | " + " | ".join(cap_labels) + " |")
+        lines.append("|:---|" + "---:|" * len(cap_labels))
+        for i, vacancy_rate in enumerate(grid["vacancy_rates"]):
+            cells = [_fmt_money(v) for v in grid["value"][i][j]]
+            lines.append(f"| Vacancy {_fmt_pct(vacancy_rate)} | " + " | ".join(cells) + " |")
+
+    return "\n".join(lines)
@@ -1,27 +1,50 @@
-"""Generate a professional PDF P&L statement using WeasyPrint + Jinja2."""
+"""Generate a professional PDF P&L statement using WeasyPrint + Jinja2.
 
+The Jinja template, the parsed stylesheet and the font configuration are
+built once at import time and shared by every render. Rendered PDFs are
+cached by a hash of the template context, so re-approving an unchanged
+P&L returns the previous bytes without touching WeasyPrint.
+"""
+
+import hashlib
+import json
 import os
+import threading
+from collections import OrderedDict
 from datetime import date
 from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML
-from pnl_handler import compute_pnl
+from weasyprint import CSS, HTML
+from weasyprint.text.fonts import FontConfiguration
+from pnl_handler import compute_pnl, compute_sensitivity
 
 
 TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
 
+# Max rendered PDFs kept in memory (LRU). A P&L PDF is ~20-40KB.
+PDF_CACHE_SIZE = int(os.getenv("PNL_PDF_CACHE_SIZE", "64"))
 
-def generate_pnl_pdf(data: dict) -> bytes:
-    """Render a P&L data dict into a professional PDF.
+# Module-level renderer — compiled/parsed once per process
+_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+_template = _env.get_template("pnl.html")
+_font_config = FontConfiguration()
+_stylesheet = CSS(filename=os.path.join(TEMPLATE_DIR, "pnl.css"), font_config=_font_config)
+# FontConfiguration isn't documented as thread-safe, and request threads
+# (WEB_THREADS) share it: one write_pdf at a time. Layout holds the GIL
+# anyway, so little is lost, and cached PDFs don't take the lock.
+_render_lock = threading.Lock()
 
-    Returns raw PDF bytes.
-    """
+_pdf_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_pdf_cache_lock = threading.Lock()
+
+
+def build_pnl_context(data: dict) -> dict:
+    """Merge raw P&L data with computed fields for the template."""
     computed = compute_pnl(data)
 
     # Build period range string (default: prior calendar year)
     year = date.today().year - 1
     period_range = f"January 1st, {year} - December 31st, {year}"
 
-    # Merge raw data with computed fields for the template
     context = {
         "property_name": data.get("property_name", "Property"),
         "property_address": data.get("property_address", ""),
@@ -34,11 +57,94 @@ def generate_pnl_pdf(data: dict) -> bytes:
         "expenses": data.get("expenses", {}),
         "total_expenses": computed["total_expenses"],
         "net_income": computed["net_income"],
+        "sensitivity": None,
     }
 
-    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
-    template = env.get_template("pnl.html")
-    html_content = template.render(**context)
+    # Optional sensitivity page — axes are stored by the scenario node
+    axes = data.get("sensitivity")
+    if axes:
+        context["sensitivity"] = compute_sensitivity(data, **axes)
+
+    return context
+
+
+def build_pdf_filename(data: dict, today: date | None = None) -> str:
+    """Build the download filename: YYYYMMDD_Profit and Loss_Address.pdf"""
+    stamp = (today or date.today()).strftime("%Y%m%d")
+    address = data.get("property_address", "").strip()
+    if not address:
+        address = data.get("property_name", "Property")
+    parts = [p.strip() for p in address.split(",")]
+    short_address = " ".join(parts[:2]) if len(parts) >= 2 else parts[0]
+    return f"{stamp}_Profit and Loss_{short_address}.pdf"
+
+
+def _context_key(context: dict) -> str:
+    """Stable content hash of a template context.
+
+    Key order of income/expense lines is preserved (it controls row order
+    in the PDF), so only the top level is sorted.
+    """
+    payload = json.dumps(
+        [[k, context[k]] for k in sorted(context)],
+        default=str,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_pnl_pdf(context: dict) -> bytes:
+    """Render a prepared template context to PDF bytes (uncached)."""
+    html_content = _template.render(**context)
+    with _render_lock:
+        return HTML(string=html_content, base_url=TEMPLATE_DIR).write_pdf(
+            stylesheets=[_stylesheet],
+            font_config=_font_config,
+        )
+
+
+def clear_pdf_cache():
+    """Drop all cached PDFs (used by benchmarks and tests)."""
+    with _pdf_cache_lock:
+        _pdf_cache.clear()
+
+
+def generate_pnl_pdf(data: dict) -> bytes:
+    """Render a P&L data dict into a professional PDF.
+
+    Returns raw PDF bytes. Identical inputs return the cached render.
+    """
+    context = build_pnl_context(data)
+    key = _context_key(context)
+
+    with _pdf_cache_lock:
+        cached = _pdf_cache.get(key)
+        if cached is not None:
+            _pdf_cache.move_to_end(key)
+            return cached
+
+    pdf_bytes = render_pnl_pdf(context)
+
+    with _pdf_cache_lock:
+        _pdf_cache[key] = pdf_bytes
+        _pdf_cache.move_to_end(key)
+        while len(_pdf_cache) > PDF_CACHE_SIZE:
+            _pdf_cache.popitem(last=False)
 
-    pdf_bytes = HTML(string=html_content).write_pdf()
     return pdf_bytes
+
+
+# Small synthetic P&L for startup warm-up — exercises every template section
+_WARMUP_PNL = {
+    "property_name": "Warm-up",
+    "property_address": "1 Main St, Ann Arbor, MI 48104",
+    "income": {"Gross Rental Income": 120000},
+    "vacancy_rate": 0.05,
+    "expenses": {"Property Taxes": 15000, "Insurance": 5000},
+    "sensitivity": {"vacancy_rates": [0.05, 0.1], "expense_growth": [0, 0.03], "cap_rates": [0.07, 0.08]},
+}
+
+
+def warm_up():
+    """Render one uncached PDF so fonts and WeasyPrint's layout code are loaded."""
+    render_pnl_pdf(build_pnl_context(_WARMUP_PNL))
@@ -1,24 +1,105 @@
 """RRG P&L Microservice — persistent Flask container.
 
 Loads the P&L LangGraph once at startup. Container stays warm.
-Exposes POST /process (standard worker node contract) and GET /health.
+Served by wsgi_server (WEB_WORKERS processes x WEB_THREADS threads).
+Exposes POST /process (standard worker node contract), POST /jobs +
+GET /jobs/<id> (the same turn as a background job with progress), POST /batch
+(structured records in, zip of PDFs out), GET /artifacts/<id> (generated
+PDFs), GET /ready (warm-up state) and GET /health.
 """
 
 import base64
 import os
+import threading
+import time
 import traceback
-from flask import Flask, request, jsonify
+from datetime import date
+from flask import Flask, Response, request, g, jsonify, send_file, stream_with_context
 
 app = Flask(__name__)
 
+
+@app.before_request
+def _start_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def _server_timing(response):
+    """Report handler time so callers can split network from processing."""
+    start = g.get("request_start")
+    if start is not None:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        response.headers["Server-Timing"] = f"app;dur={elapsed_ms:.1f}"
+    return response
+
+
 # Load graph once at startup — no cold start per request
 from graph import build_graph
 graph = build_graph()
 
+from pnl_batch import parse_pnl_csv, stream_batch_zip, MAX_BATCH_RECORDS
+
+# Working P&L data lives here; the router only round-trips a session handle
+from session_store import SessionStore
+_session_store = None
+# Guards the lazily created stores below
+_init_lock = threading.Lock()
 
-@app.route("/process", methods=["POST"])
-def process():
-    """Standard worker node endpoint.
+
+def _get_session_store() -> SessionStore:
+    """Return the session store, opening its database on first call.
+
+    Created on first use so importing the app (tests) doesn't touch /data.
+    """
+    global _session_store
+    if _session_store is None:
+        with _init_lock:
+            if _session_store is None:
+                _session_store = SessionStore()
+    return _session_store
+
+# Generated files go to the shared artifact volume; responses carry the ID
+from artifact_store import ArtifactStore
+artifact_store = ArtifactStore()
+
+
+def _encode_file(raw: bytes | None) -> tuple:
+    """Return (base64, artifact_id) for a generated file.
+
+    Uses the artifact store when the shared volume is mounted, otherwise
+    falls back to inline base64.
+    """
+    if not raw:
+        return None, None
+    if artifact_store.enabled:
+        try:
+            return None, artifact_store.put(raw)
+        except OSError:
+            traceback.print_exc()
+    return base64.b64encode(raw).decode("utf-8"), None
+
+
+# Background jobs — POST /jobs + GET /jobs/<id> for long-running turns.
+# Created on first use so importing the app (tests) doesn't touch /data.
+from job_runner import JobStore, JobRunner
+_job_runner = None
+
+
+def _get_job_runner() -> JobRunner:
+    """Return the job runner, creating its store on first call."""
+    global _job_runner
+    if _job_runner is None:
+        with _init_lock:
+            if _job_runner is None:
+                _job_runner = JobRunner(JobStore(), _handle_process)
+    return _job_runner
+
+
+def _handle_process(data: dict) -> tuple:
+    """Run one /process turn. Returns (response_body, http_status).
+
+    Shared by POST /process (synchronous) and POST /jobs (background).
 
     Request:
         {
@@ -31,24 +112,43 @@ def process():
     Response:
         {
             response: str,          # message to display to user
-            state: {...},           # updated state (passed back next time)
+            state: {...},           # {session_id, pnl_active} handle (passed back next time)
             active: bool,           # true = node still owns conversation
-            pdf_bytes: str|null,    # base64-encoded PDF if generated
+            pdf_bytes: str|null,    # base64-encoded PDF (artifact store disabled)
+            pdf_artifact_id: str|null,  # artifact ID (artifact store enabled)
             pdf_filename: str|null
         }
     """
-    data = request.json or {}
     command = data.get("command", "create")
     user_message = data.get("user_message", "")
     chat_history = data.get("chat_history", [])
     prev_state = data.get("state", {})
 
-    # Build graph input from request + previous state
+    # Resolve the session handle to the stored working state. Callers that
+    # still send the full state inline (no session_id) are accepted as-is.
+    session_id = prev_state.get("session_id")
+    if session_id:
+        session = _get_session_store().get(session_id)
+        if session is None:
+            return {
+                "response": (
+                    "That P&L session expired after a period of inactivity. "
+                    "Start a new one whenever you're ready."
+                ),
+                "state": {},
+                "active": False,
+                "pdf_bytes": None,
+                "pdf_filename": None,
+            }, 200
+    else:
+        session = prev_state
+
+    # Build graph input from request + stored session state
     graph_input = {
         "command": command,
         "user_message": user_message,
         "chat_history": chat_history,
-        "pnl_data": prev_state.get("pnl_data"),
+        "pnl_data": session.get("pnl_data"),
         # Initialize output fields
         "response": "",
         "pnl_data_out": None,
@@ -62,13 +162,13 @@ def process():
         result = graph.invoke(graph_input)
     except Exception as e:
         traceback.print_exc()
-        return jsonify({
+        return {
             "response": f"Error processing P&L request: {e}",
             "state": prev_state,
             "active": prev_state.get("pnl_active", True),
             "pdf_bytes": None,
             "pdf_filename": None,
-        }), 500
+        }, 500
 
     # Build response
     response_text = result.get("response", "")
@@ -79,27 +179,144 @@ def process():
 
     # Determine current P&L data for state persistence
     # If node produced new data, use it; otherwise keep previous
-    current_pnl_data = pnl_data_out if pnl_data_out is not None else prev_state.get("pnl_data")
+    current_pnl_data = pnl_data_out if pnl_data_out is not None else session.get("pnl_data")
 
-    # If workflow ended (active=False), clear the data
-    if not pnl_active:
-        current_pnl_data = None
+    # Persist while the workflow is active; drop the session once it ends
+    session_store = _get_session_store()
+    if pnl_active:
+        session_id = session_id or session_store.new_session_id()
+        session_store.put(session_id, {"pnl_data": current_pnl_data})
+    else:
+        session_store.delete(session_id)
+        session_id = None
 
-    # Encode PDF as base64 if present
-    pdf_b64 = None
-    if pdf_bytes_raw:
-        pdf_b64 = base64.b64encode(pdf_bytes_raw).decode("utf-8")
+    # Store the PDF as an artifact (or base64 it) if present
+    pdf_b64, pdf_artifact_id = _encode_file(pdf_bytes_raw)
 
-    return jsonify({
+    return {
         "response": response_text,
         "state": {
-            "pnl_data": current_pnl_data,
+            "session_id": session_id,
             "pnl_active": pnl_active,
         },
         "active": pnl_active,
         "pdf_bytes": pdf_b64,
+        "pdf_artifact_id": pdf_artifact_id,
         "pdf_filename": pdf_filename,
-    })
+    }, 200
+
+
+@app.route("/process", methods=["POST"])
+def process():
+    """Standard worker node endpoint — see _handle_process for the contract."""
+    body, status = _handle_process(request.json or {})
+    return jsonify(body), status
+
+
+@app.route("/jobs", methods=["POST"])
+def submit_job():
+    """Run a /process request in the background.
+
+    Request: same body as /process.
+    Response: 202 {job_id} — poll GET /jobs/<job_id>.
+    """
+    job_id = _get_job_runner().submit(request.json or {})
+    return jsonify({"job_id": job_id}), 202
+
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """Job status, progress events and (when finished) the /process body.
+
+    Response:
+        {
+            job_id: str,
+            status: "queued" | "running" | "done" | "error",
+            events: [{stage, at}, ...],
+            result: {...}|null,     # /process response body once finished
+            http_status: int|null,
+            elapsed_seconds: float,
+            queue_ms: float,        # waiting for a job thread (once started)
+            worker_ms: float        # handler time (once finished)
+        }
+        404 if the job is unknown or expired.
+    """
+    job = _get_job_runner().store.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+
+# Startup warm-up — first CLI start and first WeasyPrint render happen
+# before the first user; GET /ready reports progress
+from warmup import Warmup, warm_claude_cli
+from graph import CLAUDE_MODEL
+import pnl_pdf
+warmup = Warmup("rrg-pnl")
+warmup.add("llm_cli", lambda: warm_claude_cli(CLAUDE_MODEL))
+warmup.add("pdf_render", pnl_pdf.warm_up)
+
+
+@app.route("/batch", methods=["POST"])
+def batch():
+    """Render many P&Ls at once — no chat, no LLM.
+
+    Request (one of):
+        application/json:  {records: [pnl_data, ...]}
+        text/csv body, or multipart form with a `file` CSV upload
+        (columns: property_name, property_address, vacancy_rate,
+         income:<label>..., expense:<label>...)
+
+    Response:
+        application/zip stream — one PDF per successful record plus
+        manifest.json listing {index, property_name, ok, filename|error}.
+        400 if the request has no usable records.
+    """
+    try:
+        if "file" in request.files:
+            records = parse_pnl_csv(request.files["file"].read().decode("utf-8-sig"))
+        elif request.mimetype == "text/csv":
+            records = parse_pnl_csv(request.get_data(as_text=True))
+        else:
+            data = request.get_json(silent=True) or {}
+            records = data.get("records")
+    except (ValueError, UnicodeDecodeError) as e:
+        return jsonify({"error": f"Could not parse CSV: {e}"}), 400
+
+    if not isinstance(records, list) or not records:
+        return jsonify({"error": "No records provided"}), 400
+    if len(records) > MAX_BATCH_RECORDS:
+        return jsonify({"error": f"Too many records ({len(records)} > {MAX_BATCH_RECORDS})"}), 400
+
+    zip_name = f"{date.today().strftime('%Y%m%d')}_Profit and Loss Batch.zip"
+    return Response(
+        stream_with_context(stream_batch_zip(records)),
+        mimetype="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="{zip_name}"',
+            "X-Batch-Count": str(len(records)),
+        },
+    )
+
+
+@app.route("/artifacts/<artifact_id>", methods=["GET"])
+def get_artifact(artifact_id):
+    """Stream a generated file from the artifact store by ID."""
+    path = artifact_store.path(artifact_id)
+    if path is None:
+        return jsonify({"error": "Artifact not found"}), 404
+    return send_file(path, mimetype="application/pdf", conditional=True)
+
+
+@app.route("/ready", methods=["GET"])
+def ready():
+    """Readiness probe — per-component warm-up state and timings.
+
+    200 once every required warm-up step has finished, 503 while warming
+    or if one failed. /health stays a plain liveness check.
+    """
+    body = warmup.status()
+    return jsonify(body), 200 if body["ready"] else 503
 
 
 @app.route("/health", methods=["GET"])
@@ -111,4 +328,5 @@ def health():
 if __name__ == "__main__":
     port = int(os.getenv("PORT", "8100"))
     print(f"rrg-pnl starting on port {port}")
-    app.run(host="0.0.0.0", port=port)
+    from wsgi_server import serve
+    serve(app, port, on_worker_start=warmup.start)
@@ -0,0 +1,132 @@
+"""SQLite session store for worker conversation state.
+
+Keeps each conversation's working data (e.g. pnl_data) on the worker so
+the /process `state` that round-trips through the router and Windmill is
+just a small handle: {"session_id": ..., "<worker>_active": bool}.
+
+Sessions expire after SESSION_TTL_SECONDS of inactivity (sliding — every
+write pushes the expiry out). Expired rows are ignored on read and
+deleted periodically on write.
+"""
+
+import json
+import os
+import sqlite3
+import time
+import uuid
+
+DB_PATH = os.getenv("SESSION_DB_PATH", "/data/sessions.db")
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(24 * 60 * 60)))
+
+# Minimum seconds between expired-row sweeps
+_EVICT_INTERVAL_SECONDS = 60
+
+
+class SessionStore:
+    """SQLite-backed key/value store for per-conversation worker state.
+
+    Each session has:
+    - id: UUID string (the handle returned to the router)
+    - state: JSON dict of worker state
+    - updated_at: epoch seconds of the last write
+    - expires_at: epoch seconds after which the session is gone
+    """
+
+    def __init__(self, db_path: str | None = None, ttl_seconds: int | None = None):
+        self.db_path = db_path or DB_PATH
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else SESSION_TTL_SECONDS
+        self._last_evict = 0.0
+        self._init_table()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Create a new SQLite connection."""
+        return sqlite3.connect(self.db_path)
+
+    def _init_table(self):
+        """Create the sessions table if it doesn't exist."""
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL DEFAULT '{}',
+                    updated_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at)"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def new_session_id() -> str:
+        """Generate a fresh session handle."""
+        return str(uuid.uuid4())
+
+    def get(self, session_id: str) -> dict | None:
+        """Load a session's state. Returns None if missing or expired."""
+        if not session_id:
+            return None
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT state FROM sessions WHERE id = ? AND expires_at > ?",
+                (session_id, time.time()),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return json.loads(row[0]) if row[0] else {}
+
+    def put(self, session_id: str, state: dict):
+        """Create or replace a session's state and refresh its expiry."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                INSERT INTO sessions (id, state, updated_at, expires_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    state = excluded.state,
+                    updated_at = excluded.updated_at,
+                    expires_at = excluded.expires_at
+                """,
+                (session_id, json.dumps(state), now, now + self.ttl_seconds),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        if now - self._last_evict >= _EVICT_INTERVAL_SECONDS:
+            self.evict_expired(now)
+
+    def delete(self, session_id: str):
+        """Delete a session. No-op if it doesn't exist."""
+        if not session_id:
+            return
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def evict_expired(self, now: float | None = None) -> int:
+        """Delete all expired sessions. Returns the number removed."""
+        now = now if now is not None else time.time()
+        self._last_evict = now
+        conn = self._connect()
+        try:
+            cur = conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+            conn.commit()
+            return cur.rowcount
+        finally:
+            conn.close()
@@ -0,0 +1,26 @@
+"""Shared fixtures for rrg-pnl test suite."""
+
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+@pytest.fixture
+def sample_pnl_data():
+    """A small but complete P&L data dict, as produced by extract_pnl_data."""
+    return {
+        "property_name": "123 Main St",
+        "property_address": "123 Main St, Ann Arbor, MI 48104",
+        "period": "Annual",
+        "income": {"Gross Rental Income": 100000},
+        "vacancy_rate": 0.05,
+        "vacancy_method": "assumed",
+        "expenses": {
+            "Property Taxes": 12000,
+            "Insurance": 6000,
+            "Property Management": 8000,
+            "Repairs & Maintenance": 4000,
+        },
+    }
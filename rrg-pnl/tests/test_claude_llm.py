@@ -0,0 +1,105 @@
+"""Tests for claude_llm.py — record and replay LLM backends."""
+
+import json
+import os
+import stat
+import threading
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+
+import claude_llm
+from claude_llm import ChatClaudeCLI, load_fixture, prompt_key, save_fixture
+
+
+@pytest.fixture
+def fake_cli(tmp_path, monkeypatch):
+    """Put a `claude` on PATH that logs each call and answers "cli says hi"."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    log = tmp_path / "calls.log"
+    script = bin_dir / "claude"
+    script.write_text(f'#!/bin/sh\necho call >> "{log}"\necho "cli says hi"\n')
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return log
+
+
+@pytest.fixture
+def fixture_dir(tmp_path, monkeypatch):
+    path = tmp_path / "fixtures"
+    monkeypatch.setattr(claude_llm, "LLM_FIXTURE_DIR", str(path))
+    monkeypatch.setattr(claude_llm, "LLM_REPLAY_LATENCY_MS", "0")
+    return path
+
+
+MESSAGES = [SystemMessage(content="Be brief."), HumanMessage(content="Say hi")]
+
+
+class TestPromptKey:
+    def test_stable_and_input_sensitive(self):
+        key = prompt_key("haiku", "sys", "hello")
+        assert key == prompt_key("haiku", "sys", "hello")
+        assert key != prompt_key("sonnet", "sys", "hello")
+        assert key != prompt_key("haiku", None, "hello")
+        assert prompt_key("haiku", None, "hello") == prompt_key("haiku", "", "hello")
+
+
+class TestRecordReplay:
+    def test_record_writes_fixture(self, fake_cli, fixture_dir, monkeypatch):
+        monkeypatch.setattr(claude_llm, "LLM_BACKEND", "record")
+        result = ChatClaudeCLI().invoke(MESSAGES)
+        assert result.content == "cli says hi"
+
+        fixture = load_fixture("haiku", "Be brief.", "Say hi")
+        assert fixture["response"] == "cli says hi"
+        assert fixture["prompt"] == "Say hi"
+        assert fixture["latency_ms"] >= 0
+        assert len(os.listdir(fixture_dir)) == 1  # no leftover temp files
+
+    def test_concurrent_records_of_one_prompt(self, fixture_dir):
+        errors = []
+        start = threading.Barrier(8)
+
+        def record(n):
+            start.wait()
+            try:
+                for _ in range(20):
+                    save_fixture("haiku", "Be brief.", "Say hi", f"reply {n}", 1.0)
+            except OSError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=record, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert os.listdir(fixture_dir) == [f"{prompt_key('haiku', 'Be brief.', 'Say hi')}.json"]
+        assert load_fixture("haiku", "Be brief.", "Say hi")["response"].startswith("reply ")
+
+    def test_replay_serves_fixture_without_cli(self, fake_cli, fixture_dir, monkeypatch):
+        monkeypatch.setattr(claude_llm, "LLM_BACKEND", "record")
+        ChatClaudeCLI().invoke(MESSAGES)
+        assert fake_cli.read_text().count("call") == 1
+
+        monkeypatch.setattr(claude_llm, "LLM_BACKEND", "replay")
+        result = ChatClaudeCLI().invoke(MESSAGES)
+        assert result.content == "cli says hi"
+        assert fake_cli.read_text().count("call") == 1
+
+    def test_replay_missing_fixture_raises(self, fixture_dir, monkeypatch):
+        monkeypatch.setattr(claude_llm, "LLM_BACKEND", "replay")
+        with pytest.raises(RuntimeError, match="No recorded LLM response"):
+            ChatClaudeCLI().invoke(MESSAGES)
+
+    def test_replay_uses_recorded_response_verbatim(self, fixture_dir, monkeypatch):
+        monkeypatch.setattr(claude_llm, "LLM_BACKEND", "replay")
+        fixture_dir.mkdir()
+        key = prompt_key("sonnet", None, "Extract")
+        (fixture_dir / f"{key}.json").write_text(json.dumps(
+            {"response": '{"ok": true}', "latency_ms": 5000}
+        ))
+        # LLM_REPLAY_LATENCY_MS=0 overrides the recorded 5s
+        result = ChatClaudeCLI(model_name="sonnet").invoke([HumanMessage(content="Extract")])
+        assert result.content == '{"ok": true}'
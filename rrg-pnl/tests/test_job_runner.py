@@ -0,0 +1,123 @@
+"""Tests for job_runner.py — background /process jobs with progress events."""
+
+import threading
+import time
+import pytest
+
+import job_runner
+from job_runner import JobStore, JobRunner, report_progress
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.db"), ttl_seconds=3600)
+
+
+def _wait(store, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = store.get(job_id)
+        if job["status"] in (job_runner.DONE, job_runner.ERROR):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+class TestJobStore:
+    """Status transitions, events and expiry."""
+
+    def test_create_is_queued(self, store):
+        job = store.get(store.create())
+        assert job["status"] == "queued"
+        assert job["events"] == []
+        assert job["result"] is None
+
+    def test_events_append_in_order(self, store):
+        job_id = store.create()
+        store.add_event(job_id, "one")
+        store.add_event(job_id, "two")
+        assert [e["stage"] for e in store.get(job_id)["events"]] == ["one", "two"]
+
+    def test_finish_ok_and_error(self, store):
+        ok = store.create()
+        store.finish(ok, {"response": "hi"}, 200)
+        assert store.get(ok)["status"] == "done"
+        assert store.get(ok)["result"] == {"response": "hi"}
+
+        bad = store.create()
+        store.finish(bad, {"response": "boom"}, 500)
+        assert store.get(bad)["status"] == "error"
+        assert store.get(bad)["http_status"] == 500
+
+    def test_missing_or_expired(self, tmp_path):
+        store = JobStore(str(tmp_path / "jobs.db"), ttl_seconds=0)
+        assert store.get("nope") is None
+        assert store.get(store.create()) is None
+
+    def test_stale_running_job_reported_as_error(self, store, monkeypatch):
+        job_id = store.create()
+        store.set_running(job_id)
+        monkeypatch.setattr(job_runner, "JOB_STALE_SECONDS", -1)
+        job = store.get(job_id)
+        assert job["status"] == "error"
+        assert "stopped responding" in job["error"]
+
+
+    def test_queue_and_worker_time(self, store, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(job_runner.time, "time", lambda: now[0])
+        job_id = store.create()
+        assert "queue_ms" not in store.get(job_id)
+        now[0] = 100.25
+        store.set_running(job_id)
+        now[0] = 101.75
+        store.finish(job_id, {"response": "hi"}, 200)
+        job = store.get(job_id)
+        assert job["queue_ms"] == 250.0
+        assert job["worker_ms"] == 1500.0
+
+
+class TestJobRunner:
+    """Handlers run in the background and can report progress."""
+
+    def test_runs_handler_and_records_progress(self, store):
+        def handler(payload):
+            report_progress("Rendering PDF")
+            return {"response": payload["user_message"].upper()}, 200
+
+        runner = JobRunner(store, handler, max_workers=1)
+        job = _wait(store, runner.submit({"user_message": "hello"}))
+        assert job["status"] == "done"
+        assert job["result"] == {"response": "HELLO"}
+        assert [e["stage"] for e in job["events"]] == ["Rendering PDF"]
+
+    def test_handler_exception_becomes_error_result(self, store):
+        def handler(payload):
+            raise RuntimeError("kaboom")
+
+        runner = JobRunner(store, handler, max_workers=1)
+        job = _wait(store, runner.submit({}))
+        assert job["status"] == "error"
+        assert "kaboom" in job["result"]["response"]
+
+    def test_poll_sees_running_job(self, store):
+        release = threading.Event()
+
+        def handler(payload):
+            report_progress("Searching listings")
+            release.wait(5)
+            return {"response": "done"}, 200
+
+        runner = JobRunner(store, handler, max_workers=1)
+        job_id = runner.submit({})
+        deadline = time.time() + 5
+        while not store.get(job_id)["events"] and time.time() < deadline:
+            time.sleep(0.01)
+        job = store.get(job_id)
+        assert job["status"] == "running"
+        assert job["events"][0]["stage"] == "Searching listings"
+        release.set()
+        assert _wait(store, job_id)["status"] == "done"
+
+    def test_report_progress_outside_job_is_noop(self):
+        report_progress("nothing happens")
@@ -0,0 +1,162 @@
+"""Tests for pnl_batch.py — CSV parsing, record validation and the zip stream."""
+
+import io
+import json
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+try:
+    import pnl_batch
+except (ImportError, OSError):  # WeasyPrint's native libraries (pango) missing
+    pytest.skip("WeasyPrint is not available", allow_module_level=True)
+
+from pnl_batch import _ZipStream, parse_pnl_csv, stream_batch_zip, validate_record
+
+
+VALID_CSV = (
+    "property_name,property_address,vacancy_rate,income:Gross Rental Income,"
+    "expense:Property Taxes,expense:Insurance\n"
+    "Maple Court,\"100 Maple Ct, Ann Arbor, MI\",5%,\"$186,000\",21000,6500\n"
+    "\n"
+    "Oak Plaza,,8,120000,\"$9,000.50\",\n"
+)
+
+
+# ===========================================================================
+# parse_pnl_csv
+# ===========================================================================
+
+class TestParsePnlCsv:
+    """CSV rows -> pnl_data dicts."""
+
+    def test_valid_csv(self):
+        records = parse_pnl_csv(VALID_CSV)
+        assert len(records) == 2  # blank line skipped
+        maple, oak = records
+        assert maple["property_name"] == "Maple Court"
+        assert maple["property_address"] == "100 Maple Ct, Ann Arbor, MI"
+        assert maple["period"] == "Annual"
+        assert maple["vacancy_rate"] == pytest.approx(0.05)
+        assert maple["income"] == {"Gross Rental Income": 186000}
+        assert maple["expenses"] == {"Property Taxes": 21000, "Insurance": 6500}
+        # "8" means 8%; an empty cell is zero
+        assert oak["vacancy_rate"] == pytest.approx(0.08)
+        assert oak["expenses"] == {"Property Taxes": 9000.5, "Insurance": 0.0}
+
+    def test_defaults(self):
+        (record,) = parse_pnl_csv("income:Rent\n1000\n")
+        assert record["property_name"] == "Property"
+        assert record["vacancy_rate"] == 0.05
+
+    def test_bad_number_names_the_column(self):
+        with pytest.raises(ValueError, match="expense:Insurance"):
+            parse_pnl_csv("property_name,income:Rent,expense:Insurance\nA,1000,lots\n")
+
+
+# ===========================================================================
+# validate_record
+# ===========================================================================
+
+class TestValidateRecord:
+    """Per-record checks before rendering."""
+
+    def test_valid(self, sample_pnl_data):
+        assert validate_record(sample_pnl_data) is None
+
+    def test_not_an_object(self):
+        assert validate_record(["x"]) == "record must be an object"
+
+    def test_no_income(self, sample_pnl_data):
+        sample_pnl_data["income"] = {"Rent": 0}
+        assert validate_record(sample_pnl_data) == "no income provided"
+
+    def test_non_numeric_amount(self, sample_pnl_data):
+        sample_pnl_data["expenses"]["Insurance"] = "6000"
+        assert validate_record(sample_pnl_data) == "expenses.Insurance must be a number"
+
+    def test_bool_is_not_a_number(self, sample_pnl_data):
+        sample_pnl_data["income"]["Gross Rental Income"] = True
+        assert "must be a number" in validate_record(sample_pnl_data)
+
+    def test_vacancy_out_of_range(self, sample_pnl_data):
+        sample_pnl_data["vacancy_rate"] = 5
+        assert "vacancy_rate" in validate_record(sample_pnl_data)
+
+
+# ===========================================================================
+# _ZipStream / stream_batch_zip
+# ===========================================================================
+
+class TestZipStream:
+    def test_drain_returns_and_clears(self):
+        sink = _ZipStream()
+        sink.write(b"ab")
+        sink.write(memoryview(b"cd"))
+        assert sink.drain() == b"abcd"
+        assert sink.drain() == b""
+
+
+def test_pool_spawns_workers(monkeypatch):
+    """Forking the threaded server could copy a held pnl_pdf lock into a worker."""
+    monkeypatch.setattr(pnl_batch, "_pool", None)
+    pool = pnl_batch._get_pool()
+    try:
+        assert pool._mp_context.get_start_method() == "spawn"
+        assert pnl_batch._get_pool() is pool
+    finally:
+        pool.shutdown()
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    """Render in threads with a fake PDF, so no WeasyPrint or pool processes."""
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(pnl_batch, "_get_pool", lambda: pool)
+    monkeypatch.setattr(
+        pnl_batch, "generate_pnl_pdf", lambda data: f"%PDF {data['property_name']}".encode()
+    )
+    yield pool
+    pool.shutdown()
+
+
+class TestStreamBatchZip:
+    """The zip holds one PDF per good record plus a manifest of every outcome."""
+
+    def test_zip_and_manifest(self, thread_pool):
+        records = parse_pnl_csv(VALID_CSV)
+        records.append({"property_name": "Empty", "income": {}})
+        records.append(dict(records[0]))  # same address -> same filename
+
+        chunks = list(stream_batch_zip(records))
+        assert len(chunks) > 1  # streamed, not built in one piece
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+
+        manifest = json.loads(archive.read("manifest.json"))
+        assert manifest["total"] == 4
+        assert manifest["succeeded"] == 3
+        assert manifest["failed"] == 1
+        items = manifest["items"]
+        assert [item["index"] for item in items] == [0, 1, 2, 3]
+        assert items[2] == {"index": 2, "property_name": "Empty", "ok": False,
+                            "error": "no income provided"}
+
+        names = [items[i]["filename"] for i in (0, 1, 3)]
+        assert len(set(names)) == 3
+        assert sorted(archive.namelist()) == sorted(names + ["manifest.json"])
+        assert archive.read(items[1]["filename"]) == b"%PDF Oak Plaza"
+        maple_names = sorted([items[0]["filename"], items[3]["filename"]])
+        assert maple_names[0].endswith("_Profit and Loss_100 Maple Ct Ann Arbor (2).pdf")
+        assert maple_names[1].endswith("_Profit and Loss_100 Maple Ct Ann Arbor.pdf")
+
+    def test_render_error_is_reported(self, thread_pool, monkeypatch, sample_pnl_data):
+        def broken(data):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(pnl_batch, "generate_pnl_pdf", broken)
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(stream_batch_zip([sample_pnl_data]))))
+        manifest = json.loads(archive.read("manifest.json"))
+        assert manifest["items"][0]["ok"] is False
+        assert manifest["items"][0]["error"] == "render failed: boom"
+        assert archive.namelist() == ["manifest.json"]
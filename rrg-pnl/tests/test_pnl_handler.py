@@ -0,0 +1,202 @@
+"""Tests for pnl_handler.py — P&L computation and sensitivity analysis.
+
+Only the pure computation/formatting helpers are covered here; the
+LLM-backed extract/apply functions are exercised through the graph.
+"""
+
+import pytest
+
+from pnl_handler import (
+    compute_pnl,
+    compute_sensitivity,
+    format_sensitivity_table,
+    parse_sensitivity_axes,
+    DEFAULT_CAP_RATES,
+    DEFAULT_EXPENSE_GROWTH,
+    DEFAULT_VACANCY_RATES,
+)
+
+
+# ===========================================================================
+# compute_pnl
+# ===========================================================================
+
+class TestComputePnl:
+    """Tests for the base P&L computation."""
+
+    def test_net_income(self, sample_pnl_data):
+        computed = compute_pnl(sample_pnl_data)
+        assert computed["total_income"] == 100000
+        assert computed["vacancy_loss"] == pytest.approx(5000)
+        assert computed["total_expenses"] == 30000
+        assert computed["net_income"] == pytest.approx(65000)
+
+
+# ===========================================================================
+# compute_sensitivity
+# ===========================================================================
+
+class TestComputeSensitivity:
+    """Tests for the vacancy × expense growth × cap rate grid."""
+
+    def test_default_axes(self, sample_pnl_data):
+        grid = compute_sensitivity(sample_pnl_data)
+        assert grid["vacancy_rates"] == DEFAULT_VACANCY_RATES
+        assert grid["expense_growth"] == DEFAULT_EXPENSE_GROWTH
+        assert grid["cap_rates"] == DEFAULT_CAP_RATES
+
+    def test_grid_shape(self, sample_pnl_data):
+        grid = compute_sensitivity(
+            sample_pnl_data,
+            vacancy_rates=[0.0, 0.1],
+            expense_growth=[0.0, 0.05, 0.1],
+            cap_rates=[0.07, 0.08],
+        )
+        assert len(grid["noi"]) == 2
+        assert all(len(row) == 3 for row in grid["noi"])
+        assert all(len(cell) == 2 for row in grid["value"] for cell in row)
+
+    def test_base_case_matches_compute_pnl(self, sample_pnl_data):
+        """Zero growth at the current vacancy rate reproduces the P&L NOI."""
+        grid = compute_sensitivity(
+            sample_pnl_data, vacancy_rates=[0.05], expense_growth=[0.0], cap_rates=[0.08],
+        )
+        assert grid["noi"][0][0] == pytest.approx(compute_pnl(sample_pnl_data)["net_income"])
+
+    def test_noi_and_value(self, sample_pnl_data):
+        """8% vacancy and 10% expense growth at a 7 cap."""
+        grid = compute_sensitivity(
+            sample_pnl_data, vacancy_rates=[0.08], expense_growth=[0.10], cap_rates=[0.07],
+        )
+        # 100,000 * 0.92 - 30,000 * 1.10 = 59,000
+        assert grid["noi"][0][0] == pytest.approx(59000)
+        assert grid["value"][0][0][0] == pytest.approx(59000 / 0.07)
+
+    def test_zero_cap_rate_does_not_divide(self, sample_pnl_data):
+        grid = compute_sensitivity(
+            sample_pnl_data, vacancy_rates=[0.05], expense_growth=[0.0], cap_rates=[0.0],
+        )
+        assert grid["value"][0][0][0] == 0.0
+
+    def test_empty_pnl(self):
+        grid = compute_sensitivity({}, vacancy_rates=[0.05], expense_growth=[0.0], cap_rates=[0.08])
+        assert grid["noi"] == [[0.0]]
+
+    def test_growth_on_one_line(self, sample_pnl_data):
+        """10% on taxes only: 100,000 * 0.95 - (30,000 + 12,000 * 0.10) = 63,800."""
+        grid = compute_sensitivity(
+            sample_pnl_data, vacancy_rates=[0.05], expense_growth=[0.10, 0.10],
+            cap_rates=[0.08], expense_lines=[None, "Property Taxes"],
+        )
+        assert grid["noi"][0][0] == pytest.approx(62000)
+        assert grid["noi"][0][1] == pytest.approx(63800)
+
+
+# ===========================================================================
+# parse_sensitivity_axes
+# ===========================================================================
+
+class TestParseSensitivityAxes:
+    """Tests for pulling scenario values out of a what-if message."""
+
+    def test_includes_current_vacancy(self, sample_pnl_data):
+        sample_pnl_data["vacancy_rate"] = 0.0667
+        axes = parse_sensitivity_axes("run a sensitivity", sample_pnl_data)
+        assert 0.0667 in axes["vacancy_rates"]
+
+    def test_vacancy_and_expense_growth(self, sample_pnl_data):
+        axes = parse_sensitivity_axes(
+            "what if vacancy is 12% and taxes go up 7.5%", sample_pnl_data,
+        )
+        assert 0.12 in axes["vacancy_rates"]
+        assert 0.075 in axes["expense_growth"]
+
+    def test_line_growth_applies_to_that_line(self, sample_pnl_data):
+        axes = parse_sensitivity_axes(
+            "what if taxes go up 10% and insurance +5% and expenses rise 3%", sample_pnl_data,
+        )
+        scenarios = list(zip(axes["expense_growth"], axes["expense_lines"]))
+        assert (0.1, "Property Taxes") in scenarios
+        assert (0.05, "Insurance") in scenarios
+        assert (0.03, None) in scenarios
+        # total-expense scenarios come first
+        assert scenarios.index((0.03, None)) < scenarios.index((0.05, "Insurance"))
+
+    def test_unknown_line_is_rejected(self, sample_pnl_data):
+        del sample_pnl_data["expenses"]["Insurance"]
+        with pytest.raises(ValueError, match="insurance"):
+            parse_sensitivity_axes("what if insurance goes up 5%", sample_pnl_data)
+
+    def test_cap_rate_forms(self, sample_pnl_data):
+        axes = parse_sensitivity_axes(
+            "value it at a 6.5 cap and a cap rate of 7.25%", sample_pnl_data,
+        )
+        assert 0.065 in axes["cap_rates"]
+        assert 0.0725 in axes["cap_rates"]
+
+    def test_singular_tax(self, sample_pnl_data):
+        axes = parse_sensitivity_axes("what if property tax goes up 10%", sample_pnl_data)
+        scenarios = list(zip(axes["expense_growth"], axes["expense_lines"]))
+        assert (0.1, "Property Taxes") in scenarios
+
+    @pytest.mark.parametrize("message", [
+        "what if expenses go down 5%",
+        "expenses decrease 5%",
+        "cut expenses by 5%",
+        "what if expenses are cut by 5%",
+        "expenses -5%",
+    ])
+    def test_decrease_is_negative(self, sample_pnl_data, message):
+        axes = parse_sensitivity_axes(message, sample_pnl_data)
+        assert -0.05 in axes["expense_growth"]
+
+    def test_decrease_word_stays_in_its_clause(self, sample_pnl_data):
+        axes = parse_sensitivity_axes("vacancy down to 2% and expenses up 7%", sample_pnl_data)
+        assert 0.07 in axes["expense_growth"]
+        assert -0.07 not in axes["expense_growth"]
+
+    def test_decrease_on_one_line(self, sample_pnl_data):
+        axes = parse_sensitivity_axes("insurance down 8%", sample_pnl_data)
+        scenarios = list(zip(axes["expense_growth"], axes["expense_lines"]))
+        assert (-0.08, "Insurance") in scenarios
+
+    def test_cap_suffix_skips_claimed_percentage(self, sample_pnl_data):
+        axes = parse_sensitivity_axes("taxes up 10% cap at 7", sample_pnl_data)
+        assert 0.1 not in axes["cap_rates"]
+        assert (0.1, "Property Taxes") in zip(axes["expense_growth"], axes["expense_lines"])
+
+    def test_axes_sorted_and_unique(self, sample_pnl_data):
+        axes = parse_sensitivity_axes("what if vacancy is 5%", sample_pnl_data)
+        assert axes["vacancy_rates"] == sorted(set(axes["vacancy_rates"]))
+
+
+# ===========================================================================
+# format_sensitivity_table
+# ===========================================================================
+
+class TestFormatSensitivityTable:
+    """Tests for the markdown rendering of the grid."""
+
+    def test_has_noi_and_value_tables(self, sample_pnl_data):
+        grid = compute_sensitivity(
+            sample_pnl_data, vacancy_rates=[0.05], expense_growth=[0.0, 0.1], cap_rates=[0.07],
+        )
+        table = format_sensitivity_table(sample_pnl_data, grid)
+        assert "| **NOI** | Exp +0% | Exp +10% |" in table
+        assert "| **Value (Exp +0%)** | Cap 7% |" in table
+        assert "| **Value (Exp +10%)** | Cap 7% |" in table
+        assert "| Vacancy 5% | $65,000 | $62,000 |" in table
+
+    def test_line_growth_label(self, sample_pnl_data):
+        grid = compute_sensitivity(
+            sample_pnl_data, vacancy_rates=[0.05], expense_growth=[0.1],
+            cap_rates=[0.07], expense_lines=["Property Taxes"],
+        )
+        table = format_sensitivity_table(sample_pnl_data, grid)
+        assert "| **NOI** | Property Taxes +10% |" in table
+
+    def test_negative_noi_formatting(self):
+        data = {"income": {"Rent": 10000}, "expenses": {"Taxes": 20000}}
+        grid = compute_sensitivity(data, vacancy_rates=[0.0], expense_growth=[0.0], cap_rates=[0.08])
+        table = format_sensitivity_table(data, grid)
+        assert "-$10,000" in table
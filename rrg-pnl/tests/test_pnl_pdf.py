@@ -0,0 +1,115 @@
+"""Tests for pnl_pdf.py — rendered-PDF cache, render serialization and filenames."""
+
+import threading
+import time
+from datetime import date
+
+import pytest
+
+try:
+    import pnl_pdf
+except (ImportError, OSError):  # WeasyPrint's native libraries (pango) missing
+    pytest.skip("WeasyPrint is not available", allow_module_level=True)
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Replace the WeasyPrint render with a counter; start with an empty cache."""
+    calls = []
+
+    def fake_render(context):
+        calls.append(context)
+        return f"%PDF-{len(calls)}".encode()
+
+    monkeypatch.setattr(pnl_pdf, "render_pnl_pdf", fake_render)
+    pnl_pdf.clear_pdf_cache()
+    yield calls
+    pnl_pdf.clear_pdf_cache()
+
+
+# ===========================================================================
+# generate_pnl_pdf cache
+# ===========================================================================
+
+class TestPdfCache:
+    """Identical inputs reuse the render; the cache is an LRU of PDF_CACHE_SIZE."""
+
+    def test_identical_data_renders_once(self, renders, sample_pnl_data):
+        first = pnl_pdf.generate_pnl_pdf(sample_pnl_data)
+        second = pnl_pdf.generate_pnl_pdf(dict(sample_pnl_data))
+        assert first == second
+        assert len(renders) == 1
+
+    def test_changed_data_renders_again(self, renders, sample_pnl_data):
+        pnl_pdf.generate_pnl_pdf(sample_pnl_data)
+        sample_pnl_data["expenses"]["Insurance"] = 7000
+        pnl_pdf.generate_pnl_pdf(sample_pnl_data)
+        assert len(renders) == 2
+
+    def test_expense_order_is_part_of_the_key(self, renders, sample_pnl_data):
+        pnl_pdf.generate_pnl_pdf(sample_pnl_data)
+        sample_pnl_data["expenses"] = dict(reversed(list(sample_pnl_data["expenses"].items())))
+        pnl_pdf.generate_pnl_pdf(sample_pnl_data)
+        assert len(renders) == 2
+
+    def test_least_recently_used_is_evicted(self, renders, sample_pnl_data, monkeypatch):
+        monkeypatch.setattr(pnl_pdf, "PDF_CACHE_SIZE", 2)
+        variants = [dict(sample_pnl_data, property_name=f"P{i}") for i in range(3)]
+        pnl_pdf.generate_pnl_pdf(variants[0])
+        pnl_pdf.generate_pnl_pdf(variants[1])
+        pnl_pdf.generate_pnl_pdf(variants[0])  # P0 is now most recent
+        pnl_pdf.generate_pnl_pdf(variants[2])  # evicts P1
+        assert len(renders) == 3
+        pnl_pdf.generate_pnl_pdf(variants[0])
+        assert len(renders) == 3
+        pnl_pdf.generate_pnl_pdf(variants[1])
+        assert len(renders) == 4
+
+
+class TestRenderLock:
+    """WeasyPrint renders run one at a time across request threads."""
+
+    def test_renders_do_not_overlap(self, monkeypatch, sample_pnl_data):
+        active = []
+        overlap = []
+
+        class FakeHTML:
+            def __init__(self, string, base_url):
+                pass
+
+            def write_pdf(self, stylesheets, font_config):
+                active.append(1)
+                if len(active) > 1:
+                    overlap.append(True)
+                time.sleep(0.02)
+                active.pop()
+                return b"%PDF"
+
+        monkeypatch.setattr(pnl_pdf, "HTML", FakeHTML)
+        context = pnl_pdf.build_pnl_context(sample_pnl_data)
+        threads = [threading.Thread(target=pnl_pdf.render_pnl_pdf, args=(context,)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert not overlap
+
+
+# ===========================================================================
+# build_pdf_filename
+# ===========================================================================
+
+class TestBuildPdfFilename:
+    """YYYYMMDD_Profit and Loss_<street city>.pdf"""
+
+    def test_street_and_city(self, sample_pnl_data):
+        name = pnl_pdf.build_pdf_filename(sample_pnl_data, today=date(2026, 3, 5))
+        assert name == "20260305_Profit and Loss_123 Main St Ann Arbor.pdf"
+
+    def test_falls_back_to_property_name(self):
+        name = pnl_pdf.build_pdf_filename({"property_name": "Oak Plaza"}, today=date(2026, 3, 5))
+        assert name == "20260305_Profit and Loss_Oak Plaza.pdf"
+
+    def test_single_part_address(self):
+        name = pnl_pdf.build_pdf_filename({"property_address": " 9 Elm St "}, today=date(2026, 1, 1))
+        assert name == "20260101_Profit and Loss_9 Elm St.pdf"
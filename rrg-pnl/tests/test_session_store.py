@@ -0,0 +1,64 @@
+"""Tests for session_store.py — SQLite worker session state with TTL eviction."""
+
+import time
+import uuid
+import pytest
+
+from session_store import SessionStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SessionStore(str(tmp_path / "sessions.db"), ttl_seconds=3600)
+
+
+class TestSessionStore:
+    """CRUD and expiry behaviour."""
+
+    def test_new_session_id_is_uuid(self, store):
+        uuid.UUID(store.new_session_id())
+
+    def test_put_then_get(self, store):
+        store.put("s1", {"pnl_data": {"income": {"Rent": 1000}}})
+        assert store.get("s1") == {"pnl_data": {"income": {"Rent": 1000}}}
+
+    def test_get_missing_returns_none(self, store):
+        assert store.get("nope") is None
+        assert store.get("") is None
+
+    def test_put_replaces_state(self, store):
+        store.put("s1", {"pnl_data": {"a": 1}})
+        store.put("s1", {"pnl_data": {"a": 2}})
+        assert store.get("s1") == {"pnl_data": {"a": 2}}
+
+    def test_delete(self, store):
+        store.put("s1", {})
+        store.delete("s1")
+        assert store.get("s1") is None
+        store.delete("s1")  # no-op
+
+    def test_expired_session_not_returned(self, tmp_path):
+        store = SessionStore(str(tmp_path / "sessions.db"), ttl_seconds=0)
+        store.put("s1", {"pnl_data": {}})
+        assert store.get("s1") is None
+
+    def test_evict_expired_removes_only_expired(self, store):
+        store.put("old", {})
+        store.put("fresh", {})
+        removed = store.evict_expired(now=time.time() + 1800)
+        assert removed == 0
+        removed = store.evict_expired(now=time.time() + 7200)
+        assert removed == 2
+        assert store.get("fresh") is None
+
+    def test_put_refreshes_expiry(self, store):
+        store.put("s1", {"v": 1})
+        store.evict_expired(now=time.time() + 1800)
+        store.put("s1", {"v": 2})
+        assert store.evict_expired(now=time.time() + 3000) == 0
+        assert store.get("s1") == {"v": 2}
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "sessions.db")
+        SessionStore(path).put("s1", {"v": 1})
+        assert SessionStore(path).get("s1") == {"v": 1}
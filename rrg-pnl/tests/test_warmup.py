@@ -0,0 +1,72 @@
+"""Tests for warmup.py — startup warm-up steps and readiness state."""
+
+import time
+
+from warmup import Warmup
+
+
+def _wait(warmup, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if warmup.finished_at is not None:
+            return
+        time.sleep(0.01)
+    raise AssertionError("warm-up did not finish")
+
+
+class TestWarmup:
+    """Per-component state, timings and the overall ready flag."""
+
+    def test_not_ready_until_run(self):
+        warmup = Warmup("svc", enabled=True)
+        warmup.add("a", lambda: None)
+        status = warmup.status()
+        assert status["ready"] is False
+        assert status["components"]["a"]["state"] == "pending"
+
+    def test_ready_after_all_steps(self):
+        calls = []
+        warmup = Warmup("svc", enabled=True)
+        warmup.add("a", lambda: calls.append("a"))
+        warmup.add("b", lambda: calls.append("b"))
+        warmup.start()
+        _wait(warmup)
+        status = warmup.status()
+        assert calls == ["a", "b"]
+        assert status["ready"] is True
+        assert status["components"]["b"]["state"] == "ready"
+        assert status["components"]["b"]["seconds"] is not None
+        assert status["warmup_seconds"] is not None
+
+    def test_required_failure_blocks_ready(self):
+        def boom():
+            raise RuntimeError("no browser")
+
+        warmup = Warmup("svc", enabled=True)
+        warmup.add("browser", boom)
+        warmup.add("after", lambda: None)
+        warmup.run()
+        status = warmup.status()
+        assert status["ready"] is False
+        assert status["components"]["browser"]["state"] == "failed"
+        assert status["components"]["browser"]["error"] == "no browser"
+        # Later steps still run
+        assert status["components"]["after"]["state"] == "ready"
+
+    def test_optional_failure_does_not_block(self):
+        def boom():
+            raise RuntimeError("cli missing")
+
+        warmup = Warmup("svc", enabled=True)
+        warmup.add("llm_cli", boom, required=False)
+        warmup.run()
+        assert warmup.ready() is True
+
+    def test_disabled_is_ready_and_skips(self):
+        calls = []
+        warmup = Warmup("svc", enabled=False)
+        warmup.add("a", lambda: calls.append("a"))
+        warmup.start()
+        assert warmup.ready() is True
+        assert warmup.status()["components"]["a"]["state"] == "skipped"
+        assert calls == []
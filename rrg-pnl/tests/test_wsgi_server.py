@@ -0,0 +1,117 @@
+"""Tests for wsgi_server.py — bounded request threads for the Flask app."""
+
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import Flask, jsonify, request
+
+import wsgi_server
+from wsgi_server import make_server
+
+DELAY = 0.4
+
+
+def _post_json(url, body):
+    req = urllib.request.Request(
+        url, data=json.dumps(body).encode(), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return json.loads(resp.read())
+
+
+def _app(finished=None):
+    app = Flask("wsgi-test")
+
+    @app.route("/slow", methods=["POST"])
+    def slow():
+        time.sleep(DELAY)
+        if finished is not None:
+            finished.append(request.get_json()["user"])
+        # Echo the caller's data back — a leak between requests would show here
+        return jsonify({"user": request.get_json()["user"],
+                        "thread": threading.current_thread().name})
+
+    return app
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def _serve(threads):
+        server = make_server(_app(), "127.0.0.1", 0, threads=threads)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.port}/slow"
+
+    _serve.servers = servers
+
+    yield _serve
+    for server in servers:
+        server.shutdown()
+
+
+def _post_concurrently(url, users):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(users)) as pool:
+        bodies = list(pool.map(lambda u: _post_json(url, {"user": u}), users))
+    return bodies, time.perf_counter() - started
+
+
+class TestPooledServer:
+    def test_requests_run_in_parallel(self, serve):
+        url = serve(threads=4)
+        bodies, elapsed = _post_concurrently(url, ["a", "b"])
+        assert [b["user"] for b in bodies] == ["a", "b"]
+        assert bodies[0]["thread"] != bodies[1]["thread"]
+        assert elapsed < DELAY * 1.75
+
+    def test_thread_count_bounds_concurrency(self, serve):
+        url = serve(threads=1)
+        bodies, elapsed = _post_concurrently(url, ["a", "b"])
+        assert [b["user"] for b in bodies] == ["a", "b"]
+        assert elapsed >= DELAY * 2
+
+    def test_waiting_connections_do_not_queue_in_the_pool(self, serve):
+        url = serve(threads=1)
+        server = serve.servers[-1]
+        queued = []
+
+        def watch():
+            while not done.is_set():
+                if server._pool is not None:
+                    queued.append(server._pool._work_queue.qsize())
+                time.sleep(0.01)
+
+        done = threading.Event()
+        watcher = threading.Thread(target=watch)
+        watcher.start()
+        bodies, _ = _post_concurrently(url, ["a", "b", "c"])
+        done.set()
+        watcher.join()
+        assert [b["user"] for b in bodies] == ["a", "b", "c"]
+        assert max(queued) == 0
+
+
+class TestShutdown:
+    def test_run_worker_drains_in_flight_requests(self, monkeypatch):
+        monkeypatch.setattr(wsgi_server, "_stop_on_signals", lambda server: None)
+        finished = []
+        server = make_server(_app(finished), "127.0.0.1", 0, threads=2)
+        runner = threading.Thread(target=wsgi_server._run_worker, args=(server, None))
+        runner.start()
+        url = f"http://127.0.0.1:{server.port}/slow"
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(_post_json, url, {"user": "a"})
+            time.sleep(DELAY / 4)  # request is now running
+            server.shutdown()
+            runner.join(timeout=5)
+            assert not runner.is_alive()
+            # _run_worker returned only after the request finished
+            assert finished == ["a"]
+            assert pending.result(timeout=5)["user"] == "a"
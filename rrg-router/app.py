@@ -1,14 +1,25 @@
 """RRG Router — Streamlit chat UI with worker node orchestration."""
 
 import base64
+import time
 import streamlit as st
 from graph import build_graph
-from node_client import WorkerNodeClient
+from node_client import WorkerNodeClient, error_response
 from windmill_client import WindmillClient
+from hybrid_client import HybridClient
 from signal_client import SignalClient
+from signal_cache import SignalCache
+from signal_listener import SignalListener
+from artifact_client import ArtifactClient
+from transcript_store import TranscriptStore, router_artifact_store, evict_expired_transcripts
 from config import (
     WORKER_URLS, USE_WINDMILL, WINDMILL_BASE_URL,
     WINDMILL_TOKEN, WINDMILL_WORKSPACE,
+    DIRECT_FAST_PATH, DIRECT_COMMANDS, WORKER_POOL_SIZE,
+    JOB_POLL_SECONDS, JOB_SLOW_SECONDS,
+    SIGNAL_REFRESH_SECONDS, SIGNAL_PAGE_SIZE, SIGNAL_MAX_PAGES,
+    SIGNAL_PG_DSN, SIGNAL_PUSH_RENDER_SECONDS,
+    TRANSCRIPT_RENDER_MESSAGES,
 )
 
 st.set_page_config(page_title="RRG Assistant", page_icon="R", layout="wide")
@@ -18,8 +29,19 @@ st.title("RRG Assistant")
 # Session State Initialization
 # ---------------------------------------------------------------------------
 
-if "messages" not in st.session_state:
-    st.session_state.messages = []
+@st.cache_resource
+def get_artifact_store():
+    """Shared artifact volume if mounted, else a router-local LRU directory."""
+    return router_artifact_store()
+
+
+if "transcript" not in st.session_state:
+    # Last N messages in memory, older ones on disk, files in the artifact store
+    evict_expired_transcripts()
+    st.session_state.transcript = TranscriptStore(get_artifact_store())
+
+if "transcript_visible" not in st.session_state:
+    st.session_state.transcript_visible = TRANSCRIPT_RENDER_MESSAGES
 
 if "active_node" not in st.session_state:
     st.session_state.active_node = None  # "pnl" | "brochure" | None
@@ -30,6 +52,15 @@ if "worker_state" not in st.session_state:
 if "debug_data" not in st.session_state:
     st.session_state.debug_data = {}
 
+if "preview_docx" not in st.session_state:
+    st.session_state.preview_docx = None  # {"b64" | "artifact_id", "worker", "filename"} — kept local, never posted back
+
+if "signal_cache" not in st.session_state:
+    st.session_state.signal_cache = SignalCache()  # Signals tab — see signals_panel()
+
+if "pending_job" not in st.session_state:
+    st.session_state.pending_job = None  # {job_id, path, worker, command, submitted_at, stage}
+
 
 
 # ---------------------------------------------------------------------------
@@ -43,9 +74,13 @@ def get_graph():
 
 @st.cache_resource
 def get_client():
+    direct = WorkerNodeClient(WORKER_URLS, pool_size=WORKER_POOL_SIZE)
     if USE_WINDMILL and WINDMILL_TOKEN:
-        return WindmillClient(WINDMILL_BASE_URL, WINDMILL_TOKEN, WINDMILL_WORKSPACE)
-    return WorkerNodeClient(WORKER_URLS)
+        windmill = WindmillClient(WINDMILL_BASE_URL, WINDMILL_TOKEN, WINDMILL_WORKSPACE)
+        if DIRECT_FAST_PATH:
+            return HybridClient(direct, windmill, DIRECT_COMMANDS)
+        return windmill
+    return direct
 
 
 @st.cache_resource
@@ -55,9 +90,65 @@ def get_signal_client():
     return None
 
 
+@st.cache_resource
+def get_signal_listener():
+    """One LISTEN connection per router process, shared by all sessions."""
+    if not (SIGNAL_PG_DSN and SignalListener.available()):
+        return None
+    listener = SignalListener(SIGNAL_PG_DSN)
+    listener.start()
+    return listener
+
+
+@st.cache_resource
+def get_artifact_client():
+    return ArtifactClient(WORKER_URLS, store=get_artifact_store())
+
+
 graph = get_graph()
 client = get_client()
 signal_client = get_signal_client()
+signal_listener = get_signal_listener()
+artifact_client = get_artifact_client()
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def has_file(msg: dict) -> bool:
+    """True if a message carries a generated file (inline or by artifact ID)."""
+    return any(msg.get(k) for k in (
+        "pdf_bytes", "docx_bytes", "pdf_artifact_id", "docx_artifact_id",
+    ))
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _fetch_artifact(worker, artifact_id: str) -> bytes:
+    """Artifact bytes, memoized across reruns (IDs are content hashes, so
+    an entry never goes stale). A miss raises, so it isn't cached."""
+    data = artifact_client.fetch(worker, artifact_id)
+    if data is None:
+        raise LookupError(artifact_id)
+    return data
+
+
+def load_file(msg: dict):
+    """Return (bytes, filename) for a message's generated file.
+
+    Messages keep only the artifact ID when the worker stored the file, so
+    the bytes are fetched on first render instead of living in session
+    state, then served from _fetch_artifact's memo on later reruns.
+    """
+    file_name = msg.get("pdf_filename") or msg.get("docx_filename") or "output"
+    file_data = msg.get("pdf_bytes") or msg.get("docx_bytes")
+    if file_data:
+        return file_data, file_name
+    artifact_id = msg.get("pdf_artifact_id") or msg.get("docx_artifact_id")
+    if artifact_id:
+        try:
+            return _fetch_artifact(msg.get("artifact_worker"), artifact_id), file_name
+        except LookupError:
+            return None, file_name
+    return None, file_name
 
 
 # ---------------------------------------------------------------------------
@@ -67,14 +158,24 @@ signal_client = get_signal_client()
 chat_tab, signals_tab, debug_tab = st.tabs(["Chat", "Signals", "Debug"])
 
 with chat_tab:
-    # Display existing messages
-    for idx, msg in enumerate(st.session_state.messages):
+    # Display the most recent messages; older ones load on request
+    transcript = st.session_state.transcript
+    visible = st.session_state.transcript_visible
+    hidden = len(transcript) - visible
+    if hidden > 0:
+        if st.button(f"Show earlier messages ({hidden} hidden)", key="show_earlier"):
+            st.session_state.transcript_visible += TRANSCRIPT_RENDER_MESSAGES
+            st.rerun()
+    window = transcript.window(visible)
+    first_idx = len(transcript) - len(window)
+    for idx, msg in enumerate(window, start=first_idx):
         with st.chat_message(msg["role"]):
             st.markdown(msg["content"])
-            file_data = msg.get("pdf_bytes") or msg.get("docx_bytes")
-            file_name = msg.get("pdf_filename") or msg.get("docx_filename") or "output"
+            if not has_file(msg):
+                continue
+            file_data, file_name = load_file(msg)
             if file_data:
-                mime = "application/vnd.openxmlformats-officedocument.wordprocessingml.document" if file_name.endswith(".docx") else "application/pdf"
+                mime = DOCX_MIME if file_name.endswith(".docx") else "application/pdf"
                 st.download_button(
                     label="Download Preview",
                     data=file_data,
@@ -82,69 +183,164 @@ with chat_tab:
                     mime=mime,
                     key=f"file_{idx}",
                 )
+            else:
+                st.caption(f"{file_name} is no longer available.")
 
 
 # Chat input at module level — pins to bottom of viewport across all tabs
 prompt = st.chat_input("What can I help with?")
 
+def finish_turn(response_data: dict, source_node, command=None):
+    """Apply a response to session state and save it to chat history."""
+    # A new worker only takes over the conversation if it accepted (no error)
+    if command == "create" and not response_data.get("error"):
+        st.session_state.active_node = source_node
+
+    # Update session state from worker response
+    st.session_state.worker_state = response_data.get("state", {})
+
+    # Standing preview download (PA) — returned per turn, held locally
+    st.session_state.preview_docx = None
+    if response_data.get("preview_docx") or response_data.get("preview_artifact_id"):
+        st.session_state.preview_docx = {
+            "b64": response_data.get("preview_docx"),
+            "artifact_id": response_data.get("preview_artifact_id"),
+            "worker": source_node,
+            "filename": response_data.get("preview_filename") or "preview.docx",
+        }
+
+    if not response_data.get("active", False):
+        # Worker released control — clear active node
+        st.session_state.active_node = None
+        st.session_state.worker_state = {}
+        st.session_state.preview_docx = None
+
+    # Save assistant message to history (inline bytes go to the artifact store)
+    msg_entry = {"role": "assistant", "content": response_data["response"]}
+    if response_data.get("pdf_artifact_id"):
+        msg_entry["pdf_artifact_id"] = response_data["pdf_artifact_id"]
+        msg_entry["pdf_filename"] = response_data.get("pdf_filename", "output.pdf")
+    elif response_data.get("pdf_bytes"):
+        msg_entry["pdf_bytes"] = response_data["pdf_bytes"]
+        msg_entry["pdf_filename"] = response_data.get("pdf_filename", "output.pdf")
+    if response_data.get("docx_artifact_id"):
+        msg_entry["docx_artifact_id"] = response_data["docx_artifact_id"]
+        msg_entry["docx_filename"] = response_data.get("docx_filename", "output.docx")
+    elif response_data.get("docx_bytes"):
+        msg_entry["docx_bytes"] = response_data["docx_bytes"]
+        msg_entry["docx_filename"] = response_data.get("docx_filename", "output.docx")
+    if has_file(msg_entry):
+        msg_entry["artifact_worker"] = source_node
+    st.session_state.transcript.append(msg_entry)
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def pending_job_status():
+    """Poll the in-flight worker job and show its latest stage.
+
+    Reruns on its own every JOB_POLL_SECONDS without blocking the rest of
+    the page, so the user can keep chatting. There's no client-side
+    timeout: a slow job just keeps being polled until the worker finishes
+    it (or reports it lost).
+    """
+    job = st.session_state.pending_job
+    if not job:
+        return
+
+    polled = client.poll_job(job)
+    elapsed = time.time() - job["submitted_at"]
+
+    if polled["status"] in ("done", "lost"):
+        result = polled["result"]
+        if result is None:
+            # Worker forgot the job (restart, or results expired) — keep the
+            # conversation where it was so the user can just ask again
+            result = error_response(
+                "I lost track of that request — the worker may have restarted. "
+                "Please send it again.",
+                "job_lost",
+                st.session_state.worker_state,
+            )
+            result["active"] = st.session_state.active_node is not None
+        st.session_state.pending_job = None
+        job_ms = round(elapsed * 1000, 1)
+        hops = polled.get("timings") or {}
+        # Whatever the reported hops don't cover: Windmill's share on that
+        # path, the wait for the next poll tick on the direct one
+        rest = "windmill_ms" if job["path"] == "windmill" else "poll_wait_ms"
+        if hops:
+            hops[rest] = round(job_ms - sum(hops.values()), 1)
+        st.session_state.debug_data.setdefault("timings", {}).update({
+            "path": job["path"],
+            "worker": job["worker"],
+            "job_ms": job_ms,
+            **hops,
+        })
+        finish_turn(result, job["worker"], job["command"])
+        st.rerun()
+
+    if polled.get("stage"):
+        job["stage"] = polled["stage"]
+    with st.chat_message("assistant"):
+        st.markdown(f"_{job.get('stage') or 'Working on it'}…_ ({int(elapsed)}s)")
+        if polled["status"] == "unreachable":
+            st.caption("Can't reach the worker right now — will keep checking.")
+        elif elapsed > JOB_SLOW_SECONDS:
+            st.caption("This is taking longer than usual. It's still running — feel free to keep chatting.")
+
+
+BUSY_RESPONSE = (
+    "I'm still working on your previous request — I'll post the result "
+    "here as soon as it's ready."
+)
+
 with chat_tab:
     if prompt:
         # Show user message
-        st.session_state.messages.append({"role": "user", "content": prompt})
+        st.session_state.transcript.append({"role": "user", "content": prompt})
         with st.chat_message("user"):
             st.markdown(prompt)
 
         # Build chat history (last 20 messages for context)
-        history = [
-            {"role": m["role"], "content": m["content"]}
-            for m in st.session_state.messages[-20:]
-        ]
+        history = st.session_state.transcript.history(20)
 
+        response_data = None
         with st.chat_message("assistant"):
             with st.spinner("Thinking..."):
                 active_node = st.session_state.active_node
+                handler_name = None
+                command = None
 
                 if active_node:
                     # Active worker — skip classification, forward directly
-                    response_data = client.call_worker(
-                        handler_name=active_node,
-                        command="continue",
-                        user_message=prompt,
-                        chat_history=history,
-                        state=st.session_state.worker_state,
-                    )
+                    handler_name, command = active_node, "continue"
                     st.session_state.debug_data = {
                         "mode": "active_node_forwarding",
                         "active_node": active_node,
                         "command": "continue",
+                        "timings": {},
                     }
                 else:
                     # No active worker — classify intent
+                    classify_start = time.perf_counter()
                     result = graph.invoke({
                         "user_message": prompt,
                         "chat_history": history,
                     })
+                    classify_ms = round((time.perf_counter() - classify_start) * 1000, 1)
 
                     st.session_state.debug_data = {
                         "mode": "classification",
                         "intent": result.get("intent"),
+                        "intent_source": result.get("intent_source"),
                         "route_type": result.get("route_type"),
                         "handler_name": result.get("handler_name"),
+                        "timings": {"classify_ms": classify_ms},
                     }
 
                     if result.get("route_type") == "handler":
                         # Start new worker
-                        handler_name = result["handler_name"]
-                        response_data = client.call_worker(
-                            handler_name=handler_name,
-                            command="create",
-                            user_message=prompt,
-                            chat_history=history,
-                            state={},
-                        )
-                        # Only set active_node if worker accepted (no error)
-                        if not response_data.get("error"):
-                            st.session_state.active_node = handler_name
+                        handler_name, command = result["handler_name"], "create"
                     elif result.get("route_type") == "chat":
                         response_data = {
                             "response": result.get("response", ""),
@@ -164,57 +360,190 @@ with chat_tab:
                             "error": "unknown_route_type",
                         }
 
-            # Display response
-            st.markdown(response_data["response"])
-
-            # Handle file output (PDF or DOCX)
-            file_bytes = response_data.get("pdf_bytes") or response_data.get("docx_bytes")
-            file_name = response_data.get("pdf_filename") or response_data.get("docx_filename") or "output"
-            if file_bytes:
-                mime = "application/vnd.openxmlformats-officedocument.wordprocessingml.document" if file_name.endswith(".docx") else "application/pdf"
-                st.download_button(
-                    label="Download Preview",
-                    data=file_bytes,
-                    file_name=file_name,
-                    mime=mime,
-                )
-
-
-        # Update session state from worker response
-        st.session_state.worker_state = response_data.get("state", {})
+                if handler_name and st.session_state.pending_job:
+                    # One worker job at a time — the worker state isn't
+                    # settled until the in-flight turn finishes
+                    st.markdown(BUSY_RESPONSE)
+                    st.session_state.transcript.append(
+                        {"role": "assistant", "content": BUSY_RESPONSE}
+                    )
+                elif handler_name:
+                    # Submit as a background job; pending_job_status() polls it
+                    job = client.submit_job(
+                        handler_name=handler_name,
+                        command=command,
+                        user_message=prompt,
+                        chat_history=history,
+                        state=st.session_state.worker_state if command == "continue" else {},
+                    )
+                    if job.get("job_id"):
+                        st.session_state.pending_job = {
+                            **job,
+                            "command": command,
+                            "submitted_at": time.time(),
+                        }
+                    else:
+                        response_data = job
+
+            if response_data is not None:
+                # Display response
+                st.markdown(response_data["response"])
+
+                # Handle file output (PDF or DOCX)
+                response_data["artifact_worker"] = handler_name
+                file_bytes, file_name = load_file(response_data)
+                if file_bytes:
+                    mime = DOCX_MIME if file_name.endswith(".docx") else "application/pdf"
+                    st.download_button(
+                        label="Download Preview",
+                        data=file_bytes,
+                        file_name=file_name,
+                        mime=mime,
+                    )
 
-        if not response_data.get("active", False):
-            # Worker released control — clear active node
-            st.session_state.active_node = None
-            st.session_state.worker_state = {}
+        if response_data is not None:
+            finish_turn(response_data, handler_name, command)
 
-        # Save assistant message to history
-        msg_entry = {"role": "assistant", "content": response_data["response"]}
-        if response_data.get("pdf_bytes"):
-            msg_entry["pdf_bytes"] = response_data["pdf_bytes"]
-            msg_entry["pdf_filename"] = response_data.get("pdf_filename", "output.pdf")
-        if response_data.get("docx_bytes"):
-            msg_entry["docx_bytes"] = response_data["docx_bytes"]
-            msg_entry["docx_filename"] = response_data.get("docx_filename", "output.docx")
-        st.session_state.messages.append(msg_entry)
+# Worker job in flight — progress polls in the background
+with chat_tab:
+    if st.session_state.pending_job:
+        pending_job_status()
 
-# Download Preview — uses pre-generated bytes from worker state
+# Download Preview — uses pre-generated bytes from the last worker response
 with chat_tab:
-    preview_b64 = st.session_state.worker_state.get("preview_docx")
-    preview_name = st.session_state.worker_state.get("preview_filename", "preview.docx")
+    preview = st.session_state.preview_docx or {}
+    preview_name = preview.get("filename", "preview.docx")
     if (
-        preview_b64
+        (preview.get("b64") or preview.get("artifact_id"))
         and st.session_state.active_node in ("commercial_pa", "pnl", "brochure")
-        and st.session_state.messages
-        and not (st.session_state.messages[-1].get("pdf_bytes") or st.session_state.messages[-1].get("docx_bytes"))
+        and st.session_state.transcript.last()
+        and not has_file(st.session_state.transcript.last())
     ):
-        st.download_button(
-            label="Download Preview",
-            data=base64.b64decode(preview_b64),
-            file_name=preview_name,
-            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            key="preview_dl",
+        if preview.get("b64"):
+            preview_data = base64.b64decode(preview["b64"])
+        else:
+            try:
+                preview_data = _fetch_artifact(preview.get("worker"), preview["artifact_id"])
+            except LookupError:
+                preview_data = None
+        if preview_data:
+            st.download_button(
+                label="Download Preview",
+                data=preview_data,
+                file_name=preview_name,
+                mime=DOCX_MIME,
+                key="preview_dl",
+            )
+
+
+def refresh_signals(cache: SignalCache):
+    """Bring the signal cache up to date — full load once, then keyset reads."""
+    if not cache.loaded:
+        rows = signal_client.get_all_pending_signals(SIGNAL_PAGE_SIZE, include_detail=False)
+        if rows is not None:
+            cache.load(rows)
+        return
+    for _ in range(SIGNAL_MAX_PAGES):
+        rows = signal_client.get_signal_changes(
+            cache.since_id, cache.updated_since, limit=SIGNAL_PAGE_SIZE
         )
+        if rows is None:
+            return  # Windmill unreachable — keep showing the cached list
+        cache.apply(rows)
+        if len(rows) < SIGNAL_PAGE_SIZE:
+            return
+
+
+@st.fragment(
+    run_every=SIGNAL_PUSH_RENDER_SECONDS if signal_listener else SIGNAL_REFRESH_SECONDS
+)
+def signals_panel():
+    """Signals list — refreshes itself without rerunning the chat.
+
+    With a connected signal listener the list comes straight from its
+    push-updated cache. Otherwise it polls read_signals on its own
+    run_every tick or the Refresh button. The fragment also runs on every
+    full-app rerun (chat turns); those render from the cache, as do
+    widget clicks right after a fetch.
+    """
+    cache = st.session_state.signal_cache
+    full_rerun = st.session_state.pop("signals_full_rerun", False)
+    force = st.button("Refresh", key="refresh_signals")
+    if signal_listener is not None and signal_listener.connected:
+        signals = signal_listener.pending()
+        st.caption("Live")
+    else:
+        tick = not full_rerun and cache.is_stale(SIGNAL_REFRESH_SECONDS / 2)
+        if force or tick or not cache.loaded:
+            refresh_signals(cache)
+        signals = cache.pending()
+
+    if not signals:
+        st.success("No pending action items.")
+        return
+    st.caption(f"{len(signals)} pending signal(s)")
+
+    for sig in signals:
+        with st.expander(f"[{sig['signal_type']}] {sig['summary']}"):
+            col_meta, col_actions = st.columns([3, 1])
+
+            with col_meta:
+                st.caption(
+                    f"From: {sig['source_flow']} | "
+                    f"Created: {sig['created_at']}"
+                )
+                # Detail JSON is only fetched when asked for
+                if st.toggle("Show details", key=f"sig_{sig['id']}_detail"):
+                    detail = cache.detail(sig["id"])
+                    if detail is None:
+                        detail = signal_client.get_signal_detail(sig["id"])
+                        if detail is not None:
+                            cache.details[sig["id"]] = detail
+                    if detail:
+                        st.json(detail)
+                    elif detail is None:
+                        st.caption("Couldn't load details — try again shortly.")
+                    else:
+                        st.caption("No details.")
+
+            with col_actions:
+                actions = sig.get("actions") or []
+                for act in actions:
+                    # actions can be strings or dicts
+                    if isinstance(act, str):
+                        act_action = act.lower().replace(" ", "_")
+                        act_label = act
+                    else:
+                        act_action = act["action"]
+                        act_label = act["label"]
+                    btn_key = f"sig_{sig['id']}_{act_action}"
+                    if st.button(act_label, key=btn_key):
+                        # Mark signal as acted
+                        result = signal_client.act_on_signal(
+                            sig["id"], act_action
+                        )
+                        # Resume suspended flow if URL present
+                        if sig.get("resume_url"):
+                            signal_client.resume_flow(
+                                sig["resume_url"],
+                                {"action": act_action},
+                            )
+                        cache.remove(sig["id"])
+                        if signal_listener is not None:
+                            signal_listener.remove(sig["id"])
+                        st.success(f"Done: {act_label}")
+                        st.rerun(scope="fragment")
+
+                if not actions:
+                    btn_key = f"sig_{sig['id']}_dismiss"
+                    if st.button("Dismiss", key=btn_key):
+                        signal_client.act_on_signal(
+                            sig["id"], "dismiss"
+                        )
+                        cache.remove(sig["id"])
+                        if signal_listener is not None:
+                            signal_listener.remove(sig["id"])
+                        st.rerun(scope="fragment")
 
 
 with signals_tab:
@@ -223,63 +552,9 @@ with signals_tab:
     if signal_client is None:
         st.info("Signal queue requires Windmill. Enable USE_WINDMILL to see signals.")
     else:
-        if st.button("Refresh", key="refresh_signals"):
-            pass  # Button click triggers Streamlit rerun
-
-        signals = signal_client.get_pending_signals()
-
-        if not signals:
-            st.success("No pending action items.")
-        else:
-            st.caption(f"{len(signals)} pending signal(s)")
-
-            for sig in signals:
-                with st.expander(
-                    f"[{sig['signal_type']}] {sig['summary']}",
-                    expanded=True,
-                ):
-                    col_meta, col_actions = st.columns([3, 1])
-
-                    with col_meta:
-                        st.caption(
-                            f"From: {sig['source_flow']} | "
-                            f"Created: {sig['created_at']}"
-                        )
-                        if sig.get("detail") and sig["detail"] != {}:
-                            st.json(sig["detail"])
-
-                    with col_actions:
-                        actions = sig.get("actions") or []
-                        for act in actions:
-                            # actions can be strings or dicts
-                            if isinstance(act, str):
-                                act_action = act.lower().replace(" ", "_")
-                                act_label = act
-                            else:
-                                act_action = act["action"]
-                                act_label = act["label"]
-                            btn_key = f"sig_{sig['id']}_{act_action}"
-                            if st.button(act_label, key=btn_key):
-                                # Mark signal as acted
-                                result = signal_client.act_on_signal(
-                                    sig["id"], act_action
-                                )
-                                # Resume suspended flow if URL present
-                                if sig.get("resume_url"):
-                                    signal_client.resume_flow(
-                                        sig["resume_url"],
-                                        {"action": act_action},
-                                    )
-                                st.success(f"Done: {act_label}")
-                                st.rerun()
-
-                        if not actions:
-                            btn_key = f"sig_{sig['id']}_dismiss"
-                            if st.button("Dismiss", key=btn_key):
-                                signal_client.act_on_signal(
-                                    sig["id"], "dismiss"
-                                )
-                                st.rerun()
+        # Only set on a full-app run — fragment reruns skip this line
+        st.session_state.signals_full_rerun = True
+        signals_panel()
 
 
 with debug_tab:
@@ -292,11 +567,38 @@ with debug_tab:
     st.json({
         "active_node": st.session_state.active_node,
         "worker_state_keys": list(st.session_state.worker_state.keys()),
-        "message_count": len(st.session_state.messages),
+        "message_count": len(st.session_state.transcript),
+        "messages_in_memory": len(st.session_state.transcript.recent),
+        "pending_job": st.session_state.pending_job,
     })
 
+    timings = st.session_state.debug_data.get("timings")
+    if timings:
+        st.write("**Per-hop Latency (ms):**")
+        st.caption(f"Path: {timings.get('path', 'router')}")
+        st.table({
+            "hop": [k[:-3] for k in timings if k.endswith("_ms")],
+            "ms": [v for k, v in timings.items() if k.endswith("_ms")],
+        })
+
+    if signal_listener is not None:
+        st.write("**Signal Listener:**")
+        st.json({
+            "connected": signal_listener.connected,
+            "last_notify_at": signal_listener.last_notify_at,
+            "last_error": signal_listener.last_error,
+        })
+
     st.write("**Routing Mode:**")
-    if USE_WINDMILL and WINDMILL_TOKEN:
+    if USE_WINDMILL and WINDMILL_TOKEN and DIRECT_FAST_PATH:
+        st.json({
+            "mode": "hybrid",
+            "direct_commands": DIRECT_COMMANDS,
+            "worker_urls": WORKER_URLS,
+            "base_url": WINDMILL_BASE_URL,
+            "workspace": WINDMILL_WORKSPACE,
+        })
+    elif USE_WINDMILL and WINDMILL_TOKEN:
         st.json({"mode": "windmill", "base_url": WINDMILL_BASE_URL, "workspace": WINDMILL_WORKSPACE})
     else:
         st.json({"mode": "direct", "worker_urls": WORKER_URLS})
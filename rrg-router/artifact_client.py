@@ -0,0 +1,48 @@
+"""Fetch generated files (PDF, DOCX) by artifact ID.
+
+Workers return an artifact ID instead of inline base64 when the shared
+artifact volume is mounted. The router reads the file straight from that
+volume when it's mounted here too, and otherwise asks the worker that
+produced it (GET /artifacts/<id>).
+"""
+
+import requests
+from typing import Dict, Optional
+
+from artifact_store import ArtifactStore
+
+
+class ArtifactClient:
+    """Resolve artifact IDs to bytes — shared volume first, then worker HTTP."""
+
+    def __init__(
+        self,
+        worker_urls: Dict[str, str],
+        store: Optional[ArtifactStore] = None,
+        timeout: int = 30,
+    ):
+        self.worker_urls = worker_urls
+        self.store = store or ArtifactStore()
+        self.timeout = timeout
+
+    def fetch(self, worker: str, artifact_id: str) -> Optional[bytes]:
+        """Return an artifact's bytes, or None if it's gone or unreachable."""
+        if not ArtifactStore.is_valid_id(artifact_id):
+            return None
+
+        data = self.store.get(artifact_id)
+        if data is not None:
+            return data
+
+        base_url = self.worker_urls.get(worker)
+        if not base_url:
+            return None
+        try:
+            resp = requests.get(
+                f"{base_url}/artifacts/{artifact_id}", timeout=self.timeout
+            )
+            if resp.status_code != 200:
+                return None
+            return resp.content
+        except requests.RequestException:
+            return None
@@ -21,29 +21,92 @@ WINDMILL_BASE_URL = os.getenv("WINDMILL_BASE_URL", "http://windmill-windmill_ser
 WINDMILL_TOKEN = os.getenv("WINDMILL_TOKEN", "")
 WINDMILL_WORKSPACE = os.getenv("WINDMILL_WORKSPACE", "rrg")
 
-# Intent definitions
+# Direct fast path — with Windmill enabled, these commands skip the flow and
+# call the worker directly (pooled keep-alive connections, WORKER_POOL_SIZE
+# per worker). Other commands still go through Windmill for the audit trail.
+DIRECT_FAST_PATH = os.getenv("DIRECT_FAST_PATH", "true").lower() == "true"
+DIRECT_COMMANDS = [
+    c.strip() for c in os.getenv("DIRECT_COMMANDS", "continue").split(",") if c.strip()
+]
+WORKER_POOL_SIZE = int(os.getenv("WORKER_POOL_SIZE", "4"))
+
+# Worker turns run as background jobs; the chat polls for progress every
+# JOB_POLL_SECONDS and flags jobs running longer than JOB_SLOW_SECONDS
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1.5"))
+JOB_SLOW_SECONDS = int(os.getenv("JOB_SLOW_SECONDS", "120"))
+
+# Signals tab refresh — incremental read_signals at most this often
+SIGNAL_REFRESH_SECONDS = float(os.getenv("SIGNAL_REFRESH_SECONDS", "15"))
+SIGNAL_PAGE_SIZE = 100
+SIGNAL_MAX_PAGES = 5  # keyset pages per refresh
+
+# Push delivery — LISTEN on jake_signals (libpq DSN, e.g.
+# "host=... dbname=... user=... password=..."). Empty = polling only.
+# While connected the tab re-renders from memory every SIGNAL_PUSH_RENDER_SECONDS.
+SIGNAL_PG_DSN = os.getenv("SIGNAL_PG_DSN", "")
+SIGNAL_PUSH_RENDER_SECONDS = float(os.getenv("SIGNAL_PUSH_RENDER_SECONDS", "2"))
+
+# Chat transcript — messages rendered at first (and per "Show earlier" click).
+# Memory/disk limits are TRANSCRIPT_MAX_MESSAGES / TRANSCRIPT_DIR, read by transcript_store.
+TRANSCRIPT_RENDER_MESSAGES = int(os.getenv("TRANSCRIPT_RENDER_MESSAGES", "30"))
+
+# Intent shortcuts — exemplar matches skip the classifier LLM call, and
+# classifier results are cached per message + recent context (0 = no cache)
+INTENT_EXEMPLARS = os.getenv("INTENT_EXEMPLARS", "true").lower() == "true"
+INTENT_CACHE_SIZE = int(os.getenv("INTENT_CACHE_SIZE", "512"))
+
+# Intent definitions — `examples` are exemplar phrasings for intent_index.IntentIndex;
+# a message containing every word of one exemplar routes without the LLM.
+# Handler examples are a verb plus its object ("draft pa", not "purchase
+# agreement"), so a question that only names the document goes to the LLM.
 INTENTS = {
     "greeting": {
         "description": "User says hello or asks how the assistant is doing",
         "handler": None,
+        "examples": [
+            "hi", "hello", "hey", "hey there", "hi there", "yo",
+            "good morning", "good afternoon", "good evening",
+            "how are you", "hows it going", "whats up",
+        ],
     },
     "help": {
         "description": "User asks what the assistant can do",
         "handler": None,
+        "examples": [
+            "help", "what can you do", "what do you do",
+            "what are your capabilities", "how does this work",
+        ],
     },
     "create_pnl": {
         "description": "User wants to create a profit and loss statement for a property",
         "help_text": "Create a profit and loss (P&L) statement for a property",
+        "label": "P&L statements",
         "handler": "pnl",
+        "examples": [
+            "make p&l", "create p&l", "build p&l", "start p&l",
+            "make profit and loss", "create profit and loss",
+        ],
     },
     "create_brochure": {
         "description": "User wants to create a property marketing brochure or offering memorandum",
         "help_text": "Create a property marketing brochure (offering memorandum)",
+        "label": "property brochures",
         "handler": "brochure",
+        "examples": [
+            "make brochure", "create brochure", "build brochure",
+            "make offering memorandum", "create offering memorandum",
+            "draft offering memorandum",
+        ],
     },
     "create_commercial_pa": {
         "description": "User wants to create or resume a commercial purchase agreement",
         "help_text": "Create a commercial purchase agreement (PA)",
+        "label": "commercial purchase agreements",
         "handler": "commercial_pa",
+        "examples": [
+            "make pa", "create pa", "draft pa", "start pa", "resume pa",
+            "draft purchase agreement", "create purchase agreement",
+            "make purchase agreement", "write purchase agreement",
+        ],
     },
 }
@@ -31,6 +31,11 @@
         preferWheels = true;
       };
 
+      # Postgres driver for the signal listener (LISTEN/NOTIFY). Not in
+      # poetry.lock — the listener treats it as optional and falls back to
+      # polling without it — so it comes from nixpkgs on PYTHONPATH.
+      psycopg2 = linuxPkgs.python312Packages.psycopg2;
+
       # Application source — all Python files
       appSrc = linuxPkgs.runCommand "rrg-router-src" {} ''
         mkdir -p $out/app
@@ -40,8 +45,15 @@
         cp ${./config.py} $out/app/config.py
         cp ${./node_client.py} $out/app/node_client.py
         cp ${./windmill_client.py} $out/app/windmill_client.py
+        cp ${./hybrid_client.py} $out/app/hybrid_client.py
         cp ${./signal_client.py} $out/app/signal_client.py
+        cp ${./signal_cache.py} $out/app/signal_cache.py
+        cp ${./signal_listener.py} $out/app/signal_listener.py
         cp ${./claude_llm.py} $out/app/claude_llm.py
+        cp ${./artifact_store.py} $out/app/artifact_store.py
+        cp ${./artifact_client.py} $out/app/artifact_client.py
+        cp ${./transcript_store.py} $out/app/transcript_store.py
+        cp ${./intent_index.py} $out/app/intent_index.py
       '';
 
     in
@@ -75,7 +87,7 @@
             "HOME=/root"
             "SSL_CERT_FILE=${linuxPkgs.cacert}/etc/ssl/certs/ca-bundle.crt"
             "NIX_SSL_CERT_FILE=${linuxPkgs.cacert}/etc/ssl/certs/ca-bundle.crt"
-            "PYTHONPATH=/app"
+            "PYTHONPATH=/app:${psycopg2}/${linuxPkgs.python312.sitePackages}"
           ];
         };
       };
@@ -4,15 +4,20 @@ This graph is used when NO worker node is active. It classifies the user's
 intent and routes to either a worker container or a local chat response.
 
 Entry: detect_intent → route → (chat_response | END)
+
+detect_intent tries an exemplar match and the intent cache before calling
+the LLM (see intent_index). Greetings are answered from templates.
 """
 
 import json
+import random
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 
 from state import RouterState
-from config import CLAUDE_MODEL, INTENTS
+from config import CLAUDE_MODEL, INTENTS, INTENT_EXEMPLARS, INTENT_CACHE_SIZE
 from claude_llm import ChatClaudeCLI
+from intent_index import IntentIndex, IntentCache
 
 
 # ---------------------------------------------------------------------------
@@ -29,6 +34,10 @@ def _get_llm() -> ChatClaudeCLI:
     return _llm
 
 
+_intent_index = IntentIndex(INTENTS)
+_intent_cache = IntentCache(INTENT_CACHE_SIZE)
+
+
 # ---------------------------------------------------------------------------
 # Prompts
 # ---------------------------------------------------------------------------
@@ -47,6 +56,12 @@ Respond ONLY with valid JSON in this exact format:
 If you can't determine the intent, use: {{"intent": "help", "params": {{}}}}
 """
 
+GREETING_TEMPLATES = [
+    "Hey! I can help with {labels} — what do you need?",
+    "Hi there. I can put together {labels}. What are we working on?",
+    "Hello! Need {labels}? Just tell me the property.",
+]
+
 
 # ---------------------------------------------------------------------------
 # Helper Functions
@@ -70,6 +85,22 @@ def _get_capability_intents() -> str:
     return "\n".join(lines)
 
 
+def _build_greeting_response() -> str:
+    """Short canned greeting naming what the assistant can do."""
+    labels = [
+        info.get("label", name)
+        for name, info in INTENTS.items()
+        if info.get("handler") is not None
+    ]
+    if not labels:
+        return "Hi! I'm still getting set up — no workflows available yet."
+    if len(labels) > 1:
+        labels_str = ", ".join(labels[:-1]) + " or " + labels[-1]
+    else:
+        labels_str = labels[0]
+    return random.choice(GREETING_TEMPLATES).format(labels=labels_str)
+
+
 def _build_help_response() -> str:
     """Generate the help message listing available capabilities."""
     capabilities = _get_capability_intents()
@@ -83,7 +114,21 @@ def _build_help_response() -> str:
 # ---------------------------------------------------------------------------
 
 def detect_intent_node(state: RouterState) -> dict:
-    """Classify user message into intent via LLM."""
+    """Classify user message into intent.
+
+    Strong exemplar matches and cached classifications skip the LLM;
+    everything else is classified with the chat history as context.
+    """
+    if INTENT_EXEMPLARS:
+        match = _intent_index.match(state["user_message"])
+        if match:
+            return {"intent": match[0], "params": {}, "intent_source": "exemplar"}
+
+    cache_key = IntentCache.key(state["user_message"], state.get("chat_history"))
+    cached = _intent_cache.get(cache_key)
+    if cached:
+        return {**cached, "intent_source": "cache"}
+
     llm = _get_llm()
     intents_str = _get_available_intents()
     system = CLASSIFY_PROMPT.format(intents=intents_str)
@@ -105,12 +150,17 @@ def detect_intent_node(state: RouterState) -> dict:
             text = text.split("\n", 1)[1] if "\n" in text else text[3:]
             text = text.rsplit("```", 1)[0]
         parsed = json.loads(text.strip())
-        return {
+        result = {
             "intent": parsed.get("intent", "help"),
             "params": parsed.get("params", {}),
         }
     except (json.JSONDecodeError, AttributeError):
-        return {"intent": "help", "params": {}}
+        # Not cached — a bad LLM reply shouldn't stick
+        return {"intent": "help", "params": {}, "intent_source": "llm"}
+
+    if result["intent"] in INTENTS:
+        _intent_cache.put(cache_key, result)
+    return {**result, "intent_source": "llm"}
 
 
 def route_node(state: RouterState) -> dict:
@@ -136,18 +186,7 @@ def chat_response_node(state: RouterState) -> dict:
     if intent == "help":
         response = _build_help_response()
     elif intent == "greeting":
-        llm = _get_llm()
-        capabilities = _get_capability_intents()
-        result = llm.invoke([
-            SystemMessage(content=(
-                "You are a personal assistant. Respond to the user's greeting in one short sentence. "
-                "Be casual and friendly but not over-the-top. No emojis. No lists. "
-                "If it makes sense, briefly mention you can help with:\n"
-                f"{capabilities}"
-            )),
-            HumanMessage(content=state["user_message"]),
-        ])
-        response = result.content
+        response = _build_greeting_response()
     else:
         response = _build_help_response()
 
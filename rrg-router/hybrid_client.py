@@ -0,0 +1,73 @@
+"""Hybrid worker client — direct fast path with Windmill where it matters."""
+
+from typing import Optional, Dict, Any, Iterable
+
+from node_client import WorkerNodeClient
+from windmill_client import WindmillClient
+
+
+class HybridClient:
+    """Routes each call directly to the worker or through Windmill by command.
+
+    Same call_worker() signature as WorkerNodeClient / WindmillClient.
+    Interactive turns (`continue` by default) go straight to the worker over
+    a pooled keep-alive connection, skipping Windmill's job queue and flow
+    dispatch. Everything else (e.g. `create`, which starts a new worker
+    conversation) still runs through the message_router flow so it shows
+    up in Windmill's job history.
+    """
+
+    def __init__(
+        self,
+        direct: WorkerNodeClient,
+        windmill: WindmillClient,
+        direct_commands: Iterable[str] = ("continue",),
+    ):
+        self.direct = direct
+        self.windmill = windmill
+        self.direct_commands = frozenset(direct_commands)
+
+    def call_worker(
+        self,
+        handler_name: str,
+        command: str,
+        user_message: str,
+        chat_history: list,
+        state: Optional[dict] = None,
+    ) -> Dict[str, Any]:
+        """Call a worker, picking the path by command.
+
+        Returns:
+            {response, state, active, pdf_bytes, pdf_filename, error, timings}
+        """
+        client = self.direct if command in self.direct_commands else self.windmill
+        return client.call_worker(
+            handler_name=handler_name,
+            command=command,
+            user_message=user_message,
+            chat_history=chat_history,
+            state=state,
+        )
+
+    def submit_job(
+        self,
+        handler_name: str,
+        command: str,
+        user_message: str,
+        chat_history: list,
+        state: Optional[dict] = None,
+    ) -> Dict[str, Any]:
+        """Start a background job on the path picked by command."""
+        client = self.direct if command in self.direct_commands else self.windmill
+        return client.submit_job(
+            handler_name=handler_name,
+            command=command,
+            user_message=user_message,
+            chat_history=chat_history,
+            state=state,
+        )
+
+    def poll_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Poll a job on the path it was submitted to."""
+        client = self.windmill if job.get("path") == "windmill" else self.direct
+        return client.poll_job(job)
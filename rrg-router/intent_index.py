@@ -0,0 +1,148 @@
+"""Fast intent matching ahead of the LLM classifier.
+
+Two shortcuts for detect_intent_node:
+
+- IntentIndex — exemplar phrasings per INTENTS entry ("examples"). A
+  message that contains every word of an exemplar for exactly one intent
+  is a strong match and routes without an LLM call. Anything else
+  (no match, several intents match, negations, long chat messages) is
+  ambiguous and goes to the classifier. Handler exemplars are a verb plus
+  its object ("draft pa"): a question that only names the document
+  ("is the purchase agreement done?") is left to the classifier, and so
+  is a greeting or help request that mentions one ("hi, p&l please").
+- IntentCache — LLM results memoized by normalized message plus a short
+  fingerprint of the preceding turns, so "yes" after two different
+  questions doesn't share an entry.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Filler dropped before matching — never decides an intent
+_STOPWORDS = frozenset({"a", "an", "the", "please", "pls", "me", "for", "some"})
+
+# Any of these means the message may say what NOT to do — let the LLM read it
+_NEGATIONS = frozenset({"not", "dont", "no", "never", "without", "instead", "cancel", "stop"})
+
+# Spelling variants folded together after normalizing
+_ALIASES = (
+    (re.compile(r"\bp\s*&\s*l\b"), "p&l"),
+    (re.compile(r"\bpnl\b"), "p&l"),
+    (re.compile(r"\bp and l\b"), "p&l"),
+)
+
+# A handler exemplar must ask for something to be done — one without any of
+# these is ignored, so naming a document alone never starts a worker
+_ACTION_VERBS = frozenset({
+    "make", "create", "build", "start", "draft", "write", "generate",
+    "prepare", "put", "resume", "continue", "run",
+})
+
+# Chat intents (no handler) only match short messages — "hi, can you
+# look at this lease for me" is not a greeting
+_CHAT_EXTRA_WORDS = 2
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop apostrophes and punctuation, collapse whitespace."""
+    text = text.lower().replace("'", "").replace("’", "")
+    text = re.sub(r"[^a-z0-9&]+", " ", text)
+    for pattern, replacement in _ALIASES:
+        text = pattern.sub(replacement, text)
+    return " ".join(text.split())
+
+
+def _tokens(normalized: str) -> List[str]:
+    return [t for t in normalized.split() if t not in _STOPWORDS]
+
+
+def context_fingerprint(chat_history: Optional[List[dict]], user_message: str, turns: int = 2) -> str:
+    """Short hash of the last `turns` messages before `user_message`."""
+    history = list(chat_history or [])
+    # The router appends the new message to history before classifying
+    if history and history[-1].get("role") == "user" and history[-1].get("content") == user_message:
+        history.pop()
+    digest = hashlib.sha1()
+    for msg in history[-turns:]:
+        digest.update(f"{msg.get('role')}:{normalize(msg.get('content') or '')}\n".encode())
+    return digest.hexdigest()[:12]
+
+
+class IntentIndex:
+    """Exemplar phrasings per intent, matched by word containment."""
+
+    def __init__(self, intents: Dict[str, Dict[str, Any]]):
+        self.exemplars: List[Tuple[str, str, frozenset, bool]] = []
+        # Objects of handler exemplars ("p&l", "brochure", "pa") — a message
+        # naming one is never a plain greeting or help request
+        self.handler_words: set = set()
+        for name, info in intents.items():
+            is_chat = info.get("handler") is None
+            for phrase in info.get("examples", []):
+                words = frozenset(_tokens(normalize(phrase)))
+                if not words:
+                    continue
+                if not is_chat:
+                    if not words & _ACTION_VERBS or not words - _ACTION_VERBS:
+                        continue  # not a verb plus an object
+                    self.handler_words |= words - _ACTION_VERBS
+                self.exemplars.append((name, phrase, words, is_chat))
+
+    def match(self, message: str) -> Optional[Tuple[str, str]]:
+        """Return (intent, matched exemplar) for a strong match, else None."""
+        tokens = _tokens(normalize(message))
+        words = set(tokens)
+        if not words or words & _NEGATIONS:
+            return None
+
+        names_handler_object = bool(words & self.handler_words)
+        best: Dict[str, Tuple[str, frozenset]] = {}
+        for name, phrase, exemplar, is_chat in self.exemplars:
+            if not exemplar <= words:
+                continue
+            if is_chat and (names_handler_object or len(tokens) > len(exemplar) + _CHAT_EXTRA_WORDS):
+                continue
+            if name not in best or len(exemplar) > len(best[name][1]):
+                best[name] = (phrase, exemplar)
+
+        if len(best) != 1:
+            return None  # no match, or two intents both fit
+        name, (phrase, _) = next(iter(best.items()))
+        return name, phrase
+
+
+class IntentCache:
+    """Thread-safe LRU of classifier results keyed by (message, context)."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(user_message: str, chat_history: Optional[List[dict]]) -> Tuple[str, str]:
+        return normalize(user_message), context_fingerprint(chat_history, user_message)
+
+    def get(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(result)
+
+    def put(self, key: Tuple[str, str], result: Dict[str, Any]):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = dict(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -1,16 +1,113 @@
 """HTTP client for communicating with worker node containers."""
 
 import base64
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional, Dict, Any
 
 
+def parse_server_timing(header: Optional[str]) -> Optional[float]:
+    """Return the `app;dur=` value (ms) from a worker's Server-Timing header."""
+    for metric in (header or "").split(","):
+        name, _, params = metric.strip().partition(";")
+        if name != "app":
+            continue
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur":
+                try:
+                    return float(value)
+                except ValueError:
+                    return None
+    return None
+
+
+def network_ms(start: float, resp) -> float:
+    """Round-trip time since `start` (perf_counter) minus the worker's handler time."""
+    total_ms = (time.perf_counter() - start) * 1000
+    worker_ms = parse_server_timing(resp.headers.get("Server-Timing"))
+    return round(total_ms - (worker_ms or 0.0), 1)
+
+
+def worker_response(data: dict) -> Dict[str, Any]:
+    """Normalize a worker /process body into the router's response dict.
+
+    Decodes inline base64 files; artifact IDs are passed through.
+    """
+    # Decode PDF if present
+    pdf_bytes = None
+    if data.get("pdf_bytes"):
+        try:
+            pdf_bytes = base64.b64decode(data["pdf_bytes"])
+        except Exception:
+            pass
+
+    # Decode DOCX if present
+    docx_bytes = None
+    if data.get("docx_bytes"):
+        try:
+            docx_bytes = base64.b64decode(data["docx_bytes"])
+        except Exception:
+            pass
+
+    return {
+        "response": data.get("response", ""),
+        "state": data.get("state", {}),
+        "active": data.get("active", False),
+        "pdf_bytes": pdf_bytes,
+        "pdf_artifact_id": data.get("pdf_artifact_id"),
+        "pdf_filename": data.get("pdf_filename"),
+        "docx_bytes": docx_bytes,
+        "docx_artifact_id": data.get("docx_artifact_id"),
+        "docx_filename": data.get("docx_filename"),
+        "preview_docx": data.get("preview_docx"),
+        "preview_artifact_id": data.get("preview_artifact_id"),
+        "preview_filename": data.get("preview_filename"),
+        "error": None,
+    }
+
+
+def error_response(message: str, error: str, state: Optional[dict] = None) -> Dict[str, Any]:
+    """Response dict for a call that never produced a worker body."""
+    return {
+        "response": message,
+        "state": state or {},
+        "active": False,
+        "pdf_bytes": None,
+        "pdf_filename": None,
+        "docx_bytes": None,
+        "docx_filename": None,
+        "error": error,
+    }
+
+
 class WorkerNodeClient:
-    """Client for calling worker node /process endpoints."""
+    """Client for calling worker node /process endpoints.
 
-    def __init__(self, worker_urls: Dict[str, str], timeout: int = 120):
+    Keeps one keep-alive `requests.Session` per worker so chat turns reuse
+    an open connection instead of paying TCP setup each time.
+    """
+
+    def __init__(self, worker_urls: Dict[str, str], timeout: int = 120, pool_size: int = 4):
         self.worker_urls = worker_urls
         self.timeout = timeout
+        self.pool_size = pool_size
+        self._sessions: Dict[str, requests.Session] = {}
+        self._sessions_lock = threading.Lock()
+
+    def _session(self, handler_name: str) -> requests.Session:
+        """Return the pooled session for a worker, creating it on first use."""
+        with self._sessions_lock:
+            session = self._sessions.get(handler_name)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[handler_name] = session
+            return session
 
     def call_worker(
         self,
@@ -23,19 +120,13 @@ class WorkerNodeClient:
         """Call a worker node's /process endpoint.
 
         Returns:
-            {response, state, active, pdf_bytes, pdf_filename, error}
+            {response, state, active, pdf_bytes, pdf_filename, error, timings}
+            (plus *_artifact_id fields when the worker stored a file)
         """
         if handler_name not in self.worker_urls:
-            return {
-                "response": f"Unknown worker: {handler_name}",
-                "state": state or {},
-                "active": False,
-                "pdf_bytes": None,
-                "pdf_filename": None,
-                "docx_bytes": None,
-                "docx_filename": None,
-                "error": f"Unknown worker: {handler_name}",
-            }
+            return error_response(
+                f"Unknown worker: {handler_name}", f"Unknown worker: {handler_name}", state
+            )
 
         url = f"{self.worker_urls[handler_name]}/process"
         payload = {
@@ -45,57 +136,122 @@ class WorkerNodeClient:
             "state": state or {},
         }
 
+        start = time.perf_counter()
+        timings = {"path": "direct", "worker": handler_name}
         try:
-            resp = requests.post(url, json=payload, timeout=self.timeout)
+            resp = self._session(handler_name).post(url, json=payload, timeout=self.timeout)
+            timings["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            worker_ms = parse_server_timing(resp.headers.get("Server-Timing"))
+            if worker_ms is not None:
+                timings["worker_ms"] = worker_ms
+                timings["network_ms"] = round(timings["total_ms"] - worker_ms, 1)
             resp.raise_for_status()
-            data = resp.json()
+            response = worker_response(resp.json())
+            response["timings"] = timings
+            return response
 
-            # Decode PDF if present
-            pdf_bytes = None
-            if data.get("pdf_bytes"):
-                try:
-                    pdf_bytes = base64.b64decode(data["pdf_bytes"])
-                except Exception:
-                    pass
+        except requests.Timeout:
+            timings["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            response = error_response(
+                f"Worker {handler_name} timed out. Please try again.", "timeout", state
+            )
+            response["timings"] = timings
+            return response
+        except requests.RequestException as e:
+            timings["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            response = error_response(
+                f"Failed to reach {handler_name} worker: {e}", str(e), state
+            )
+            response["timings"] = timings
+            return response
 
-            # Decode DOCX if present
-            docx_bytes = None
-            if data.get("docx_bytes"):
-                try:
-                    docx_bytes = base64.b64decode(data["docx_bytes"])
-                except Exception:
-                    pass
+    def submit_job(
+        self,
+        handler_name: str,
+        command: str,
+        user_message: str,
+        chat_history: list,
+        state: Optional[dict] = None,
+    ) -> Dict[str, Any]:
+        """Start a /process turn as a background job on the worker (POST /jobs).
 
-            return {
-                "response": data.get("response", ""),
-                "state": data.get("state", {}),
-                "active": data.get("active", False),
-                "pdf_bytes": pdf_bytes,
-                "pdf_filename": data.get("pdf_filename"),
-                "docx_bytes": docx_bytes,
-                "docx_filename": data.get("docx_filename"),
-                "error": None,
-            }
+        Returns a job handle {job_id, path, worker, network_ms} to pass to
+        poll_job(), or {error, response} if the job couldn't be submitted.
+        """
+        if handler_name not in self.worker_urls:
+            return error_response(
+                f"Unknown worker: {handler_name}", f"Unknown worker: {handler_name}", state
+            )
 
-        except requests.Timeout:
-            return {
-                "response": f"Worker {handler_name} timed out. Please try again.",
-                "state": state or {},
-                "active": False,
-                "pdf_bytes": None,
-                "pdf_filename": None,
-                "docx_bytes": None,
-                "docx_filename": None,
-                "error": "timeout",
-            }
-        except requests.RequestException as e:
+        url = f"{self.worker_urls[handler_name]}/jobs"
+        payload = {
+            "command": command,
+            "user_message": user_message,
+            "chat_history": chat_history,
+            "state": state or {},
+        }
+        start = time.perf_counter()
+        try:
+            resp = self._session(handler_name).post(url, json=payload, timeout=self.timeout)
+            resp.raise_for_status()
             return {
-                "response": f"Failed to reach {handler_name} worker: {e}",
-                "state": state or {},
-                "active": False,
-                "pdf_bytes": None,
-                "pdf_filename": None,
-                "docx_bytes": None,
-                "docx_filename": None,
-                "error": str(e),
+                "job_id": resp.json()["job_id"],
+                "path": "direct",
+                "worker": handler_name,
+                "network_ms": network_ms(start, resp),
             }
+        except (requests.RequestException, ValueError, KeyError) as e:
+            return error_response(
+                f"Failed to reach {handler_name} worker: {e}", str(e), state
+            )
+
+    def poll_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Check a background job (GET /jobs/<id>).
+
+        Adds each poll's network time to job["network_ms"], so the handle
+        carries the job's total time on the wire.
+
+        Returns:
+            {status, stage, elapsed_seconds, result, timings}
+            status: "running" | "done" | "lost" | "unreachable"
+            result: the normalized response dict once done
+            timings: {worker_ms, queue_ms, network_ms} once done
+        """
+        handler_name = job["worker"]
+        url = f"{self.worker_urls[handler_name]}/jobs/{job['job_id']}"
+        start = time.perf_counter()
+        try:
+            resp = self._session(handler_name).get(url, timeout=self.timeout)
+            if resp.status_code == 404:
+                return {"status": "lost", "stage": None, "result": None}
+            resp.raise_for_status()
+            data = resp.json()
+            job["network_ms"] = round(job.get("network_ms", 0.0) + network_ms(start, resp), 1)
+        except (requests.RequestException, ValueError):
+            # Worker busy or restarting — the job is still there, poll again
+            return {"status": "unreachable", "stage": None, "result": None}
+
+        events = data.get("events") or []
+        polled = {
+            "status": "running",
+            "stage": events[-1]["stage"] if events else None,
+            "elapsed_seconds": data.get("elapsed_seconds"),
+            "result": None,
+        }
+        if data.get("status") in ("done", "error"):
+            polled["status"] = "done"
+            if data.get("result"):
+                result = worker_response(data["result"])
+                if data.get("status") == "error":
+                    result["error"] = "worker_error"
+            else:
+                result = error_response(
+                    f"The {handler_name} worker stopped before finishing. Please try again.",
+                    data.get("error") or "worker_error",
+                )
+            polled["result"] = result
+            polled["timings"] = {"network_ms": job["network_ms"]}
+            for key in ("worker_ms", "queue_ms"):
+                if isinstance(data.get(key), (int, float)):
+                    polled["timings"][key] = data[key]
+        return polled
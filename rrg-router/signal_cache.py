@@ -0,0 +1,76 @@
+"""In-memory cache of pending signals, kept current with keyset reads.
+
+The Signals tab loads the pending list once, then asks read_signals only
+for rows whose (updated_at, id) comes after the latest pair it has seen —
+new signals and ones acted on since. Changed rows that are no longer
+pending (acted on, dismissed) drop out of the cache.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+
+class SignalCache:
+    """Pending signals by ID plus the keyset cursor for the next read.
+
+    The cursor is the pair (updated_since, since_id): read_signals pages
+    by (updated_at, id), so both advance together to the last row seen.
+    """
+
+    def __init__(self):
+        self.signals: Dict[int, Dict[str, Any]] = {}
+        self.details: Dict[int, Dict[str, Any]] = {}
+        self.since_id = 0
+        self.updated_since = ""
+        self.loaded = False
+        self.fetched_at = 0.0
+
+    def _advance(self, row: Dict[str, Any]):
+        updated_at = row.get("updated_at") or row.get("created_at") or ""
+        # Timestamps come back in one format from Postgres, so they sort as strings
+        if (updated_at, int(row["id"])) > (self.updated_since, self.since_id):
+            self.updated_since, self.since_id = updated_at, int(row["id"])
+
+    def load(self, rows: List[Dict[str, Any]]):
+        """Replace the cache with a full read of pending signals."""
+        self.signals = {}
+        self.details = {}
+        self.since_id = 0
+        self.updated_since = ""
+        self.apply(rows)
+        self.loaded = True
+
+    def apply(self, rows: List[Dict[str, Any]], status: str = "pending"):
+        """Merge new/changed rows from an incremental read."""
+        for row in rows:
+            signal_id = int(row["id"])
+            if row.get("status", status) == status:
+                self.signals[signal_id] = row
+            else:
+                self.remove(signal_id)
+            self._advance(row)
+        self.fetched_at = time.time()
+
+    def remove(self, signal_id: int):
+        """Drop a signal (e.g. after acting on it here)."""
+        self.signals.pop(signal_id, None)
+        self.details.pop(signal_id, None)
+
+    def is_stale(self, max_age_seconds: float) -> bool:
+        """True if the last fetch is older than `max_age_seconds`."""
+        return not self.loaded or time.time() - self.fetched_at >= max_age_seconds
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Pending signals, newest first."""
+        return sorted(
+            self.signals.values(),
+            key=lambda s: (s.get("created_at") or "", s["id"]),
+            reverse=True,
+        )
+
+    def detail(self, signal_id: int) -> Optional[Dict[str, Any]]:
+        """Cached `detail` JSON for a signal, or None if not loaded yet."""
+        if signal_id in self.details:
+            return self.details[signal_id]
+        row = self.signals.get(signal_id) or {}
+        return row.get("detail")
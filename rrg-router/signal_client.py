@@ -37,16 +37,75 @@ class SignalClient:
         resp.raise_for_status()
         return resp.json()
 
-    def get_pending_signals(self, limit: int = 20) -> List[Dict[str, Any]]:
+    def get_pending_signals(
+        self, limit: int = 20, include_detail: bool = True
+    ) -> List[Dict[str, Any]]:
         """Fetch pending signals from the queue."""
         try:
             return self._run_script(
                 "f/switchboard/read_signals",
-                {"status": "pending", "limit": limit},
+                {"status": "pending", "limit": limit, "include_detail": include_detail},
             )
         except Exception:
             return []
 
+    def get_all_pending_signals(
+        self, page_size: int = 100, include_detail: bool = True
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Fetch every pending signal, newest first, a keyset page at a time.
+
+        Pages by (created_at, id) until a short page. Returns None on
+        failure so the caller doesn't mistake a partial list for the
+        whole queue.
+        """
+        rows: List[Dict[str, Any]] = []
+        args = {"status": "pending", "limit": page_size, "include_detail": include_detail}
+        while True:
+            try:
+                page = self._run_script("f/switchboard/read_signals", args)
+            except Exception:
+                return None
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+            args["before_created_at"] = page[-1]["created_at"]
+            args["before_id"] = page[-1]["id"]
+
+    def get_signal_changes(
+        self, since_id: int, updated_since: str, limit: int = 100
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Fetch signals whose (updated_at, id) is after (`updated_since`, `since_id`).
+
+        Summary columns only (no `detail`). Returns None on failure so the
+        caller can keep its cached list and retry next refresh.
+        """
+        try:
+            return self._run_script(
+                "f/switchboard/read_signals",
+                {
+                    "status": "pending",
+                    "limit": limit,
+                    "since_id": since_id,
+                    "updated_since": updated_since,
+                    "include_detail": False,
+                },
+            )
+        except Exception:
+            return None
+
+    def get_signal_detail(self, signal_id: int) -> Optional[Dict[str, Any]]:
+        """Fetch one signal's `detail` JSON. Returns None on failure."""
+        try:
+            result = self._run_script(
+                "f/switchboard/read_signal_detail",
+                {"signal_id": signal_id},
+            )
+        except Exception:
+            return None
+        if not isinstance(result, dict) or "error" in result:
+            return None
+        return result.get("detail") or {}
+
     def act_on_signal(
         self, signal_id: int, action: str, acted_by: str = "jake"
     ) -> Dict[str, Any]:
@@ -0,0 +1,178 @@
+"""Push-based signal updates via Postgres LISTEN/NOTIFY.
+
+A background thread LISTENs on the `jake_signals` channel (trigger
+installed by f/switchboard/setup_signal_notify). Each notification names
+a signal ID; the listener re-reads that row and updates a process-wide
+SignalCache, so every Streamlit session sees new or acted-on signals
+within a second without polling Windmill.
+
+On (re)connect it re-reads all pending signals before waiting for
+notifications, so nothing sent while it was disconnected is missed.
+While Postgres is unreachable `connected` is False and the Signals tab
+falls back to polling read_signals through Windmill.
+
+psycopg2 is optional: without it (or without SIGNAL_PG_DSN) the listener
+is simply not started.
+"""
+
+import json
+import select
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional
+
+from signal_cache import SignalCache
+
+try:
+    import psycopg2
+    import psycopg2.extensions
+except ImportError:  # polling fallback only
+    psycopg2 = None
+
+CHANNEL = "jake_signals"
+
+# Same summary columns as f/switchboard/read_signals (no `detail`)
+_SUMMARY_SQL = """
+    SELECT id, signal_type, source_flow, summary, actions,
+           windmill_job_id, resume_url, cancel_url, status, created_at,
+           COALESCE(acted_at, created_at) AS updated_at
+    FROM public.jake_signals
+"""
+
+
+class SignalListener:
+    """Keeps a shared SignalCache current from Postgres notifications."""
+
+    def __init__(
+        self,
+        dsn: str,
+        limit: int = 200,
+        reconnect_seconds: float = 5.0,
+        max_reconnect_seconds: float = 60.0,
+    ):
+        self.dsn = dsn
+        self.limit = limit
+        self.reconnect_seconds = reconnect_seconds
+        self.max_reconnect_seconds = max_reconnect_seconds
+        self.cache = SignalCache()
+        self.connected = False
+        self.last_error: Optional[str] = None
+        self.last_notify_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def available() -> bool:
+        """True if psycopg2 is installed."""
+        return psycopg2 is not None
+
+    def start(self):
+        """Start the background listener thread (idempotent)."""
+        if self._thread is not None or not self.available():
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="signal-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Ask the listener thread to exit."""
+        self._stop.set()
+
+    # -- Reads for the UI -------------------------------------------------
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Pending signals, newest first (a copy — safe to iterate)."""
+        with self._lock:
+            return [dict(s) for s in self.cache.pending()]
+
+    def remove(self, signal_id: int):
+        """Drop a signal right away (acted on here; the notify will follow)."""
+        with self._lock:
+            self.cache.remove(signal_id)
+
+    # -- Listener thread --------------------------------------------------
+
+    @staticmethod
+    def _rows(cur) -> List[Dict[str, Any]]:
+        cols = [d[0] for d in cur.description]
+        rows = []
+        for r in cur.fetchall():
+            row = dict(zip(cols, r))
+            row["created_at"] = str(row["created_at"])
+            row["updated_at"] = str(row["updated_at"])
+            rows.append(row)
+        return rows
+
+    def _resync(self, conn):
+        """Reload every pending signal (after connecting)."""
+        with conn.cursor() as cur:
+            cur.execute(
+                _SUMMARY_SQL + " WHERE status = 'pending' ORDER BY created_at DESC LIMIT %s",
+                (self.limit,),
+            )
+            rows = self._rows(cur)
+        with self._lock:
+            self.cache.load(rows)
+
+    def _refresh_ids(self, conn, ids: List[int]):
+        """Re-read the rows named in a batch of notifications."""
+        with conn.cursor() as cur:
+            cur.execute(_SUMMARY_SQL + " WHERE id = ANY(%s)", (ids,))
+            rows = self._rows(cur)
+        found = {row["id"] for row in rows}
+        with self._lock:
+            self.cache.apply(rows)
+            for signal_id in ids:
+                if signal_id not in found:  # deleted
+                    self.cache.remove(signal_id)
+
+    def _listen(self):
+        conn = psycopg2.connect(self.dsn, connect_timeout=10)
+        try:
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {CHANNEL}")
+            # LISTEN first, then resync — a change between the two is
+            # picked up by both, which is harmless
+            self._resync(conn)
+            self.connected = True
+            self.last_error = None
+
+            while not self._stop.is_set():
+                ready, _, _ = select.select([conn], [], [], 30)
+                if not ready:
+                    # Idle keepalive — surfaces a dead connection
+                    with conn.cursor() as cur:
+                        cur.execute("SELECT 1")
+                    continue
+                conn.poll()
+                ids = set()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    try:
+                        ids.add(int(json.loads(notify.payload)["id"]))
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                if ids:
+                    self._refresh_ids(conn, sorted(ids))
+                    self.last_notify_at = time.time()
+        finally:
+            self.connected = False
+            conn.close()
+
+    def _run(self):
+        delay = self.reconnect_seconds
+        while not self._stop.is_set():
+            started = time.time()
+            try:
+                self._listen()
+            except Exception as e:
+                self.last_error = str(e)
+                traceback.print_exc()
+            if time.time() - started > self.max_reconnect_seconds:
+                delay = self.reconnect_seconds  # was healthy for a while
+            self._stop.wait(delay)
+            delay = min(delay * 2, self.max_reconnect_seconds)
@@ -12,6 +12,7 @@ class RouterState(TypedDict, total=False):
     # Set by detect_intent node
     intent: str
     params: dict
+    intent_source: str  # "exemplar" | "cache" | "llm"
 
     # Set by route node
     route_type: str  # "handler" | "chat" | "error"
@@ -0,0 +1,56 @@
+"""Shared fixtures for rrg-router test suite."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class FakeResponse:
+    """Just enough of requests.Response for the worker clients."""
+
+    def __init__(self, status_code=200, json_body=None, text="", headers=None):
+        self.status_code = status_code
+        self._json = json_body
+        self.text = text
+        self.headers = headers or {}
+
+    def json(self):
+        if self._json is None:
+            raise ValueError("no JSON body")
+        return self._json
+
+    def raise_for_status(self):
+        import requests
+
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+
+class FakeSession:
+    """Records calls and answers each with the next queued response (or exception)."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def _next(self, method, url, kwargs):
+        self.calls.append((method, url, kwargs))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def post(self, url, **kwargs):
+        return self._next("POST", url, kwargs)
+
+    def get(self, url, **kwargs):
+        return self._next("GET", url, kwargs)
+
+
+@pytest.fixture
+def worker_body():
+    """A minimal worker /process response body."""
+    return {"response": "Done.", "state": {"session_id": "s1"}, "active": True}
@@ -0,0 +1,171 @@
+"""Tests for intent_index.py — exemplar matching and the classifier cache."""
+
+import threading
+
+import pytest
+
+from intent_index import IntentCache, IntentIndex, context_fingerprint, normalize
+
+
+INTENTS = {
+    "greeting": {"handler": None, "examples": ["hi", "hello", "good morning", "how are you"]},
+    "help": {"handler": None, "examples": ["help", "what can you do"]},
+    "create_pnl": {"handler": "pnl", "examples": ["make p&l", "create profit and loss"]},
+    "create_brochure": {"handler": "brochure", "examples": ["make brochure", "create offering memorandum"]},
+    "create_commercial_pa": {"handler": "commercial_pa", "examples": ["draft purchase agreement", "draft pa"]},
+}
+
+
+@pytest.fixture
+def index():
+    return IntentIndex(INTENTS)
+
+
+# ===========================================================================
+# normalize
+# ===========================================================================
+
+class TestNormalize:
+    @pytest.mark.parametrize("text", ["Make a P&L", "make a pnl", "MAKE A P & L!", "make a p and l"])
+    def test_pnl_spellings_fold_together(self, text):
+        assert normalize(text) == "make a p&l"
+
+    def test_apostrophes_and_whitespace(self):
+        assert normalize("  What’s   up?  Don't ") == "whats up dont"
+
+
+# ===========================================================================
+# IntentIndex
+# ===========================================================================
+
+class TestIntentIndex:
+    """Strong matches route without the LLM; anything ambiguous returns None."""
+
+    def test_exemplar_words_in_any_order(self, index):
+        assert index.match("Please make me a P&L for 12 Oak St") == ("create_pnl", "make p&l")
+        assert index.match("can you draft the PA") == ("create_commercial_pa", "draft pa")
+
+    def test_longest_exemplar_wins_within_intent(self):
+        index = IntentIndex({"create_pnl": {"handler": "pnl", "examples": ["make p&l", "make p&l statement"]}})
+        assert index.match("make a p&l statement") == ("create_pnl", "make p&l statement")
+
+    def test_handler_exemplar_needs_a_verb(self):
+        index = IntentIndex({"create_commercial_pa": {
+            "handler": "commercial_pa", "examples": ["purchase agreement", "draft"],
+        }})
+        assert index.exemplars == []
+
+    @pytest.mark.parametrize("message", [
+        "explain the purchase agreement terms",
+        "is the purchase agreement done?",
+        "what is a commercial pa",
+        "what does the offering memorandum include",
+        "how much is a profit and loss statement",
+    ])
+    def test_naming_a_document_goes_to_llm(self, index, message):
+        assert index.match(message) is None
+
+    def test_two_intents_is_ambiguous(self, index):
+        assert index.match("make a brochure and a p&l") is None
+
+    @pytest.mark.parametrize("message", [
+        "don't make a p&l",
+        "make a brochure instead",
+        "no purchase agreement",
+    ])
+    def test_negation_goes_to_llm(self, index, message):
+        assert index.match(message) is None
+
+    def test_no_match(self, index):
+        assert index.match("what is the cap rate on this deal") is None
+        assert index.match("") is None
+        assert index.match("the a please") is None  # stopwords only
+
+    def test_chat_intents_only_match_short_messages(self, index):
+        assert index.match("hi there") == ("greeting", "hi")
+        assert index.match("hi, can you look at this lease") is None
+
+    @pytest.mark.parametrize("message", [
+        "help me with a p&l",
+        "what can you do for a pa",
+        "hi, p&l please",
+        "how are you at p&l",
+        "hello, brochure",
+    ])
+    def test_chat_intents_skip_handler_requests(self, index, message):
+        assert index.match(message) is None
+
+    def test_chat_intent_still_defers_to_handler_exemplar(self, index):
+        assert index.match("hi, make a p&l") == ("create_pnl", "make p&l")
+
+    def test_intents_without_examples(self):
+        assert IntentIndex({"help": {"handler": None}}).match("help") is None
+
+
+# ===========================================================================
+# context_fingerprint / IntentCache
+# ===========================================================================
+
+class TestContextFingerprint:
+    def test_current_message_is_not_part_of_context(self):
+        history = [{"role": "assistant", "content": "Want a P&L?"}]
+        with_current = history + [{"role": "user", "content": "yes"}]
+        assert context_fingerprint(with_current, "yes") == context_fingerprint(history, "yes")
+
+    def test_different_questions_differ(self):
+        a = [{"role": "assistant", "content": "Want a P&L?"}]
+        b = [{"role": "assistant", "content": "Want a brochure?"}]
+        assert context_fingerprint(a, "yes") != context_fingerprint(b, "yes")
+
+    def test_only_last_turns_count(self):
+        tail = [{"role": "user", "content": "x"}, {"role": "assistant", "content": "y"}]
+        old = [{"role": "user", "content": "long ago"}]
+        assert context_fingerprint(old + tail, "z") == context_fingerprint(tail, "z")
+
+
+class TestIntentCache:
+    """Thread-safe LRU keyed by (normalized message, context fingerprint)."""
+
+    def test_key_normalizes_message(self):
+        assert IntentCache.key("Make a PNL!", []) == IntentCache.key("make a p&l", None)
+
+    def test_hit_miss_and_copies(self):
+        cache = IntentCache()
+        key = IntentCache.key("yes", [])
+        assert cache.get(key) is None
+        cache.put(key, {"intent": "create_pnl"})
+        result = cache.get(key)
+        assert result == {"intent": "create_pnl"}
+        result["intent"] = "changed"
+        assert cache.get(key) == {"intent": "create_pnl"}
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_lru_eviction(self):
+        cache = IntentCache(max_entries=2)
+        cache.put(("a", ""), {"intent": "a"})
+        cache.put(("b", ""), {"intent": "b"})
+        cache.get(("a", ""))  # a is now most recent
+        cache.put(("c", ""), {"intent": "c"})
+        assert cache.get(("b", "")) is None
+        assert cache.get(("a", "")) is not None
+        assert cache.get(("c", "")) is not None
+
+    def test_disabled(self):
+        cache = IntentCache(max_entries=0)
+        cache.put(("a", ""), {"intent": "a"})
+        assert cache.get(("a", "")) is None
+
+    def test_concurrent_puts_stay_bounded(self):
+        cache = IntentCache(max_entries=50)
+
+        def worker(n):
+            for i in range(200):
+                cache.put((f"{n}-{i}", ""), {"intent": "x"})
+                cache.get((f"{n}-{i // 2}", ""))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(cache._entries) == 50
@@ -0,0 +1,175 @@
+"""Tests for node_client.py / hybrid_client.py — direct worker calls and path selection."""
+
+import time
+
+import pytest
+import requests
+
+import node_client
+from hybrid_client import HybridClient
+from node_client import WorkerNodeClient, network_ms, parse_server_timing
+from windmill_client import WindmillClient
+from tests.conftest import FakeResponse, FakeSession
+
+
+# ===========================================================================
+# parse_server_timing
+# ===========================================================================
+
+class TestParseServerTiming:
+    """The worker reports its handler time as `Server-Timing: app;dur=<ms>`."""
+
+    def test_app_duration(self):
+        assert parse_server_timing("app;dur=123.4") == 123.4
+
+    def test_picks_app_among_metrics(self):
+        assert parse_server_timing("db;dur=5, app;desc=\"handler\";dur=42, cache;dur=1") == 42.0
+
+    @pytest.mark.parametrize("header", [None, "", "db;dur=5", "app", "app;desc=x", "app;dur=abc"])
+    def test_missing_or_malformed(self, header):
+        assert parse_server_timing(header) is None
+
+
+# ===========================================================================
+# WorkerNodeClient.call_worker
+# ===========================================================================
+
+def _client(session):
+    client = WorkerNodeClient({"pnl": "http://pnl:8100"})
+    client._sessions["pnl"] = session
+    return client
+
+
+class TestCallWorker:
+    """Pooled direct calls and the per-hop timing split."""
+
+    def test_timings_split_worker_and_network(self, worker_body):
+        session = FakeSession(FakeResponse(json_body=worker_body, headers={"Server-Timing": "app;dur=2.5"}))
+        result = _client(session).call_worker("pnl", "continue", "hi", [], {"session_id": "s1"})
+        assert result["response"] == "Done."
+        assert result["error"] is None
+        timings = result["timings"]
+        assert timings["path"] == "direct"
+        assert timings["worker"] == "pnl"
+        assert timings["worker_ms"] == 2.5
+        assert timings["network_ms"] == pytest.approx(timings["total_ms"] - 2.5, abs=0.11)
+        method, url, kwargs = session.calls[0]
+        assert (method, url) == ("POST", "http://pnl:8100/process")
+        assert kwargs["json"]["state"] == {"session_id": "s1"}
+
+    def test_no_server_timing_header(self, worker_body):
+        result = _client(FakeSession(FakeResponse(json_body=worker_body))).call_worker("pnl", "continue", "hi", [])
+        assert "worker_ms" not in result["timings"]
+        assert "total_ms" in result["timings"]
+
+    def test_timeout(self):
+        result = _client(FakeSession(requests.Timeout())).call_worker("pnl", "continue", "hi", [], {"a": 1})
+        assert result["error"] == "timeout"
+        assert result["state"] == {"a": 1}
+        assert "total_ms" in result["timings"]
+
+    def test_unknown_worker(self):
+        result = WorkerNodeClient({}).call_worker("nope", "create", "hi", [])
+        assert result["error"] == "Unknown worker: nope"
+
+    def test_session_is_reused_per_worker(self):
+        client = WorkerNodeClient({"pnl": "http://pnl:8100", "brochure": "http://b:8101"})
+        assert client._session("pnl") is client._session("pnl")
+        assert client._session("pnl") is not client._session("brochure")
+
+
+# ===========================================================================
+# HybridClient
+# ===========================================================================
+
+class _Recorder:
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+
+    def call_worker(self, **kwargs):
+        self.calls.append(("call_worker", kwargs["command"]))
+        return {"via": self.name}
+
+    def submit_job(self, **kwargs):
+        self.calls.append(("submit_job", kwargs["command"]))
+        return {"job_id": "j", "path": self.name, "worker": kwargs["handler_name"]}
+
+    def poll_job(self, job):
+        self.calls.append(("poll_job", job["job_id"]))
+        return {"via": self.name}
+
+
+class TestHybridClient:
+    """Direct commands skip Windmill; everything else goes through the flow."""
+
+    def test_routes_by_command(self):
+        direct, windmill = _Recorder("direct"), _Recorder("windmill")
+        client = HybridClient(direct, windmill, ("continue",))
+        assert client.call_worker("pnl", "continue", "hi", [])["via"] == "direct"
+        assert client.call_worker("pnl", "create", "hi", [])["via"] == "windmill"
+
+    def test_jobs_polled_on_the_path_they_were_submitted_to(self):
+        direct, windmill = _Recorder("direct"), _Recorder("windmill")
+        client = HybridClient(direct, windmill, ("continue",))
+        job = client.submit_job("pnl", "create", "hi", [])
+        assert client.poll_job(job)["via"] == "windmill"
+        job = client.submit_job("pnl", "continue", "hi", [])
+        assert client.poll_job(job)["via"] == "direct"
+
+
+# ===========================================================================
+# WorkerNodeClient jobs
+# ===========================================================================
+
+class TestJobTimings:
+    """Background jobs report worker, queue and summed network time."""
+
+    def test_network_ms_subtracts_handler_time(self):
+        start = time.perf_counter() - 0.05
+        ms = network_ms(start, FakeResponse(headers={"Server-Timing": "app;dur=20"}))
+        assert 29 <= ms < 100
+
+    def test_network_time_is_summed_across_polls(self, worker_body, monkeypatch):
+        monkeypatch.setattr(node_client, "network_ms", lambda start, resp: 2.0)
+        session = FakeSession(
+            FakeResponse(status_code=202, json_body={"job_id": "j1"}),
+            FakeResponse(json_body={"status": "running", "events": [{"stage": "Rendering PDF"}]}),
+            FakeResponse(json_body={"status": "done", "result": worker_body,
+                                    "queue_ms": 3.0, "worker_ms": 250.0}),
+        )
+        client = _client(session)
+        job = client.submit_job("pnl", "create", "hi", [])
+        assert job["job_id"] == "j1"
+        assert job["network_ms"] == 2.0
+
+        polled = client.poll_job(job)
+        assert polled["status"] == "running"
+        assert polled["stage"] == "Rendering PDF"
+        assert "timings" not in polled
+        assert job["network_ms"] == 4.0
+
+        polled = client.poll_job(job)
+        assert polled["status"] == "done"
+        assert polled["result"]["response"] == "Done."
+        assert polled["timings"] == {"network_ms": 6.0, "worker_ms": 250.0, "queue_ms": 3.0}
+
+    def test_job_without_timing_fields(self, worker_body):
+        session = FakeSession(FakeResponse(json_body={"status": "done", "result": worker_body}))
+        polled = _client(session).poll_job({"job_id": "j1", "worker": "pnl"})
+        assert set(polled["timings"]) == {"network_ms"}
+
+    def test_lost_job(self):
+        polled = _client(FakeSession(FakeResponse(status_code=404))).poll_job(
+            {"job_id": "j1", "worker": "pnl"}
+        )
+        assert polled["status"] == "lost"
+
+    def test_windmill_job_reports_worker_time(self, worker_body):
+        client = WindmillClient("http://windmill", "token")
+        client._session = FakeSession(
+            FakeResponse(json_body={"completed": True, "result": dict(worker_body, worker_ms=80.5)})
+        )
+        polled = client.poll_job({"job_id": "w1", "worker": "pnl"})
+        assert polled["status"] == "done"
+        assert polled["timings"] == {"worker_ms": 80.5}
@@ -0,0 +1,75 @@
+"""Tests for signal_cache.py / signal_client.py — keyset cursor and paged loads."""
+
+import signal_client
+from signal_cache import SignalCache
+from signal_client import SignalClient
+
+
+def _row(signal_id, updated_at, status="pending"):
+    return {"id": signal_id, "status": status, "created_at": updated_at, "updated_at": updated_at}
+
+
+# ===========================================================================
+# SignalCache cursor
+# ===========================================================================
+
+class TestSignalCacheCursor:
+    """The cursor is the (updated_at, id) pair of the last row seen."""
+
+    def test_cursor_is_the_largest_pair(self):
+        cache = SignalCache()
+        cache.load([_row(5, "2026-01-02 00:00:00+00:00"), _row(9, "2026-01-01 00:00:00+00:00")])
+        assert (cache.updated_since, cache.since_id) == ("2026-01-02 00:00:00+00:00", 5)
+
+    def test_same_timestamp_advances_by_id(self):
+        cache = SignalCache()
+        cache.load([_row(3, "2026-01-01 00:00:00+00:00")])
+        cache.apply([_row(7, "2026-01-01 00:00:00+00:00")])
+        assert (cache.updated_since, cache.since_id) == ("2026-01-01 00:00:00+00:00", 7)
+
+    def test_older_id_acted_on_later_moves_cursor(self):
+        # An old signal acted on now sorts after newer pending ones
+        cache = SignalCache()
+        cache.load([_row(1, "2026-01-01 00:00:00+00:00"), _row(8, "2026-01-02 00:00:00+00:00")])
+        cache.apply([_row(1, "2026-01-03 00:00:00+00:00", status="acted")])
+        assert (cache.updated_since, cache.since_id) == ("2026-01-03 00:00:00+00:00", 1)
+        assert [s["id"] for s in cache.pending()] == [8]
+
+
+# ===========================================================================
+# SignalClient.get_all_pending_signals
+# ===========================================================================
+
+class TestGetAllPendingSignals:
+    """The first load pages by (created_at, id) until a short page."""
+
+    def _client(self, monkeypatch, pages):
+        calls = []
+
+        def run_script(self, path, args):
+            calls.append(dict(args))
+            page = pages.pop(0)
+            if isinstance(page, Exception):
+                raise page
+            return page
+
+        monkeypatch.setattr(signal_client.SignalClient, "_run_script", run_script)
+        return SignalClient("http://windmill", "token"), calls
+
+    def test_pages_until_exhausted(self, monkeypatch):
+        pages = [
+            [_row(9, "2026-01-03"), _row(8, "2026-01-02")],
+            [_row(7, "2026-01-02"), _row(4, "2026-01-01")],
+            [_row(2, "2026-01-01")],
+        ]
+        client, calls = self._client(monkeypatch, pages)
+        rows = client.get_all_pending_signals(page_size=2, include_detail=False)
+        assert [r["id"] for r in rows] == [9, 8, 7, 4, 2]
+        assert "before_id" not in calls[0]
+        assert (calls[1]["before_created_at"], calls[1]["before_id"]) == ("2026-01-02", 8)
+        assert (calls[2]["before_created_at"], calls[2]["before_id"]) == ("2026-01-01", 4)
+        assert all(call["include_detail"] is False for call in calls)
+
+    def test_failure_is_not_a_partial_list(self, monkeypatch):
+        client, _ = self._client(monkeypatch, [[_row(9, "2026-01-03")], RuntimeError("down")])
+        assert client.get_all_pending_signals(page_size=1) is None
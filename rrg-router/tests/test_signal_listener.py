@@ -0,0 +1,197 @@
+"""Tests for signal_listener.py — resync, notification batches and reconnects."""
+
+import json
+import types
+from datetime import datetime, timezone
+
+import pytest
+
+import signal_listener
+from signal_listener import SignalListener
+
+
+COLUMNS = ["id", "signal_type", "summary", "status", "created_at", "updated_at"]
+
+
+def _db_row(signal_id, status="pending", day=1):
+    at = datetime(2026, 1, day, tzinfo=timezone.utc)
+    return (signal_id, "approval", f"Signal {signal_id}", status, at, at)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = [(c,) for c in COLUMNS]
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql, params))
+        if "ANY(%s)" in sql:
+            self._rows = [self.conn.table[i] for i in params[0] if i in self.conn.table]
+        elif "status = 'pending'" in sql:
+            self._rows = [r for r in self.conn.table.values() if r[3] == "pending"]
+        else:
+            self._rows = []
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConn:
+    """A psycopg2 connection over an in-memory jake_signals table."""
+
+    def __init__(self, rows=(), notify_batches=()):
+        self.table = {row[0]: row for row in rows}
+        self.notify_batches = list(notify_batches)
+        self.notifies = []
+        self.executed = []
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def set_isolation_level(self, level):
+        pass
+
+    def poll(self):
+        if self.notify_batches:
+            self.notifies.extend(self.notify_batches.pop(0))
+
+    def close(self):
+        self.closed = True
+
+
+def _notify(payload):
+    return types.SimpleNamespace(payload=payload)
+
+
+# ===========================================================================
+# Cache updates from the database
+# ===========================================================================
+
+class TestCacheUpdates:
+    """Resync loads every pending row; notifications re-read just those rows."""
+
+    def test_resync_loads_pending(self):
+        listener = SignalListener("dsn")
+        conn = FakeConn([_db_row(1), _db_row(2, day=2), _db_row(3, status="acted")])
+        listener._resync(conn)
+        pending = listener.pending()
+        assert [s["id"] for s in pending] == [2, 1]
+        assert pending[0]["created_at"] == "2026-01-02 00:00:00+00:00"  # stringified
+        assert conn.executed[0][1] == (listener.limit,)
+
+    def test_refresh_ids_applies_changes_and_deletes(self):
+        listener = SignalListener("dsn")
+        conn = FakeConn([_db_row(1), _db_row(2), _db_row(3)])
+        listener._resync(conn)
+        conn.table[1] = _db_row(1, status="acted", day=3)
+        del conn.table[2]
+        conn.table[4] = _db_row(4, day=4)
+        listener._refresh_ids(conn, [1, 2, 4])
+        assert sorted(s["id"] for s in listener.pending()) == [3, 4]
+
+    def test_pending_returns_copies(self):
+        listener = SignalListener("dsn")
+        listener._resync(FakeConn([_db_row(1)]))
+        listener.pending()[0]["summary"] = "changed"
+        assert listener.pending()[0]["summary"] == "Signal 1"
+
+    def test_remove(self):
+        listener = SignalListener("dsn")
+        listener._resync(FakeConn([_db_row(1), _db_row(2)]))
+        listener.remove(1)
+        assert [s["id"] for s in listener.pending()] == [2]
+
+
+# ===========================================================================
+# _listen / _run
+# ===========================================================================
+
+@pytest.fixture
+def fake_pg(monkeypatch):
+    """Route psycopg2.connect to a FakeConn and select() to 'ready' until stopped."""
+    state = {"conn": None, "selects": 0}
+
+    def connect(dsn, connect_timeout):
+        return state["conn"]
+
+    fake = types.SimpleNamespace(
+        connect=connect,
+        extensions=types.SimpleNamespace(ISOLATION_LEVEL_AUTOCOMMIT=0),
+    )
+    monkeypatch.setattr(signal_listener, "psycopg2", fake)
+    return state
+
+
+class TestListen:
+    """LISTEN, resync, then batch notifications by signal ID."""
+
+    def test_batches_notifications(self, fake_pg, monkeypatch):
+        listener = SignalListener("dsn")
+        conn = FakeConn(
+            [_db_row(1), _db_row(2)],
+            notify_batches=[[
+                _notify(json.dumps({"id": 1})),
+                _notify(json.dumps({"id": 1})),
+                _notify("not json"),
+                _notify(json.dumps({"no_id": 5})),
+                _notify(json.dumps({"id": 2})),
+            ]],
+        )
+        fake_pg["conn"] = conn
+
+        def fake_select(rlist, wlist, xlist, timeout):
+            fake_pg["selects"] += 1
+            assert listener.connected
+            if fake_pg["selects"] == 1:
+                conn.table[1] = _db_row(1, status="acted", day=3)
+                return rlist, [], []
+            listener.stop()
+            return [], [], []  # idle -> keepalive, then the loop sees stop
+
+        monkeypatch.setattr(signal_listener.select, "select", fake_select)
+        listener._listen()
+
+        assert conn.executed[0][0] == "LISTEN jake_signals"
+        refreshes = [params for sql, params in conn.executed if "ANY(%s)" in sql]
+        assert refreshes == [([1, 2],)]  # one re-read for the whole batch, deduplicated
+        assert [s["id"] for s in listener.pending()] == [2]
+        assert listener.last_notify_at is not None
+        assert conn.executed[-1][0] == "SELECT 1"
+        assert not listener.connected
+        assert conn.closed
+
+    def test_run_backs_off_and_records_errors(self, monkeypatch):
+        listener = SignalListener("dsn", reconnect_seconds=1, max_reconnect_seconds=4)
+        waits = []
+
+        def failing_listen():
+            raise OSError("connection refused")
+
+        def fake_wait(delay):
+            waits.append(delay)
+            if len(waits) == 4:
+                listener._stop.set()
+
+        monkeypatch.setattr(listener, "_listen", failing_listen)
+        monkeypatch.setattr(listener._stop, "wait", fake_wait)
+        monkeypatch.setattr(signal_listener.traceback, "print_exc", lambda: None)
+        listener._run()
+        assert waits == [1, 2, 4, 4]
+        assert listener.last_error == "connection refused"
+        assert not listener.connected
+
+
+def test_start_without_psycopg2_is_noop(monkeypatch):
+    monkeypatch.setattr(signal_listener, "psycopg2", None)
+    listener = SignalListener("dsn")
+    assert not SignalListener.available()
+    listener.start()
+    assert listener._thread is None
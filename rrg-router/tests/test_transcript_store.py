@@ -0,0 +1,134 @@
+"""Tests for transcript_store.py — memory window, JSONL archive and file offload."""
+
+import json
+import os
+import time
+
+import pytest
+
+import transcript_store
+from artifact_store import ArtifactStore
+from transcript_store import TranscriptStore, evict_expired_transcripts, router_artifact_store
+
+
+@pytest.fixture
+def artifacts(tmp_path):
+    root = tmp_path / "artifacts"
+    root.mkdir()
+    return ArtifactStore(str(root))
+
+
+@pytest.fixture
+def transcript(tmp_path, artifacts):
+    return TranscriptStore(artifacts, root=str(tmp_path / "transcripts"), max_in_memory=3)
+
+
+def _broken_put(data):
+    raise OSError("disk full")
+
+
+def _fill(transcript, n):
+    for i in range(n):
+        transcript.append({"role": "user" if i % 2 == 0 else "assistant", "content": f"m{i}"})
+
+
+# ===========================================================================
+# Memory window and JSONL archive
+# ===========================================================================
+
+class TestWindow:
+    """The last max_in_memory messages stay in memory; older ones go to disk."""
+
+    def test_in_memory_until_limit(self, transcript):
+        _fill(transcript, 3)
+        assert len(transcript) == 3
+        assert transcript.archived_count == 0
+        assert not os.path.exists(transcript.archive_path)
+        assert transcript.last()["content"] == "m2"
+
+    def test_overflow_is_archived(self, transcript):
+        _fill(transcript, 5)
+        assert len(transcript) == 5
+        assert [m["content"] for m in transcript.recent] == ["m2", "m3", "m4"]
+        with open(transcript.archive_path, encoding="utf-8") as f:
+            archived = [json.loads(line)["content"] for line in f]
+        assert archived == ["m0", "m1"]
+
+    def test_window_within_memory_does_not_read_disk(self, transcript, monkeypatch):
+        _fill(transcript, 5)
+        monkeypatch.setattr("builtins.open", None)  # any read would fail
+        assert [m["content"] for m in transcript.window(2)] == ["m3", "m4"]
+
+    def test_window_reads_back_archived(self, transcript):
+        _fill(transcript, 6)
+        assert [m["content"] for m in transcript.window(4)] == ["m2", "m3", "m4", "m5"]
+        assert len(transcript.window(100)) == 6
+
+    def test_window_after_archive_expired(self, transcript):
+        _fill(transcript, 5)
+        os.unlink(transcript.archive_path)
+        assert [m["content"] for m in transcript.window(5)] == ["m2", "m3", "m4"]
+        assert len(transcript) == 3
+
+    def test_history_is_role_and_content_only(self, transcript):
+        transcript.append({"role": "assistant", "content": "hi", "pdf_filename": "a.pdf"})
+        assert transcript.history(20) == [{"role": "assistant", "content": "hi"}]
+
+    def test_empty(self, transcript):
+        assert transcript.last() is None
+        assert transcript.window(10) == []
+
+
+# ===========================================================================
+# Artifact offload
+# ===========================================================================
+
+class TestOffload:
+    """Inline file bytes move to the artifact store; the message keeps the ID."""
+
+    def test_bytes_become_artifact_id(self, transcript, artifacts):
+        msg = {"role": "assistant", "content": "PDF", "pdf_bytes": b"%PDF-1.7", "pdf_filename": "a.pdf"}
+        transcript.append(msg)
+        stored = transcript.last()
+        assert "pdf_bytes" not in stored
+        assert artifacts.get(stored["pdf_artifact_id"]) == b"%PDF-1.7"
+        assert msg["pdf_bytes"] == b"%PDF-1.7"  # caller's dict untouched
+
+    def test_store_failure_keeps_bytes(self, transcript, artifacts, monkeypatch):
+        monkeypatch.setattr(artifacts, "put", _broken_put)
+        transcript.append({"role": "assistant", "content": "DOCX", "docx_bytes": b"PK"})
+        assert transcript.last()["docx_bytes"] == b"PK"
+
+    def test_archive_drops_unoffloaded_bytes(self, transcript, artifacts, monkeypatch):
+        monkeypatch.setattr(artifacts, "put", _broken_put)
+        transcript.append({"role": "assistant", "content": "DOCX", "docx_bytes": b"PK"})
+        _fill(transcript, 3)
+        (archived,) = transcript.window(4)[:1]
+        assert archived == {"role": "assistant", "content": "DOCX"}
+
+
+# ===========================================================================
+# Expiry and store selection
+# ===========================================================================
+
+def test_evict_expired_transcripts(tmp_path):
+    old = tmp_path / "old.jsonl"
+    new = tmp_path / "new.jsonl"
+    other = tmp_path / "notes.txt"
+    for path in (old, new, other):
+        path.write_text("{}\n")
+    past = time.time() - 3600
+    os.utime(old, (past, past))
+    os.utime(other, (past, past))
+    assert evict_expired_transcripts(str(tmp_path), ttl_seconds=60) == 1
+    assert not old.exists()
+    assert new.exists() and other.exists()
+    assert evict_expired_transcripts(str(tmp_path / "missing")) == 0
+
+
+def test_router_artifact_store_falls_back_to_local_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("artifact_store.ARTIFACT_DIR", str(tmp_path / "not-mounted"))
+    monkeypatch.setattr(transcript_store, "LOCAL_ARTIFACT_DIR", str(tmp_path / "local"))
+    store = router_artifact_store()
+    assert store.root == str(tmp_path / "local")
+    assert store.enabled
@@ -0,0 +1,141 @@
+"""Bounded chat transcript for one Streamlit session.
+
+Keeps the last TRANSCRIPT_MAX_MESSAGES messages in memory. Older messages
+are appended to a per-session JSONL file and only read back when the
+user asks to see earlier history. Generated files never sit in the
+transcript: inline PDF/DOCX bytes are moved to the artifact store (LRU
+by size) and the message keeps just the artifact ID.
+
+So per-session memory is bounded by the message count, not by how many
+brochures or contact sheets the session produced.
+"""
+
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from artifact_store import ArtifactStore
+
+# On the router's data volume — /tmp is a tmpfs (RAM) in the container
+TRANSCRIPT_DIR = os.getenv("TRANSCRIPT_DIR", "/data/transcripts")
+TRANSCRIPT_MAX_MESSAGES = int(os.getenv("TRANSCRIPT_MAX_MESSAGES", "40"))
+TRANSCRIPT_TTL_SECONDS = int(os.getenv("TRANSCRIPT_TTL_SECONDS", str(24 * 60 * 60)))
+
+# Router-local artifact directory when the shared /artifacts volume isn't mounted
+LOCAL_ARTIFACT_DIR = os.getenv("ROUTER_ARTIFACT_DIR", "/data/artifacts")
+
+# (bytes field, artifact ID field) pairs moved out of messages
+_FILE_FIELDS = (("pdf_bytes", "pdf_artifact_id"), ("docx_bytes", "docx_artifact_id"))
+
+
+def router_artifact_store() -> ArtifactStore:
+    """The shared artifact volume if mounted, else a router-local directory."""
+    store = ArtifactStore()
+    if store.enabled:
+        return store
+    os.makedirs(LOCAL_ARTIFACT_DIR, exist_ok=True)
+    return ArtifactStore(LOCAL_ARTIFACT_DIR)
+
+
+def evict_expired_transcripts(root: str = TRANSCRIPT_DIR, ttl_seconds: int = TRANSCRIPT_TTL_SECONDS) -> int:
+    """Delete archived transcripts untouched for `ttl_seconds`. Returns the count."""
+    removed = 0
+    cutoff = time.time() - ttl_seconds
+    try:
+        entries = list(os.scandir(root))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        if not entry.name.endswith(".jsonl"):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+class TranscriptStore:
+    """Recent messages in memory, older ones in a JSONL file on disk."""
+
+    def __init__(
+        self,
+        artifact_store: ArtifactStore,
+        root: Optional[str] = None,
+        max_in_memory: Optional[int] = None,
+    ):
+        self.artifact_store = artifact_store
+        self.root = root or TRANSCRIPT_DIR
+        self.max_in_memory = max_in_memory or TRANSCRIPT_MAX_MESSAGES
+        self.session_id = str(uuid.uuid4())
+        self.recent: List[Dict[str, Any]] = []
+        self.archived_count = 0
+
+    @property
+    def archive_path(self) -> str:
+        return os.path.join(self.root, f"{self.session_id}.jsonl")
+
+    def __len__(self) -> int:
+        return self.archived_count + len(self.recent)
+
+    def last(self) -> Optional[Dict[str, Any]]:
+        """The newest message, or None if the transcript is empty."""
+        return self.recent[-1] if self.recent else None
+
+    def history(self, n: int) -> List[Dict[str, str]]:
+        """The last `n` messages as {role, content} (LLM context)."""
+        return [
+            {"role": m["role"], "content": m["content"]}
+            for m in self.recent[-n:]
+        ]
+
+    def _offload_files(self, msg: Dict[str, Any]) -> Dict[str, Any]:
+        """Move inline file bytes to the artifact store; keep the ID."""
+        msg = dict(msg)
+        for bytes_field, id_field in _FILE_FIELDS:
+            data = msg.get(bytes_field)
+            if not data:
+                continue
+            try:
+                msg[id_field] = self.artifact_store.put(data)
+                del msg[bytes_field]
+            except OSError:
+                pass  # keep the bytes rather than lose the file
+        return msg
+
+    def append(self, msg: Dict[str, Any]):
+        """Add a message, archiving the oldest ones past the memory limit."""
+        self.recent.append(self._offload_files(msg))
+        overflow = len(self.recent) - self.max_in_memory
+        if overflow > 0:
+            self._archive(self.recent[:overflow])
+            del self.recent[:overflow]
+
+    def _archive(self, messages: List[Dict[str, Any]]):
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.archive_path, "a", encoding="utf-8") as f:
+            for m in messages:
+                # Bytes that couldn't be offloaded aren't JSON — drop them
+                f.write(json.dumps(
+                    {k: v for k, v in m.items() if not isinstance(v, bytes)}
+                ) + "\n")
+        self.archived_count += len(messages)
+
+    def window(self, count: int) -> List[Dict[str, Any]]:
+        """The last `count` messages, reading archived ones only if needed."""
+        if count <= len(self.recent):
+            return self.recent[len(self.recent) - count:]
+        need = min(count - len(self.recent), self.archived_count)
+        older: List[Dict[str, Any]] = []
+        if need:
+            try:
+                with open(self.archive_path, encoding="utf-8") as f:
+                    lines = f.readlines()
+                older = [json.loads(line) for line in lines[-need:]]
+            except FileNotFoundError:
+                self.archived_count = 0  # expired from disk
+        return older + self.recent
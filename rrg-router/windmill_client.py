@@ -1,9 +1,20 @@
 """HTTP client for routing worker calls through Windmill."""
 
-import base64
+import time
 import requests
 from typing import Optional, Dict, Any
 
+from node_client import worker_response, error_response
+
+
+def _worker_hops(result: dict) -> Dict[str, float]:
+    """worker_ms / queue_ms the flow's post step copied from the worker job."""
+    return {
+        key: result[key]
+        for key in ("worker_ms", "queue_ms")
+        if isinstance(result.get(key), (int, float))
+    }
+
 
 class WindmillClient:
     """Client that routes worker calls through a Windmill flow.
@@ -11,6 +22,7 @@ class WindmillClient:
     Drop-in replacement for WorkerNodeClient — same call_worker() signature.
     Calls Windmill's synchronous webhook endpoint which runs the
     f/switchboard/message_router flow (branchone routing to worker containers).
+    One keep-alive session is reused for all calls to the Windmill server.
     """
 
     def __init__(
@@ -24,6 +36,7 @@ class WindmillClient:
         self.token = windmill_token
         self.workspace = workspace
         self.timeout = timeout
+        self._session = requests.Session()
 
     def call_worker(
         self,
@@ -36,16 +49,14 @@ class WindmillClient:
         """Call a worker node via the Windmill message_router flow.
 
         Returns:
-            {response, state, active, pdf_bytes, pdf_filename, error}
+            {response, state, active, pdf_bytes, pdf_filename, error, timings}
+            (plus *_artifact_id fields when the worker stored a file)
         """
         url = (
             f"{self.base_url}/api/w/{self.workspace}"
             f"/jobs/run_wait_result/f/f/switchboard/message_router"
         )
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-        }
+        headers = self._headers()
         payload = {
             "target_node": handler_name,
             "command": command,
@@ -54,59 +65,122 @@ class WindmillClient:
             "state": state or {},
         }
 
+        start = time.perf_counter()
+        timings = {"path": "windmill", "worker": handler_name}
         try:
-            resp = requests.post(
+            resp = self._session.post(
                 url, json=payload, headers=headers, timeout=self.timeout
             )
+            timings["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
             resp.raise_for_status()
             data = resp.json()
 
-            # Decode PDF if present
-            pdf_bytes = None
-            if data.get("pdf_bytes"):
-                try:
-                    pdf_bytes = base64.b64decode(data["pdf_bytes"])
-                except Exception:
-                    pass
-
-            # Decode DOCX if present
-            docx_bytes = None
-            if data.get("docx_bytes"):
-                try:
-                    docx_bytes = base64.b64decode(data["docx_bytes"])
-                except Exception:
-                    pass
+            # The flow's post step reports the worker job's handler time and
+            # queue wait; the rest is Windmill and the hops to the worker
+            hops = _worker_hops(data)
+            if hops:
+                timings.update(hops)
+                timings["windmill_ms"] = round(timings["total_ms"] - sum(hops.values()), 1)
 
-            return {
-                "response": data.get("response", ""),
-                "state": data.get("state", {}),
-                "active": data.get("active", False),
-                "pdf_bytes": pdf_bytes,
-                "pdf_filename": data.get("pdf_filename"),
-                "docx_bytes": docx_bytes,
-                "docx_filename": data.get("docx_filename"),
-                "error": None,
-            }
+            response = worker_response(data)
+            response["timings"] = timings
+            return response
 
         except requests.Timeout:
-            return {
-                "response": f"Worker {handler_name} timed out (via Windmill). Please try again.",
-                "state": state or {},
-                "active": False,
-                "pdf_bytes": None,
-                "pdf_filename": None,
-                "docx_bytes": None,
-                "docx_filename": None,
-                "error": "timeout",
-            }
+            timings["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            response = error_response(
+                f"Worker {handler_name} timed out (via Windmill). Please try again.",
+                "timeout",
+                state,
+            )
+            response["timings"] = timings
+            return response
+        except requests.RequestException as e:
+            timings["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            response = error_response(
+                f"Failed to reach {handler_name} worker via Windmill: {e}", str(e), state
+            )
+            response["timings"] = timings
+            return response
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.token}",
+            "Content-Type": "application/json",
+        }
+
+    def submit_job(
+        self,
+        handler_name: str,
+        command: str,
+        user_message: str,
+        chat_history: list,
+        state: Optional[dict] = None,
+    ) -> Dict[str, Any]:
+        """Queue the message_router flow without waiting (jobs/run).
+
+        Returns a job handle {job_id, path, worker} to pass to poll_job(),
+        or {error, response} if Windmill rejected the job.
+        """
+        url = (
+            f"{self.base_url}/api/w/{self.workspace}"
+            f"/jobs/run/f/f/switchboard/message_router"
+        )
+        payload = {
+            "target_node": handler_name,
+            "command": command,
+            "user_message": user_message,
+            "chat_history": chat_history,
+            "state": state or {},
+        }
+        try:
+            resp = self._session.post(
+                url, json=payload, headers=self._headers(), timeout=30
+            )
+            resp.raise_for_status()
+            # jobs/run returns the job UUID as plain text
+            return {"job_id": resp.text.strip().strip('"'), "path": "windmill", "worker": handler_name}
         except requests.RequestException as e:
+            return error_response(
+                f"Failed to reach {handler_name} worker via Windmill: {e}", str(e), state
+            )
+
+    def poll_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Check a queued flow run (jobs_u/completed/get_result_maybe).
+
+        Windmill doesn't see the worker's stage events, so `stage` is
+        always None on this path.
+
+        Returns:
+            {status, stage, elapsed_seconds, result, timings}
+            status: "running" | "done" | "lost" | "unreachable"
+            timings: {worker_ms, queue_ms} once done, from the worker job
+                the flow's post step ran
+        """
+        url = (
+            f"{self.base_url}/api/w/{self.workspace}"
+            f"/jobs_u/completed/get_result_maybe/{job['job_id']}"
+        )
+        try:
+            resp = self._session.get(url, headers=self._headers(), timeout=30)
+            if resp.status_code == 404:
+                return {"status": "lost", "stage": None, "result": None}
+            resp.raise_for_status()
+            data = resp.json()
+        except (requests.RequestException, ValueError):
+            return {"status": "unreachable", "stage": None, "result": None}
+
+        if not data.get("completed"):
+            return {"status": "running", "stage": None, "result": None}
+
+        result = data.get("result")
+        if data.get("success") is False or not isinstance(result, dict):
             return {
-                "response": f"Failed to reach {handler_name} worker via Windmill: {e}",
-                "state": state or {},
-                "active": False,
-                "pdf_bytes": None,
-                "pdf_filename": None,
-                "docx_bytes": None,
-                "docx_filename": None,
-                "error": str(e),
+                "status": "done",
+                "stage": None,
+                "result": error_response(
+                    f"The {job['worker']} worker failed (via Windmill). Please try again.",
+                    "windmill_job_failed",
+                ),
             }
+        return {"status": "done", "stage": None, "result": worker_response(result), "timings": _worker_hops(result)}
@@ -0,0 +1,115 @@
+"""P&L and PA workers serving users at the same time.
+
+Each service is started in its own process (the services share module
+names, so they can't be imported side by side) on wsgi_server with the
+LLM graph replaced by a fixed delay. Two users per service then send
+turns at once; all four must overlap and get their own sessions back.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DELAY = 0.5
+
+# Runs inside the service directory: fake graph, real server + wsgi_server
+_BOOTSTRAP = """
+import sys, time
+from unittest.mock import MagicMock, patch
+
+service, delay = sys.argv[1], float(sys.argv[2])
+
+def invoke(graph_input):
+    time.sleep(delay)  # stands in for the LLM call
+    user = graph_input["user_message"]
+    if service == "pnl":
+        return {"response": f"P&L for {user}", "pnl_data_out": {"property_name": user},
+                "pnl_active_out": True}
+    return {"response": f"Draft for {user}", "draft_id": graph_input["draft_id"] or f"draft-{user}",
+            "pa_active": True, "docx_bytes": None, "docx_filename": None}
+
+# Left patched: the PA server builds its graph on first request
+patch("graph.build_graph", return_value=MagicMock(invoke=invoke)).start()
+from server import app
+from wsgi_server import make_server
+
+server = make_server(app, "127.0.0.1", 0, threads=4)
+print(server.port, flush=True)
+server.serve_forever()
+"""
+
+
+def _start(service_dir, service, tmp_path):
+    log = tmp_path / f"{service}.log"
+    env = dict(
+        os.environ,
+        SESSION_DB_PATH=str(tmp_path / f"{service}-sessions.db"),
+        JOB_DB_PATH=str(tmp_path / f"{service}-jobs.db"),
+        PA_DB_PATH=str(tmp_path / f"{service}-drafts.db"),
+        ARTIFACT_DIR=str(tmp_path / "no-artifacts"),
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-c", _BOOTSTRAP, service, str(DELAY)],
+        cwd=os.path.join(REPO, service_dir),
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=open(log, "w"),
+        text=True,
+    )
+    for line in proc.stdout:  # the port, after anything printed on import
+        if line.strip().isdigit():
+            return proc, f"http://127.0.0.1:{line.strip()}"
+    proc.wait()
+    with open(log) as f:
+        error = f.read().strip().splitlines()
+    pytest.skip(f"{service_dir} can't start here: {error[-1] if error else 'no output'}")
+
+
+@pytest.fixture
+def workers(tmp_path):
+    procs = []
+    try:
+        pnl, pnl_url = _start("rrg-pnl", "pnl", tmp_path)
+        procs.append(pnl)
+        pa, pa_url = _start("rrg-commercial-pa", "pa", tmp_path)
+        procs.append(pa)
+        yield {"pnl": pnl_url, "pa": pa_url}
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+
+def _turn(url, user):
+    body = {"command": "create", "user_message": user, "chat_history": [], "state": {}}
+    req = urllib.request.Request(
+        f"{url}/process", data=json.dumps(body).encode(), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return json.loads(resp.read())
+
+
+def test_pnl_and_pa_users_at_once(workers):
+    for url in workers.values():
+        _turn(url, "warm-up")  # first turn pays each service's lazy imports
+    turns = [("pnl", "alice"), ("pa", "bob"), ("pnl", "carol"), ("pa", "dave")]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(turns)) as pool:
+        results = list(pool.map(lambda t: _turn(workers[t[0]], t[1]), turns))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < DELAY * 1.75  # all four turns overlapped
+    alice, bob, carol, dave = results
+    assert alice["response"] == "P&L for alice"
+    assert carol["response"] == "P&L for carol"
+    assert alice["state"]["session_id"] != carol["state"]["session_id"]
+    assert bob["response"] == "Draft for bob"
+    assert bob["state"]["draft_id"] == "draft-bob"
+    assert dave["state"]["draft_id"] == "draft-dave"
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import subprocess
+import threading
+import time
+from datetime import datetime, timezone
+
+
+# Same backends and fixture format as claude_llm.py in the rrg-* services:
+#   LLM_BACKEND=cli     call the Claude CLI (default)
+#   LLM_BACKEND=record  call the CLI and save prompt->response fixtures
+#   LLM_BACKEND=replay  answer from fixtures by prompt hash, no CLI
+# Fixtures are <sha256>.json files in LLM_FIXTURE_DIR; replay sleeps for the
+# recorded latency unless LLM_REPLAY_LATENCY_MS is set.
+
+
+def _settings():
+    # Read per call — Windmill workers are long-lived and env can change per job
+    return (
+        os.getenv("LLM_BACKEND", "cli"),
+        os.getenv("LLM_FIXTURE_DIR", "llm_fixtures"),
+        os.getenv("LLM_REPLAY_LATENCY_MS", ""),
+    )
+
+
+def prompt_key(model: str, system_prompt: str | None, prompt: str) -> str:
+    """Stable fixture key for one LLM call (matches claude_llm.prompt_key)."""
+    payload = json.dumps([model, system_prompt or "", prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _call_cli(prompt: str, model: str, timeout: int, system_prompt: str | None) -> str:
+    cmd = ["claude", "-p", prompt, "--model", model, "--no-chrome", "--allowedTools", ""]
+    if system_prompt:
+        cmd.extend(["--system-prompt", system_prompt])
+    result = subprocess.run(
+        cmd,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        env=os.environ.copy(),
+    )
+    if result.returncode != 0:
+        error_msg = result.stderr.strip() or f"Claude CLI exited with code {result.returncode}"
+        raise RuntimeError(error_msg)
+    return result.stdout.strip()
+
+
+def run_claude(
+    prompt: str,
+    model: str = "haiku",
+    timeout: int = 90,
+    system_prompt: str | None = None,
+) -> str:
+    """Run one prompt through the configured backend and return the text.
+
+    Raises RuntimeError if the CLI fails or (replay) no fixture exists.
+    """
+    backend, fixture_dir, replay_latency_ms = _settings()
+    key = prompt_key(model, system_prompt, prompt)
+    path = os.path.join(fixture_dir, f"{key}.json")
+
+    if backend == "replay":
+        try:
+            with open(path, encoding="utf-8") as f:
+                fixture = json.load(f)
+        except FileNotFoundError:
+            raise RuntimeError(
+                f"No recorded LLM response for this prompt (key {key[:12]} in {fixture_dir}). "
+                "Re-run with LLM_BACKEND=record to capture it."
+            )
+        latency_ms = float(replay_latency_ms or fixture.get("latency_ms") or 0)
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+        return fixture["response"]
+
+    started = time.perf_counter()
+    text = _call_cli(prompt, model, timeout, system_prompt)
+    if backend == "record":
+        os.makedirs(fixture_dir, exist_ok=True)
+        # pid + thread: two threads recording the same prompt mustn't share a temp file
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "model": model,
+                "system_prompt": system_prompt,
+                "prompt": prompt,
+                "response": text,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+    return text
+
+
+def main(prompt: str, model: str = "haiku", system_prompt: str = ""):
+    """Run one prompt through the Claude backend (for ad-hoc checks).
+
+    Flow steps import run_claude from this script instead of calling the
+    CLI directly, so LLM_BACKEND=record/replay covers them too.
+    """
+    return run_claude(prompt, model=model, system_prompt=system_prompt or None)
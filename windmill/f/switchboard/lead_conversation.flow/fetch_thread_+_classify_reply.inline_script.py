@@ -10,11 +10,10 @@
 
 import wmill
 import json
-import os
 import re
-import subprocess
 import base64
 import html
+from f.switchboard.claude_backend import run_claude
 from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
 
@@ -168,19 +167,7 @@ Respond with ONLY valid JSON (no markdown fences, no explanation outside the JSO
 {{"classification": "INTERESTED", "sub_classification": "OFFER" or "WANT_SOMETHING" or "GENERAL_INTEREST", "wants": ["tour", "more_info"] or null, "confidence": 0.85, "reasoning": "brief 1-sentence explanation"}}"""
 
     try:
-        result = subprocess.run(
-            ["claude", "-p", prompt, "--model", "haiku", "--no-chrome", "--allowedTools", ""],
-            capture_output=True,
-            text=True,
-            timeout=90,
-            env=os.environ.copy(),
-        )
-
-        if result.returncode != 0:
-            error_msg = result.stderr.strip() or f"Claude CLI exited with code {result.returncode}"
-            raise RuntimeError(error_msg)
-
-        result_text = result.stdout.strip()
+        result_text = run_claude(prompt, model="haiku", timeout=90)
 
         # Parse JSON from response (handle potential markdown wrapping)
         clean = result_text
@@ -19,15 +19,14 @@
 
 import wmill
 import json
-import os
 import re
-import subprocess
 import base64
 import time
 import requests
 import psycopg2
 from email.mime.text import MIMEText
 from datetime import datetime, timezone
+from f.switchboard.claude_backend import run_claude
 from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
 
@@ -652,19 +651,7 @@ RULES:
         return None
 
     try:
-        result = subprocess.run(
-            ["claude", "-p", prompt, "--model", "haiku", "--no-chrome", "--allowedTools", ""],
-            capture_output=True,
-            text=True,
-            timeout=90,
-            env=os.environ.copy(),
-        )
-
-        if result.returncode != 0:
-            error_msg = result.stderr.strip() or f"Claude CLI exited with code {result.returncode}"
-            raise RuntimeError(error_msg)
-
-        body = result.stdout.strip()
+        body = run_claude(prompt, model="haiku", timeout=90)
         # Remove any markdown fences Claude might add
         if body.startswith("```"):
             body = re.sub(r'^```\w*\s*', '', body)
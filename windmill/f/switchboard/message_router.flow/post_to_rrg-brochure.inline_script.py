@@ -1,8 +1,18 @@
 #extra_requirements:
 #requests
 
+import time
+
 import requests as req
 
+WORKER_URL = "http://rrg-brochure:8101"
+# The turn runs as a job on the worker, so a slow one (photo search, PDF
+# render) isn't cut off by one request's timeout; this only bounds how
+# long the step waits for it
+JOB_DEADLINE_SECONDS = 30 * 60
+POLL_SECONDS = 1.0
+
+
 def main(
     target_node: str,
     command: str,
@@ -10,13 +20,36 @@ def main(
     chat_history: list,
     state: dict,
 ):
-    url = "http://rrg-brochure:8101/process"
     payload = {
         "command": command,
         "user_message": user_message,
         "chat_history": chat_history,
         "state": state,
     }
-    resp = req.post(url, json=payload, timeout=120)
-    resp.raise_for_status()
-    return resp.json()
+    with req.Session() as session:
+        resp = session.post(f"{WORKER_URL}/jobs", json=payload, timeout=30)
+        resp.raise_for_status()
+        job_id = resp.json()["job_id"]
+
+        deadline = time.monotonic() + JOB_DEADLINE_SECONDS
+        while True:
+            resp = session.get(f"{WORKER_URL}/jobs/{job_id}", timeout=30)
+            if resp.status_code == 404:
+                raise RuntimeError(f"rrg-brochure lost job {job_id} (worker restarted?)")
+            resp.raise_for_status()
+            job = resp.json()
+            if job["status"] in ("done", "error"):
+                break
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"rrg-brochure job {job_id} still {job['status']} after {JOB_DEADLINE_SECONDS}s")
+            time.sleep(POLL_SECONDS)
+
+    result = job.get("result")
+    if not isinstance(result, dict):
+        raise RuntimeError(job.get("error") or f"rrg-brochure job {job_id} failed")
+    # The worker's handler time and queue wait, as the direct path reports
+    # them, so the router can split them from Windmill overhead
+    for key in ("worker_ms", "queue_ms"):
+        if key in job:
+            result[key] = job[key]
+    return result
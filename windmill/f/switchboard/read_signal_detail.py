@@ -0,0 +1,35 @@
+#extra_requirements:
+#psycopg2-binary
+
+import wmill
+import psycopg2
+
+
+def main(signal_id: int):
+    """Read one signal's detail JSON from jake_signals.
+
+    The Router's Signals list is loaded without `detail`; this fetches it
+    when the user expands a signal.
+    """
+    pg = wmill.get_resource("f/switchboard/pg")
+    conn = psycopg2.connect(
+        host=pg["host"],
+        port=pg.get("port", 5432),
+        user=pg["user"],
+        password=pg["password"],
+        dbname=pg["dbname"],
+        sslmode=pg.get("sslmode", "disable"),
+    )
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT detail FROM public.jake_signals WHERE id = %s",
+            (signal_id,),
+        )
+        row = cur.fetchone()
+        cur.close()
+    finally:
+        conn.close()
+    if row is None:
+        return {"error": f"Signal {signal_id} not found"}
+    return {"id": signal_id, "detail": row[0] or {}}
@@ -6,11 +6,40 @@ import psycopg2
 import json
 
 
-def main(status: str = "pending", limit: int = 20):
+# Summary columns — everything the Signals list needs except `detail`
+_SUMMARY_COLUMNS = """
+    id, signal_type, source_flow, summary, actions,
+    windmill_job_id, resume_url, cancel_url, status, created_at,
+    COALESCE(acted_at, created_at) AS updated_at
+"""
+
+
+def main(
+    status: str = "pending",
+    limit: int = 20,
+    since_id: int = 0,
+    updated_since: str = "",
+    include_detail: bool = True,
+    before_created_at: str = "",
+    before_id: int = 0,
+):
     """Read signals from jake_signals table.
-    
+
     Returns pending (or other status) signals ordered by newest first.
     Used by Router UI to poll for action items.
+
+    Pages of the full list: pass the last row's created_at and id as
+    before_created_at / before_id to get the rows after it.
+
+    Incremental mode (since_id > 0 or updated_since set) is a keyset read
+    for clients that cache the list. It returns rows of any status whose
+    (updated_at, id) comes after the cursor (updated_since, since_id),
+    where updated_at is acted_at, else created_at — so new signals show up
+    and the client can drop ones that were acted on elsewhere. Ordered by
+    that pair, so the last row of a page is the cursor for the next one.
+
+    include_detail=False leaves out the `detail` JSON; the Router fetches
+    it per signal with f/switchboard/read_signal_detail when expanded.
     """
     pg = wmill.get_resource("f/switchboard/pg")
     conn = psycopg2.connect(
@@ -21,26 +50,51 @@ def main(status: str = "pending", limit: int = 20):
         dbname=pg["dbname"],
         sslmode=pg.get("sslmode", "disable"),
     )
+    columns = _SUMMARY_COLUMNS + (", detail" if include_detail else "")
     try:
         cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT id, signal_type, source_flow, summary, detail, actions,
-                   windmill_job_id, resume_url, cancel_url, status, created_at
-            FROM public.jake_signals
-            WHERE status = %s
-            ORDER BY created_at DESC
-            LIMIT %s
-            """,
-            (status, limit),
-        )
+        if since_id or updated_since:
+            cur.execute(
+                f"""
+                SELECT {columns}
+                FROM public.jake_signals
+                WHERE (COALESCE(acted_at, created_at), id)
+                    > (%s::timestamptz, %s)
+                ORDER BY COALESCE(acted_at, created_at), id
+                LIMIT %s
+                """,
+                (updated_since or "-infinity", since_id, limit),
+            )
+        elif before_created_at:
+            cur.execute(
+                f"""
+                SELECT {columns}
+                FROM public.jake_signals
+                WHERE status = %s
+                  AND (created_at, id) < (%s::timestamptz, %s)
+                ORDER BY created_at DESC, id DESC
+                LIMIT %s
+                """,
+                (status, before_created_at, before_id, limit),
+            )
+        else:
+            cur.execute(
+                f"""
+                SELECT {columns}
+                FROM public.jake_signals
+                WHERE status = %s
+                ORDER BY created_at DESC, id DESC
+                LIMIT %s
+                """,
+                (status, limit),
+            )
         cols = [d[0] for d in cur.description]
         rows = []
         for r in cur.fetchall():
             row = {}
             for i, col in enumerate(cols):
                 val = r[i]
-                if col == "created_at":
+                if col in ("created_at", "updated_at"):
                     val = str(val)
                 row[col] = val
             rows.append(row)
@@ -0,0 +1,56 @@
+# Setup Signal Notify — push jake_signals changes to listeners
+# Path: f/switchboard/setup_signal_notify
+#
+# Installs a trigger on public.jake_signals that sends
+#   pg_notify('jake_signals', '{"id": ..., "status": ..., "op": "INSERT"|"UPDATE"}')
+# on insert and on status change. The Router's signal listener LISTENs on
+# that channel and re-reads just the changed rows. Safe to re-run.
+
+#extra_requirements:
+#psycopg2-binary
+
+import wmill
+import psycopg2
+
+CHANNEL = "jake_signals"
+
+_SQL = f"""
+CREATE OR REPLACE FUNCTION public.jake_signals_notify() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.status IS NOT DISTINCT FROM NEW.status THEN
+        RETURN NEW;
+    END IF;
+    PERFORM pg_notify(
+        '{CHANNEL}',
+        json_build_object('id', NEW.id, 'status', NEW.status, 'op', TG_OP)::text
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS jake_signals_notify ON public.jake_signals;
+CREATE TRIGGER jake_signals_notify
+    AFTER INSERT OR UPDATE OF status ON public.jake_signals
+    FOR EACH ROW EXECUTE FUNCTION public.jake_signals_notify();
+"""
+
+
+def main():
+    """Create or replace the jake_signals notify trigger."""
+    pg = wmill.get_resource("f/switchboard/pg")
+    conn = psycopg2.connect(
+        host=pg["host"],
+        port=pg.get("port", 5432),
+        user=pg["user"],
+        password=pg["password"],
+        dbname=pg["dbname"],
+        sslmode=pg.get("sslmode", "disable"),
+    )
+    try:
+        cur = conn.cursor()
+        cur.execute(_SQL)
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+    return {"installed": True, "channel": CHANNEL}